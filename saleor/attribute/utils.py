@@ -1,4 +1,7 @@
-from typing import TYPE_CHECKING, Iterable, Set, Union
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Type, Union
+
+from django.db.models import Q
 
 from ..page.models import Page
 from ..product.models import Product, ProductVariant
@@ -10,8 +13,12 @@ from .models import (
     AssignedVariantAttribute,
     AssignedVariantAttributeValue,
     Attribute,
+    AttributePage,
+    AttributeProduct,
     AttributeValue,
+    AttributeVariant,
 )
+from .models.base import BaseAssignedAttribute
 
 AttributeAssignmentType = Union[
     AssignedProductAttribute, AssignedVariantAttribute, AssignedPageAttribute
@@ -19,10 +26,6 @@ AttributeAssignmentType = Union[
 T_INSTANCE = Union[Product, ProductVariant, Page]
 
 
-if TYPE_CHECKING:
-    from .models import AttributePage, AttributeProduct, AttributeVariant
-
-
 def associate_attribute_values_to_instance(
     instance: T_INSTANCE,
     attribute: Attribute,
@@ -115,3 +118,165 @@ def sort_assigned_attribute_values(
         value_assignment.sort_order = index
 
     assignment_model.objects.bulk_update(values_assignment, ["sort_order"])
+
+
+# Models used to assign attributes to instances of the given model: relation of
+# attributes to the instance type, with the name of its type field, and assigned
+# attribute, with the name of its instance field.
+INSTANCE_ASSIGNMENT_MODELS = {
+    Product: (AttributeProduct, "product_type_id", AssignedProductAttribute, "product"),
+    ProductVariant: (
+        AttributeVariant,
+        "product_type_id",
+        AssignedVariantAttribute,
+        "variant",
+    ),
+    Page: (AttributePage, "page_type_id", AssignedPageAttribute, "page"),
+}
+ASSIGNED_VALUE_MODELS = {
+    AssignedProductAttribute: AssignedProductAttributeValue,
+    AssignedVariantAttribute: AssignedVariantAttributeValue,
+    AssignedPageAttribute: AssignedPageAttributeValue,
+}
+
+
+def _get_instance_type_id(instance: T_INSTANCE) -> int:
+    if isinstance(instance, Product):
+        return instance.product_type_id
+    if isinstance(instance, ProductVariant):
+        return instance.product.product_type_id
+    if isinstance(instance, Page):
+        return instance.page_type_id
+    raise AssertionError(f"{instance.__class__.__name__} is unsupported")
+
+
+def associate_attribute_values_to_instances(
+    instances_values: Sequence[Tuple[T_INSTANCE, Attribute, Sequence[AttributeValue]]]
+) -> List[AttributeAssignmentType]:
+    """Assign given attribute values to many instances at once.
+
+    Works like ``associate_attribute_values_to_instance`` called for each item,
+    but all instances of the same type are handled with a few queries.
+    """
+    instances_values_by_type: Dict[type, list] = defaultdict(list)
+    for instance, attribute, values in instances_values:
+        if any(value.attribute_id != attribute.pk for value in values):
+            raise AssertionError("Some values are not from the provided attribute.")
+        instances_values_by_type[type(instance)].append((instance, attribute, values))
+
+    assignments = []
+    for instance_type, items in instances_values_by_type.items():
+        if instance_type not in INSTANCE_ASSIGNMENT_MODELS:
+            raise AssertionError(f"{instance_type.__name__} is unsupported")
+        assignments.extend(_associate_attribute_values_to_instances_of_type(items))
+    return assignments
+
+
+def _associate_attribute_values_to_instances_of_type(items):
+    instance_type = type(items[0][0])
+    (
+        relation_model,
+        type_field,
+        assignment_model,
+        instance_field,
+    ) = INSTANCE_ASSIGNMENT_MODELS[instance_type]
+    value_assignment_model = ASSIGNED_VALUE_MODELS[assignment_model]
+
+    # Relations of the attributes to the product or page types
+    type_ids = {_get_instance_type_id(instance) for instance, _, _ in items}
+    attribute_ids = {attribute.pk for _, attribute, _ in items}
+    relations = {
+        (getattr(relation, type_field), relation.attribute_id): relation
+        for relation in relation_model.objects.filter(
+            **{f"{type_field}__in": type_ids, "attribute_id__in": attribute_ids}
+        )
+    }
+    relations_to_assign = []
+    for instance, attribute, values in items:
+        key = (_get_instance_type_id(instance), attribute.pk)
+        if key not in relations:
+            raise relation_model.DoesNotExist(
+                f"{relation_model.__name__} matching query does not exist."
+            )
+        relations_to_assign.append(relations[key])
+
+    # Assignments of the attributes to the instances
+    existing_assignments = {
+        (getattr(assignment, f"{instance_field}_id"), assignment.assignment_id): (
+            assignment
+        )
+        for assignment in assignment_model.objects.filter(
+            **{
+                f"{instance_field}__in": [instance for instance, _, _ in items],
+                "assignment__in": relations_to_assign,
+            }
+        )
+    }
+    assignments = []
+    assignments_to_create = []
+    for (instance, _, _), relation in zip(items, relations_to_assign):
+        key = (instance.pk, relation.pk)
+        if key not in existing_assignments:
+            existing_assignments[key] = assignment_model(
+                **{instance_field: instance, "assignment": relation}
+            )
+            assignments_to_create.append(existing_assignments[key])
+        assignments.append(existing_assignments[key])
+    assignment_model.objects.bulk_create(assignments_to_create)
+
+    # Values assigned to the assignments, ordered as given
+    assigned_values = defaultdict(dict)
+    for value_assignment in value_assignment_model.objects.filter(
+        assignment__in=assignments
+    ):
+        assigned_values[value_assignment.assignment_id][
+            value_assignment.value_id
+        ] = value_assignment
+    value_assignments_to_create = []
+    value_assignments_to_update = []
+    value_assignments_to_delete = []
+    for assignment, (_, _, values) in zip(assignments, items):
+        current_values = assigned_values[assignment.pk]
+        values_pks = list(dict.fromkeys(value.pk for value in values))
+        for sort_order, value_pk in enumerate(values_pks):
+            value_assignment = current_values.pop(value_pk, None)
+            if value_assignment is None:
+                value_assignments_to_create.append(
+                    value_assignment_model(
+                        assignment=assignment, value_id=value_pk, sort_order=sort_order
+                    )
+                )
+            elif value_assignment.sort_order != sort_order:
+                value_assignment.sort_order = sort_order
+                value_assignments_to_update.append(value_assignment)
+        value_assignments_to_delete.extend(
+            value_assignment.pk for value_assignment in current_values.values()
+        )
+        # values were replaced, so the cached ones are outdated
+        assignment._prefetched_objects_cache = {}
+
+    if value_assignments_to_delete:
+        value_assignment_model.objects.filter(
+            pk__in=value_assignments_to_delete
+        ).delete()
+    value_assignment_model.objects.bulk_create(value_assignments_to_create)
+    value_assignment_model.objects.bulk_update(
+        value_assignments_to_update, ["sort_order"]
+    )
+    return assignments
+
+
+def remove_attributes_from_instances(
+    instances_attributes: Iterable[Tuple[T_INSTANCE, Attribute]]
+):
+    """Drop assignments of the given attributes from the instances."""
+    lookups: Dict[Type[BaseAssignedAttribute], Q] = defaultdict(Q)
+    for instance, attribute in instances_attributes:
+        _, _, assignment_model, instance_field = INSTANCE_ASSIGNMENT_MODELS[
+            type(instance)
+        ]
+        lookups[assignment_model] |= Q(
+            **{instance_field: instance, "assignment__attribute_id": attribute.pk}
+        )
+    for assignment_model, lookup in lookups.items():
+        assignment_model.objects.filter(lookup).delete()
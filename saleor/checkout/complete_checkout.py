@@ -64,7 +64,11 @@ from ..tax.utils import (
 from ..warehouse.availability import check_stock_and_preorder_quantity_bulk
 from ..warehouse.management import allocate_preorders, allocate_stocks
 from ..warehouse.models import Reservation, Stock
-from ..warehouse.reservations import is_reservation_enabled
+from ..warehouse.reservations import (
+    is_reservation_enabled,
+    release_checkout_lines_reservations,
+    release_stock_reservations,
+)
 from . import AddressType
 from .base_calculations import (
     base_checkout_delivery_price,
@@ -877,6 +881,7 @@ def complete_checkout_post_payment_part(
                 private_metadata_list=private_metadata_list,
             )
             # remove checkout after order is successfully created
+            release_checkout_lines_reservations(checkout_info.checkout.lines.all())
             checkout_info.checkout.delete()
         except InsufficientStock as e:
             release_voucher_usage(
@@ -1247,6 +1252,7 @@ def create_order_from_checkout(
                 private_metadata_list=private_metadata_list,
             )
             if delete_checkout:
+                release_checkout_lines_reservations(checkout_info.checkout.lines.all())
                 checkout_info.checkout.delete()
             return order
         except InsufficientStock:
@@ -1368,7 +1374,9 @@ def complete_checkout(
                 channel_slug=checkout_info.channel.slug,
             )
             if not is_reservation_enabled(site_settings):
-                Reservation.objects.filter(id__in=[r.id for r in reservations]).delete()
+                release_stock_reservations(
+                    Reservation.objects.filter(id__in=[r.id for r in reservations])
+                )
             raise ValidationError("Checkout has changed during payment processing")
 
     return order, action_required, action_data
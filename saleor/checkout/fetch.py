@@ -1,5 +1,5 @@
 import itertools
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from functools import singledispatch
 from typing import (
     TYPE_CHECKING,
@@ -12,7 +12,10 @@ from typing import (
     Tuple,
     Union,
 )
+from uuid import UUID
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.functional import SimpleLazyObject
 
 from ..discount import DiscountInfo, VoucherType
@@ -44,6 +47,11 @@ if TYPE_CHECKING:
     from ..tax.models import TaxClass, TaxConfiguration
     from .models import Checkout, CheckoutLine
 
+CHECKOUT_LINES_SNAPSHOT_KEY = "checkout_lines_snapshot"
+CHECKOUT_LINES_SNAPSHOT_CATALOGUE_VERSION_KEY = (
+    "checkout_lines_snapshot_catalogue_version"
+)
+
 
 @dataclass
 class CheckoutLineInfo:
@@ -656,3 +664,100 @@ def update_checkout_info_delivery_method(
     checkout_info.delivery_method_info = get_delivery_method_info(
         delivery_method, checkout_info.shipping_address
     )
+
+
+def get_checkout_lines_snapshot_catalogue_version() -> int:
+    return cache.get_or_set(
+        CHECKOUT_LINES_SNAPSHOT_CATALOGUE_VERSION_KEY, 0, timeout=None
+    )
+
+
+def invalidate_checkout_lines_snapshots():
+    """Invalidate the cached lines snapshots of all checkouts.
+
+    Should be called when catalogue data used by the checkout lines, like
+    products, variants, their channel listings or collections, is changed.
+    """
+    if not settings.CHECKOUT_LINES_SNAPSHOT_TTL:
+        return
+    try:
+        cache.incr(CHECKOUT_LINES_SNAPSHOT_CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.set(CHECKOUT_LINES_SNAPSHOT_CATALOGUE_VERSION_KEY, 1, timeout=None)
+
+
+def get_checkout_lines_snapshot_key(checkout: "Checkout", catalogue_version: int):
+    """Return the cache key of the lines snapshot for the given checkout.
+
+    The key is versioned with the `last_change` field of the checkout, which is
+    bumped by each checkout mutation, and with the catalogue version bumped by
+    `invalidate_checkout_lines_snapshots`.
+    """
+    return ":".join(
+        [
+            CHECKOUT_LINES_SNAPSHOT_KEY,
+            str(checkout.token),
+            str(checkout.last_change.timestamp()),
+            str(catalogue_version),
+        ]
+    )
+
+
+def get_checkout_lines_snapshots(
+    checkouts: Iterable["Checkout"], catalogue_version: int
+) -> Dict[UUID, Dict[UUID, CheckoutLineInfo]]:
+    """Return the cached lines info of the given checkouts, mapped by token.
+
+    Snapshots map checkout line IDs to lines info without the line itself and
+    without applied vouchers. Checkouts without a valid snapshot are not present
+    in the result.
+    """
+    if not settings.CHECKOUT_LINES_SNAPSHOT_TTL:
+        return {}
+    token_by_key = {
+        get_checkout_lines_snapshot_key(checkout, catalogue_version): checkout.token
+        for checkout in checkouts
+    }
+    snapshots = cache.get_many(token_by_key.keys())
+    return {token_by_key[key]: snapshot for key, snapshot in snapshots.items()}
+
+
+def set_checkout_lines_snapshots(
+    lines_info_by_checkout: Iterable[Tuple["Checkout", List[CheckoutLineInfo]]],
+    catalogue_version: int,
+):
+    """Store lines info of the given checkouts in the cache.
+
+    Lines info must be fetched before applying vouchers. The catalogue version
+    must be read before lines info are fetched, so snapshots of data fetched
+    while the catalogue is being changed are stored under the outdated version.
+    """
+    timeout = settings.CHECKOUT_LINES_SNAPSHOT_TTL.total_seconds()
+    if not timeout:
+        return
+    cache.set_many(
+        {
+            get_checkout_lines_snapshot_key(checkout, catalogue_version): {
+                line_info.line.pk: replace(line_info, line=None, voucher=None)
+                for line_info in lines_info
+            }
+            for checkout, lines_info in lines_info_by_checkout
+        },
+        timeout=timeout,
+    )
+
+
+def restore_checkout_lines_info(
+    lines: Iterable["CheckoutLine"], snapshot: Dict[UUID, CheckoutLineInfo]
+) -> Optional[List[CheckoutLineInfo]]:
+    """Combine the given checkout lines with the lines info from the snapshot.
+
+    Return `None` when any of the lines is missing in the snapshot.
+    """
+    lines_info = []
+    for line in lines:
+        line_info = snapshot.get(line.pk)
+        if line_info is None:
+            return None
+        lines_info.append(replace(line_info, line=line))
+    return lines_info
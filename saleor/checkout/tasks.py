@@ -4,25 +4,11 @@ from django.db.models import Q
 from django.utils import timezone
 
 from ..celeryconf import app
+from ..core.purge import purge, schedule_purge_continuation
 from .models import Checkout
 
 task_logger = get_task_logger(__name__)
 
-# Batch size of 2000 is about ~27MB of memory usage in task.
-CHECKOUT_BATCH_SIZE = 2000
-
-
-def _batch_tokens(iterable, batch_size=1):
-    length = len(iterable)
-    for index in range(0, length, batch_size):
-        yield iterable[index : min(index + batch_size, length)]
-
-
-def queryset_in_batches(queryset):
-    tokens = queryset.values_list("token", flat=True)
-    for tokens_batch in _batch_tokens(tokens, CHECKOUT_BATCH_SIZE):
-        yield tokens_batch
-
 
 @app.task
 def delete_expired_checkouts():
@@ -42,10 +28,7 @@ def delete_expired_checkouts():
         empty_checkouts | expired_anonymous_checkouts | expired_user_checkout
     )
 
-    deleted_count = 0
-    for tokens_batch in queryset_in_batches(qs):
-        batch_count, _ = Checkout.objects.filter(token__in=tokens_batch).delete()
-        deleted_count += batch_count
-
-    if deleted_count:
-        task_logger.debug("Removed %s checkouts.", deleted_count)
+    result = purge("expired_checkouts", qs)
+    if result.deleted_count:
+        task_logger.debug("Removed %s checkouts.", result.deleted_count)
+    schedule_purge_continuation(delete_expired_checkouts, result)
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..fetch import (
+    fetch_checkout_lines,
+    get_checkout_lines_snapshot_catalogue_version,
+    get_checkout_lines_snapshots,
+    invalidate_checkout_lines_snapshots,
+    restore_checkout_lines_info,
+    set_checkout_lines_snapshots,
+)
+
+
+def test_checkout_lines_snapshot(settings, checkout_with_items):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = timedelta(minutes=5)
+    checkout = checkout_with_items
+    catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+    lines_info, _ = fetch_checkout_lines(checkout)
+
+    # when
+    set_checkout_lines_snapshots([(checkout, lines_info)], catalogue_version)
+    snapshots = get_checkout_lines_snapshots([checkout], catalogue_version)
+
+    # then
+    assert list(snapshots) == [checkout.token]
+    restored_lines_info = restore_checkout_lines_info(
+        checkout.lines.all(), snapshots[checkout.token]
+    )
+    assert restored_lines_info == lines_info
+
+
+def test_restore_checkout_lines_info_with_new_line(
+    settings, checkout_with_items, product
+):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = timedelta(minutes=5)
+    checkout = checkout_with_items
+    catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+    lines_info, _ = fetch_checkout_lines(checkout)
+    set_checkout_lines_snapshots([(checkout, lines_info[1:])], catalogue_version)
+    snapshots = get_checkout_lines_snapshots([checkout], catalogue_version)
+
+    # when
+    restored_lines_info = restore_checkout_lines_info(
+        checkout.lines.all(), snapshots[checkout.token]
+    )
+
+    # then
+    assert restored_lines_info is None
+
+
+def test_checkout_lines_snapshot_disabled(settings, checkout_with_items):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = timedelta()
+    checkout = checkout_with_items
+    catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+    lines_info, _ = fetch_checkout_lines(checkout)
+
+    # when
+    set_checkout_lines_snapshots([(checkout, lines_info)], catalogue_version)
+
+    # then
+    assert get_checkout_lines_snapshots([checkout], catalogue_version) == {}
+
+
+def test_checkout_lines_snapshot_checkout_changed(settings, checkout_with_items):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = timedelta(minutes=5)
+    checkout = checkout_with_items
+    catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+    lines_info, _ = fetch_checkout_lines(checkout)
+    set_checkout_lines_snapshots([(checkout, lines_info)], catalogue_version)
+
+    # when
+    checkout.last_change = timezone.now() + timedelta(seconds=1)
+
+    # then
+    assert get_checkout_lines_snapshots([checkout], catalogue_version) == {}
+
+
+def test_invalidate_checkout_lines_snapshots(settings, checkout_with_items):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = timedelta(minutes=5)
+    checkout = checkout_with_items
+    catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+    lines_info, _ = fetch_checkout_lines(checkout)
+    set_checkout_lines_snapshots([(checkout, lines_info)], catalogue_version)
+
+    # when
+    invalidate_checkout_lines_snapshots()
+
+    # then
+    assert (
+        get_checkout_lines_snapshots(
+            [checkout], get_checkout_lines_snapshot_catalogue_version()
+        )
+        == {}
+    )
+
+
+def test_checkout_lines_snapshot_of_lines_fetched_during_catalogue_change(
+    settings, checkout_with_items
+):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = timedelta(minutes=5)
+    checkout = checkout_with_items
+    catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+    lines_info, _ = fetch_checkout_lines(checkout)
+    invalidate_checkout_lines_snapshots()
+
+    # when
+    set_checkout_lines_snapshots([(checkout, lines_info)], catalogue_version)
+
+    # then
+    assert (
+        get_checkout_lines_snapshots(
+            [checkout], get_checkout_lines_snapshot_catalogue_version()
+        )
+        == {}
+    )
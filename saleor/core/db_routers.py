@@ -1,4 +1,27 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
 from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Replication lag in seconds. A replica that has replayed all received WAL is
+# up to date even if the primary has been idle for a while, so its lag is zero.
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Results of the last lag check, by replica: (time of the check, is available).
+_replica_checks: Dict[str, Tuple[float, bool]] = {}
+_replica_checks_lock = threading.Lock()
 
 
 class PrimaryReplicaRouter:
@@ -9,3 +32,70 @@ class PrimaryReplicaRouter:
     def allow_relation(self, obj1, obj2, **hints):
         """All relations are allowed as we don't have pool separation."""
         return True
+
+
+def get_replica_lag(connection_name: str) -> Optional[float]:
+    """Return the replication lag of the replica in seconds.
+
+    Return `None` when the replica can't be queried or the lag is unknown.
+    """
+    try:
+        with connections[connection_name].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_QUERY)
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        logger.warning("Unable to check lag of %s replica.", connection_name)
+        return None
+    return None if lag is None else float(lag)
+
+
+def is_replica_available(connection_name: str) -> bool:
+    """Check whether the replica is reachable and not lagging behind the primary.
+
+    The result is kept in the process for `DATABASE_REPLICA_LAG_CHECK_INTERVAL`.
+    """
+    now = time.monotonic()
+    interval = settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL.total_seconds()
+    with _replica_checks_lock:
+        checked_at, is_available = _replica_checks.get(connection_name, (None, False))
+        if checked_at is not None and now - checked_at < interval:
+            return is_available
+
+    lag = get_replica_lag(connection_name)
+    max_lag = settings.DATABASE_REPLICA_MAX_LAG.total_seconds()
+    is_available = lag is not None and lag <= max_lag
+    with _replica_checks_lock:
+        _replica_checks[connection_name] = (now, is_available)
+    return is_available
+
+
+def get_replica_weights(connection_names: List[str]) -> Dict[str, int]:
+    weights = settings.DATABASE_REPLICA_WEIGHTS
+    return {
+        name: weights[index] if index < len(weights) else 1
+        for index, name in enumerate(connection_names)
+    }
+
+
+def get_replica_connection_name() -> str:
+    """Pick a connection to read from, out of the available replicas.
+
+    Replicas are chosen at random, proportionally to `DATABASE_REPLICA_WEIGHTS`.
+    When no replica pool is configured, `DATABASE_CONNECTION_REPLICA_NAME` is used.
+    When all replicas are lagging or unreachable, reads go to the primary database.
+    """
+    replica_names = settings.DATABASE_CONNECTION_REPLICA_NAMES
+    if not replica_names:
+        return settings.DATABASE_CONNECTION_REPLICA_NAME
+
+    weights = get_replica_weights(replica_names)
+    available_replicas = [
+        name
+        for name in replica_names
+        if weights[name] > 0 and is_replica_available(name)
+    ]
+    if not available_replicas:
+        return settings.DATABASE_CONNECTION_DEFAULT_NAME
+    return random.choices(
+        available_replicas, weights=[weights[name] for name in available_replicas]
+    )[0]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:26
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_alter_eventdelivery_webhook"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventdelivery",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="eventdelivery_created_at_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventdeliveryattempt",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="eventattempt_created_at_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventpayload",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="eventpayload_created_at_brin"
+            ),
+        ),
+    ]
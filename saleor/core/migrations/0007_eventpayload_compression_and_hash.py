@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_event_tables_created_at_brin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventpayload",
+            name="compressed_payload",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="eventpayload",
+            name="payload_hash",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="eventpayload",
+            index=models.Index(
+                condition=models.Q(("payload_hash__isnull", False)),
+                fields=["payload_hash"],
+                name="eventpayload_payload_hash_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-19 14:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_eventpayload_compression_and_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParkedEventDelivery",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "circuit_breaker_key",
+                    models.CharField(db_index=True, max_length=255),
+                ),
+                (
+                    "delivery",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="parked",
+                        to="core.eventdelivery",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("pk",),
+            },
+        ),
+    ]
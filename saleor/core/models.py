@@ -1,11 +1,15 @@
 import datetime
-from typing import Any
+import hashlib
+import zlib
+from typing import Any, Dict, List, cast
 
 import pytz
-from django.contrib.postgres.indexes import GinIndex
+from django.conf import settings
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.db import models, transaction
 from django.db.models import JSONField  # type: ignore
 from django.db.models import F, Max, Q
+from django.utils import timezone
 
 from . import EventDeliveryStatus, JobStatus
 from .utils.json_serializer import CustomJsonEncoder
@@ -124,10 +128,105 @@ class Job(models.Model):
         abstract = True
 
 
+class EventPayloadManager(models.Manager):
+    def prepare_payload(self, payload: str) -> "EventPayload":
+        """Return an unsaved event payload, compressed when it's large enough.
+
+        Payloads of at least `EVENT_PAYLOAD_COMPRESSION_MIN_SIZE` bytes are stored
+        zlib-compressed; the `payload` attribute of the instance always holds
+        the full text.
+        """
+        payload = self.model._meta.get_field("payload").to_python(payload)
+        encoded_payload = payload.encode("utf-8")
+        event_payload = self.model(
+            payload=payload,
+            payload_hash=hashlib.sha256(encoded_payload).hexdigest(),
+        )
+        min_size = settings.EVENT_PAYLOAD_COMPRESSION_MIN_SIZE
+        if min_size and len(encoded_payload) >= min_size:
+            event_payload.compressed_payload = zlib.compress(encoded_payload)
+        return event_payload
+
+    def _get_recent_payloads_by_hash(self, hashes) -> Dict[str, "EventPayload"]:
+        """Return stored payloads with given hashes, that can be shared.
+
+        Only payloads created within `EVENT_PAYLOAD_DEDUPLICATION_PERIOD` are
+        shared, so they can't be removed by `delete_event_payloads_task` or
+        `clear_successful_delivery` before the new delivery is created.
+        """
+        period = settings.EVENT_PAYLOAD_DEDUPLICATION_PERIOD
+        if not period:
+            return {}
+        payloads = self.filter(
+            payload_hash__in=hashes, created_at__gte=timezone.now() - period
+        )
+        return {payload.payload_hash: payload for payload in payloads}
+
+    def create_with_payload(self, payload: str) -> "EventPayload":
+        """Store the payload or return the identical payload stored recently."""
+        return self.bulk_create_with_payloads([payload])[0]
+
+    def bulk_create_with_payloads(self, payloads: List[str]) -> List["EventPayload"]:
+        """Store the payloads, reusing identical payloads.
+
+        Return event payloads in order of the given payloads.
+        """
+        event_payloads = [self.prepare_payload(payload) for payload in payloads]
+        # Hashes are always set by `prepare_payload`.
+        hashes = [
+            cast(str, event_payload.payload_hash) for event_payload in event_payloads
+        ]
+        existing_payloads = self._get_recent_payloads_by_hash(set(hashes))
+        payloads_to_create: Dict[str, "EventPayload"] = {}
+        for payload_hash, event_payload in zip(hashes, event_payloads):
+            if payload_hash not in existing_payloads:
+                payloads_to_create.setdefault(payload_hash, event_payload)
+        # Compressed payloads are stored without the text.
+        compressed = [
+            event_payload
+            for event_payload in payloads_to_create.values()
+            if event_payload.compressed_payload is not None
+        ]
+        texts = [event_payload.payload for event_payload in compressed]
+        for event_payload in compressed:
+            event_payload.payload = ""
+        self.bulk_create(payloads_to_create.values())
+        for event_payload, text in zip(compressed, texts):
+            event_payload.payload = text
+
+        payloads_by_hash = {**existing_payloads, **payloads_to_create}
+        return [payloads_by_hash[payload_hash] for payload_hash in hashes]
+
+
 class EventPayload(models.Model):
     payload = models.TextField()
+    # When set, holds the payload compressed with zlib and `payload` is stored empty.
+    compressed_payload = models.BinaryField(null=True, blank=True)
+    payload_hash = models.CharField(max_length=64, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = EventPayloadManager()
+
+    class Meta:
+        indexes = [
+            # Rows are appended in time order, so a small BRIN index is enough
+            # to find the expired ones.
+            BrinIndex(fields=["created_at"], name="eventpayload_created_at_brin"),
+            models.Index(
+                fields=["payload_hash"],
+                name="eventpayload_payload_hash_idx",
+                condition=Q(payload_hash__isnull=False),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        compressed_payload = instance.__dict__.get("compressed_payload")
+        if compressed_payload is not None:
+            instance.payload = zlib.decompress(compressed_payload).decode("utf-8")
+        return instance
+
 
 class EventDelivery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -144,6 +243,9 @@ class EventDelivery(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            BrinIndex(fields=["created_at"], name="eventdelivery_created_at_brin"),
+        ]
 
 
 class EventDeliveryAttempt(models.Model):
@@ -165,3 +267,18 @@ class EventDeliveryAttempt(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            BrinIndex(fields=["created_at"], name="eventattempt_created_at_brin"),
+        ]
+
+
+class ParkedEventDelivery(models.Model):
+    """Delivery parked until the circuit breaker of its target closes."""
+
+    circuit_breaker_key = models.CharField(max_length=255, db_index=True)
+    delivery = models.OneToOneField(
+        EventDelivery, related_name="parked", on_delete=models.CASCADE
+    )
+
+    class Meta:
+        ordering = ("pk",)
@@ -0,0 +1,141 @@
+"""Deleting expired data in bounded chunks.
+
+Rows are selected with keyset pagination over the primary key and deleted in
+batches of `PURGE_BATCH_SIZE`, until `PURGE_TIME_BUDGET` of the run is used.
+The position reached is kept in the cache, so the next run resumes where
+the previous one stopped instead of scanning the table from the beginning.
+Tasks running purges re-enqueue themselves with `schedule_purge_continuation`
+until all rows are deleted, instead of waiting for the next scheduled run.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from celery import Task
+
+logger = logging.getLogger(__name__)
+
+PURGE_CACHE_KEY_PREFIX = "purge"
+# Delay in seconds of the next run of a purge stopped by the time budget.
+PURGE_CONTINUATION_COUNTDOWN = 10
+
+
+@dataclass
+class PurgeResult:
+    deleted_count: int = 0
+    # Whether all matching rows have been visited.
+    finished: bool = False
+    # Whether the run was skipped, because another one is in progress.
+    skipped: bool = False
+
+    @property
+    def needs_continuation(self) -> bool:
+        return not self.finished and not self.skipped
+
+
+def _get_cache_key(name: str, key: str) -> str:
+    return f"{PURGE_CACHE_KEY_PREFIX}:{name}:{key}"
+
+
+def default_delete(queryset: QuerySet) -> int:
+    deleted_count, _ = queryset.delete()
+    return deleted_count
+
+
+def get_purge_metrics(name: str) -> Dict[str, Any]:
+    """Return stats of the last run of the purge.
+
+    `lag` is the number of seconds since the last time all matching rows were
+    deleted, or `None` if it has never happened.
+    """
+    metrics = cache.get(_get_cache_key(name, "metrics")) or {}
+    completed_at = metrics.get("last_completed_at")
+    lag = (timezone.now() - completed_at).total_seconds() if completed_at else None
+    return {**metrics, "lag": lag}
+
+
+def purge(
+    name: str,
+    queryset: QuerySet,
+    delete: Callable[[QuerySet], int] = default_delete,
+    batch_size: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> PurgeResult:
+    """Delete rows matching the queryset in batches, within the time budget.
+
+    :param name: unique name of the purge, used to keep its state.
+    :param queryset: rows to delete.
+    :param delete: function deleting rows of the given queryset and returning
+        the number of deleted rows.
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    if time_budget is None:
+        time_budget = settings.PURGE_TIME_BUDGET.total_seconds()
+
+    lock_key = _get_cache_key(name, "lock")
+    if not cache.add(lock_key, 1, timeout=time_budget * 2 or None):
+        logger.info("Purge %s is already running.", name)
+        return PurgeResult(skipped=True)
+
+    result = PurgeResult()
+    try:
+        result = _purge_batches(name, queryset, delete, batch_size, time_budget)
+    finally:
+        cache.delete(lock_key)
+
+    metrics_key = _get_cache_key(name, "metrics")
+    metrics = cache.get(metrics_key) or {}
+    now = timezone.now()
+    metrics.update(
+        {
+            "deleted_count": result.deleted_count,
+            "total_deleted_count": (
+                metrics.get("total_deleted_count", 0) + result.deleted_count
+            ),
+            "last_run_at": now,
+        }
+    )
+    if result.finished:
+        metrics["last_completed_at"] = now
+    cache.set(metrics_key, metrics, timeout=None)
+    logger.debug(
+        "Purge %s deleted %s rows.",
+        name,
+        result.deleted_count,
+        extra={"purge": name, **get_purge_metrics(name)},
+    )
+    return result
+
+
+def schedule_purge_continuation(task: "Task", *results: PurgeResult):
+    """Enqueue the task again if any of its purges stopped on the time budget."""
+    if any(result.needs_continuation for result in results):
+        task.apply_async(countdown=PURGE_CONTINUATION_COUNTDOWN)
+
+
+def _purge_batches(name, queryset, delete, batch_size, time_budget) -> PurgeResult:
+    cursor_key = _get_cache_key(name, "cursor")
+    cursor = cache.get(cursor_key)
+    started_at = time.monotonic()
+    result = PurgeResult()
+    queryset = queryset.order_by("pk")
+    while True:
+        batch_queryset = queryset.filter(pk__gt=cursor) if cursor else queryset
+        pks = list(batch_queryset.values_list("pk", flat=True)[:batch_size])
+        if pks:
+            result.deleted_count += delete(queryset.model.objects.filter(pk__in=pks))
+            cursor = pks[-1]
+        if len(pks) < batch_size:
+            result.finished = True
+            cache.delete(cursor_key)
+            return result
+        if time.monotonic() - started_at >= time_budget:
+            cache.set(cursor_key, cursor, timeout=None)
+            return result
@@ -1,11 +1,12 @@
 from botocore.exceptions import ClientError
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.db.models import Exists, OuterRef, Q
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from ..celeryconf import app
 from .models import EventDelivery, EventDeliveryAttempt, EventPayload
+from .purge import purge, schedule_purge_continuation
 
 
 @app.task
@@ -13,21 +14,46 @@ def delete_from_storage_task(path):
     default_storage.delete(path)
 
 
+def _raw_delete(queryset) -> int:
+    return queryset._raw_delete(queryset.db)
+
+
+def _delete_event_deliveries(deliveries) -> int:
+    _raw_delete(EventDeliveryAttempt.objects.filter(delivery__in=deliveries))
+    return _raw_delete(deliveries)
+
+
 @app.task
 def delete_event_payloads_task():
-    delete_period = timezone.now() - settings.EVENT_PAYLOAD_DELETE_PERIOD
-    deliveries = EventDelivery.objects.filter(created_at__lte=delete_period)
-    attempts = EventDeliveryAttempt.objects.filter(
-        Q(Exists(deliveries.filter(id=OuterRef("delivery_id"))))
-        | Q(delivery__isnull=True, created_at__lte=delete_period)
+    """Delete expired event deliveries, attempts and payloads in batches.
+
+    Rows are selected by the `created_at` BRIN indexes and deleted by primary keys.
+    Each run is limited by `PURGE_TIME_BUDGET`; if any rows are left, the task is
+    enqueued again and continues from where the previous run stopped.
+    """
+    expiration_date = timezone.now() - settings.EVENT_PAYLOAD_DELETE_PERIOD
+    deliveries = purge(
+        "event_deliveries",
+        EventDelivery.objects.filter(created_at__lte=expiration_date),
+        delete=_delete_event_deliveries,
     )
-    payloads = EventPayload.objects.filter(
-        deliveries__isnull=True, created_at__lte=delete_period
+    attempts = purge(
+        "event_delivery_attempts",
+        EventDeliveryAttempt.objects.filter(
+            delivery__isnull=True, created_at__lte=expiration_date
+        ),
+        delete=_raw_delete,
+    )
+    payloads = purge(
+        "event_payloads",
+        EventPayload.objects.filter(created_at__lte=expiration_date).filter(
+            ~Exists(EventDelivery.objects.filter(payload_id=OuterRef("pk")))
+        ),
+        delete=_raw_delete,
+    )
+    schedule_purge_continuation(
+        delete_event_payloads_task, deliveries, attempts, payloads
     )
-
-    attempts._raw_delete(attempts.db)
-    deliveries._raw_delete(deliveries.db)
-    payloads._raw_delete(payloads.db)
 
 
 @app.task(
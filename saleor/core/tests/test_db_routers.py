@@ -0,0 +1,135 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from .. import db_routers
+from ..db_routers import (
+    get_replica_connection_name,
+    get_replica_lag,
+    is_replica_available,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_replica_checks():
+    db_routers._replica_checks.clear()
+    yield
+    db_routers._replica_checks.clear()
+
+
+@pytest.fixture
+def replica_pool(settings):
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = ["replica_0", "replica_1"]
+    settings.DATABASE_REPLICA_WEIGHTS = []
+    return settings.DATABASE_CONNECTION_REPLICA_NAMES
+
+
+def test_get_replica_lag_of_primary(db):
+    # when
+    lag = get_replica_lag("default")
+
+    # then
+    assert lag == 0
+
+
+@patch("saleor.core.db_routers.get_replica_lag")
+def test_is_replica_available(mocked_get_replica_lag, settings):
+    # given
+    settings.DATABASE_REPLICA_MAX_LAG = timedelta(seconds=5)
+    mocked_get_replica_lag.return_value = 1.5
+
+    # when
+    is_available = is_replica_available("replica_0")
+
+    # then
+    assert is_available is True
+    mocked_get_replica_lag.assert_called_once_with("replica_0")
+
+
+@pytest.mark.parametrize("lag", [None, 60.0])
+@patch("saleor.core.db_routers.get_replica_lag")
+def test_is_replica_available_lagging_or_unreachable(
+    mocked_get_replica_lag, lag, settings
+):
+    # given
+    mocked_get_replica_lag.return_value = lag
+
+    # when
+    is_available = is_replica_available("replica_0")
+
+    # then
+    assert is_available is False
+
+
+@patch("saleor.core.db_routers.get_replica_lag")
+def test_is_replica_available_uses_last_check(mocked_get_replica_lag):
+    # given
+    mocked_get_replica_lag.return_value = 0
+    is_replica_available("replica_0")
+
+    # when
+    is_available = is_replica_available("replica_0")
+
+    # then
+    assert is_available is True
+    mocked_get_replica_lag.assert_called_once_with("replica_0")
+
+
+def test_get_replica_connection_name_without_replica_pool(settings):
+    # given
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = []
+    settings.DATABASE_CONNECTION_REPLICA_NAME = "replica"
+
+    # when
+    connection_name = get_replica_connection_name()
+
+    # then
+    assert connection_name == "replica"
+
+
+@patch("saleor.core.db_routers.get_replica_lag")
+def test_get_replica_connection_name_skips_lagging_replicas(
+    mocked_get_replica_lag, replica_pool
+):
+    # given
+    mocked_get_replica_lag.side_effect = lambda name: {
+        "replica_0": 60.0,
+        "replica_1": 0.0,
+    }[name]
+
+    # when
+    connection_names = {get_replica_connection_name() for _ in range(10)}
+
+    # then
+    assert connection_names == {"replica_1"}
+
+
+@patch("saleor.core.db_routers.get_replica_lag")
+def test_get_replica_connection_name_all_replicas_lagging(
+    mocked_get_replica_lag, replica_pool, settings
+):
+    # given
+    mocked_get_replica_lag.return_value = None
+
+    # when
+    connection_name = get_replica_connection_name()
+
+    # then
+    assert connection_name == settings.DATABASE_CONNECTION_DEFAULT_NAME
+
+
+@patch("saleor.core.db_routers.get_replica_lag")
+def test_get_replica_connection_name_skips_replicas_with_zero_weight(
+    mocked_get_replica_lag, replica_pool, settings
+):
+    # given
+    settings.DATABASE_REPLICA_WEIGHTS = [0, 1]
+    mocked_get_replica_lag.return_value = 0.0
+
+    # when
+    connection_names = {get_replica_connection_name() for _ in range(10)}
+
+    # then
+    assert connection_names == {"replica_1"}
+    mocked_get_replica_lag.assert_called_once_with("replica_1")
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from ...webhook.event_types import WebhookEventAsyncType
+from ..models import EventDelivery, EventPayload
+
+PAYLOAD = '{"order": {"id": "T3JkZXI6MQ==", "lines": []}}'
+
+
+def test_create_with_payload(db):
+    # when
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    event_payload.refresh_from_db()
+    assert event_payload.payload == PAYLOAD
+    assert event_payload.compressed_payload is None
+    assert event_payload.payload_hash
+
+
+def test_create_with_payload_compressed(db, settings):
+    # given
+    settings.EVENT_PAYLOAD_COMPRESSION_MIN_SIZE = 10
+
+    # when
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    assert event_payload.payload == PAYLOAD
+    stored_payload = EventPayload.objects.values_list("payload", flat=True).get()
+    assert stored_payload == ""
+    assert EventPayload.objects.get().payload == PAYLOAD
+
+
+def test_create_with_payload_below_compression_min_size(db, settings):
+    # given
+    settings.EVENT_PAYLOAD_COMPRESSION_MIN_SIZE = len(PAYLOAD) + 1
+
+    # when
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    assert event_payload.compressed_payload is None
+    stored_payload = EventPayload.objects.values_list("payload", flat=True).get()
+    assert stored_payload == PAYLOAD
+
+
+def test_compressed_payload_loaded_with_delivery(webhook, settings):
+    # given
+    settings.EVENT_PAYLOAD_COMPRESSION_MIN_SIZE = 10
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+    delivery = EventDelivery.objects.create(
+        event_type=WebhookEventAsyncType.ANY, payload=event_payload, webhook=webhook
+    )
+
+    # when
+    delivery = EventDelivery.objects.select_related("payload").get(pk=delivery.pk)
+
+    # then
+    assert delivery.payload.payload == PAYLOAD
+
+
+def test_create_with_payload_deduplicated(db, settings):
+    # given
+    settings.EVENT_PAYLOAD_DEDUPLICATION_PERIOD = timedelta(hours=1)
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # when
+    duplicated_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+    other_payload = EventPayload.objects.create_with_payload("{}")
+
+    # then
+    assert duplicated_payload.pk == event_payload.pk
+    assert other_payload.pk != event_payload.pk
+    assert EventPayload.objects.count() == 2
+
+
+def test_create_with_payload_without_deduplication(db, settings):
+    # given
+    settings.EVENT_PAYLOAD_DEDUPLICATION_PERIOD = timedelta(0)
+    event_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # when
+    duplicated_payload = EventPayload.objects.create_with_payload(PAYLOAD)
+
+    # then
+    assert duplicated_payload.pk != event_payload.pk
+
+
+def test_bulk_create_with_payloads_deduplicated(
+    db, settings, django_assert_num_queries
+):
+    # given
+    settings.EVENT_PAYLOAD_DEDUPLICATION_PERIOD = timedelta(hours=1)
+    settings.EVENT_PAYLOAD_COMPRESSION_MIN_SIZE = 10
+    existing_payload = EventPayload.objects.create_with_payload("{}")
+
+    # when
+    with django_assert_num_queries(2):
+        event_payloads = EventPayload.objects.bulk_create_with_payloads(
+            [PAYLOAD, "{}", PAYLOAD]
+        )
+
+    # then
+    assert event_payloads[0] is event_payloads[2]
+    assert event_payloads[1].pk == existing_payload.pk
+    assert event_payloads[0].payload == PAYLOAD
+    assert EventPayload.objects.count() == 2
+    assert EventPayload.objects.get(pk=event_payloads[0].pk).payload == PAYLOAD
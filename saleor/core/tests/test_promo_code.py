@@ -0,0 +1,43 @@
+from unittest import mock
+
+from ..utils.promo_code import generate_promo_codes
+
+
+def test_generate_promo_codes(db, django_assert_num_queries):
+    # when
+    with django_assert_num_queries(1):
+        codes = generate_promo_codes(10)
+
+    # then
+    assert len(codes) == 10
+    assert len(set(codes)) == 10
+
+
+@mock.patch("saleor.core.utils.promo_code.PROMO_CODES_BATCH_SIZE", 2)
+def test_generate_promo_codes_in_batches(db, django_assert_num_queries):
+    # when
+    with django_assert_num_queries(3):
+        codes = generate_promo_codes(5)
+
+    # then
+    assert len(set(codes)) == 5
+
+
+@mock.patch("saleor.core.utils.promo_code.generate_random_code")
+def test_generate_promo_codes_regenerates_used_codes(
+    mock_generate_random_code, gift_card, voucher
+):
+    # given
+    mock_generate_random_code.side_effect = [
+        gift_card.code,
+        voucher.code,
+        "NEW-CODE-1",
+        "NEW-CODE-1",
+        "NEW-CODE-2",
+    ]
+
+    # when
+    codes = generate_promo_codes(2)
+
+    # then
+    assert sorted(codes) == ["NEW-CODE-1", "NEW-CODE-2"]
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ...checkout.models import Checkout
+from ...checkout.tasks import delete_expired_checkouts
+from ..purge import (
+    PurgeResult,
+    _get_cache_key,
+    get_purge_metrics,
+    purge,
+    schedule_purge_continuation,
+)
+
+
+def test_purge_deletes_rows_in_batches(channel_USD):
+    # given
+    cache.clear()
+    Checkout.objects.bulk_create(
+        [Checkout(channel=channel_USD, currency="USD") for _ in range(5)]
+    )
+    delete = Mock(side_effect=lambda queryset: queryset.delete()[0])
+
+    # when
+    result = purge("test", Checkout.objects.all(), delete=delete, batch_size=2)
+
+    # then
+    assert result.deleted_count == 5
+    assert result.finished
+    assert delete.call_count == 3
+    assert not Checkout.objects.exists()
+    assert cache.get(_get_cache_key("test", "cursor")) is None
+
+
+def test_purge_resumes_from_cursor(channel_USD):
+    # given
+    cache.clear()
+    Checkout.objects.bulk_create(
+        [Checkout(channel=channel_USD, currency="USD") for _ in range(5)]
+    )
+    queryset = Checkout.objects.all()
+
+    # when
+    first_result = purge("test", queryset, batch_size=2, time_budget=0)
+
+    # then
+    assert first_result.deleted_count == 2
+    assert not first_result.finished
+    assert cache.get(_get_cache_key("test", "cursor")) is not None
+    assert Checkout.objects.count() == 3
+
+    # when
+    second_result = purge("test", queryset, batch_size=10, time_budget=0)
+
+    # then
+    assert second_result.deleted_count == 3
+    assert second_result.finished
+    assert not Checkout.objects.exists()
+
+
+def test_purge_metrics(channel_USD):
+    # given
+    cache.clear()
+    Checkout.objects.bulk_create(
+        [Checkout(channel=channel_USD, currency="USD") for _ in range(3)]
+    )
+    assert get_purge_metrics("test") == {"lag": None}
+
+    # when
+    purge("test", Checkout.objects.all(), batch_size=2, time_budget=0)
+
+    # then
+    metrics = get_purge_metrics("test")
+    assert metrics["deleted_count"] == 2
+    assert metrics["total_deleted_count"] == 2
+    assert metrics["lag"] is None
+
+    # when
+    purge("test", Checkout.objects.all(), batch_size=2, time_budget=0)
+
+    # then
+    metrics = get_purge_metrics("test")
+    assert metrics["deleted_count"] == 1
+    assert metrics["total_deleted_count"] == 3
+    assert metrics["lag"] is not None
+
+
+def test_purge_skipped_when_already_running(channel_USD):
+    # given
+    cache.clear()
+    Checkout.objects.create(channel=channel_USD, currency="USD")
+    cache.add(_get_cache_key("test", "lock"), 1)
+
+    # when
+    result = purge("test", Checkout.objects.all())
+
+    # then
+    assert result.deleted_count == 0
+    assert result.skipped
+    assert not result.needs_continuation
+    assert Checkout.objects.exists()
+
+
+def test_schedule_purge_continuation():
+    # given
+    task = Mock()
+
+    # when
+    schedule_purge_continuation(task, PurgeResult(finished=True))
+    schedule_purge_continuation(task, PurgeResult(skipped=True))
+
+    # then
+    task.apply_async.assert_not_called()
+
+    # when
+    schedule_purge_continuation(task, PurgeResult(finished=True), PurgeResult())
+
+    # then
+    task.apply_async.assert_called_once()
+
+
+def test_purge_task_continues_until_finished(settings, channel_USD):
+    # given
+    cache.clear()
+    settings.PURGE_BATCH_SIZE = 2
+    settings.PURGE_TIME_BUDGET = timedelta(0)
+    Checkout.objects.bulk_create(
+        [Checkout(channel=channel_USD, currency="USD") for _ in range(5)]
+    )
+    Checkout.objects.update(
+        last_change=timezone.now() - settings.EMPTY_CHECKOUTS_TIMEDELTA * 2
+    )
+
+    # when
+    delete_expired_checkouts.delay()
+
+    # then
+    assert not Checkout.objects.exists()
@@ -59,6 +59,34 @@ def test_delete_event_payloads_task(webhook, settings):
     assert EventDeliveryAttempt.objects.count() == 1
 
 
+def test_delete_event_payloads_task_in_batches(webhook, settings):
+    # given
+    settings.PURGE_BATCH_SIZE = 2
+    delete_period = settings.EVENT_PAYLOAD_DELETE_PERIOD
+    start_time = timezone.now()
+    before_delete_period = start_time - delete_period - timedelta(seconds=1)
+    after_delete_period = start_time - delete_period + timedelta(seconds=1)
+    for creation_time in [before_delete_period] * 5 + [after_delete_period]:
+        with freeze_time(creation_time):
+            payload = EventPayload.objects.create(payload='{"key": "data"}')
+            delivery = EventDelivery.objects.create(
+                event_type=WebhookEventAsyncType.ANY,
+                payload=payload,
+                webhook=webhook,
+            )
+            EventDeliveryAttempt.objects.create(delivery=delivery)
+            EventDeliveryAttempt.objects.create(delivery=None)
+
+    # when
+    with freeze_time(start_time):
+        delete_event_payloads_task()
+
+    # then
+    assert EventPayload.objects.count() == 1
+    assert EventDelivery.objects.count() == 1
+    assert EventDeliveryAttempt.objects.count() == 2
+
+
 def test_delete_files_from_storage_task(
     product_with_image, variant_with_image, media_root
 ):
@@ -1,4 +1,5 @@
 import secrets
+from typing import Iterable, List, Set
 
 from django.core.exceptions import ValidationError
 
@@ -6,6 +7,9 @@ from ...discount.models import Voucher
 from ...giftcard.error_codes import GiftCardErrorCode
 from ...giftcard.models import GiftCard
 
+# Number of generated codes checked against the existing ones in a single query.
+PROMO_CODES_BATCH_SIZE = 1000
+
 
 class InvalidPromoCode(ValidationError):
     def __init__(self, message=None, **kwargs):
@@ -20,10 +24,25 @@ class InvalidPromoCode(ValidationError):
 
 def generate_promo_code():
     """Generate a promo unique code that can be used as a voucher or gift card code."""
-    code = generate_random_code()
-    while not is_available_promo_code(code):
-        code = generate_random_code()
-    return code
+    return generate_promo_codes(1)[0]
+
+
+def generate_promo_codes(count: int) -> List[str]:
+    """Generate unique promo codes that can be used as voucher or gift card codes.
+
+    Codes are checked against the existing ones in batches of
+    `PROMO_CODES_BATCH_SIZE`, and only the colliding ones are generated again.
+    """
+    codes: Set[str] = set()
+    while len(codes) < count:
+        batch_size = min(count - len(codes), PROMO_CODES_BATCH_SIZE)
+        candidates: Set[str] = set()
+        while len(candidates) < batch_size:
+            code = generate_random_code()
+            if code not in codes:
+                candidates.add(code)
+        codes.update(candidates - get_used_promo_codes(candidates))
+    return list(codes)
 
 
 def generate_random_code():
@@ -36,6 +55,14 @@ def is_available_promo_code(code):
     return not (promo_code_is_gift_card(code) or promo_code_is_voucher(code))
 
 
+def get_used_promo_codes(codes: Iterable[str]) -> Set[str]:
+    """Return the codes already used by vouchers or gift cards."""
+    codes = list(codes)
+    vouchers = Voucher.objects.filter(code__in=codes).values_list("code", flat=True)
+    gift_cards = GiftCard.objects.filter(code__in=codes).values_list("code", flat=True)
+    return set(vouchers.union(gift_cards))
+
+
 def promo_code_is_voucher(code):
     return Voucher.objects.filter(code=code).exists()
 
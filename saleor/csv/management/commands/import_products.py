@@ -0,0 +1,56 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import FileTypes
+from ...models import ImportFile
+from ...tasks import import_products_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports products from a CSV or XLSX file in the format of the products "
+        "export, or resumes the interrupted import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Path to the imported file.")
+        parser.add_argument(
+            "--delimiter",
+            default=",",
+            help="CSV delimiter. Resumed imports use the delimiter they started with.",
+        )
+        parser.add_argument(
+            "--resume", type=int, help="ID of the import file to resume."
+        )
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            try:
+                import_file = ImportFile.objects.get(pk=options["resume"])
+            except ImportFile.DoesNotExist:
+                raise CommandError(f"Import file {options['resume']} doesn't exist.")
+        elif options["path"]:
+            import_file = self.create_import_file(options["path"], options["delimiter"])
+        else:
+            raise CommandError("Provide the path of the file or the import to resume.")
+
+        import_products_task.delay(import_file.pk)
+        self.stdout.write(f"Started import of the file {import_file.pk}.")
+
+    @staticmethod
+    def create_import_file(path, delimiter):
+        _, extension = os.path.splitext(path)
+        file_type = extension.lstrip(".").lower()
+        if file_type not in (FileTypes.CSV, FileTypes.XLSX):
+            raise CommandError("Only CSV and XLSX files can be imported.")
+        if len(delimiter) != 1:
+            raise CommandError("The delimiter must be a single character.")
+        import_file = ImportFile(file_type=file_type, delimiter=delimiter)
+        with open(path, "rb") as content_file:
+            import_file.content_file.save(
+                os.path.basename(path), File(content_file), save=False
+            )
+        import_file.save()
+        return import_file
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("csv", "0005_importfile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importfile",
+            name="delimiter",
+            field=models.CharField(default=",", max_length=1),
+        ),
+    ]
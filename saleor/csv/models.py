@@ -6,7 +6,7 @@ from ..account.models import User
 from ..app.models import App
 from ..core.models import Job
 from ..core.utils.json_serializer import CustomJsonEncoder
-from . import ExportEvents
+from . import ExportEvents, FileTypes
 
 
 class ExportFile(Job):
@@ -19,6 +19,24 @@ class ExportFile(Job):
     content_file = models.FileField(upload_to="export_files", null=True)
 
 
+class ImportFile(Job):
+    user = models.ForeignKey(
+        User, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    app = models.ForeignKey(
+        App, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    content_file = models.FileField(upload_to="import_files")
+    file_type = models.CharField(
+        max_length=10, choices=FileTypes.CHOICES, default=FileTypes.CSV
+    )
+    delimiter = models.CharField(max_length=1, default=",")
+    # Number of rows already processed, the import is resumed after them.
+    processed_rows = models.PositiveIntegerField(default=0)
+    failed_rows = models.PositiveIntegerField(default=0)
+    errors = JSONField(blank=True, default=list, encoder=CustomJsonEncoder)
+
+
 class ExportEvent(models.Model):
     """Model used to store events that happened during the export file lifecycle."""
 
@@ -10,10 +10,13 @@ from django.utils import timezone
 
 from ..celeryconf import app
 from ..core import JobStatus
+from ..core.purge import purge, schedule_purge_continuation
+from ..plugins.manager import get_plugins_manager
 from . import events
-from .models import ExportEvent, ExportFile
+from .models import ExportEvent, ExportFile, ImportFile
 from .notifications import send_export_failed_info
 from .utils.export import export_gift_cards, export_products
+from .utils.product_import import import_products
 
 task_logger = get_task_logger(__name__)
 
@@ -78,6 +81,45 @@ def export_gift_cards_task(
     export_gift_cards(export_file, scope, file_type, delimiter)
 
 
+class ImportTask(celery.Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        import_file = ImportFile.objects.get(pk=args[0])
+        import_file.status = JobStatus.FAILED
+        import_file.message = str(exc)[:255]
+        import_file.save(update_fields=["status", "message", "updated_at"])
+
+    def on_success(self, retval, task_id, args, kwargs):
+        import_file = ImportFile.objects.get(pk=args[0])
+        import_file.status = JobStatus.SUCCESS
+        import_file.message = (
+            f"Imported {import_file.processed_rows - import_file.failed_rows} rows, "
+            f"{import_file.failed_rows} rows failed."
+        )
+        import_file.save(update_fields=["status", "message", "updated_at"])
+
+
+@app.task(name="import-products", base=ImportTask, acks_late=True)
+def import_products_task(import_file_id: int):
+    """Import products from the file.
+
+    Rows processed by a previous run of the task are skipped, so a failed import
+    can be resumed by running it again.
+    """
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    import_file.status = JobStatus.PENDING
+    import_file.save(update_fields=["status", "updated_at"])
+    import_products(import_file, get_plugins_manager())
+
+
+def _delete_export_files(export_files) -> int:
+    paths_to_delete = list(export_files.values_list("content_file", flat=True))
+    for path in paths_to_delete:
+        if path and default_storage.exists(path):
+            default_storage.delete(path)
+    deleted_count, _ = export_files.delete()
+    return deleted_count
+
+
 @app.task
 def delete_old_export_files():
     now = timezone.now()
@@ -89,17 +131,7 @@ def delete_old_export_files():
         Q(events__isnull=True) | Exists(events.filter(export_file_id=OuterRef("id")))
     )
 
-    if not export_files:
-        return
-
-    paths_to_delete = list(export_files.values_list("content_file", flat=True))
-
-    counter = 0
-    for path in paths_to_delete:
-        if path and default_storage.exists(path):
-            default_storage.delete(path)
-            counter += 1
-
-    export_files.delete()
+    result = purge("old_export_files", export_files, delete=_delete_export_files)
 
-    task_logger.debug("Delete %s export files.", counter)
+    task_logger.debug("Delete %s export files.", result.deleted_count)
+    schedule_purge_continuation(delete_old_export_files, result)
@@ -0,0 +1,258 @@
+import csv
+import io
+from decimal import Decimal
+from unittest.mock import patch
+
+import graphene
+import pytest
+from django.core.files.base import ContentFile
+from openpyxl import Workbook
+
+from ...core import JobStatus
+from ...plugins.manager import get_plugins_manager
+from ...product.models import Product
+from .. import FileTypes
+from ..models import ImportFile
+from ..tasks import import_products_task
+from ..utils.product_import import import_products
+
+
+@pytest.fixture
+def create_import_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+    def create(rows, file_type=FileTypes.CSV, delimiter=","):
+        if file_type == FileTypes.CSV:
+            content = io.StringIO()
+            csv.writer(content, delimiter=delimiter).writerows(rows)
+            data = content.getvalue().encode()
+        else:
+            workbook = Workbook()
+            for row in rows:
+                workbook.active.append(row)
+            content = io.BytesIO()
+            workbook.save(content)
+            data = content.getvalue()
+        import_file = ImportFile(file_type=file_type, delimiter=delimiter)
+        import_file.content_file.save(
+            f"products.{file_type}", ContentFile(data), save=False
+        )
+        import_file.save()
+        return import_file
+
+    return create
+
+
+def test_import_products_creates_products(
+    create_import_file, product_type, category, warehouse, channel_USD
+):
+    # given
+    headers = [
+        "id",
+        "name",
+        "category",
+        "product type",
+        "variant sku",
+        "color (product attribute)",
+        "size (variant attribute)",
+        f"{warehouse.slug} (warehouse quantity)",
+        f"{channel_USD.slug} (channel price amount)",
+        f"{channel_USD.slug} (channel published)",
+    ]
+    rows = [
+        ["", "Shirt", category.slug, product_type.name, "SHIRT-S", "Red", "Small"]
+        + ["5", "10.50", "true"],
+        ["", "Shirt", "", "", "SHIRT-XL", "", "Extra large", "0", "12", ""],
+    ]
+    import_file = create_import_file([headers, *rows])
+
+    # when
+    import_products(import_file, get_plugins_manager())
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.processed_rows == 2
+    assert import_file.failed_rows == 0
+    assert import_file.errors == []
+    product = Product.objects.get(slug="shirt")
+    assert product.category == category
+    assert product.product_type == product_type
+    assert product.channel_listings.get().is_published is True
+    assert product.attributes.get().values.get().slug == "red"
+    variants = list(product.variants.order_by("sort_order"))
+    assert [variant.sku for variant in variants] == ["SHIRT-S", "SHIRT-XL"]
+    assert [variant.name for variant in variants] == ["Small", "Extra large"]
+    assert product.default_variant == variants[0]
+    assert variants[0].stocks.get(warehouse=warehouse).quantity == 5
+    assert variants[1].channel_listings.get().price_amount == Decimal("12")
+
+
+def test_import_products_updates_products(
+    create_import_file, product, channel_USD, warehouse
+):
+    # given
+    variant = product.variants.get()
+    product_updated_at = product.updated_at
+    variant_updated_at = variant.updated_at
+    headers = [
+        "id",
+        "name",
+        "variant sku",
+        "variant weight",
+        f"{warehouse.slug} (warehouse quantity)",
+        f"{channel_USD.slug} (channel price amount)",
+    ]
+    rows = [
+        [
+            graphene.Node.to_global_id("Product", product.pk),
+            "New name",
+            variant.sku,
+            "12.0 g",
+            "7",
+            "3.25",
+        ]
+    ]
+    import_file = create_import_file([headers, *rows], file_type=FileTypes.XLSX)
+
+    # when
+    import_products(import_file, get_plugins_manager())
+
+    # then
+    product.refresh_from_db()
+    assert product.name == "New name"
+    assert product.search_index_dirty
+    assert product.updated_at > product_updated_at
+    assert product.variants.get() == variant
+    variant.refresh_from_db()
+    assert variant.weight.g == 12
+    assert variant.updated_at > variant_updated_at
+    assert variant.stocks.get(warehouse=warehouse).quantity == 7
+    listing = variant.channel_listings.get(channel=channel_USD)
+    assert listing.price_amount == Decimal("3.25")
+
+
+def test_import_products_reports_invalid_rows(
+    create_import_file, product_type, warehouse
+):
+    # given
+    headers = [
+        "name",
+        "category",
+        "product type",
+        "variant sku",
+        f"{warehouse.slug} (warehouse quantity)",
+        "unknown (variant attribute)",
+    ]
+    rows = [
+        ["First", "unknown", product_type.name, "FIRST", "1", ""],
+        ["Second", "", product_type.name, "SECOND", "-1", ""],
+        ["Third", "", "", "THIRD", "1", ""],
+        ["Fourth", "", product_type.name, "FOURTH", "1", ""],
+    ]
+    import_file = create_import_file([headers, *rows])
+
+    # when
+    import_products(import_file, get_plugins_manager())
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.processed_rows == 4
+    assert import_file.failed_rows == 3
+    assert [(error["row"], error["field"]) for error in import_file.errors] == [
+        (1, "unknown (variant attribute)"),
+        (2, "category"),
+        (3, f"{warehouse.slug} (warehouse quantity)"),
+        (4, "product type"),
+    ]
+    assert list(Product.objects.values_list("name", flat=True)) == ["Fourth"]
+
+
+def test_import_products_reports_duplicated_new_variant_sku(
+    create_import_file, product_type
+):
+    # given
+    headers = ["name", "product type", "variant sku"]
+    rows = [
+        ["First", product_type.name, "SKU"],
+        ["Second", product_type.name, "SKU"],
+    ]
+    import_file = create_import_file([headers, *rows])
+
+    # when
+    import_products(import_file, get_plugins_manager())
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.processed_rows == 2
+    assert import_file.failed_rows == 1
+    assert [(error["row"], error["field"]) for error in import_file.errors] == [
+        (3, "variant sku")
+    ]
+    assert list(Product.objects.values_list("name", flat=True)) == ["First"]
+    assert Product.objects.get().variants.get().sku == "SKU"
+
+
+def test_import_products_resumes_after_processed_rows(create_import_file, product_type):
+    # given
+    rows = [["First", product_type.name], ["Second", product_type.name]]
+    import_file = create_import_file([["name", "product type"], *rows])
+    import_file.processed_rows = 1
+    import_file.save(update_fields=["processed_rows"])
+
+    # when
+    import_products(import_file, get_plugins_manager())
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.processed_rows == 2
+    assert list(Product.objects.values_list("name", flat=True)) == ["Second"]
+
+
+def test_import_products_task_resumes_with_file_delimiter(
+    create_import_file, product_type
+):
+    # given
+    rows = [["First", product_type.name], ["Second", product_type.name]]
+    import_file = create_import_file([["name", "product type"], *rows], delimiter=";")
+    import_file.processed_rows = 1
+    import_file.save(update_fields=["processed_rows"])
+
+    # when
+    import_products_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+    assert not import_file.errors
+    assert list(Product.objects.values_list("name", flat=True)) == ["Second"]
+
+
+@patch("saleor.csv.utils.product_import.IMPORT_BATCH_SIZE", 2)
+def test_import_products_task(create_import_file, product_type):
+    # given
+    rows = [[f"Product {index}", product_type.name] for index in range(5)]
+    import_file = create_import_file([["name", "product type"], *rows])
+
+    # when
+    import_products_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+    assert import_file.message == "Imported 5 rows, 0 rows failed."
+    assert Product.objects.count() == 5
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task_failed(import_products_mock, create_import_file):
+    # given
+    import_products_mock.side_effect = Exception("Test error")
+    import_file = create_import_file([["name"]])
+
+    # when
+    import_products_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.FAILED
+    assert import_file.message == "Test error"
@@ -0,0 +1,844 @@
+"""Importing products from files in the format of the products export.
+
+The file is streamed and processed in batches of `IMPORT_BATCH_SIZE` rows, each
+one saved in a separate transaction together with the progress of the import,
+so an interrupted import can be resumed after the last saved batch.
+
+Every row describes a product variant, like rows of the export file. Products
+are matched by `id` or by the slug of their name, variants by `variant id` or
+`variant sku`; the ones that don't exist are created. Supported columns are:
+- `id`, `name`, `description`, `category`, `product type`, `product weight`,
+- `variant id`, `variant sku`, `variant weight`,
+- `<slug> (product attribute)` and `<slug> (variant attribute)` with names of
+  the dropdown and multiselect attributes values,
+- `<slug> (warehouse quantity)`,
+- `<slug> (channel <field>)` with the product and variant channel listing fields.
+Other columns are skipped.
+
+Categories and product types are resolved by slug and name, attributes,
+warehouses and channels by slug, all of them are cached for the whole import.
+Rows with invalid values are skipped and reported as errors.
+"""
+import csv
+import io
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import graphene
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+from measurement.measures import Weight
+from openpyxl import load_workbook
+from text_unidecode import unidecode
+
+from ...attribute import AttributeInputType
+from ...attribute.models import (
+    Attribute,
+    AttributeProduct,
+    AttributeValue,
+    AttributeVariant,
+)
+from ...attribute.utils import associate_attribute_values_to_instances
+from ...channel.models import Channel
+from ...core.utils.editorjs import clean_editor_js
+from ...product.models import (
+    Category,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...product.tasks import update_products_discounted_prices_task
+from ...product.utils.variants import generate_and_set_variants_names
+from ...warehouse.models import Warehouse
+from ...warehouse.stock_upsert import StockUpsertRow, bulk_upsert_stocks
+from .. import FileTypes
+
+if TYPE_CHECKING:
+    from ...plugins.manager import PluginsManager
+    from ..models import ImportFile
+
+
+IMPORT_BATCH_SIZE = 500
+# Maximum number of errors stored in the import file.
+MAX_IMPORT_ERRORS = 1000
+
+HEADER_PATTERN = re.compile(
+    r"^(?P<slug>.+) \((?P<kind>product attribute|variant attribute|"
+    r"warehouse quantity|channel (?P<field>.+))\)$"
+)
+SUPPORTED_ATTRIBUTE_INPUT_TYPES = {
+    AttributeInputType.DROPDOWN,
+    AttributeInputType.MULTISELECT,
+}
+ATTRIBUTE_VALUES_SEPARATOR = ", "
+
+
+def _parse_bool(value: str) -> bool:
+    value = value.strip().lower()
+    if value not in ("true", "false"):
+        raise ValueError("Enter true or false.")
+    return value == "true"
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        date_time = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError("Enter a date in ISO 8601 format.")
+    if timezone.is_naive(date_time):
+        date_time = timezone.make_aware(date_time, timezone.utc)
+    return date_time
+
+
+def _parse_decimal(value: str) -> Decimal:
+    try:
+        amount = Decimal(value.strip())
+    except InvalidOperation:
+        raise ValueError("Enter a number.")
+    if amount < 0:
+        raise ValueError("The value can't be negative.")
+    return amount
+
+
+def _parse_quantity(value: str) -> int:
+    try:
+        quantity = int(value.strip())
+    except ValueError:
+        raise ValueError("Enter a whole number.")
+    if quantity < 0:
+        raise ValueError("The value can't be negative.")
+    return quantity
+
+
+def _parse_weight(value: str) -> Weight:
+    # Weights are exported in grams, like "12.0 g"
+    amount = value.strip()
+    if amount.endswith(" g"):
+        amount = amount[:-2]
+    return Weight(g=_parse_decimal(amount))
+
+
+def _parse_description(value: str) -> dict:
+    try:
+        description = json.loads(value)
+    except ValueError:
+        description = None
+    if not isinstance(description, dict):
+        description = {
+            "blocks": [{"type": "paragraph", "data": {"text": value}}],
+        }
+    return description
+
+
+# Channel listing fields by header fields: model, field and parser of the value.
+CHANNEL_FIELDS = {
+    "published": ("product", "is_published", _parse_bool),
+    "publication date": ("product", "published_at", _parse_datetime),
+    "published at": ("product", "published_at", _parse_datetime),
+    "searchable": ("product", "visible_in_listings", _parse_bool),
+    "available for purchase": (
+        "product",
+        "available_for_purchase_at",
+        _parse_datetime,
+    ),
+    "price amount": ("variant", "price_amount", _parse_decimal),
+    "variant cost price": ("variant", "cost_price_amount", _parse_decimal),
+    "variant preorder quantity threshold": (
+        "variant",
+        "preorder_quantity_threshold",
+        _parse_quantity,
+    ),
+}
+
+VARIANT_HEADERS = {"variant id", "variant sku", "variant weight"}
+
+
+def read_rows(
+    content_file: IO[bytes], file_type: str, delimiter: str = ","
+) -> Iterator[List[str]]:
+    """Yield rows of the file as lists of strings, starting with the headers."""
+    if file_type == FileTypes.CSV:
+        text_file = io.TextIOWrapper(content_file, encoding="utf-8-sig", newline="")
+        yield from csv.reader(text_file, delimiter=delimiter)
+        return
+
+    workbook = load_workbook(content_file, read_only=True, data_only=True)
+    try:
+        for values in workbook.active.iter_rows(values_only=True):
+            yield ["" if value is None else str(value) for value in values]
+    finally:
+        workbook.close()
+
+
+def import_products(import_file: "ImportFile", manager: "PluginsManager"):
+    """Import products from the file, resuming after the already processed rows."""
+    with import_file.content_file.open("rb") as content_file:
+        rows = read_rows(content_file, import_file.file_type, import_file.delimiter)
+        headers = [header.strip() for header in next(rows, [])]
+        importer = ProductsImporter(headers)
+        if not import_file.processed_rows:
+            _add_errors(import_file, importer.header_errors)
+
+        rows = islice(rows, import_file.processed_rows, None)
+        while batch := list(islice(rows, IMPORT_BATCH_SIZE)):
+            # The first line of the file contains headers.
+            first_line = import_file.processed_rows + 2
+            lines = [
+                (line, dict(zip(headers, values)))
+                for line, values in enumerate(batch, start=first_line)
+            ]
+            with transaction.atomic():
+                errors = importer.import_rows(lines, manager)
+                import_file.processed_rows += len(batch)
+                import_file.failed_rows += len({error["row"] for error in errors})
+                _add_errors(import_file, errors)
+                import_file.save(
+                    update_fields=[
+                        "processed_rows",
+                        "failed_rows",
+                        "errors",
+                        "updated_at",
+                    ]
+                )
+
+
+def _add_errors(import_file: "ImportFile", errors: List[dict]):
+    free_slots = MAX_IMPORT_ERRORS - len(import_file.errors)
+    if free_slots > 0:
+        import_file.errors.extend(errors[:free_slots])
+
+
+@dataclass
+class ProductRow:
+    line: int
+    product: Product
+    variant: Optional[ProductVariant] = None
+    product_attributes: List[Tuple[Attribute, List[str]]] = field(default_factory=list)
+    variant_attributes: List[Tuple[Attribute, List[str]]] = field(default_factory=list)
+    product_listings: Dict[Channel, Dict[str, Any]] = field(default_factory=dict)
+    variant_listings: Dict[Channel, Dict[str, Any]] = field(default_factory=dict)
+    stocks: List[Tuple[Warehouse, int]] = field(default_factory=list)
+
+
+class ProductsImporter:
+    def __init__(self, headers: Sequence[str]):
+        self.header_errors: List[dict] = []
+        self.attribute_headers: Dict[str, Tuple[Attribute, str]] = {}
+        self.warehouse_headers: Dict[str, Warehouse] = {}
+        self.channel_headers: Dict[str, Tuple[Channel, str, str, Any]] = {}
+        self.categories: Dict[str, Optional[Category]] = {}
+        self.product_types: Dict[str, Optional[ProductType]] = {}
+        # IDs of the product and variant attributes of the product types.
+        self.product_types_attributes: Dict[int, Tuple[Set[int], Set[int]]] = {}
+        self._parse_headers(headers)
+
+    def _parse_headers(self, headers: Sequence[str]):
+        matches = {}
+        for header in headers:
+            if match := HEADER_PATTERN.match(header):
+                matches[header] = match
+        slugs: Dict[str, Set[str]] = defaultdict(set)
+        for match in matches.values():
+            kind = match["kind"].split(" ")[0]
+            slugs[kind].add(match["slug"])
+        attributes = Attribute.objects.in_bulk(
+            slugs["product"] | slugs["variant"], field_name="slug"
+        )
+        warehouses = Warehouse.objects.in_bulk(slugs["warehouse"], field_name="slug")
+        channels = Channel.objects.in_bulk(slugs["channel"], field_name="slug")
+
+        for header, match in matches.items():
+            slug, kind = match["slug"], match["kind"]
+            if kind.endswith("attribute"):
+                attribute = attributes.get(slug)
+                if attribute is None:
+                    self._add_header_error(header, "Attribute doesn't exist.")
+                elif attribute.input_type not in SUPPORTED_ATTRIBUTE_INPUT_TYPES:
+                    self._add_header_error(
+                        header,
+                        f"Importing values of {attribute.input_type} attributes "
+                        "is not supported.",
+                    )
+                else:
+                    self.attribute_headers[header] = (attribute, kind.split(" ")[0])
+            elif kind == "warehouse quantity":
+                if warehouse := warehouses.get(slug):
+                    self.warehouse_headers[header] = warehouse
+                else:
+                    self._add_header_error(header, "Warehouse doesn't exist.")
+            elif match["field"] in CHANNEL_FIELDS:
+                if channel := channels.get(slug):
+                    self.channel_headers[header] = (
+                        channel,
+                        *CHANNEL_FIELDS[match["field"]],
+                    )
+                else:
+                    self._add_header_error(header, "Channel doesn't exist.")
+
+    def _add_header_error(self, header: str, message: str):
+        self.header_errors.append({"row": 1, "field": header, "message": message})
+
+    @staticmethod
+    def _load_cache(cache: dict, model, field_name: str, keys: Set[str]):
+        missing_keys = keys - cache.keys()
+        if not missing_keys:
+            return
+        cache.update(dict.fromkeys(missing_keys))
+        # the first created instance wins when the field is not unique
+        for instance in model.objects.filter(
+            **{f"{field_name}__in": missing_keys}
+        ).order_by("-pk"):
+            cache[getattr(instance, field_name)] = instance
+
+    def load_product_types_attributes(self, product_type_ids: Set[int]):
+        missing_ids = product_type_ids - self.product_types_attributes.keys()
+        for product_type_id in missing_ids:
+            self.product_types_attributes[product_type_id] = (set(), set())
+        for relation_model, position in ((AttributeProduct, 0), (AttributeVariant, 1)):
+            for product_type_id, attribute_id in relation_model.objects.filter(
+                product_type_id__in=missing_ids
+            ).values_list("product_type_id", "attribute_id"):
+                self.product_types_attributes[product_type_id][position].add(
+                    attribute_id
+                )
+
+    def import_rows(
+        self, lines: List[Tuple[int, Dict[str, str]]], manager: "PluginsManager"
+    ) -> List[dict]:
+        """Import the rows given with their line numbers and return errors."""
+        self._load_cache(
+            self.categories,
+            Category,
+            "slug",
+            {row["category"] for _, row in lines if row.get("category")},
+        )
+        self._load_cache(
+            self.product_types,
+            ProductType,
+            "name",
+            {row["product type"] for _, row in lines if row.get("product type")},
+        )
+        batch = ImportBatch(self, lines)
+        product_rows = batch.clean()
+        batch.save(product_rows, manager)
+        return batch.errors
+
+
+class ImportBatch:
+    def __init__(
+        self, importer: ProductsImporter, lines: List[Tuple[int, Dict[str, str]]]
+    ):
+        self.importer = importer
+        self.lines = lines
+        self.errors: List[dict] = []
+
+        product_ids = set()
+        product_slugs = set()
+        variant_ids = set()
+        skus = set()
+        for _, row in lines:
+            if product_id := self._get_id(row.get("id"), "Product"):
+                product_ids.add(product_id)
+            elif name := row.get("name"):
+                product_slugs.add(self._get_slug(name))
+            if variant_id := self._get_id(row.get("variant id"), "ProductVariant"):
+                variant_ids.add(variant_id)
+            elif sku := row.get("variant sku"):
+                skus.add(sku)
+
+        self.products_by_id = Product.objects.in_bulk(product_ids)
+        self.products_by_slug = Product.objects.in_bulk(
+            product_slugs, field_name="slug"
+        )
+        self.variants_by_id = ProductVariant.objects.in_bulk(variant_ids)
+        self.variants_by_sku = ProductVariant.objects.in_bulk(skus, field_name="sku")
+        self.variant_listings_keys = set(
+            ProductVariantChannelListing.objects.filter(
+                variant_id__in={
+                    *self.variants_by_id.keys(),
+                    *(variant.pk for variant in self.variants_by_sku.values()),
+                }
+            ).values_list("variant_id", "channel_id")
+        )
+        importer.load_product_types_attributes(
+            {product.product_type_id for product in self.products_by_id.values()}
+            | {product.product_type_id for product in self.products_by_slug.values()}
+            | {
+                product_type.pk
+                for product_type in importer.product_types.values()
+                if product_type
+            }
+        )
+        self.new_products: Dict[str, Product] = {}
+        self.products_to_update: Dict[int, Product] = {}
+        self.product_update_fields: Set[str] = set()
+        self.new_variants: List[ProductVariant] = []
+        self.new_variants_skus: Set[str] = set()
+        self.variants_to_update: Dict[int, ProductVariant] = {}
+        self.variant_update_fields: Set[str] = set()
+
+    @staticmethod
+    def _get_id(global_id: Optional[str], type_name: str) -> Optional[int]:
+        if not global_id:
+            return None
+        try:
+            type_, id_ = graphene.Node.from_global_id(global_id)
+            return int(id_) if type_ == type_name else None
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+    @staticmethod
+    def _get_slug(name: str) -> str:
+        return slugify(unidecode(name))
+
+    def _add_error(self, line: int, field: Optional[str], message: str):
+        self.errors.append({"row": line, "field": field, "message": message})
+
+    def clean(self) -> List[ProductRow]:
+        product_rows = []
+        for line, row in self.lines:
+            if product_row := self._clean_row(line, row):
+                product_rows.append(product_row)
+        return product_rows
+
+    def _clean_row(self, line: int, row: Dict[str, str]) -> Optional[ProductRow]:
+        errors_count = len(self.errors)
+        values: Dict[str, Any] = {}
+        for header, field_name, parse in (
+            ("description", "description", _parse_description),
+            ("product weight", "weight", _parse_weight),
+            ("variant weight", "variant_weight", _parse_weight),
+        ):
+            if row.get(header):
+                try:
+                    values[field_name] = parse(row[header])
+                except ValueError as error:
+                    self._add_error(line, header, str(error))
+        if category_slug := row.get("category"):
+            values["category"] = self.importer.categories[category_slug]
+            if values["category"] is None:
+                self._add_error(line, "category", "Category doesn't exist.")
+        if row.get("name"):
+            values["name"] = row["name"]
+
+        product = self._get_product(line, row)
+        if product is None:
+            return None
+        variant = self._get_variant(line, row, product)
+
+        product_row = ProductRow(line=line, product=product, variant=variant)
+        self._clean_attributes(line, row, product_row)
+        self._clean_channels(line, row, product_row)
+        self._clean_stocks(line, row, product_row)
+        if len(self.errors) > errors_count:
+            return None
+
+        self._set_product_values(product, values)
+        if variant:
+            self._set_variant_values(variant, values)
+        return product_row
+
+    def _get_product(self, line: int, row: Dict[str, str]) -> Optional[Product]:
+        if row.get("id"):
+            product_id = self._get_id(row["id"], "Product")
+            product = self.products_by_id.get(product_id)  # type: ignore
+            if product is None:
+                self._add_error(line, "id", "Product doesn't exist.")
+            return product
+
+        name = row.get("name") or ""
+        slug = self._get_slug(name)
+        if not slug:
+            self._add_error(line, "name", "Product name or ID is required.")
+            return None
+        if product := self.products_by_slug.get(slug) or self.new_products.get(slug):
+            return product
+
+        product_type_name = row.get("product type")
+        if not product_type_name:
+            self._add_error(
+                line, "product type", "Product type is required for new products."
+            )
+            return None
+        product_type = self.importer.product_types[product_type_name]
+        if product_type is None:
+            self._add_error(line, "product type", "Product type doesn't exist.")
+            return None
+        return Product(name=name, slug=slug, product_type=product_type)
+
+    def _get_variant(
+        self, line: int, row: Dict[str, str], product: Product
+    ) -> Optional[ProductVariant]:
+        variant = None
+        field_name = "variant id"
+        if row.get("variant id"):
+            variant_id = self._get_id(row["variant id"], "ProductVariant")
+            variant = self.variants_by_id.get(variant_id)  # type: ignore
+            if variant is None:
+                self._add_error(line, "variant id", "Product variant doesn't exist.")
+                return None
+        elif row.get("variant sku"):
+            variant = self.variants_by_sku.get(row["variant sku"])
+            field_name = "variant sku"
+
+        if variant:
+            if variant.product_id != product.pk:
+                self._add_error(
+                    line, field_name, "Product variant belongs to another product."
+                )
+            variant.product = product
+            return variant
+
+        has_variant_data = any(row.get(header) for header in VARIANT_HEADERS) or any(
+            row.get(header)
+            for header in [
+                *self.importer.warehouse_headers,
+                *(
+                    header
+                    for header, (_, kind) in self.importer.attribute_headers.items()
+                    if kind == "variant"
+                ),
+                *(
+                    header
+                    for header, (
+                        _,
+                        model,
+                        _,
+                        _,
+                    ) in self.importer.channel_headers.items()
+                    if model == "variant"
+                ),
+            ]
+        )
+        if not has_variant_data:
+            return None
+        sku = row.get("variant sku") or None
+        if sku in self.new_variants_skus:
+            self._add_error(
+                line, "variant sku", "Product variant with this SKU already exists."
+            )
+            return None
+        return ProductVariant(product=product, sku=sku)
+
+    def _clean_attributes(self, line: int, row: Dict[str, str], product_row):
+        (
+            product_attribute_ids,
+            variant_attribute_ids,
+        ) = self.importer.product_types_attributes.get(
+            product_row.product.product_type_id, (set(), set())
+        )
+        for header, (attribute, kind) in self.importer.attribute_headers.items():
+            value = row.get(header)
+            if not value:
+                continue
+            names = [
+                name.strip()
+                for name in value.split(ATTRIBUTE_VALUES_SEPARATOR)
+                if name.strip()
+            ]
+            if attribute.input_type == AttributeInputType.DROPDOWN and len(names) > 1:
+                self._add_error(line, header, "Attribute must take only one value.")
+            elif kind == "product":
+                if attribute.pk not in product_attribute_ids:
+                    self._add_error(
+                        line, header, "Attribute is not assigned to the product type."
+                    )
+                product_row.product_attributes.append((attribute, names))
+            elif product_row.variant:
+                if attribute.pk not in variant_attribute_ids:
+                    self._add_error(
+                        line, header, "Attribute is not assigned to the product type."
+                    )
+                product_row.variant_attributes.append((attribute, names))
+
+    def _clean_channels(self, line: int, row: Dict[str, str], product_row):
+        for header, (
+            channel,
+            model,
+            field_name,
+            parse,
+        ) in self.importer.channel_headers.items():
+            value = row.get(header)
+            if not value:
+                continue
+            if model == "variant" and not product_row.variant:
+                continue
+            try:
+                parsed_value = parse(value)
+            except ValueError as error:
+                self._add_error(line, header, str(error))
+                continue
+            listings = (
+                product_row.product_listings
+                if model == "product"
+                else product_row.variant_listings
+            )
+            listings.setdefault(channel, {})[field_name] = parsed_value
+
+        for channel, listing_data in product_row.variant_listings.items():
+            key = (product_row.variant.pk, channel.pk)
+            if (
+                "price_amount" not in listing_data
+                and key not in self.variant_listings_keys
+            ):
+                self._add_error(
+                    line,
+                    f"{channel.slug} (channel price amount)",
+                    "Price is required for new variant channel listings.",
+                )
+
+    def _clean_stocks(self, line: int, row: Dict[str, str], product_row):
+        if not product_row.variant:
+            return
+        for header, warehouse in self.importer.warehouse_headers.items():
+            value = row.get(header)
+            if not value:
+                continue
+            try:
+                product_row.stocks.append((warehouse, _parse_quantity(value)))
+            except ValueError as error:
+                self._add_error(line, header, str(error))
+
+    def _set_product_values(self, product: Product, values: Dict[str, Any]):
+        update_fields = []
+        for field_name in ("name", "category", "weight", "description"):
+            if field_name in values:
+                setattr(product, field_name, values[field_name])
+                update_fields.append(field_name)
+        if "description" in values:
+            product.description_plaintext = clean_editor_js(
+                values["description"], to_string=True
+            )
+            update_fields.append("description_plaintext")
+        product.search_index_dirty = True
+
+        if not product.pk:
+            self.new_products[product.slug] = product
+        elif update_fields:
+            self.products_to_update[product.pk] = product
+            self.product_update_fields.update(update_fields)
+
+    def _set_variant_values(self, variant: ProductVariant, values: Dict[str, Any]):
+        if "variant_weight" in values:
+            variant.weight = values["variant_weight"]
+        if not variant.pk:
+            self.new_variants.append(variant)
+            if variant.sku:
+                self.new_variants_skus.add(variant.sku)
+        elif "variant_weight" in values:
+            self.variants_to_update[variant.pk] = variant
+            self.variant_update_fields.add("weight")
+
+    def save(self, product_rows: List[ProductRow], manager: "PluginsManager"):
+        if not product_rows:
+            return
+        self._save_products()
+        self._save_variants()
+        self._save_attributes(product_rows)
+        product_ids = self._save_channel_listings(product_rows)
+        self._save_stocks(product_rows, manager)
+        if product_ids:
+            transaction.on_commit(
+                lambda: update_products_discounted_prices_task.delay(product_ids)
+            )
+
+    def _save_products(self):
+        Product.objects.bulk_create(self.new_products.values())
+        if self.products_to_update:
+            # bulk_update doesn't apply auto_now, the timestamp is set explicitly.
+            now = timezone.now()
+            for product in self.products_to_update.values():
+                product.updated_at = now
+            Product.objects.bulk_update(
+                self.products_to_update.values(),
+                [*self.product_update_fields, "search_index_dirty", "updated_at"],
+            )
+
+    def _save_variants(self):
+        for variant in self.new_variants:
+            # set IDs of the products created in this batch, keeping the instances
+            variant.product = variant.product
+        max_sort_orders = dict(
+            ProductVariant.objects.filter(
+                product_id__in={variant.product_id for variant in self.new_variants}
+            )
+            .values("product_id")
+            .annotate(max_sort_order=Max("sort_order"))
+            .values_list("product_id", "max_sort_order")
+        )
+        for variant in self.new_variants:
+            max_sort_order = max_sort_orders.get(variant.product_id)
+            variant.sort_order = 0 if max_sort_order is None else max_sort_order + 1
+            max_sort_orders[variant.product_id] = variant.sort_order
+        ProductVariant.objects.bulk_create(self.new_variants)
+        if self.variants_to_update:
+            now = timezone.now()
+            for variant in self.variants_to_update.values():
+                variant.updated_at = now
+            ProductVariant.objects.bulk_update(
+                self.variants_to_update.values(),
+                [*self.variant_update_fields, "updated_at"],
+            )
+
+        products_without_default_variant = {}
+        for variant in self.new_variants:
+            product = variant.product
+            if product.default_variant_id is None:
+                product.default_variant = variant
+                products_without_default_variant[product.pk] = product
+        Product.objects.bulk_update(
+            products_without_default_variant.values(), ["default_variant"]
+        )
+
+    def _save_attributes(self, product_rows: List[ProductRow]):
+        values_keys: Set[Tuple[Attribute, str, str]] = set()
+        instances_attributes: Dict[
+            Tuple[Union[Product, ProductVariant], Attribute], List[str]
+        ] = {}
+        for product_row in product_rows:
+            for instance, attributes in (
+                (product_row.product, product_row.product_attributes),
+                (product_row.variant, product_row.variant_attributes),
+            ):
+                if instance is None:
+                    continue
+                for attribute, names in attributes:
+                    instances_attributes[(instance, attribute)] = names
+                    values_keys.update(
+                        (attribute, self._get_slug(name), name) for name in names
+                    )
+        if not instances_attributes:
+            return
+
+        values = {
+            (value.attribute_id, value.slug): value
+            for value in AttributeValue.objects.filter(
+                attribute_id__in={attribute.pk for attribute, _, _ in values_keys},
+                slug__in={slug for _, slug, _ in values_keys},
+            )
+        }
+        values_to_create = {}
+        for attribute, slug, name in values_keys:
+            key = (attribute.pk, slug)
+            if key not in values and key not in values_to_create:
+                values_to_create[key] = AttributeValue(
+                    attribute=attribute, name=name, slug=slug
+                )
+        AttributeValue.objects.bulk_create(values_to_create.values())
+        values.update(values_to_create)
+
+        associate_attribute_values_to_instances(
+            [
+                (
+                    instance,
+                    attribute,
+                    [values[(attribute.pk, self._get_slug(name))] for name in names],
+                )
+                for (instance, attribute), names in instances_attributes.items()
+            ]
+        )
+        variants = {
+            instance.pk: instance
+            for instance, _ in instances_attributes
+            if isinstance(instance, ProductVariant)
+        }
+        if variants:
+            generate_and_set_variants_names(list(variants.values()))
+
+    def _save_channel_listings(self, product_rows: List[ProductRow]) -> List[int]:
+        product_listings_data: Dict[Tuple[Product, Channel], dict] = {}
+        variant_listings_data: Dict[Tuple[ProductVariant, Channel], dict] = {}
+        for product_row in product_rows:
+            for channel, data in product_row.product_listings.items():
+                product_listings_data.setdefault(
+                    (product_row.product, channel), {}
+                ).update(data)
+            if product_row.variant is None:
+                continue
+            for channel, data in product_row.variant_listings.items():
+                variant_listings_data.setdefault(
+                    (product_row.variant, channel), {}
+                ).update(data)
+
+        self._upsert_listings(ProductChannelListing, "product", product_listings_data)
+        self._upsert_listings(
+            ProductVariantChannelListing, "variant", variant_listings_data
+        )
+        return list({variant.product_id for variant, _ in variant_listings_data})
+
+    @staticmethod
+    def _upsert_listings(listing_model, instance_field, listings_data):
+        if not listings_data:
+            return
+        existing_listings = {
+            (getattr(listing, f"{instance_field}_id"), listing.channel_id): listing
+            for listing in listing_model.objects.filter(
+                **{
+                    f"{instance_field}__in": {
+                        instance for instance, _ in listings_data
+                    },
+                    "channel__in": {channel for _, channel in listings_data},
+                }
+            )
+        }
+        listings_to_create = []
+        listings_to_update = []
+        update_fields = set()
+        for (instance, channel), data in listings_data.items():
+            listing = existing_listings.get((instance.pk, channel.pk))
+            if listing is None:
+                listing = listing_model(
+                    **{instance_field: instance, "channel": channel},
+                    currency=channel.currency_code,
+                )
+                listings_to_create.append(listing)
+            else:
+                listings_to_update.append(listing)
+                update_fields.update(data.keys())
+            for field_name, value in data.items():
+                setattr(listing, field_name, value)
+        listing_model.objects.bulk_create(listings_to_create)
+        if listings_to_update:
+            listing_model.objects.bulk_update(listings_to_update, [*update_fields])
+
+    def _save_stocks(self, product_rows: List[ProductRow], manager):
+        rows = []
+        lines = []
+        for product_row in product_rows:
+            for warehouse, quantity in product_row.stocks:
+                rows.append(
+                    StockUpsertRow(
+                        warehouse=str(warehouse.pk),
+                        quantity=quantity,
+                        variant_id=product_row.variant.pk,  # type: ignore
+                    )
+                )
+                lines.append(
+                    (product_row.line, f"{warehouse.slug} (warehouse quantity)")
+                )
+        result = bulk_upsert_stocks(rows, manager)
+        for error in result.errors:
+            line, header = lines[error.index]
+            self._add_error(line, header, error.message)
@@ -269,7 +269,7 @@ def get_products_voucher_discount(
 
 
 def fetch_categories(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
-    from ..product.models import Category
+    from ..product.category_tree import get_category_tree
 
     categories = (
         Sale.categories.through.objects.filter(sale_id__in=sale_pks)
@@ -280,12 +280,11 @@ def fetch_categories(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
     for sale_pk, category_pk in categories:
         category_map[sale_pk].add(category_pk)
     subcategory_map: Dict[int, Set[int]] = defaultdict(set)
+    if not category_map:
+        return subcategory_map
+    category_tree = get_category_tree()
     for sale_pk, category_pks in category_map.items():
-        subcategory_map[sale_pk] = set(
-            Category.tree.filter(pk__in=category_pks)
-            .get_descendants(include_self=True)  # type: ignore
-            .values_list("pk", flat=True)
-        )
+        subcategory_map[sale_pk] = category_tree.get_descendant_ids(category_pks)
     return subcategory_map
 
 
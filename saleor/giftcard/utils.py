@@ -10,7 +10,7 @@ from django.utils import timezone
 from ..checkout.models import Checkout
 from ..core.exceptions import GiftCardNotApplicable
 from ..core.tracing import traced_atomic_transaction
-from ..core.utils.promo_code import InvalidPromoCode, generate_promo_code
+from ..core.utils.promo_code import InvalidPromoCode, generate_promo_codes
 from ..order.actions import create_fulfillments
 from ..order.models import OrderLine
 from ..site import GiftCardSettingsExpiryType
@@ -173,12 +173,18 @@ def gift_cards_create(
     gift_cards = []
     non_shippable_gift_cards = []
     expiry_date = calculate_expiry_date(settings)
+    gift_card_lines_info = list(gift_card_lines_info)
+    codes = iter(
+        generate_promo_codes(
+            sum(line_data.quantity for line_data in gift_card_lines_info)
+        )
+    )
     for line_data in gift_card_lines_info:
         order_line = line_data.order_line
         price = order_line.unit_price_gross
         line_gift_cards = [
             GiftCard(  # type: ignore
-                code=generate_promo_code(),
+                code=next(codes),
                 initial_balance=price,
                 current_balance=price,
                 created_by=customer_user,
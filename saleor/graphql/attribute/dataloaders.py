@@ -21,6 +21,8 @@ class AttributeValuesByAttributeIdLoader(DataLoader):
 
 class AttributesByAttributeId(DataLoader):
     context_key = "attributes_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Attribute,)
 
     def batch_load(self, keys):
         attributes = Attribute.objects.using(self.database_connection_name).in_bulk(
@@ -2,7 +2,7 @@ import graphene
 import pytest
 
 from .....attribute.models import AttributeTranslation, AttributeValueTranslation
-from ....attribute.utils import associate_attribute_values_to_instance
+from .....attribute.utils import associate_attribute_values_to_instance
 from ....tests.utils import get_graphql_content
 
 
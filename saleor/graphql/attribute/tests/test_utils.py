@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from ....attribute import AttributeInputType
 from ....page.error_codes import PageErrorCode
 from ....product.error_codes import ProductErrorCode
+from ....product.models import ProductVariant
 from ..utils import (
     AttributeAssignmentMixin,
     AttrValuesForSelectableFieldInput,
@@ -1918,3 +1919,67 @@ def test_prepare_attribute_values_that_gives_the_same_slug(color_attribute):
     assert result[0] == existing_value
     assert result[1].name == new_value
     assert result[2].name == new_value_2
+
+
+def test_save_bulk_assigns_values_to_many_instances(
+    product, size_attribute, django_assert_max_num_queries
+):
+    # given
+    variants = ProductVariant.objects.bulk_create(
+        [ProductVariant(product=product, sku=f"sku-{index}") for index in range(3)]
+    )
+    existing_value = size_attribute.values.first()
+    attribute_id = graphene.Node.to_global_id("Attribute", size_attribute.pk)
+    names = [existing_value.name, "New size", "New size"]
+    instances_inputs = [
+        (
+            variant,
+            [(size_attribute, AttrValuesInput(global_id=attribute_id, values=[name]))],
+        )
+        for variant, name in zip(variants, names)
+    ]
+    values_count = size_attribute.values.count()
+
+    # when
+    with django_assert_max_num_queries(10):
+        AttributeAssignmentMixin.save_bulk(instances_inputs)
+
+    # then
+    assert size_attribute.values.count() == values_count + 1
+    for variant, name in zip(variants, names):
+        assert variant.attributes.get().values.get().name == name
+
+
+def test_save_bulk_removes_assignment_without_values(
+    product, size_attribute, numeric_attribute
+):
+    # given
+    product.product_type.variant_attributes.add(numeric_attribute)
+    variant = product.variants.first()
+    size_id = graphene.Node.to_global_id("Attribute", size_attribute.pk)
+    numeric_id = graphene.Node.to_global_id("Attribute", numeric_attribute.pk)
+    AttributeAssignmentMixin.save(
+        variant,
+        [(size_attribute, AttrValuesInput(global_id=size_id, values=["Big"]))],
+    )
+
+    # when
+    AttributeAssignmentMixin.save_bulk(
+        [
+            (
+                variant,
+                [
+                    (size_attribute, AttrValuesInput(global_id=size_id, values=[])),
+                    (
+                        numeric_attribute,
+                        AttrValuesInput(global_id=numeric_id, numeric="12.5"),
+                    ),
+                ],
+            )
+        ]
+    )
+
+    # then
+    assignment = variant.attributes.get()
+    assert assignment.attribute == numeric_attribute
+    assert assignment.values.get().name == "12.5"
@@ -2,11 +2,11 @@ import re
 from collections import defaultdict, namedtuple
 from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import graphene
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db.models import Max, Q
 from django.template.defaultfilters import truncatechars
 from django.utils import timezone
 from django.utils.text import slugify
@@ -15,7 +15,10 @@ from text_unidecode import unidecode
 
 from ...attribute import AttributeEntityType, AttributeInputType, AttributeType
 from ...attribute import models as attribute_models
-from ...attribute.utils import associate_attribute_values_to_instance
+from ...attribute.utils import (
+    associate_attribute_values_to_instances,
+    remove_attributes_from_instances,
+)
 from ...core.utils import generate_unique_slug, prepare_unique_slug
 from ...core.utils.editorjs import clean_editor_js
 from ...core.utils.url import get_default_storage_root_url
@@ -310,6 +313,19 @@ class AttributeAssignmentMixin:
         :param instance: the product or variant to associate the attribute against.
         :param cleaned_input: the cleaned user input (refer to clean_attributes)
         """
+        cls.save_bulk([(instance, cleaned_input)])
+
+    @classmethod
+    def save_bulk(cls, instances_inputs: Iterable[Tuple[T_INSTANCE, T_INPUT_MAP]]):
+        """Save the cleaned inputs of many instances at once.
+
+        Values of all attributes are resolved, and missing ones created, with a few
+        queries, and then assigned to all instances together.
+
+        Note: this should always be ran inside a transaction.
+
+        :param instances_inputs: pairs of the instance and its cleaned user input.
+        """
         pre_save_methods_mapping = {
             AttributeInputType.BOOLEAN: cls._pre_save_boolean_values,
             AttributeInputType.DATE: cls._pre_save_date_time_values,
@@ -322,34 +338,44 @@ class AttributeAssignmentMixin:
             AttributeInputType.REFERENCE: cls._pre_save_reference_values,
             AttributeInputType.RICH_TEXT: cls._pre_save_rich_text_values,
         }
-        clean_assignment = []
-        for attribute, attr_values in cleaned_input:
-            is_handled_by_values_field = (
-                attr_values.values
-                and attribute.input_type
-                in (
-                    AttributeInputType.DROPDOWN,
-                    AttributeInputType.MULTISELECT,
-                    AttributeInputType.SWATCH,
+        values_resolver = AttributeValuesResolver()
+        instances_values_keys = []
+        for instance, cleaned_input in instances_inputs:
+            for attribute, attr_values in cleaned_input:
+                is_handled_by_values_field = (
+                    attr_values.values
+                    and attribute.input_type
+                    in (
+                        AttributeInputType.DROPDOWN,
+                        AttributeInputType.MULTISELECT,
+                        AttributeInputType.SWATCH,
+                    )
                 )
-            )
-            if is_handled_by_values_field:
-                attribute_values = cls._pre_save_values(attribute, attr_values)
-            else:
-                pre_save_func = pre_save_methods_mapping[attribute.input_type]
-                attribute_values = pre_save_func(instance, attribute, attr_values)
+                if is_handled_by_values_field:
+                    values_keys = cls._pre_save_values(
+                        attribute, attr_values, values_resolver
+                    )
+                else:
+                    pre_save_func = pre_save_methods_mapping[attribute.input_type]
+                    values_keys = pre_save_func(
+                        instance, attribute, attr_values, values_resolver
+                    )
+                instances_values_keys.append((instance, attribute, values_keys))
 
-            associate_attribute_values_to_instance(
-                instance, attribute, *attribute_values
-            )
-            if not attribute_values:
-                clean_assignment.append(attribute.pk)
+        values_resolver.resolve()
+        instances_values = []
+        clean_assignment = []
+        for instance, attribute, values_keys in instances_values_keys:
+            attribute_values = values_resolver.get_values(values_keys)
+            if attribute_values:
+                instances_values.append((instance, attribute, attribute_values))
+            else:
+                clean_assignment.append((instance, attribute))
 
+        associate_attribute_values_to_instances(instances_values)
         # drop attribute assignment model when values are unassigned from instance
         if clean_assignment:
-            instance.attributes.filter(
-                assignment__attribute_id__in=clean_assignment
-            ).delete()
+            remove_attributes_from_instances(clean_assignment)
 
     @classmethod
     def _pre_save_dropdown_value(
@@ -357,22 +383,18 @@ class AttributeAssignmentMixin:
         _,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         if not attr_values.dropdown:
-            return tuple()
+            return []
 
         if id := attr_values.dropdown.id:
-            _, attr_value_id = from_global_id_or_error(id)
-            model = attribute_models.AttributeValue.objects.get(pk=attr_value_id)
-            if not model:
-                raise ValidationError("Attribute value with given ID can't be found")
-            return (model,)
+            return [values_resolver.get_by_id(id)]
 
         if attr_value := attr_values.dropdown.value:
-            model = prepare_attribute_values(attribute, [attr_value])
-            return model
+            return [values_resolver.get_or_create_by_name(attribute, attr_value)]
 
-        return tuple()
+        return []
 
     @classmethod
     def _pre_save_multiselect_values(
@@ -380,32 +402,22 @@ class AttributeAssignmentMixin:
         _,
         attribute: attribute_models.Attribute,
         attr_values_input: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         if not attr_values_input.multiselect:
-            return tuple()
+            return []
 
-        attribute_values: List[attribute_models.AttributeValue] = []
+        values_keys = []
         for attr_value in attr_values_input.multiselect:
             if attr_value.id:
-                _, attr_value_id = from_global_id_or_error(attr_value.id)
-                attr_value_model = attribute_models.AttributeValue.objects.get(
-                    pk=attr_value_id
-                )
-                if not attr_value_model:
-                    raise ValidationError(
-                        "Attribute value with given ID can't be found"
-                    )
-                if attr_value_model.id not in [a.id for a in attribute_values]:
-                    attribute_values.append(attr_value_model)
+                values_keys.append(values_resolver.get_by_id(attr_value.id))
 
             if attr_value.value:
-                attr_value_model = prepare_attribute_values(
-                    attribute, [attr_value.value]
-                )[0]
-                if attr_value_model.id not in [a.id for a in attribute_values]:
-                    attribute_values.append(attr_value_model)
+                values_keys.append(
+                    values_resolver.get_or_create_by_name(attribute, attr_value.value)
+                )
 
-        return attribute_values
+        return values_keys
 
     @classmethod
     def _pre_save_numeric_values(
@@ -413,22 +425,28 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         if attr_values.values:
             value = attr_values.values[0]
         elif attr_values.numeric:
             value = attr_values.numeric
         else:
-            return tuple()
+            return []
 
         defaults = {
             "name": value,
         }
-        return cls._update_or_create_value(instance, attribute, defaults)
+        return cls._update_or_create_value(
+            instance, attribute, defaults, values_resolver
+        )
 
     @classmethod
     def _pre_save_values(
-        cls, attribute: attribute_models.Attribute, attr_values: AttrValuesInput
+        cls,
+        attribute: attribute_models.Attribute,
+        attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         """To be deprecated together with `AttributeValueInput.values` field.
 
@@ -436,11 +454,12 @@ class AttributeAssignmentMixin:
         """
 
         if not attr_values.values:
-            return tuple()
+            return []
 
-        result = prepare_attribute_values(attribute, attr_values.values)
-
-        return tuple(result)
+        return [
+            values_resolver.get_or_create_by_name(attribute, value)
+            for value in attr_values.values
+        ]
 
     @classmethod
     def _pre_save_rich_text_values(
@@ -448,16 +467,19 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         if not attr_values.rich_text:
-            return tuple()
+            return []
         defaults = {
             "rich_text": attr_values.rich_text,
             "name": truncatechars(
                 clean_editor_js(attr_values.rich_text, to_string=True), 200
             ),
         }
-        return cls._update_or_create_value(instance, attribute, defaults)
+        return cls._update_or_create_value(
+            instance, attribute, defaults, values_resolver
+        )
 
     @classmethod
     def _pre_save_plain_text_values(
@@ -465,14 +487,17 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         if not attr_values.plain_text:
-            return tuple()
+            return []
         defaults = {
             "plain_text": attr_values.plain_text,
             "name": truncatechars(attr_values.plain_text, 200),
         }
-        return cls._update_or_create_value(instance, attribute, defaults)
+        return cls._update_or_create_value(
+            instance, attribute, defaults, values_resolver
+        )
 
     @classmethod
     def _pre_save_boolean_values(
@@ -480,20 +505,21 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         if attr_values.boolean is None:
-            return tuple()
-        get_or_create = attribute.values.get_or_create
+            return []
         boolean = bool(attr_values.boolean)
-        value, _ = get_or_create(
-            attribute=attribute,
-            slug=slugify(unidecode(f"{attribute.id}_{boolean}")),
-            defaults={
-                "name": f"{attribute.name}: {'Yes' if boolean else 'No'}",
-                "boolean": boolean,
-            },
-        )
-        return (value,)
+        return [
+            values_resolver.get_or_create_by_slug(
+                attribute,
+                slug=slugify(unidecode(f"{attribute.id}_{boolean}")),
+                defaults={
+                    "name": f"{attribute.name}: {'Yes' if boolean else 'No'}",
+                    "boolean": boolean,
+                },
+            )
+        ]
 
     @classmethod
     def _pre_save_date_time_values(
@@ -501,12 +527,13 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         is_date_attr = attribute.input_type == AttributeInputType.DATE
         value = attr_values.date if is_date_attr else attr_values.date_time
 
         if value is None:
-            return tuple()
+            return []
 
         tz = timezone.get_current_timezone()
         date_time = (
@@ -518,7 +545,9 @@ class AttributeAssignmentMixin:
         )
         defaults = {"name": value, "date_time": date_time}
         return (
-            cls._update_or_create_value(instance, attribute, defaults) if value else ()
+            cls._update_or_create_value(instance, attribute, defaults, values_resolver)
+            if value
+            else []
         )
 
     @classmethod
@@ -527,15 +556,14 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         value_defaults: dict,
+        values_resolver: "AttributeValuesResolver",
     ):
-        update_or_create = attribute.values.update_or_create
         slug = slugify(unidecode(f"{instance.id}_{attribute.id}"))
-        value, _created = update_or_create(
-            attribute=attribute,
-            slug=slug,
-            defaults=value_defaults,
-        )
-        return (value,)
+        return [
+            values_resolver.get_or_create_by_slug(
+                attribute, slug=slug, defaults=value_defaults, update=True
+            )
+        ]
 
     @classmethod
     def _pre_save_reference_values(
@@ -543,17 +571,17 @@ class AttributeAssignmentMixin:
         instance,
         attribute: attribute_models.Attribute,
         attr_values: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         """Lazy-retrieve or create the database objects from the supplied raw values.
 
         Slug value is generated based on instance and reference entity id.
         """
         if not attr_values.references or not attribute.entity_type:
-            return tuple()
+            return []
 
         entity_data = cls.ENTITY_TYPE_MAPPING[attribute.entity_type]  # type: ignore
         field_name = entity_data.name_field
-        get_or_create = attribute.values.get_or_create
 
         reference_list = []
         attr_value_field = entity_data.value_field
@@ -562,14 +590,13 @@ class AttributeAssignmentMixin:
             if attribute.entity_type == AttributeEntityType.PRODUCT_VARIANT:
                 name = f"{ref.product.name}: {name}"  # type: ignore
             reference_list.append(
-                get_or_create(
-                    attribute=attribute,
+                values_resolver.get_or_create_by_slug(
+                    attribute,
                     slug=slugify(unidecode(f"{instance.id}_{ref.id}")),  # type: ignore
-                    defaults={"name": name},
-                    **{attr_value_field: ref},
-                )[0]
+                    defaults={"name": name, attr_value_field: ref},
+                )
             )
-        return tuple(reference_list)
+        return reference_list
 
     @classmethod
     def _pre_save_file_value(
@@ -577,6 +604,7 @@ class AttributeAssignmentMixin:
         instance: T_INSTANCE,
         attribute: attribute_models.Attribute,
         attr_value: AttrValuesInput,
+        values_resolver: "AttributeValuesResolver",
     ):
         """Create database file attribute value object from the supplied value.
 
@@ -585,7 +613,7 @@ class AttributeAssignmentMixin:
         """
         file_url = attr_value.file_url
         if not file_url:
-            return tuple()
+            return []
         name = file_url.split("/")[-1]
         # don't create new value when assignment already exists
         value = cls._get_assigned_attribute_value_if_exists(
@@ -600,7 +628,129 @@ class AttributeAssignmentMixin:
             )
             value.slug = generate_unique_slug(value, name)  # type: ignore
             value.save()
-        return (value,)
+        return [values_resolver.add(value)]
+
+
+class AttributeValuesResolver:
+    """Resolve attribute values requested by many attribute inputs at once.
+
+    Values are requested with the ``get_*`` methods, which return keys of
+    the values. After ``resolve`` is called, values can be retrieved by their keys
+    with ``get_values``.
+    """
+
+    def __init__(self):
+        self.ids: Set[int] = set()
+        self.names: Dict[attribute_models.Attribute, List[str]] = defaultdict(list)
+        self.slugs: Dict[Tuple[int, str], tuple] = {}
+        self.values: Dict[tuple, attribute_models.AttributeValue] = {}
+
+    def get_by_id(self, global_id: str) -> tuple:
+        _, pk = from_global_id_or_error(global_id)
+        self.ids.add(int(pk))
+        return ("id", int(pk))
+
+    def get_or_create_by_name(
+        self, attribute: attribute_models.Attribute, name: str
+    ) -> tuple:
+        """Match the value by slug or name, or create it when it doesn't exist."""
+        self.names[attribute].append(name)
+        return ("name", attribute.pk, name)
+
+    def get_or_create_by_slug(
+        self,
+        attribute: attribute_models.Attribute,
+        slug: str,
+        defaults: dict,
+        update: bool = False,
+    ) -> tuple:
+        """Get the value by slug, or create it with defaults when it doesn't exist.
+
+        With `update`, defaults are also set on the existing value.
+        """
+        self.slugs[(attribute.pk, slug)] = (attribute, defaults, update)
+        return ("slug", attribute.pk, slug)
+
+    def add(self, value: attribute_models.AttributeValue) -> tuple:
+        key = ("pk", value.pk)
+        self.values[key] = value
+        return key
+
+    def resolve(self):
+        if self.ids:
+            values = attribute_models.AttributeValue.objects.in_bulk(self.ids)
+            if len(values) != len(self.ids):
+                raise ValidationError("Attribute value with given ID can't be found")
+            for pk, value in values.items():
+                self.values[("id", pk)] = value
+        if self.names:
+            values_map = prepare_attribute_values_bulk(self.names)
+            for attribute_pk, attribute_values_map in values_map.items():
+                for name, value in attribute_values_map.items():
+                    self.values[("name", attribute_pk, name)] = value
+        if self.slugs:
+            self._resolve_slugs()
+
+    def _resolve_slugs(self):
+        lookup = Q()
+        for attribute_pk, slug in self.slugs:
+            lookup |= Q(attribute_id=attribute_pk, slug=slug)
+        existing_values = {
+            (value.attribute_id, value.slug): value
+            for value in attribute_models.AttributeValue.objects.filter(lookup)
+        }
+        values_to_create = []
+        values_to_update = []
+        update_fields: Set[str] = set()
+        for key, (attribute, defaults, update) in self.slugs.items():
+            value = existing_values.get(key)
+            if value is None:
+                value = attribute_models.AttributeValue(
+                    attribute=attribute, slug=key[1], **defaults
+                )
+                values_to_create.append(value)
+            elif update:
+                for field, field_value in defaults.items():
+                    setattr(value, field, field_value)
+                update_fields.update(defaults)
+                values_to_update.append(value)
+            self.values[("slug", *key)] = value
+
+        if values_to_create:
+            set_new_attribute_values_sort_order(values_to_create)
+            attribute_models.AttributeValue.objects.bulk_create(values_to_create)
+        if values_to_update:
+            attribute_models.AttributeValue.objects.bulk_update(
+                values_to_update, update_fields
+            )
+
+    def get_values(
+        self, keys: Iterable[tuple]
+    ) -> List[attribute_models.AttributeValue]:
+        values: Dict[int, attribute_models.AttributeValue] = {}
+        for key in keys:
+            value = self.values[key]
+            values.setdefault(value.pk, value)
+        return list(values.values())
+
+
+def set_new_attribute_values_sort_order(
+    values: List[attribute_models.AttributeValue],
+):
+    """Place new values at the end of their attributes' values."""
+    max_sort_orders = dict(
+        attribute_models.AttributeValue.objects.filter(
+            attribute_id__in={value.attribute_id for value in values}
+        )
+        .order_by()
+        .values("attribute_id")
+        .annotate(max_sort_order=Max("sort_order"))
+        .values_list("attribute_id", "max_sort_order")
+    )
+    for value in values:
+        max_sort_order = max_sort_orders.get(value.attribute_id)
+        value.sort_order = 0 if max_sort_order is None else max_sort_order + 1
+        max_sort_orders[value.attribute_id] = value.sort_order
 
 
 def get_variant_selection_attributes(qs: "QuerySet") -> "QuerySet":
@@ -610,47 +760,81 @@ def get_variant_selection_attributes(qs: "QuerySet") -> "QuerySet":
 
 
 def prepare_attribute_values(attribute: attribute_models.Attribute, values: List[str]):
-    slug_to_value_map = {}
-    name_to_value_map = {}
-    for val in attribute.values.filter(Q(name__in=values) | Q(slug__in=values)):
-        slug_to_value_map[val.slug] = val
-        name_to_value_map[val.name] = val
+    values_map = prepare_attribute_values_bulk({attribute: values})[attribute.pk]
+    return [values_map[value] for value in values]
 
-    existing_slugs = get_existing_slugs(attribute, values)
 
-    result = []
-    values_to_create = []
-    for value in values:
-        # match the value firstly by slug then by name
-        value_obj = slug_to_value_map.get(value) or name_to_value_map.get(value)
-        if value_obj:
-            result.append(value_obj)
-        else:
-            slug = prepare_unique_slug(slugify(unidecode(value)), existing_slugs)
-            instance = attribute_models.AttributeValue(
-                attribute=attribute, name=value, slug=slug
-            )
-            result.append(instance)
+def prepare_attribute_values_bulk(
+    values_by_attribute: Dict[attribute_models.Attribute, List[str]]
+) -> Dict[int, Dict[str, attribute_models.AttributeValue]]:
+    """Return values of many attributes matching the given slugs or names.
 
-            values_to_create.append(instance)
+    Missing values are created. The result maps attribute ID and the given raw
+    value to the attribute value.
+    """
+    lookup = Q()
+    for attribute, values in values_by_attribute.items():
+        lookup |= Q(attribute=attribute) & (Q(name__in=values) | Q(slug__in=values))
+    slug_to_value_map: Dict[int, dict] = defaultdict(dict)
+    name_to_value_map: Dict[int, dict] = defaultdict(dict)
+    for val in attribute_models.AttributeValue.objects.filter(lookup):
+        slug_to_value_map[val.attribute_id][val.slug] = val
+        name_to_value_map[val.attribute_id][val.name] = val
+
+    missing_values = {
+        attribute: [
+            value
+            for value in values
+            if value not in slug_to_value_map[attribute.pk]
+            and value not in name_to_value_map[attribute.pk]
+        ]
+        for attribute, values in values_by_attribute.items()
+    }
+    existing_slugs = get_existing_slugs_bulk(missing_values)
+
+    result: Dict[int, Dict[str, attribute_models.AttributeValue]] = defaultdict(dict)
+    values_to_create = []
+    for attribute, values in values_by_attribute.items():
+        attribute_slugs = existing_slugs[attribute.pk]
+        for value in values:
+            # match the value firstly by slug then by name
+            value_obj = slug_to_value_map[attribute.pk].get(value) or name_to_value_map[
+                attribute.pk
+            ].get(value)
+            if not value_obj:
+                slug = prepare_unique_slug(slugify(unidecode(value)), attribute_slugs)
+                value_obj = attribute_models.AttributeValue(
+                    attribute=attribute, name=value, slug=slug
+                )
+                values_to_create.append(value_obj)
 
-            # the set of existing slugs must be updated to not generate accidentally
-            # the same slug for two or more values
-            existing_slugs.add(slug)
+                # the set of existing slugs must be updated to not generate
+                # accidentally the same slug for two or more values
+                attribute_slugs.add(slug)
 
-            # extend name to slug value to not create two elements with the same name
-            name_to_value_map[instance.name] = instance
+                # extend name to slug value to not create two elements with the same
+                # name
+                name_to_value_map[attribute.pk][value_obj.name] = value_obj
+            result[attribute.pk][value] = value_obj
 
     attribute_models.AttributeValue.objects.bulk_create(values_to_create)
     return result
 
 
-def get_existing_slugs(attribute: attribute_models.Attribute, values: List[str]):
+def get_existing_slugs_bulk(
+    values_by_attribute: Dict[attribute_models.Attribute, List[str]]
+) -> Dict[int, Set[str]]:
+    existing_slugs: Dict[int, Set[str]] = defaultdict(set)
     lookup = Q()
-    for value in values:
-        lookup |= Q(slug__startswith=slugify(unidecode(value)))
-
-    existing_slugs = set(attribute.values.filter(lookup).values_list("slug", flat=True))
+    for attribute, values in values_by_attribute.items():
+        for value in values:
+            lookup |= Q(attribute=attribute, slug__startswith=slugify(unidecode(value)))
+    if not lookup:
+        return existing_slugs
+    for attribute_id, slug in attribute_models.AttributeValue.objects.filter(
+        lookup
+    ).values_list("attribute_id", "slug"):
+        existing_slugs[attribute_id].add(slug)
     return existing_slugs
 
 
@@ -9,6 +9,8 @@ from ..order.dataloaders import OrderByIdLoader, OrderLineByIdLoader
 
 class ChannelByIdLoader(DataLoader):
     context_key = "channel_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Channel,)
 
     def batch_load(self, keys):
         channels = Channel.objects.using(self.database_connection_name).in_bulk(keys)
@@ -17,6 +19,8 @@ class ChannelByIdLoader(DataLoader):
 
 class ChannelBySlugLoader(DataLoader):
     context_key = "channel_by_slug"
+    shared_cache_timeout = 300
+    shared_cache_models = (Channel,)
 
     def batch_load(self, keys):
         channels = Channel.objects.using(self.database_connection_name).in_bulk(
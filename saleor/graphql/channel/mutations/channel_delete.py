@@ -2,10 +2,11 @@ import graphene
 from django.core.exceptions import ValidationError
 
 from ....channel import models
-from ....checkout.models import Checkout
+from ....checkout.models import Checkout, CheckoutLine
 from ....core.permissions import ChannelPermissions
 from ....core.tracing import traced_atomic_transaction
 from ....order.models import Order
+from ....warehouse.reservations import release_checkout_lines_reservations
 from ...core.mutations import ModelDeleteMutation
 from ...core.types import ChannelError, ChannelErrorCode
 from ...plugins.dataloaders import get_plugin_manager_promise
@@ -70,6 +71,9 @@ class ChannelDelete(ModelDeleteMutation):
 
     @classmethod
     def delete_checkouts(cls, origin_channel_id):
+        release_checkout_lines_reservations(
+            CheckoutLine.objects.filter(checkout__channel_id=origin_channel_id)
+        )
         Checkout.objects.select_for_update().filter(
             channel_id=origin_channel_id
         ).delete()
@@ -7,7 +7,11 @@ from ...checkout.fetch import (
     CheckoutInfo,
     CheckoutLineInfo,
     apply_voucher_to_checkout_line,
+    get_checkout_lines_snapshot_catalogue_version,
+    get_checkout_lines_snapshots,
     get_delivery_method_info,
+    restore_checkout_lines_info,
+    set_checkout_lines_snapshots,
     update_delivery_method_lists_for_checkout_info,
 )
 from ...checkout.models import Checkout, CheckoutLine
@@ -50,122 +54,155 @@ class CheckoutLinesInfoByCheckoutTokenLoader(DataLoader):
     def batch_load(self, keys):
         def with_checkout_lines(results):
             checkouts, checkout_lines = results
-            variants_pks = list(
-                {line.variant_id for lines in checkout_lines for line in lines}
+            # the version is read before lines info are fetched, so snapshots
+            # fetched while the catalogue is being changed get outdated right away
+            catalogue_version = get_checkout_lines_snapshot_catalogue_version()
+            checkouts_with_lines = [
+                checkout for checkout, lines in zip(checkouts, checkout_lines) if lines
+            ]
+            snapshots = get_checkout_lines_snapshots(
+                checkouts_with_lines, catalogue_version
             )
-            if not variants_pks:
-                return [[] for _ in keys]
-
-            channel_pks = [checkout.channel_id for checkout in checkouts]
-
-            def with_variants_products_collections(results):
-                (
-                    variants,
-                    products,
-                    product_types,
-                    collections,
-                    tax_classes,
-                    channel_listings,
-                    voucher_infos,
-                ) = results
-                variants_map = dict(zip(variants_pks, variants))
-                products_map = dict(zip(variants_pks, products))
-                product_types_map = dict(zip(variants_pks, product_types))
-                collections_map = dict(zip(variants_pks, collections))
-                tax_class_map = dict(zip(variants_pks, tax_classes))
-                channel_listings_map = dict(
-                    zip(variant_ids_channel_ids, channel_listings)
+            lines_info_map = {}
+            missing_checkouts, missing_checkout_lines = [], []
+            for checkout, lines in zip(checkouts, checkout_lines):
+                lines_info = restore_checkout_lines_info(
+                    lines, snapshots.get(checkout.token, {})
+                )
+                if lines_info is None:
+                    missing_checkouts.append(checkout)
+                    missing_checkout_lines.append(lines)
+                else:
+                    lines_info_map[checkout.token] = lines_info
+
+            def with_lines_info(lines_info):
+                set_checkout_lines_snapshots(
+                    zip(missing_checkouts, lines_info), catalogue_version
+                )
+                for checkout, checkout_lines_info in zip(missing_checkouts, lines_info):
+                    lines_info_map[checkout.token] = checkout_lines_info
+                return self.apply_vouchers(checkouts, lines_info_map).then(
+                    lambda _: [lines_info_map[key] for key in keys]
                 )
 
-                lines_info_map = defaultdict(list)
-                voucher_infos_map = {
-                    voucher_info.voucher.code: voucher_info
-                    for voucher_info in voucher_infos
-                    if voucher_info
-                }
-                for checkout, lines in zip(checkouts, checkout_lines):
-                    lines_info_map[checkout.pk].extend(
-                        [
-                            CheckoutLineInfo(
-                                line=line,
-                                variant=variants_map[line.variant_id],
-                                channel_listing=channel_listings_map[
-                                    (line.variant_id, checkout.channel_id)
-                                ],
-                                product=products_map[line.variant_id],
-                                product_type=product_types_map[line.variant_id],
-                                collections=collections_map[line.variant_id],
-                                tax_class=tax_class_map[line.variant_id],
-                            )
-                            for line in lines
-                        ]
-                    )
-
-                for checkout in checkouts:
-                    if not checkout.voucher_code:
-                        continue
-                    voucher_info = voucher_infos_map.get(checkout.voucher_code)
-                    if not voucher_info:
-                        continue
-                    voucher = voucher_info.voucher
-                    if (
-                        voucher.type == VoucherType.SPECIFIC_PRODUCT
-                        or voucher.apply_once_per_order
-                    ):
-                        discounts = load_discounts(self.context)
-                        apply_voucher_to_checkout_line(
-                            voucher_info=voucher_info,
-                            checkout=checkout,
-                            lines_info=lines_info_map[checkout.pk],
-                            discounts=discounts,
-                        )
-                return [lines_info_map[key] for key in keys]
+            return self.fetch_lines_info(
+                missing_checkouts, missing_checkout_lines
+            ).then(with_lines_info)
 
-            variants = ProductVariantByIdLoader(self.context).load_many(variants_pks)
-            products = ProductByVariantIdLoader(self.context).load_many(variants_pks)
-            product_types = ProductTypeByVariantIdLoader(self.context).load_many(
-                variants_pks
-            )
-            collections = CollectionsByVariantIdLoader(self.context).load_many(
-                variants_pks
-            )
-            tax_classes = TaxClassByVariantIdLoader(self.context).load_many(
-                variants_pks
-            )
+        checkouts = CheckoutByTokenLoader(self.context).load_many(keys)
+        checkout_lines = CheckoutLinesByCheckoutTokenLoader(self.context).load_many(
+            keys
+        )
+        return Promise.all([checkouts, checkout_lines]).then(with_checkout_lines)
 
-            voucher_codes = {
-                checkout.voucher_code for checkout in checkouts if checkout.voucher_code
+    def apply_vouchers(self, checkouts, lines_info_map):
+        def with_voucher_infos(voucher_infos):
+            voucher_infos_map = {
+                voucher_info.voucher.code: voucher_info
+                for voucher_info in voucher_infos
+                if voucher_info
             }
-            voucher_infos = VoucherInfoByVoucherCodeLoader(self.context).load_many(
-                voucher_codes
-            )
+            for checkout in checkouts:
+                if not checkout.voucher_code:
+                    continue
+                voucher_info = voucher_infos_map.get(checkout.voucher_code)
+                if not voucher_info:
+                    continue
+                voucher = voucher_info.voucher
+                if (
+                    voucher.type == VoucherType.SPECIFIC_PRODUCT
+                    or voucher.apply_once_per_order
+                ):
+                    discounts = load_discounts(self.context)
+                    apply_voucher_to_checkout_line(
+                        voucher_info=voucher_info,
+                        checkout=checkout,
+                        lines_info=lines_info_map[checkout.token],
+                        discounts=discounts,
+                    )
 
-            variant_ids_channel_ids = []
-            for channel_id, lines in zip(channel_pks, checkout_lines):
-                variant_ids_channel_ids.extend(
-                    [(line.variant_id, channel_id) for line in lines]
-                )
+        voucher_codes = {
+            checkout.voucher_code
+            for checkout in checkouts
+            if checkout.voucher_code and lines_info_map[checkout.token]
+        }
+        return (
+            VoucherInfoByVoucherCodeLoader(self.context)
+            .load_many(voucher_codes)
+            .then(with_voucher_infos)
+        )
 
-            channel_listings = VariantChannelListingByVariantIdAndChannelIdLoader(
-                self.context
-            ).load_many(variant_ids_channel_ids)
-            return Promise.all(
+    def fetch_lines_info(self, checkouts, checkout_lines):
+        """Fetch lines info without applied vouchers."""
+        variants_pks = list(
+            {line.variant_id for lines in checkout_lines for line in lines}
+        )
+        if not variants_pks:
+            return Promise.resolve([[] for _ in checkouts])
+
+        channel_pks = [checkout.channel_id for checkout in checkouts]
+
+        def with_variants_products_collections(results):
+            (
+                variants,
+                products,
+                product_types,
+                collections,
+                tax_classes,
+                channel_listings,
+            ) = results
+            variants_map = dict(zip(variants_pks, variants))
+            products_map = dict(zip(variants_pks, products))
+            product_types_map = dict(zip(variants_pks, product_types))
+            collections_map = dict(zip(variants_pks, collections))
+            tax_class_map = dict(zip(variants_pks, tax_classes))
+            channel_listings_map = dict(zip(variant_ids_channel_ids, channel_listings))
+
+            return [
                 [
-                    variants,
-                    products,
-                    product_types,
-                    collections,
-                    tax_classes,
-                    channel_listings,
-                    voucher_infos,
+                    CheckoutLineInfo(
+                        line=line,
+                        variant=variants_map[line.variant_id],
+                        channel_listing=channel_listings_map[
+                            (line.variant_id, checkout.channel_id)
+                        ],
+                        product=products_map[line.variant_id],
+                        product_type=product_types_map[line.variant_id],
+                        collections=collections_map[line.variant_id],
+                        tax_class=tax_class_map[line.variant_id],
+                    )
+                    for line in lines
                 ]
-            ).then(with_variants_products_collections)
+                for checkout, lines in zip(checkouts, checkout_lines)
+            ]
 
-        checkouts = CheckoutByTokenLoader(self.context).load_many(keys)
-        checkout_lines = CheckoutLinesByCheckoutTokenLoader(self.context).load_many(
-            keys
+        variants = ProductVariantByIdLoader(self.context).load_many(variants_pks)
+        products = ProductByVariantIdLoader(self.context).load_many(variants_pks)
+        product_types = ProductTypeByVariantIdLoader(self.context).load_many(
+            variants_pks
         )
-        return Promise.all([checkouts, checkout_lines]).then(with_checkout_lines)
+        collections = CollectionsByVariantIdLoader(self.context).load_many(variants_pks)
+        tax_classes = TaxClassByVariantIdLoader(self.context).load_many(variants_pks)
+
+        variant_ids_channel_ids = []
+        for channel_id, lines in zip(channel_pks, checkout_lines):
+            variant_ids_channel_ids.extend(
+                [(line.variant_id, channel_id) for line in lines]
+            )
+
+        channel_listings = VariantChannelListingByVariantIdAndChannelIdLoader(
+            self.context
+        ).load_many(variant_ids_channel_ids)
+        return Promise.all(
+            [
+                variants,
+                products,
+                product_types,
+                collections,
+                tax_classes,
+                channel_listings,
+            ]
+        ).then(with_variants_products_collections)
 
 
 class CheckoutByUserLoader(DataLoader):
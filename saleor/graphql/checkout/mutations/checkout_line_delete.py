@@ -3,6 +3,7 @@ import graphene
 from ....checkout.error_codes import CheckoutErrorCode
 from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ....checkout.utils import invalidate_checkout_prices
+from ....warehouse.reservations import release_checkout_lines_reservations
 from ...core.descriptions import ADDED_IN_34, DEPRECATED_IN_3X_INPUT
 from ...core.mutations import BaseMutation
 from ...core.scalars import UUID
@@ -56,6 +57,7 @@ class CheckoutLineDelete(BaseMutation):
         )
 
         if line and line in checkout.lines.all():
+            release_checkout_lines_reservations([line])
             line.delete()
 
         manager = get_plugin_manager_promise(info.context).get()
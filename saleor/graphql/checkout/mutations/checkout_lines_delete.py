@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 from ....checkout.error_codes import CheckoutErrorCode
 from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ....checkout.utils import invalidate_checkout_prices
+from ....warehouse.reservations import release_checkout_lines_reservations
 from ...core.descriptions import ADDED_IN_34, DEPRECATED_IN_3X_INPUT
 from ...core.mutations import BaseMutation
 from ...core.scalars import UUID
@@ -74,7 +75,9 @@ class CheckoutLinesDelete(BaseMutation):
             lines_ids, graphene_type="CheckoutLine", raise_error=True
         )
         cls.validate_lines(checkout, lines_to_delete)
-        checkout.lines.filter(id__in=lines_to_delete).delete()
+        deleted_lines = checkout.lines.filter(id__in=lines_to_delete)
+        release_checkout_lines_reservations(deleted_lines)
+        deleted_lines.delete()
 
         lines, _ = fetch_checkout_lines(checkout)
 
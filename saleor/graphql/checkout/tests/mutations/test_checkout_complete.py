@@ -2013,6 +2013,67 @@ def test_checkout_complete_own_reservation(
         reservation.refresh_from_db()
 
 
+def test_checkout_complete_own_reservation_using_counters(
+    site_settings_with_reservations,
+    user_api_client,
+    checkout_with_item,
+    address,
+    payment_dummy,
+    shipping_method,
+    settings,
+):
+    # given
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    checkout = checkout_with_item
+    checkout_line = checkout.lines.first()
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+
+    checkout.shipping_address = address
+    checkout.shipping_method = shipping_method
+    checkout.billing_address = address
+    checkout.save()
+
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=checkout_line.quantity,
+        reserved_until=timezone.now() + timedelta(minutes=5),
+    )
+    stock.quantity_reserved = checkout_line.quantity
+    stock.save(update_fields=["quantity_reserved"])
+
+    manager = get_plugins_manager()
+    lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, [], manager)
+    total = calculations.checkout_total(
+        manager=manager, checkout_info=checkout_info, lines=lines, address=address
+    )
+
+    payment = payment_dummy
+    payment.is_active = True
+    payment.order = None
+    payment.total = total.gross.amount
+    payment.currency = total.gross.currency
+    payment.checkout = checkout
+    payment.save()
+
+    variables = {
+        "id": to_global_id_or_none(checkout),
+        "redirectUrl": "https://www.example.com",
+    }
+
+    # when
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_COMPLETE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert not content["data"]["checkoutComplete"]["errors"]
+    assert not Reservation.objects.exists()
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 0
+    assert stock.quantity_allocated == checkout_line.quantity
+
+
 def test_checkout_complete_without_redirect_url(
     user_api_client,
     checkout_with_gift_card,
@@ -18,7 +18,12 @@ from ....checkout.checkout_cleaner import (
     clean_checkout_shipping,
 )
 from ....checkout.error_codes import CheckoutErrorCode
-from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ....checkout.fetch import (
+    fetch_checkout_info,
+    fetch_checkout_lines,
+    get_checkout_lines_snapshot_catalogue_version,
+    get_checkout_lines_snapshots,
+)
 from ....core.prices import quantize_price
 from ....payment import TransactionAction
 from ....plugins.manager import get_plugins_manager
@@ -198,6 +203,81 @@ def test_checkout_available_payment_gateways_currency_specified_EUR(
     )
 
 
+GET_CHECKOUT_LINES_QUERY = """
+query getCheckoutLines($id: ID) {
+    checkout(id: $id) {
+        quantity
+        lines {
+            quantity
+        }
+    }
+}
+"""
+
+
+def test_checkout_lines_use_snapshot(
+    api_client, checkout_with_items, settings, django_assert_max_num_queries
+):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = datetime.timedelta(minutes=5)
+    checkout = checkout_with_items
+    variables = {"id": to_global_id_or_none(checkout)}
+    response = api_client.post_graphql(GET_CHECKOUT_LINES_QUERY, variables)
+    expected_data = get_graphql_content(response)["data"]["checkout"]
+    assert get_checkout_lines_snapshots(
+        [checkout], get_checkout_lines_snapshot_catalogue_version()
+    )
+
+    # when
+    with django_assert_max_num_queries(4) as captured:
+        response = api_client.post_graphql(GET_CHECKOUT_LINES_QUERY, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["checkout"] == expected_data
+    assert not any("product_productvariant" in query["sql"] for query in captured)
+
+
+def test_checkout_lines_snapshot_with_changed_lines(
+    user_api_client, checkout_with_items, settings
+):
+    # given
+    settings.CHECKOUT_LINES_SNAPSHOT_TTL = datetime.timedelta(minutes=5)
+    checkout = checkout_with_items
+    variables = {"id": to_global_id_or_none(checkout)}
+    response = user_api_client.post_graphql(GET_CHECKOUT_LINES_QUERY, variables)
+    get_graphql_content(response)
+    line = checkout.lines.first()
+    query = """
+    mutation checkoutLinesUpdate($id: ID, $lines: [CheckoutLineUpdateInput!]!) {
+        checkoutLinesUpdate(id: $id, lines: $lines) {
+            checkout {
+                lines {
+                    quantity
+                }
+            }
+            errors {
+                field
+                message
+            }
+        }
+    }
+    """
+    lines = [{"lineId": to_global_id_or_none(line), "quantity": 2}]
+
+    # when
+    response = user_api_client.post_graphql(query, {**variables, "lines": lines})
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["checkoutLinesUpdate"]
+    assert not data["errors"]
+    assert sorted(line["quantity"] for line in data["checkout"]["lines"]) == sorted(
+        2 if checkout_line == line else checkout_line.quantity
+        for checkout_line in checkout.lines.all()
+    )
+
+
 GET_CHECKOUT_SELECTED_SHIPPING_METHOD = """
 query getCheckout($id: ID) {
     checkout(id: $id) {
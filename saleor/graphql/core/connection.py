@@ -1,9 +1,12 @@
+import hashlib
 import json
 from decimal import Decimal, InvalidOperation
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, cast
 
 import graphene
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
 from django.db.models import Model as DjangoModel
 from django.db.models import Q, QuerySet
 from graphene.relay import Connection
@@ -25,6 +28,7 @@ ConnectionArguments = Dict[str, Any]
 EPSILON = Decimal("0.000001")
 FILTERS_NAME = "_FILTERS_NAME"
 FILTERSET_CLASS = "_FILTERSET_CLASS"
+TOTAL_COUNT_CACHE_KEY_PREFIX = "total_count"
 
 
 def to_global_cursor(values):
@@ -238,6 +242,72 @@ def _get_id_coercion(qs: QuerySet) -> Callable[[str], Any]:
     return qs.model.id.field.to_python if hasattr(qs.model, "id") else int
 
 
+def exact_total_count(qs: QuerySet) -> int:
+    return qs.count()
+
+
+def get_total_count_cache_key(qs: QuerySet) -> str:
+    sql, params = qs.query.sql_with_params()
+    query_hash = hashlib.md5(f"{qs.db}:{sql}:{params!r}".encode()).hexdigest()
+    return f"{TOTAL_COUNT_CACHE_KEY_PREFIX}:{qs.model._meta.label_lower}:{query_hash}"
+
+
+def cached_total_count(qs: QuerySet) -> int:
+    """Return the exact count, cached for `TOTAL_COUNT_CACHE_TIMEOUT`.
+
+    The cache key is a hash of the SQL query, so it covers the applied filters,
+    the channel and the search phrase; pages of the same list share the count.
+    """
+    cache_key = get_total_count_cache_key(qs)
+    total_count = cache.get(cache_key)
+    if total_count is None:
+        total_count = qs.count()
+        timeout = settings.TOTAL_COUNT_CACHE_TIMEOUT.total_seconds()
+        cache.set(cache_key, total_count, timeout=timeout)
+    return total_count
+
+
+def get_estimated_count(qs: QuerySet) -> int:
+    """Return the number of rows estimated by the PostgreSQL planner."""
+    sql, params = qs.query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimated_total_count(qs: QuerySet) -> int:
+    """Return the planner estimate for large results and the exact count otherwise.
+
+    Estimates below `TOTAL_COUNT_ESTIMATE_THRESHOLD` are replaced with the exact
+    count, which is cheap for small results.
+    """
+    estimated_count = get_estimated_count(qs)
+    if estimated_count < settings.TOTAL_COUNT_ESTIMATE_THRESHOLD:
+        return qs.count()
+    return estimated_count
+
+
+TOTAL_COUNT_STRATEGIES: Dict[str, Callable[[QuerySet], int]] = {
+    "exact": exact_total_count,
+    "cached": cached_total_count,
+    "estimated": estimated_total_count,
+}
+
+
+def get_total_count_strategy(connection_type: Any) -> Callable[[QuerySet], int]:
+    strategy = settings.TOTAL_COUNT_STRATEGIES.get(connection_type._meta.name, "exact")
+    try:
+        return TOTAL_COUNT_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(
+            f"Unknown total count strategy {strategy!r} "
+            f"for {connection_type._meta.name}."
+        )
+
+
 def connection_from_queryset_slice(
     qs: QuerySet,
     args: ConnectionArguments = None,
@@ -289,7 +359,7 @@ def connection_from_queryset_slice(
     if "total_count" in connection_type._meta.fields:
 
         def get_total_count():
-            return qs.count()
+            return get_total_count_strategy(connection_type)(qs)
 
         return connection_type(
             edges=edges,
@@ -1,11 +1,16 @@
+import hashlib
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest
 from django.utils.functional import empty
 
 from ...account.models import User
 from ...app.models import App
+from ...core.auth import get_token_from_request
+from ...core.db_routers import get_replica_connection_name
+from ...core.utils import get_client_ip
 
 if TYPE_CHECKING:
     from .dataloaders import DataLoader
@@ -13,11 +18,14 @@ if TYPE_CHECKING:
 
 UserType = Optional[User]
 
+PRIMARY_STICKINESS_CACHE_KEY_PREFIX = "db_primary_stickiness"
+
 
 class SaleorContext(HttpRequest):
     _cached_user: UserType
     decoded_auth_token: Optional[Dict[str, Any]]
     is_mutation: bool
+    replica_connection_name: Optional[str]
     dataloaders: Dict[str, "DataLoader"]
     app: Optional["App"]
     user: UserType  # type: ignore
@@ -38,6 +46,38 @@ def set_mutation_flag_in_context(context: SaleorContext) -> None:
     context.is_mutation = True
 
 
+def get_primary_stickiness_cache_key(context: SaleorContext) -> Optional[str]:
+    """Return the cache key identifying the client by its auth token or IP address."""
+    client = get_token_from_request(context) or get_client_ip(context)
+    if not client:
+        return None
+    client_hash = hashlib.sha256(client.encode()).hexdigest()
+    return f"{PRIMARY_STICKINESS_CACHE_KEY_PREFIX}:{client_hash}"
+
+
+def stick_client_to_primary(context: SaleorContext) -> None:
+    """Send reads of the client to the primary database for a short time.
+
+    Part of the database read replicas in Saleor.
+    Called after a mutation, so the following queries of the client read its own
+    writes, even if replicas haven't replayed them yet.
+    The time is defined by `DATABASE_PRIMARY_STICKINESS`.
+    """
+    if not settings.DATABASE_CONNECTION_REPLICA_NAMES:
+        return
+    timeout = settings.DATABASE_PRIMARY_STICKINESS.total_seconds()
+    cache_key = get_primary_stickiness_cache_key(context)
+    if timeout and cache_key:
+        cache.set(cache_key, True, timeout=timeout)
+
+
+def is_client_stuck_to_primary(context: SaleorContext) -> bool:
+    if not settings.DATABASE_CONNECTION_REPLICA_NAMES:
+        return False
+    cache_key = get_primary_stickiness_cache_key(context)
+    return bool(cache_key and cache.get(cache_key))
+
+
 def get_database_connection_name(context: SaleorContext) -> str:
     """Retrieve connection name based on request context.
 
@@ -47,11 +87,23 @@ def get_database_connection_name(context: SaleorContext) -> str:
     Add `.using(connection_name)` to use connection name in QuerySet.
     Queryset to main database: `User.objects.all()`.
     Queryset to read replica: `User.objects.using(connection_name).all()`.
+
+    The replica is chosen once per request, out of the replicas that are not
+    lagging behind. Clients that have recently run a mutation read from the main
+    database, see `stick_client_to_primary`.
     """
     is_mutation = getattr(context, "is_mutation", False)
-    if not is_mutation:
-        return settings.DATABASE_CONNECTION_REPLICA_NAME
-    return settings.DATABASE_CONNECTION_DEFAULT_NAME
+    if is_mutation:
+        return settings.DATABASE_CONNECTION_DEFAULT_NAME
+
+    connection_name = getattr(context, "replica_connection_name", None)
+    if connection_name is None:
+        if is_client_stuck_to_primary(context):
+            connection_name = settings.DATABASE_CONNECTION_DEFAULT_NAME
+        else:
+            connection_name = get_replica_connection_name()
+        context.replica_connection_name = connection_name
+    return connection_name
 
 
 def setup_context_user(context: SaleorContext) -> None:
@@ -1,7 +1,28 @@
-from typing import Generic, Iterable, List, Optional, TypeVar, Union
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import opentracing
 import opentracing.tags
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
 from promise import Promise
 from promise.dataloader import DataLoader as BaseLoader
 
@@ -11,11 +32,98 @@ from .context import get_database_connection_name
 K = TypeVar("K")
 R = TypeVar("R")
 
+SHARED_CACHE_KEY_PREFIX = "dataloader"
+
+
+class LocalCache:
+    """Thread-safe, in-process LRU cache with expiring entries.
+
+    Values are stored pickled, so each lookup returns a new copy that can be
+    safely modified within a request.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        now = time.monotonic()
+        values = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at < now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                values[key] = value
+        return {key: pickle.loads(value) for key, value in values.items()}
+
+    def set_many(self, data: Dict[str, Any], timeout: int):
+        expires_at = time.monotonic() + timeout
+        pickled_data = {key: pickle.dumps(value) for key, value in data.items()}
+        with self._lock:
+            for key, value in pickled_data.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalCache(settings.DATALOADER_LOCAL_CACHE_SIZE)
+
+
+def get_shared_cache_version_key(context_key: str) -> str:
+    return f"{SHARED_CACHE_KEY_PREFIX}:{context_key}:version"
+
+
+def invalidate_shared_cache(context_key: str):
+    """Drop values of the given data loader from the shared cache.
+
+    Values are not removed from the cache; instead, the version of the loader's
+    cache keys is bumped, so the stale values are no longer used.
+    """
+    version_key = get_shared_cache_version_key(context_key)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, 1, timeout=None)
+
+
+def _invalidate_shared_cache_on_commit(context_key: str, **_kwargs):
+    transaction.on_commit(partial(invalidate_shared_cache, context_key))
+
 
 class DataLoader(BaseLoader, Generic[K, R]):
     context_key: str
     context: Optional[SaleorContext] = None
     database_connection_name: str
+    # When set, loaded values are shared between requests for the given number of
+    # seconds, in the in-process LRU cache and in the Django cache.
+    # Shared values are invalidated when any instance of `shared_cache_models`
+    # is saved or deleted.
+    shared_cache_timeout: Optional[int] = None
+    shared_cache_models: Tuple[Type[Model], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for model in cls.__dict__.get("shared_cache_models", ()):
+            receiver = partial(_invalidate_shared_cache_on_commit, cls.context_key)
+            dispatch_uid = f"{SHARED_CACHE_KEY_PREFIX}:{cls.context_key}"
+            post_save.connect(
+                receiver, sender=model, weak=False, dispatch_uid=dispatch_uid
+            )
+            post_delete.connect(
+                receiver, sender=model, weak=False, dispatch_uid=dispatch_uid
+            )
 
     def __new__(cls, context: SaleorContext):
         key = cls.context_key
@@ -43,10 +151,67 @@ class DataLoader(BaseLoader, Generic[K, R]):
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
-            results = self.batch_load(keys)
+            if self.shared_cache_timeout and settings.DATALOADER_SHARED_CACHE_ENABLED:
+                results = self.batch_load_with_shared_cache(
+                    keys, self.shared_cache_timeout
+                )
+            else:
+                results = self.batch_load(keys)
             if not isinstance(results, Promise):
                 return Promise.resolve(results)
             return results
 
     def batch_load(self, keys: Iterable[K]) -> Union[Promise[List[R]], List[R]]:
         raise NotImplementedError()
+
+    def get_shared_cache_key(self, key: K, version: int) -> str:
+        if isinstance(key, tuple):
+            key_str = ":".join(map(str, key))
+        else:
+            key_str = str(key)
+        return f"{SHARED_CACHE_KEY_PREFIX}:{self.context_key}:{version}:{key_str}"
+
+    def batch_load_with_shared_cache(
+        self, keys: Iterable[K], timeout: int
+    ) -> Union[Promise[List[R]], List[R]]:
+        """Load values from the shared cache and fetch only the missing ones.
+
+        Values are looked up in the in-process cache first and then in the Django
+        cache. `None` values are never cached.
+        """
+        keys = list(keys)
+        version = cache.get_or_set(
+            get_shared_cache_version_key(self.context_key), 0, timeout=None
+        )
+        cache_keys = {key: self.get_shared_cache_key(key, version) for key in keys}
+
+        cached_values = local_cache.get_many(cache_keys.values())
+        missing_cache_keys = [
+            cache_key
+            for cache_key in cache_keys.values()
+            if cache_key not in cached_values
+        ]
+        if missing_cache_keys:
+            values_from_cache = cache.get_many(missing_cache_keys)
+            local_cache.set_many(values_from_cache, timeout)
+            cached_values.update(values_from_cache)
+
+        missing_keys = [key for key in keys if cache_keys[key] not in cached_values]
+        if not missing_keys:
+            return [cached_values[cache_keys[key]] for key in keys]
+
+        def with_missing_values(values):
+            fetched_values = {
+                cache_keys[key]: value
+                for key, value in zip(missing_keys, values)
+                if value is not None
+            }
+            cache.set_many(fetched_values, timeout=timeout)
+            local_cache.set_many(fetched_values, timeout)
+            values_map = dict(zip(missing_keys, values))
+            return [
+                values_map[key] if key in values_map else cached_values[cache_keys[key]]
+                for key in keys
+            ]
+
+        return Promise.resolve(self.batch_load(missing_keys)).then(with_missing_values)
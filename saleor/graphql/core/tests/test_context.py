@@ -1,6 +1,14 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
 from django.urls import reverse
 
 from ...context import set_app_on_context
+from ..context import (
+    get_database_connection_name,
+    get_primary_stickiness_cache_key,
+    stick_client_to_primary,
+)
 
 
 def test_app_middleware_accepts_app_requests(app, rf):
@@ -42,3 +50,73 @@ def test_app_middleware_skips_when_token_length_is_different_than_30(
 
     # then
     assert not request.app
+
+
+@patch("saleor.graphql.core.context.get_replica_connection_name")
+def test_get_database_connection_name_uses_replica(
+    mocked_get_replica_connection_name, rf, settings
+):
+    # given
+    cache.clear()
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = ["replica_0"]
+    mocked_get_replica_connection_name.return_value = "replica_0"
+    request = rf.get(reverse("api"))
+
+    # when
+    connection_names = {get_database_connection_name(request) for _ in range(3)}
+
+    # then
+    assert connection_names == {"replica_0"}
+    mocked_get_replica_connection_name.assert_called_once_with()
+
+
+@patch("saleor.graphql.core.context.get_replica_connection_name")
+def test_get_database_connection_name_for_mutation(
+    mocked_get_replica_connection_name, rf, settings
+):
+    # given
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = ["replica_0"]
+    request = rf.get(reverse("api"))
+    request.is_mutation = True
+
+    # when
+    connection_name = get_database_connection_name(request)
+
+    # then
+    assert connection_name == settings.DATABASE_CONNECTION_DEFAULT_NAME
+    mocked_get_replica_connection_name.assert_not_called()
+
+
+@patch("saleor.graphql.core.context.get_replica_connection_name")
+def test_get_database_connection_name_after_client_mutation(
+    mocked_get_replica_connection_name, rf, settings
+):
+    # given
+    cache.clear()
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = ["replica_0"]
+    mutation_request = rf.post(reverse("api"), HTTP_AUTHORIZATION="Bearer token")
+    stick_client_to_primary(mutation_request)
+    request = rf.get(reverse("api"), HTTP_AUTHORIZATION="Bearer token")
+    other_client_request = rf.get(reverse("api"), HTTP_AUTHORIZATION="Bearer other")
+    mocked_get_replica_connection_name.return_value = "replica_0"
+
+    # when
+    connection_name = get_database_connection_name(request)
+    other_client_connection_name = get_database_connection_name(other_client_request)
+
+    # then
+    assert connection_name == settings.DATABASE_CONNECTION_DEFAULT_NAME
+    assert other_client_connection_name == "replica_0"
+
+
+def test_stick_client_to_primary_without_replica_pool(rf, settings):
+    # given
+    cache.clear()
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = []
+    request = rf.post(reverse("api"), HTTP_AUTHORIZATION="Bearer token")
+
+    # when
+    stick_client_to_primary(request)
+
+    # then
+    assert cache.get(get_primary_stickiness_cache_key(request)) is None
@@ -0,0 +1,126 @@
+from unittest.mock import patch
+
+import pytest
+
+from ....channel.models import Channel
+from ...channel.dataloaders import ChannelByIdLoader
+from ..dataloaders import LocalCache, local_cache
+
+
+@pytest.fixture
+def shared_cache_enabled(settings):
+    settings.DATALOADER_SHARED_CACHE_ENABLED = True
+    local_cache.clear()
+    yield
+    local_cache.clear()
+
+
+def test_shared_cache_values_reused_between_requests(
+    shared_cache_enabled, channel_USD, rf, django_assert_num_queries
+):
+    # given
+    ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    # when
+    with django_assert_num_queries(0):
+        channel = ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    # then
+    assert channel == channel_USD
+    assert channel is not channel_USD
+
+
+def test_shared_cache_values_loaded_from_django_cache(
+    shared_cache_enabled, channel_USD, rf, django_assert_num_queries
+):
+    # given
+    ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+    local_cache.clear()
+
+    # when
+    with django_assert_num_queries(0):
+        channel = ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    # then
+    assert channel == channel_USD
+
+
+def test_shared_cache_fetches_only_missing_values(
+    shared_cache_enabled, channel_USD, channel_PLN, rf
+):
+    # given
+    ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    # when
+    with patch.object(
+        ChannelByIdLoader,
+        "batch_load",
+        autospec=True,
+        side_effect=ChannelByIdLoader.batch_load,
+    ) as batch_load_mock:
+        channels = (
+            ChannelByIdLoader(rf.request())
+            .load_many([channel_USD.pk, channel_PLN.pk])
+            .get()
+        )
+
+    # then
+    assert channels == [channel_USD, channel_PLN]
+    batch_load_mock.assert_called_once()
+    assert batch_load_mock.call_args.args[1] == [channel_PLN.pk]
+
+
+def test_shared_cache_invalidated_on_save(
+    shared_cache_enabled, channel_USD, rf, django_capture_on_commit_callbacks
+):
+    # given
+    ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    channel = Channel.objects.get(pk=channel_USD.pk)
+    channel.name = "New name"
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        channel.save(update_fields=["name"])
+
+    # then
+    channel = ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+    assert channel.name == "New name"
+
+
+def test_shared_cache_disabled(channel_USD, rf, django_assert_num_queries, settings):
+    # given
+    settings.DATALOADER_SHARED_CACHE_ENABLED = False
+    ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    # when
+    with django_assert_num_queries(1):
+        channel = ChannelByIdLoader(rf.request()).load(channel_USD.pk).get()
+
+    # then
+    assert channel == channel_USD
+
+
+def test_local_cache_evicts_least_recently_used_values():
+    # given
+    cache = LocalCache(max_size=2)
+    cache.set_many({"a": 1, "b": 2}, timeout=60)
+    cache.get_many(["a"])
+
+    # when
+    cache.set_many({"c": 3}, timeout=60)
+
+    # then
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_local_cache_skips_expired_values():
+    # given
+    cache = LocalCache(max_size=2)
+    cache.set_many({"a": 1}, timeout=-1)
+
+    # when
+    values = cache.get_many(["a"])
+
+    # then
+    assert values == {}
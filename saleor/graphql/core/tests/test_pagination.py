@@ -3,9 +3,14 @@ import math
 
 import graphene
 import pytest
+from django.core.cache import cache
 
 from ....tests.models import Book
-from ..connection import CountableConnection, create_connection_slice
+from ..connection import (
+    CountableConnection,
+    create_connection_slice,
+    get_estimated_count,
+)
 from ..fields import ConnectionField
 
 
@@ -311,3 +316,82 @@ def test_query_with_pagination_and_fragments_no_first_or_last_raises_an_error(bo
         "the `books` connection."
     )
     assert str(result.errors[0]) == expected_err_msg
+
+
+QUERY_BOOKS_TOTAL_COUNT = """
+    query BooksTotalCount($first: Int){
+        books(first: $first) {
+            totalCount
+        }
+    }
+"""
+
+
+def test_total_count_exact(books, settings, django_assert_num_queries):
+    # given
+    settings.TOTAL_COUNT_STRATEGIES = {"BookTypeCountableConnection": "exact"}
+
+    # when
+    with django_assert_num_queries(2):
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+def test_total_count_cached(books, settings, django_assert_num_queries):
+    # given
+    cache.clear()
+    settings.TOTAL_COUNT_STRATEGIES = {"BookTypeCountableConnection": "cached"}
+    schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"first": 1})
+    Book.objects.create(name="New book")
+
+    # when
+    with django_assert_num_queries(1):
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+def test_total_count_estimated_below_threshold(books, settings):
+    # given
+    settings.TOTAL_COUNT_STRATEGIES = {"BookTypeCountableConnection": "estimated"}
+    settings.TOTAL_COUNT_ESTIMATE_THRESHOLD = 1_000_000_000
+
+    # when
+    result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+def test_total_count_estimated_above_threshold(
+    books, settings, django_assert_num_queries
+):
+    # given
+    settings.TOTAL_COUNT_STRATEGIES = {"BookTypeCountableConnection": "estimated"}
+    settings.TOTAL_COUNT_ESTIMATE_THRESHOLD = 0
+
+    # when
+    with django_assert_num_queries(2):
+        result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == get_estimated_count(Book.objects.all())
+
+
+def test_total_count_unknown_strategy(books, settings):
+    # given
+    settings.TOTAL_COUNT_STRATEGIES = {"BookTypeCountableConnection": "unknown"}
+
+    # when
+    result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert result.errors
+    assert "Unknown total count strategy" in str(result.errors[0])
@@ -3,6 +3,7 @@ from .common import (
     AccountError,
     AppError,
     AttributeError,
+    BulkOrderError,
     BulkProductError,
     BulkStockError,
     ChannelError,
@@ -65,6 +66,7 @@ __all__ = [
     "AccountError",
     "AppError",
     "AttributeError",
+    "BulkOrderError",
     "BulkProductError",
     "BulkStockError",
     "ChannelError",
@@ -6,7 +6,7 @@ from django.db import transaction
 
 from ...core.permissions import GiftcardPermissions
 from ...core.tracing import traced_atomic_transaction
-from ...core.utils.promo_code import generate_promo_code
+from ...core.utils.promo_code import generate_promo_codes
 from ...core.utils.validators import is_date_in_future
 from ...giftcard import events, models
 from ...giftcard.error_codes import GiftCardErrorCode
@@ -133,8 +133,8 @@ class GiftCardBulkCreate(BaseMutation):
         app = load_app(info.context)
         gift_cards = models.GiftCard.objects.bulk_create(
             [
-                models.GiftCard(code=generate_promo_code(), **cleaned_input)
-                for _ in range(count)
+                models.GiftCard(code=code, **cleaned_input)
+                for code in generate_promo_codes(count)
             ]
         )
         events.gift_cards_issued_event(gift_cards, info.context.user, app, balance)
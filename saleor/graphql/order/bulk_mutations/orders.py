@@ -1,14 +1,24 @@
+from collections import defaultdict
+
 import graphene
+from django.core.exceptions import ValidationError
 
+from ....core.exceptions import InsufficientStock
 from ....core.permissions import OrderPermissions
-from ....order import models
-from ....order.actions import cancel_order
+from ....order import OrderFulfillmentData, models
+from ....order.actions import cancel_orders, create_fulfillments_for_orders
+from ....order.error_codes import OrderErrorCode
 from ...app.dataloaders import load_app
-from ...core.mutations import BaseBulkMutation
-from ...core.types import NonNullList, OrderError
+from ...core.descriptions import ADDED_IN_39, PREVIEW_FEATURE
+from ...core.mutations import BaseBulkMutation, BaseMutation
+from ...core.types import BulkOrderError, NonNullList, OrderError
 from ...plugins.dataloaders import get_plugin_manager_promise
+from ...site.dataloaders import get_site_promise
+from ...warehouse.types import Warehouse
 from ..mutations.order_cancel import clean_order_cancel
-from ..types import Order
+from ..mutations.order_fulfill import OrderFulfill, OrderFulfillLineInput
+from ..types import Fulfillment, Order, OrderLine
+from ..utils import prepare_insufficient_stock_order_validation_errors
 
 
 class OrderBulkCancel(BaseBulkMutation):
@@ -32,10 +42,196 @@ class OrderBulkCancel(BaseBulkMutation):
     @classmethod
     def bulk_action(cls, info, queryset):
         manager = get_plugin_manager_promise(info.context).get()
-        for order in queryset:
-            cancel_order(
-                order=order,
-                user=info.context.user,
-                app=load_app(info.context),
-                manager=manager,
+        cancel_orders(
+            orders=list(queryset),
+            user=info.context.user,
+            app=load_app(info.context),
+            manager=manager,
+        )
+
+
+class OrderBulkFulfillInput(graphene.InputObjectType):
+    order = graphene.ID(description="ID of the order to be fulfilled.", required=True)
+    lines = NonNullList(
+        OrderFulfillLineInput,
+        required=True,
+        description="List of items informing how to fulfill the order.",
+    )
+    tracking_number = graphene.String(description="Fulfillment tracking number.")
+
+
+class OrderBulkFulfill(BaseMutation):
+    count = graphene.Int(
+        required=True, description="Returns how many orders were fulfilled."
+    )
+    fulfillments = NonNullList(Fulfillment, description="List of created fulfillments.")
+
+    class Arguments:
+        orders = NonNullList(
+            OrderBulkFulfillInput,
+            required=True,
+            description="List of orders to fulfill.",
+        )
+        notify_customer = graphene.Boolean(
+            description="If true, send email notifications to the customers."
+        )
+        allow_stock_to_be_exceeded = graphene.Boolean(
+            description=(
+                "If true, then allow proceed fulfillment when stock is exceeded."
+            ),
+            default_value=False,
+        )
+
+    class Meta:
+        description = (
+            "Creates new fulfillments for many orders. No order is fulfilled when "
+            "any of them is invalid." + ADDED_IN_39 + PREVIEW_FEATURE
+        )
+        permissions = (OrderPermissions.MANAGE_ORDERS,)
+        error_type_class = BulkOrderError
+
+    @classmethod
+    def add_indexes_to_errors(cls, index, error, error_dict):
+        """Append errors with index in params to mutation error dict."""
+        for key, value in error.error_dict.items():
+            for e in value:
+                if e.params:
+                    e.params["index"] = index
+                else:
+                    e.params = {"index": index}
+            error_dict[key].extend(value)
+
+    @classmethod
+    def get_orders(cls, orders_data, errors):
+        order_ids = [order_data["order"] for order_data in orders_data]
+        order_pks = cls.get_global_ids_or_error(order_ids, Order, field="order")
+        orders = {
+            str(pk): order
+            for pk, order in models.Order.objects.select_related("channel")
+            .prefetch_related("lines__variant")
+            .in_bulk(order_pks)
+            .items()
+        }
+        seen_orders = set()
+        for index, order_pk in enumerate(order_pks):
+            if order_pk in seen_orders:
+                error = ValidationError(
+                    "Duplicated order ID.",
+                    code=OrderErrorCode.DUPLICATED_INPUT_ITEM,
+                    params={"index": index},
+                )
+                errors["order"].append(error)
+            elif str(order_pk) not in orders:
+                error = ValidationError(
+                    f"Couldn't resolve to a node: {order_ids[index]}",
+                    code=OrderErrorCode.NOT_FOUND,
+                    params={"index": index},
+                )
+                errors["order"].append(error)
+            seen_orders.add(order_pk)
+        return orders, order_pks
+
+    @classmethod
+    def clean_order_input(cls, order, data, site):
+        if not order.is_fully_paid() and (
+            site.settings.fulfillment_auto_approve
+            and not site.settings.fulfillment_allow_unpaid
+        ):
+            raise ValidationError(
+                {
+                    "order": ValidationError(
+                        "Cannot fulfill unpaid order.",
+                        code=OrderErrorCode.CANNOT_FULFILL_UNPAID_ORDER.value,
+                    )
+                }
+            )
+
+        lines = data["lines"]
+        OrderFulfill.check_warehouses_for_duplicates(
+            [[stock["warehouse"] for stock in line["stocks"]] for line in lines]
+        )
+        quantities_for_lines = [
+            [stock["quantity"] for stock in line["stocks"]] for line in lines
+        ]
+        lines_ids = [line["order_line_id"] for line in lines]
+        OrderFulfill.check_lines_for_duplicates(lines_ids)
+        lines_pks = cls.get_global_ids_or_error(lines_ids, OrderLine, field="lines")
+        order_lines_by_pk = {str(line.pk): line for line in order.lines.all()}
+        missing_lines = [
+            line_id
+            for line_id, line_pk in zip(lines_ids, lines_pks)
+            if str(line_pk) not in order_lines_by_pk
+        ]
+        if missing_lines:
+            raise ValidationError(
+                {
+                    "lines": ValidationError(
+                        "Order lines don't belong to the order.",
+                        code=OrderErrorCode.NOT_FOUND,
+                        params={"order_lines": missing_lines},
+                    )
+                }
+            )
+        order_lines = [order_lines_by_pk[str(line_pk)] for line_pk in lines_pks]
+
+        OrderFulfill.clean_lines(order_lines, quantities_for_lines)
+        if site.settings.fulfillment_auto_approve:
+            OrderFulfill.check_lines_for_preorder(order_lines)
+        OrderFulfill.check_total_quantity_of_items(quantities_for_lines)
+
+        lines_for_warehouses = defaultdict(list)
+        for line, order_line in zip(lines, order_lines):
+            for stock in line["stocks"]:
+                if stock["quantity"] > 0:
+                    warehouse_pk = cls.get_global_id_or_error(
+                        stock["warehouse"], only_type=Warehouse, field="warehouse"
+                    )
+                    lines_for_warehouses[warehouse_pk].append(
+                        {"order_line": order_line, "quantity": stock["quantity"]}
+                    )
+        return OrderFulfillmentData(
+            order=order,
+            lines_for_warehouses=dict(lines_for_warehouses),
+            tracking_number=data.get("tracking_number") or "",
+        )
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        site = get_site_promise(info.context).get()
+        errors = defaultdict(list)
+        orders_data = data["orders"]
+        orders, order_pks = cls.get_orders(orders_data, errors)
+        fulfillments_data = []
+        for index, (order_data, order_pk) in enumerate(zip(orders_data, order_pks)):
+            order = orders.get(str(order_pk))
+            if order is None:
+                continue
+            try:
+                fulfillments_data.append(cls.clean_order_input(order, order_data, site))
+            except ValidationError as exc:
+                cls.add_indexes_to_errors(index, exc, errors)
+        if errors:
+            return cls.handle_errors(ValidationError(errors), count=0)
+
+        manager = get_plugin_manager_promise(info.context).get()
+        try:
+            fulfillments = create_fulfillments_for_orders(
+                info.context.user,
+                load_app(info.context),
+                fulfillments_data,
+                manager,
+                site.settings,
+                notify_customer=data.get("notify_customer", True),
+                approved=site.settings.fulfillment_auto_approve,
+                allow_stock_to_be_exceeded=data["allow_stock_to_be_exceeded"],
             )
+        except InsufficientStock as exc:
+            indexes = {str(pk): index for index, pk in enumerate(order_pks)}
+            stock_errors = prepare_insufficient_stock_order_validation_errors(exc)
+            for item, error in zip(exc.items, stock_errors):
+                if item.order_line:
+                    order_pk = str(item.order_line.order_id)
+                    error.params["index"] = indexes.get(order_pk)
+            return cls.handle_errors(ValidationError({"stocks": stock_errors}), count=0)
+
+        return OrderBulkFulfill(count=len(fulfillments_data), fulfillments=fulfillments)
@@ -1,4 +1,4 @@
-from unittest.mock import ANY, call, patch
+from unittest.mock import ANY, patch
 
 import graphene
 
@@ -19,9 +19,9 @@ mutation CancelManyOrders($ids: [ID!]!) {
 """
 
 
-@patch("saleor.graphql.order.bulk_mutations.orders.cancel_order")
+@patch("saleor.graphql.order.bulk_mutations.orders.cancel_orders")
 def test_order_bulk_cancel(
-    mock_cancel_order,
+    mock_cancel_orders,
     staff_api_client,
     order_list,
     fulfilled_order_with_all_cancelled_fulfillments,
@@ -42,13 +42,12 @@ def test_order_bulk_cancel(
     assert data["count"] == expected_count
     assert not data["errors"]
 
-    calls = [
-        call(order=order, user=staff_api_client.user, app=None, manager=ANY)
-        for order in orders
-    ]
-
-    mock_cancel_order.assert_has_calls(calls, any_order=True)
-    mock_cancel_order.call_count == expected_count
+    mock_cancel_orders.assert_called_once_with(
+        orders=ANY, user=staff_api_client.user, app=None, manager=ANY
+    )
+    cancelled_orders = mock_cancel_orders.call_args.kwargs["orders"]
+    assert len(cancelled_orders) == expected_count
+    assert {order.pk for order in cancelled_orders} <= {order.pk for order in orders}
 
 
 @patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
@@ -72,9 +71,9 @@ def test_order_bulk_cancel_with_back_in_stock_webhook(
     product_variant_back_in_stock_webhook_mock.assert_called_once()
 
 
-@patch("saleor.graphql.order.bulk_mutations.orders.cancel_order")
+@patch("saleor.graphql.order.bulk_mutations.orders.cancel_orders")
 def test_order_bulk_cancel_as_app(
-    mock_cancel_order,
+    mock_cancel_orders,
     app_api_client,
     order_list,
     fulfilled_order_with_all_cancelled_fulfillments,
@@ -95,18 +94,17 @@ def test_order_bulk_cancel_as_app(
     assert data["count"] == expected_count
     assert not data["errors"]
 
-    calls = [
-        call(order=order, user=None, app=app_api_client.app, manager=ANY)
-        for order in orders
-    ]
-
-    mock_cancel_order.assert_has_calls(calls, any_order=True)
-    assert mock_cancel_order.call_count == expected_count
+    mock_cancel_orders.assert_called_once_with(
+        orders=ANY, user=None, app=app_api_client.app, manager=ANY
+    )
+    cancelled_orders = mock_cancel_orders.call_args.kwargs["orders"]
+    assert len(cancelled_orders) == expected_count
+    assert {order.pk for order in cancelled_orders} <= {order.pk for order in orders}
 
 
-@patch("saleor.graphql.order.bulk_mutations.orders.cancel_order")
+@patch("saleor.graphql.order.bulk_mutations.orders.cancel_orders")
 def test_order_bulk_cancel_without_sku(
-    mock_cancel_order,
+    mock_cancel_orders,
     staff_api_client,
     order_list,
     fulfilled_order_with_all_cancelled_fulfillments,
@@ -130,10 +128,9 @@ def test_order_bulk_cancel_without_sku(
     assert data["count"] == expected_count
     assert not data["errors"]
 
-    calls = [
-        call(order=order, user=staff_api_client.user, app=None, manager=ANY)
-        for order in orders
-    ]
-
-    mock_cancel_order.assert_has_calls(calls, any_order=True)
-    mock_cancel_order.call_count == expected_count
+    mock_cancel_orders.assert_called_once_with(
+        orders=ANY, user=staff_api_client.user, app=None, manager=ANY
+    )
+    cancelled_orders = mock_cancel_orders.call_args.kwargs["orders"]
+    assert len(cancelled_orders) == expected_count
+    assert {order.pk for order in cancelled_orders} <= {order.pk for order in orders}
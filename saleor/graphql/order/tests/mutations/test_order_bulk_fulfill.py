@@ -0,0 +1,166 @@
+import graphene
+
+from .....order import OrderStatus
+from .....order.error_codes import OrderErrorCode
+from ....tests.utils import assert_no_permission, get_graphql_content
+
+ORDER_BULK_FULFILL_MUTATION = """
+    mutation OrderBulkFulfill($orders: [OrderBulkFulfillInput!]!) {
+        orderBulkFulfill(orders: $orders, notifyCustomer: false) {
+            count
+            fulfillments {
+                trackingNumber
+                lines {
+                    quantity
+                }
+            }
+            errors {
+                field
+                code
+                index
+                orderLines
+                warehouse
+            }
+        }
+    }
+"""
+
+
+def _get_order_input(order, warehouse, quantities=None):
+    lines = []
+    for line in order.lines.all():
+        quantity = (
+            quantities.get(line.pk, line.quantity) if quantities else line.quantity
+        )
+        lines.append(
+            {
+                "orderLineId": graphene.Node.to_global_id("OrderLine", line.pk),
+                "stocks": [
+                    {
+                        "quantity": quantity,
+                        "warehouse": graphene.Node.to_global_id(
+                            "Warehouse", warehouse.pk
+                        ),
+                    }
+                ],
+            }
+        )
+    return {"order": graphene.Node.to_global_id("Order", order.pk), "lines": lines}
+
+
+def test_order_bulk_fulfill(
+    staff_api_client, order_with_lines, warehouse, permission_manage_orders
+):
+    # given
+    order = order_with_lines
+    order_input = _get_order_input(order, warehouse)
+    order_input["trackingNumber"] = "123"
+    variables = {"orders": [order_input]}
+
+    # when
+    response = staff_api_client.post_graphql(
+        ORDER_BULK_FULFILL_MUTATION,
+        variables,
+        permissions=[permission_manage_orders],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["orderBulkFulfill"]
+    assert not data["errors"]
+    assert data["count"] == 1
+    assert data["fulfillments"] == [
+        {
+            "trackingNumber": "123",
+            "lines": [{"quantity": line.quantity} for line in order.lines.all()],
+        }
+    ]
+    order.refresh_from_db()
+    assert order.status == OrderStatus.FULFILLED
+
+
+def test_order_bulk_fulfill_invalid_input(
+    staff_api_client,
+    order_with_lines,
+    warehouse,
+    permission_manage_orders,
+):
+    # given
+    order = order_with_lines
+    line = order.lines.first()
+    order_input = _get_order_input(order, warehouse)
+    invalid_order_input = _get_order_input(
+        order, warehouse, quantities={line.pk: line.quantity + 1}
+    )
+    variables = {"orders": [order_input, invalid_order_input]}
+
+    # when
+    response = staff_api_client.post_graphql(
+        ORDER_BULK_FULFILL_MUTATION,
+        variables,
+        permissions=[permission_manage_orders],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["orderBulkFulfill"]
+    assert data["count"] == 0
+    errors = sorted(data["errors"], key=lambda error: error["field"])
+    assert errors[0]["field"] == "order"
+    assert errors[0]["code"] == OrderErrorCode.DUPLICATED_INPUT_ITEM.name
+    assert errors[0]["index"] == 1
+    assert errors[1]["field"] == "orderLineId"
+    assert errors[1]["code"] == OrderErrorCode.FULFILL_ORDER_LINE.name
+    assert errors[1]["index"] == 1
+    assert errors[1]["orderLines"] == [graphene.Node.to_global_id("OrderLine", line.pk)]
+    assert not order.fulfillments.exists()
+
+
+def test_order_bulk_fulfill_insufficient_stock(
+    staff_api_client,
+    order_with_lines,
+    warehouse,
+    permission_manage_orders,
+):
+    # given
+    order = order_with_lines
+    line = order.lines.first()
+    stock = line.variant.stocks.get(warehouse=warehouse)
+    stock.quantity = 0
+    stock.save(update_fields=["quantity"])
+    variables = {"orders": [_get_order_input(order, warehouse)]}
+
+    # when
+    response = staff_api_client.post_graphql(
+        ORDER_BULK_FULFILL_MUTATION,
+        variables,
+        permissions=[permission_manage_orders],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["orderBulkFulfill"]
+    assert data["count"] == 0
+    assert data["errors"] == [
+        {
+            "field": "stocks",
+            "code": OrderErrorCode.INSUFFICIENT_STOCK.name,
+            "index": 0,
+            "orderLines": [graphene.Node.to_global_id("OrderLine", line.pk)],
+            "warehouse": graphene.Node.to_global_id("Warehouse", warehouse.pk),
+        }
+    ]
+    assert not order.fulfillments.exists()
+
+
+def test_order_bulk_fulfill_no_permission(
+    staff_api_client, order_with_lines, warehouse
+):
+    # given
+    variables = {"orders": [_get_order_input(order_with_lines, warehouse)]}
+
+    # when
+    response = staff_api_client.post_graphql(ORDER_BULK_FULFILL_MUTATION, variables)
+
+    # then
+    assert_no_permission(response)
@@ -3,11 +3,12 @@ from typing import Iterable
 
 import graphene
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from django.db.models import Exists, OuterRef, Q, Subquery
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, Max, OuterRef, Q, Subquery
 from django.db.models.fields import IntegerField
 from django.db.models.functions import Coalesce
 from graphene.types import InputObjectType
+from graphql import GraphQLError
 
 from ....attribute import AttributeInputType
 from ....attribute import models as attribute_models
@@ -23,16 +24,17 @@ from ....product.search import (
     prepare_product_search_vector_value,
     update_product_search_vector,
 )
-from ....product.tasks import update_product_discounted_price_task
+from ....product.tasks import delete_products_task, update_product_discounted_price_task
 from ....product.utils import delete_categories
-from ....product.utils.variants import generate_and_set_variant_name
+from ....product.utils.variants import generate_and_set_variants_names
 from ....warehouse import models as warehouse_models
 from ....warehouse.error_codes import StockErrorCode
+from ....warehouse.stock_upsert import StockUpsertRow, bulk_upsert_stocks
 from ...app.dataloaders import load_app
 from ...attribute.utils import AttributeAssignmentMixin
 from ...channel import ChannelContext
 from ...channel.types import Channel
-from ...core.descriptions import ADDED_IN_38
+from ...core.descriptions import ADDED_IN_38, ADDED_IN_39, PREVIEW_FEATURE
 from ...core.mutations import BaseMutation, ModelBulkDeleteMutation, ModelMutation
 from ...core.types import (
     BulkProductError,
@@ -42,7 +44,7 @@ from ...core.types import (
     ProductError,
     StockError,
 )
-from ...core.utils import get_duplicated_values
+from ...core.utils import from_global_id_or_error, get_duplicated_values
 from ...core.validators import (
     validate_one_of_args_is_in_mutation,
     validate_price_precision,
@@ -62,6 +64,7 @@ from ..types import (
     Category,
     Collection,
     Product,
+    ProductDeletion,
     ProductMedia,
     ProductType,
     ProductVariant,
@@ -125,83 +128,54 @@ class CollectionBulkDelete(ModelBulkDeleteMutation):
             manager.product_updated(product)
 
 
-class ProductBulkDelete(ModelBulkDeleteMutation):
+class ProductBulkDelete(BaseMutation):
+    count = graphene.Int(
+        required=True,
+        description="Returns how many products are scheduled for deletion.",
+    )
+    product_deletion = graphene.Field(
+        ProductDeletion,
+        description=(
+            "Job deleting the products in the background."
+            + ADDED_IN_39
+            + PREVIEW_FEATURE
+        ),
+    )
+
     class Arguments:
         ids = NonNullList(
             graphene.ID, required=True, description="List of product IDs to delete."
         )
 
     class Meta:
-        description = "Deletes products."
-        model = models.Product
-        object_type = Product
+        description = (
+            "Deletes products. The products are deleted in the background, in "
+            "batches."
+        )
         permissions = (ProductPermissions.MANAGE_PRODUCTS,)
         error_type_class = ProductError
         error_type_field = "product_errors"
 
     @classmethod
-    @traced_atomic_transaction()
     def perform_mutation(cls, _root, info, ids, **data):
+        # Allow to pass empty list for dummy mutation
+        if not ids:
+            return cls(count=0)
         try:
             pks = cls.get_global_ids_or_error(ids, Product)
         except ValidationError as error:
-            return 0, error
-        product_to_variant = list(
-            models.ProductVariant.objects.filter(product__pk__in=pks).values_list(
-                "product_id", "id"
-            )
-        )
-        variants_ids = [variant_id for _, variant_id in product_to_variant]
-
-        cls.delete_assigned_attribute_values(pks)
-
-        draft_order_lines_data = get_draft_order_lines_data_for_variants(variants_ids)
-
-        response = super().perform_mutation(
-            _root,
-            info,
-            ids,
-            product_to_variant=product_to_variant,
-            **data,
+            return cls.handle_errors(error, count=0)
+        product_ids = list(
+            models.Product.objects.filter(pk__in=pks).values_list("pk", flat=True)
         )
 
-        # delete order lines for deleted variants
-        order_models.OrderLine.objects.filter(
-            pk__in=draft_order_lines_data.line_pks
-        ).delete()
-
         app = load_app(info.context)
-        # run order event for deleted lines
-        for order, order_lines in draft_order_lines_data.order_to_lines_mapping.items():
-            order_events.order_line_product_removed_event(
-                order, info.context.user, app, order_lines
-            )
-
-        order_pks = draft_order_lines_data.order_pks
-        if order_pks:
-            recalculate_orders_task.delay(list(order_pks))
-
-        return response
-
-    @staticmethod
-    def delete_assigned_attribute_values(instance_pks):
-        attribute_models.AttributeValue.objects.filter(
-            productassignments__product_id__in=instance_pks,
-            attribute__input_type__in=AttributeInputType.TYPES_WITH_UNIQUE_VALUES,
-        ).delete()
-
-    @classmethod
-    def bulk_action(cls, info, queryset, product_to_variant):
-        product_variant_map = defaultdict(list)
-        for product, variant in product_to_variant:
-            product_variant_map[product].append(variant)
-
-        products = [product for product in queryset]
-        queryset.delete()
-        manager = get_plugin_manager_promise(info.context).get()
-        for product in products:
-            variants = product_variant_map.get(product.id, [])
-            manager.product_deleted(product, variants)
+        kwargs = {"app": app} if app else {"user": info.context.user}
+        product_deletion = models.ProductDeletion.objects.create(
+            product_ids=product_ids, **kwargs
+        )
+        delete_products_task.delay(product_deletion.pk)
+        return cls(count=len(product_ids), product_deletion=product_deletion)
 
 
 class BulkAttributeValueInput(InputObjectType):
@@ -414,16 +388,6 @@ class ProductVariantBulkCreate(BaseMutation):
                     e.params = {"index": index}
             error_dict[key].extend(value)
 
-    @classmethod
-    def save(cls, info, instance, cleaned_input):
-        instance.save()
-
-        attributes = cleaned_input.get("attributes")
-        if attributes:
-            AttributeAssignmentMixin.save(instance, attributes)
-            if not instance.name:
-                generate_and_set_variant_name(instance, cleaned_input.get("sku"))
-
     @classmethod
     def create_variants(cls, info, cleaned_inputs, product, errors):
         instances = []
@@ -498,56 +462,97 @@ class ProductVariantBulkCreate(BaseMutation):
         return cleaned_inputs
 
     @classmethod
-    def create_variant_channel_listings(cls, variant, cleaned_input):
-        channel_listings_data = cleaned_input.get("channel_listings")
-        if not channel_listings_data:
-            return
+    def save_variants_attributes(cls, instances, cleaned_inputs):
+        variants_attributes = []
+        variants_without_name = []
+        for instance, cleaned_input in zip(instances, cleaned_inputs):
+            attributes = cleaned_input.get("attributes")
+            if attributes:
+                variants_attributes.append((instance, attributes))
+                if not instance.name:
+                    variants_without_name.append(instance)
+        AttributeAssignmentMixin.save_bulk(variants_attributes)
+        if variants_without_name:
+            generate_and_set_variants_names(variants_without_name)
+
+    @classmethod
+    def create_variants_channel_listings(cls, instances, cleaned_inputs):
         variant_channel_listings = []
-        for channel_listing_data in channel_listings_data:
-            channel = channel_listing_data["channel"]
-            price = channel_listing_data["price"]
-            cost_price = channel_listing_data.get("cost_price")
-            preorder_quantity_threshold = channel_listing_data.get("preorder_threshold")
-            variant_channel_listings.append(
-                models.ProductVariantChannelListing(
-                    channel=channel,
-                    variant=variant,
-                    price_amount=price,
-                    cost_price_amount=cost_price,
-                    currency=channel.currency_code,
-                    preorder_quantity_threshold=preorder_quantity_threshold,
+        for variant, cleaned_input in zip(instances, cleaned_inputs):
+            for channel_listing_data in cleaned_input.get("channel_listings") or []:
+                channel = channel_listing_data["channel"]
+                price = channel_listing_data["price"]
+                cost_price = channel_listing_data.get("cost_price")
+                preorder_quantity_threshold = channel_listing_data.get(
+                    "preorder_threshold"
+                )
+                variant_channel_listings.append(
+                    models.ProductVariantChannelListing(
+                        channel=channel,
+                        variant=variant,
+                        price_amount=price,
+                        cost_price_amount=cost_price,
+                        currency=channel.currency_code,
+                        preorder_quantity_threshold=preorder_quantity_threshold,
+                    )
                 )
-            )
         models.ProductVariantChannelListing.objects.bulk_create(
             variant_channel_listings
         )
 
+    @classmethod
+    def create_variants_stocks(cls, instances, cleaned_inputs):
+        warehouse_ids = list(
+            {
+                stock["warehouse"]
+                for cleaned_input in cleaned_inputs
+                for stock in cleaned_input.get("stocks") or []
+            }
+        )
+        if not warehouse_ids:
+            return
+        warehouses = cls.get_nodes_or_error(
+            warehouse_ids, "warehouse", only_type=Warehouse
+        )
+        warehouses_by_id = dict(zip(warehouse_ids, warehouses))
+        try:
+            warehouse_models.Stock.objects.bulk_create(
+                [
+                    warehouse_models.Stock(
+                        product_variant=variant,
+                        warehouse=warehouses_by_id[stock["warehouse"]],
+                        quantity=stock["quantity"],
+                    )
+                    for variant, cleaned_input in zip(instances, cleaned_inputs)
+                    for stock in cleaned_input.get("stocks") or []
+                ]
+            )
+        except IntegrityError:
+            msg = "Stock for one of warehouses already exists for this product variant."
+            raise ValidationError(msg)
+
     @classmethod
     @traced_atomic_transaction()
     def save_variants(cls, info, instances, product, cleaned_inputs):
         assert len(instances) == len(
             cleaned_inputs
         ), "There should be the same number of instances and cleaned inputs."
-        for instance, cleaned_input in zip(instances, cleaned_inputs):
-            cls.save(info, instance, cleaned_input)
-            cls.create_variant_stocks(instance, cleaned_input)
-            cls.create_variant_channel_listings(instance, cleaned_input)
+        max_sort_order = product.variants.aggregate(Max("sort_order"))[
+            "sort_order__max"
+        ]
+        first_sort_order = 0 if max_sort_order is None else max_sort_order + 1
+        for sort_order, instance in enumerate(instances, start=first_sort_order):
+            instance.sort_order = sort_order
+        models.ProductVariant.objects.bulk_create(instances)
+
+        cls.save_variants_attributes(instances, cleaned_inputs)
+        cls.create_variants_stocks(instances, cleaned_inputs)
+        cls.create_variants_channel_listings(instances, cleaned_inputs)
 
         if not product.default_variant:
             product.default_variant = instances[0]
             product.save(update_fields=["default_variant", "updated_at"])
 
-    @classmethod
-    def create_variant_stocks(cls, variant, cleaned_input):
-        stocks = cleaned_input.get("stocks")
-        if not stocks:
-            return
-        warehouse_ids = [stock["warehouse"] for stock in stocks]
-        warehouses = cls.get_nodes_or_error(
-            warehouse_ids, "warehouse", only_type=Warehouse
-        )
-        create_stocks(variant, stocks, warehouses)
-
     @classmethod
     @traced_atomic_transaction()
     def perform_mutation(cls, _root, info, **data):
@@ -968,6 +973,106 @@ class ProductVariantStocksDelete(BaseMutation):
         return cls(product_variant=variant)
 
 
+class StockBulkUpsertInput(graphene.InputObjectType):
+    variant_id = graphene.ID(description="ID of a product variant.")
+    sku = graphene.String(description="SKU of a product variant.")
+    warehouse = graphene.ID(
+        required=True, description="Warehouse in which stock is located."
+    )
+    quantity = graphene.Int(
+        required=True, description="Quantity of items available for sell."
+    )
+
+
+class StockBulkUpsert(BaseMutation):
+    count = graphene.Int(
+        required=True, description="Returns how many stocks were created or updated."
+    )
+
+    class Arguments:
+        stocks = NonNullList(
+            StockBulkUpsertInput,
+            required=True,
+            description="Input list of stocks to create or update.",
+        )
+
+    class Meta:
+        description = (
+            "Creates or updates stocks of product variants. Stocks with invalid "
+            "input are skipped and returned as errors, the rest of them are saved."
+            + ADDED_IN_39
+            + PREVIEW_FEATURE
+        )
+        permissions = (ProductPermissions.MANAGE_PRODUCTS,)
+        error_type_class = BulkStockError
+        error_type_field = "bulk_stock_errors"
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        errors = defaultdict(list)
+        rows = []
+        # Indexes of the input items by the index of the row.
+        indexes = []
+        for index, stock_data in enumerate(data["stocks"]):
+            try:
+                rows.append(cls.clean_stock_input(stock_data))
+            except ValidationError as error:
+                for field, field_errors in error.error_dict.items():
+                    cls.update_errors(
+                        errors,
+                        field_errors[0].message,
+                        field,
+                        StockErrorCode.GRAPHQL_ERROR,
+                        [index],
+                    )
+                continue
+            indexes.append(index)
+
+        manager = get_plugin_manager_promise(info.context).get()
+        result = bulk_upsert_stocks(rows, manager)
+        for upsert_error in result.errors:
+            cls.update_errors(
+                errors,
+                upsert_error.message,
+                upsert_error.field,
+                upsert_error.code,
+                [indexes[upsert_error.index]],
+            )
+
+        if errors:
+            return cls.handle_errors(ValidationError(errors), count=result.count)
+        return cls(count=result.count)
+
+    @classmethod
+    def clean_stock_input(cls, stock_data):
+        variant_id = None
+        try:
+            if stock_data.get("variant_id"):
+                _, variant_id = from_global_id_or_error(
+                    stock_data["variant_id"], ProductVariant, raise_error=True
+                )
+        except GraphQLError as error:
+            raise ValidationError({"variant_id": ValidationError(str(error))})
+        try:
+            _, warehouse_id = from_global_id_or_error(
+                stock_data["warehouse"], Warehouse, raise_error=True
+            )
+        except GraphQLError as error:
+            raise ValidationError({"warehouse": ValidationError(str(error))})
+        return StockUpsertRow(
+            warehouse=warehouse_id,
+            quantity=stock_data["quantity"],
+            variant_id=int(variant_id) if variant_id else None,
+            sku=stock_data.get("sku"),
+        )
+
+    @classmethod
+    def update_errors(cls, errors, msg, field, code, indexes):
+        for index in indexes:
+            error = ValidationError(msg, code=code, params={"index": index})
+            errors[field].append(error)
+
+
 class ProductTypeBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
         ids = NonNullList(
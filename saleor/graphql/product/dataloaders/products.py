@@ -132,6 +132,8 @@ class ProductChannelListingByProductIdAndChannelSlugLoader(
 
 class ProductTypeByIdLoader(DataLoader):
     context_key = "product_type_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (ProductType,)
 
     def batch_load(self, keys):
         product_types = ProductType.objects.using(
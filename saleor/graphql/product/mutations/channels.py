@@ -18,6 +18,7 @@ from ....product.models import ProductChannelListing
 from ....product.models import ProductVariant as ProductVariantModel
 from ....product.models import ProductVariantChannelListing
 from ....product.tasks import update_product_discounted_price_task
+from ....warehouse.reservations import release_checkout_lines_reservations
 from ...channel import ChannelContext
 from ...channel.mutations import BaseChannelListingMutation
 from ...channel.types import Channel
@@ -319,6 +320,7 @@ class ProductChannelListingUpdate(BaseChannelListingMutation):
         )
         lines_ids = {line["id"] for line in lines_id_and_checkout_id}
 
+        release_checkout_lines_reservations(lines_ids)
         CheckoutLine.objects.filter(id__in=lines_ids).delete()
 
     @classmethod
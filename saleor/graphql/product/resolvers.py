@@ -56,6 +56,10 @@ def resolve_digital_content_by_id(id):
     return models.DigitalContent.objects.filter(pk=id).first()
 
 
+def resolve_product_deletion_by_id(id):
+    return models.ProductDeletion.objects.filter(pk=id).first()
+
+
 def resolve_digital_contents(_info):
     return models.DigitalContent.objects.all()
 
@@ -9,6 +9,7 @@ from ...product.models import ALL_PRODUCTS_PERMISSIONS
 from ..channel import ChannelContext
 from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..core.connection import create_connection_slice, filter_connection_queryset
+from ..core.descriptions import ADDED_IN_39, PREVIEW_FEATURE
 from ..core.enums import ReportingPeriod
 from ..core.fields import ConnectionField, FilterConnectionField, PermissionsField
 from ..core.types import NonNullList
@@ -32,6 +33,7 @@ from .bulk_mutations.products import (
     ProductVariantStocksCreate,
     ProductVariantStocksDelete,
     ProductVariantStocksUpdate,
+    StockBulkUpsert,
 )
 from .filters import (
     CategoryFilterInput,
@@ -99,6 +101,7 @@ from .resolvers import (
     resolve_digital_contents,
     resolve_product_by_id,
     resolve_product_by_slug,
+    resolve_product_deletion_by_id,
     resolve_product_type_by_id,
     resolve_product_types,
     resolve_product_variant_by_sku,
@@ -124,6 +127,7 @@ from .types import (
     DigitalContentCountableConnection,
     Product,
     ProductCountableConnection,
+    ProductDeletion,
     ProductType,
     ProductTypeCountableConnection,
     ProductVariant,
@@ -231,6 +235,16 @@ class ProductQueries(graphene.ObjectType):
             f"{', '.join([p.name for p in ALL_PRODUCTS_PERMISSIONS])}."
         ),
     )
+    product_deletion = PermissionsField(
+        ProductDeletion,
+        id=graphene.Argument(
+            graphene.ID, description="ID of the product deletion job.", required=True
+        ),
+        description=(
+            "Look up a product deletion job by ID." + ADDED_IN_39 + PREVIEW_FEATURE
+        ),
+        permissions=[ProductPermissions.MANAGE_PRODUCTS],
+    )
     product_type = graphene.Field(
         ProductType,
         id=graphene.Argument(
@@ -421,6 +435,11 @@ class ProductQueries(graphene.ObjectType):
         qs = filter_connection_queryset(qs, kwargs)
         return create_connection_slice(qs, info, kwargs, ProductCountableConnection)
 
+    @staticmethod
+    def resolve_product_deletion(_root, _info: graphene.ResolveInfo, *, id):
+        _, id = from_global_id_or_error(id, ProductDeletion)
+        return resolve_product_deletion_by_id(id)
+
     @staticmethod
     def resolve_product_type(_root, _info: graphene.ResolveInfo, *, id):
         _, id = from_global_id_or_error(id, ProductType)
@@ -560,6 +579,7 @@ class ProductMutations(graphene.ObjectType):
     product_variant_stocks_create = ProductVariantStocksCreate.Field()
     product_variant_stocks_delete = ProductVariantStocksDelete.Field()
     product_variant_stocks_update = ProductVariantStocksUpdate.Field()
+    stock_bulk_upsert = StockBulkUpsert.Field()
     product_variant_update = ProductVariantUpdate.Field()
     product_variant_set_default = ProductVariantSetDefault.Field()
     product_variant_translate = ProductVariantTranslate.Field()
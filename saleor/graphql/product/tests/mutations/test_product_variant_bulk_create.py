@@ -1141,3 +1141,51 @@ def test_product_variant_bulk_create_two_variants_duplicated_one_attribute_value
     assert not data["errors"]
     assert data["count"] == 1
     assert product_variant_count + 1 == ProductVariant.objects.count()
+
+
+def test_product_variant_bulk_create_many_variants(
+    staff_api_client,
+    product,
+    size_attribute,
+    warehouse,
+    channel_USD,
+    permission_manage_products,
+):
+    # given
+    max_sort_order = max(product.variants.values_list("sort_order", flat=True))
+    product_id = graphene.Node.to_global_id("Product", product.pk)
+    attribute_id = graphene.Node.to_global_id("Attribute", size_attribute.pk)
+    warehouse_id = graphene.Node.to_global_id("Warehouse", warehouse.pk)
+    channel_id = graphene.Node.to_global_id("Channel", channel_USD.pk)
+    variants = [
+        {
+            "sku": f"sku-{index}",
+            "attributes": [{"id": attribute_id, "values": [f"Size {index}"]}],
+            "stocks": [{"warehouse": warehouse_id, "quantity": index}],
+            "channelListings": [{"channelId": channel_id, "price": index + 1}],
+        }
+        for index in range(3)
+    ]
+    variables = {"productId": product_id, "variants": variants}
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    # when
+    response = staff_api_client.post_graphql(
+        PRODUCT_VARIANT_BULK_CREATE_MUTATION, variables
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productVariantBulkCreate"]
+    assert not data["errors"]
+    assert data["count"] == 3
+    for index, variant_data in enumerate(data["productVariants"]):
+        assert variant_data["name"] == f"Size {index}"
+        assert variant_data["stocks"][0]["quantity"] == index
+        assert variant_data["channelListings"][0]["price"]["amount"] == index + 1
+    variants = ProductVariant.objects.filter(sku__startswith="sku-").order_by("sku")
+    assert [variant.sort_order for variant in variants] == [
+        max_sort_order + 1,
+        max_sort_order + 2,
+        max_sort_order + 3,
+    ]
@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+import graphene
+
+from .....tests.utils import flush_post_commit_hooks
+from .....warehouse.error_codes import StockErrorCode
+from .....warehouse.models import Stock
+from ....tests.utils import get_graphql_content
+
+STOCK_BULK_UPSERT_MUTATION = """
+    mutation StockBulkUpsert($stocks: [StockBulkUpsertInput!]!) {
+        stockBulkUpsert(stocks: $stocks) {
+            count
+            errors {
+                code
+                field
+                index
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
+def test_stock_bulk_upsert(
+    mock_back_in_stock,
+    staff_api_client,
+    variant,
+    warehouses,
+    permission_manage_products,
+):
+    # given
+    first_warehouse, second_warehouse = warehouses
+    Stock.objects.create(product_variant=variant, warehouse=first_warehouse)
+    stocks = [
+        {
+            "variantId": graphene.Node.to_global_id("ProductVariant", variant.pk),
+            "warehouse": graphene.Node.to_global_id("Warehouse", first_warehouse.pk),
+            "quantity": 10,
+        },
+        {
+            "sku": variant.sku,
+            "warehouse": graphene.Node.to_global_id("Warehouse", second_warehouse.pk),
+            "quantity": 0,
+        },
+    ]
+
+    # when
+    response = staff_api_client.post_graphql(
+        STOCK_BULK_UPSERT_MUTATION,
+        {"stocks": stocks},
+        permissions=[permission_manage_products],
+    )
+    flush_post_commit_hooks()
+
+    # then
+    data = get_graphql_content(response)["data"]["stockBulkUpsert"]
+    assert data["count"] == 2
+    assert not data["errors"]
+    assert variant.stocks.get(warehouse=first_warehouse).quantity == 10
+    assert variant.stocks.get(warehouse=second_warehouse).quantity == 0
+    mock_back_in_stock.assert_called_once()
+
+
+def test_stock_bulk_upsert_saves_valid_rows(
+    staff_api_client, variant, warehouse, permission_manage_products
+):
+    # given
+    warehouse_id = graphene.Node.to_global_id("Warehouse", warehouse.pk)
+    stocks = [
+        {"variantId": "invalid", "warehouse": warehouse_id, "quantity": 5},
+        {"sku": "unknown", "warehouse": warehouse_id, "quantity": 5},
+        {"sku": variant.sku, "warehouse": warehouse_id, "quantity": 5},
+    ]
+
+    # when
+    response = staff_api_client.post_graphql(
+        STOCK_BULK_UPSERT_MUTATION,
+        {"stocks": stocks},
+        permissions=[permission_manage_products],
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["stockBulkUpsert"]
+    assert data["count"] == 1
+    assert data["errors"] == [
+        {
+            "code": StockErrorCode.GRAPHQL_ERROR.name,
+            "field": "variantId",
+            "index": 0,
+        },
+        {"code": StockErrorCode.NOT_FOUND.name, "field": "sku", "index": 1},
+    ]
+    assert variant.stocks.get(warehouse=warehouse).quantity == 5
@@ -0,0 +1,60 @@
+import graphene
+
+from .....core import JobStatus
+from .....product.models import ProductDeletion
+from ....tests.utils import assert_no_permission, get_graphql_content
+
+PRODUCT_DELETION_QUERY = """
+    query getProductDeletion($id: ID!) {
+        productDeletion(id: $id) {
+            id
+            status
+            message
+            deletedCount
+            totalCount
+        }
+    }
+"""
+
+
+def test_product_deletion_query(
+    staff_api_client, permission_manage_products, product_list
+):
+    # given
+    product_deletion = ProductDeletion.objects.create(
+        product_ids=[product.pk for product in product_list], deleted_count=2
+    )
+    deletion_id = graphene.Node.to_global_id("ProductDeletion", product_deletion.pk)
+
+    # when
+    response = staff_api_client.post_graphql(
+        PRODUCT_DELETION_QUERY,
+        {"id": deletion_id},
+        permissions=[permission_manage_products],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["productDeletion"] == {
+        "id": deletion_id,
+        "status": JobStatus.PENDING.upper(),
+        "message": None,
+        "deletedCount": 2,
+        "totalCount": 3,
+    }
+
+
+def test_product_deletion_query_no_permission(staff_api_client, product_list):
+    # given
+    product_deletion = ProductDeletion.objects.create(
+        product_ids=[product.pk for product in product_list]
+    )
+    deletion_id = graphene.Node.to_global_id("ProductDeletion", product_deletion.pk)
+
+    # when
+    response = staff_api_client.post_graphql(
+        PRODUCT_DELETION_QUERY, {"id": deletion_id}
+    )
+
+    # then
+    assert_no_permission(response)
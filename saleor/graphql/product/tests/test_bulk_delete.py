@@ -10,6 +10,7 @@ from ....attribute.models import AttributeValue
 from ....attribute.utils import associate_attribute_values_to_instance
 from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ....checkout.utils import add_variant_to_checkout, calculate_checkout_quantity
+from ....core import JobStatus
 from ....order import OrderEvents, OrderStatus
 from ....order.models import OrderEvent, OrderLine
 from ....plugins.manager import get_plugins_manager
@@ -20,6 +21,7 @@ from ....product.models import (
     Collection,
     Product,
     ProductChannelListing,
+    ProductDeletion,
     ProductMedia,
     ProductType,
     ProductVariant,
@@ -522,9 +524,11 @@ def test_delete_products_invalid_object_typed_of_given_ids(
 
 
 @patch("saleor.product.signals.delete_from_storage_task.delay")
+@patch("saleor.product.deletion.delete_files_from_storage_task.delay")
 @patch("saleor.order.tasks.recalculate_orders_task.delay")
 def test_delete_products_with_images(
     mocked_recalculate_orders_task,
+    delete_files_from_storage_task_mock,
     delete_from_storage_task_mock,
     staff_api_client,
     product_list,
@@ -536,6 +540,9 @@ def test_delete_products_with_images(
     # given
     media1 = ProductMedia.objects.create(product=product_list[0], image=image_list[0])
     media2 = ProductMedia.objects.create(product=product_list[1], image=image_list[1])
+    thumbnail = Thumbnail.objects.create(
+        product_media=media1, size=128, image=image_list[0]
+    )
 
     query = DELETE_PRODUCTS_MUTATION
     variables = {
@@ -544,19 +551,107 @@ def test_delete_products_with_images(
             for product in product_list
         ]
     }
+
+    # when
     response = staff_api_client.post_graphql(
         query, variables, permissions=[permission_manage_products]
     )
-    content = get_graphql_content(response)
+    flush_post_commit_hooks()
 
+    # then
+    content = get_graphql_content(response)
     assert content["data"]["productBulkDelete"]["count"] == 3
-    assert delete_from_storage_task_mock.call_count == 2
-    assert {
-        call_args.args[0] for call_args in delete_from_storage_task_mock.call_args_list
-    } == {media1.image.name, media2.image.name}
+    assert not ProductMedia.objects.filter(id__in=[media1.id, media2.id]).exists()
+    assert not Thumbnail.objects.filter(id=thumbnail.id).exists()
+    delete_from_storage_task_mock.assert_not_called()
+    delete_files_from_storage_task_mock.assert_called_once()
+    assert set(delete_files_from_storage_task_mock.call_args.args[0]) == {
+        media1.image.name,
+        media2.image.name,
+        thumbnail.image.name,
+    }
     mocked_recalculate_orders_task.assert_not_called()
 
 
+DELETE_PRODUCTS_WITH_DELETION_JOB_MUTATION = """
+mutation productBulkDelete($ids: [ID!]!) {
+    productBulkDelete(ids: $ids) {
+        count
+        productDeletion {
+            id
+            status
+            deletedCount
+            totalCount
+        }
+        errors {
+            code
+            field
+        }
+    }
+}
+"""
+
+
+@patch("saleor.product.tasks.PRODUCTS_DELETE_BATCH_SIZE", 2)
+@patch("saleor.plugins.manager.PluginsManager.product_deleted")
+def test_delete_products_in_batches(
+    product_deleted_mock,
+    staff_api_client,
+    product_list,
+    permission_manage_products,
+):
+    # given
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("Product", product.id)
+            for product in product_list
+        ]
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        DELETE_PRODUCTS_WITH_DELETION_JOB_MUTATION,
+        variables,
+        permissions=[permission_manage_products],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productBulkDelete"]
+    assert data["count"] == 3
+    assert not Product.objects.filter(
+        id__in=[product.id for product in product_list]
+    ).exists()
+    assert product_deleted_mock.call_count == 3
+    product_deletion = ProductDeletion.objects.get()
+    assert product_deletion.user == staff_api_client.user
+    assert product_deletion.status == JobStatus.SUCCESS
+    assert product_deletion.deleted_count == 3
+    # the response returns the job as it was scheduled
+    assert data["productDeletion"] == {
+        "id": graphene.Node.to_global_id("ProductDeletion", product_deletion.pk),
+        "status": JobStatus.PENDING.upper(),
+        "deletedCount": 0,
+        "totalCount": 3,
+    }
+
+
+def test_delete_products_with_empty_ids(staff_api_client, permission_manage_products):
+    # when
+    response = staff_api_client.post_graphql(
+        DELETE_PRODUCTS_WITH_DELETION_JOB_MUTATION,
+        {"ids": []},
+        permissions=[permission_manage_products],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productBulkDelete"]
+    assert data["count"] == 0
+    assert data["productDeletion"] is None
+    assert not ProductDeletion.objects.exists()
+
+
 @patch("saleor.plugins.webhook.plugin.get_webhooks_for_event")
 @patch("saleor.plugins.webhook.plugin.trigger_webhooks_async")
 @patch("saleor.order.tasks.recalculate_orders_task.delay")
@@ -1,5 +1,6 @@
 from .categories import Category, CategoryCountableConnection
 from .collections import Collection, CollectionCountableConnection
+from .deletions import ProductDeletion
 from .digital_contents import (
     DigitalContent,
     DigitalContentCountableConnection,
@@ -22,6 +23,7 @@ __all__ = [
     "CollectionCountableConnection",
     "Product",
     "ProductCountableConnection",
+    "ProductDeletion",
     "ProductMedia",
     "ProductType",
     "ProductTypeCountableConnection",
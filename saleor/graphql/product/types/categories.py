@@ -6,6 +6,7 @@ from graphene import relay
 from ....core.permissions import has_one_of_permissions
 from ....core.tracing import traced_resolver
 from ....product import models
+from ....product.category_tree import get_category_tree
 from ....product.models import ALL_PRODUCTS_PERMISSIONS
 from ....thumbnail.utils import get_image_or_proxy_url, get_thumbnail_size
 from ...channel import ChannelQsContext
@@ -75,9 +76,9 @@ class Category(ModelObjectType):
 
     @staticmethod
     def resolve_ancestors(root: models.Category, info, **kwargs):
-        return create_connection_slice(
-            root.get_ancestors(), info, kwargs, CategoryCountableConnection
-        )
+        ancestor_ids = get_category_tree().get_ancestor_ids(root.pk)
+        qs = models.Category.objects.filter(pk__in=ancestor_ids)
+        return create_connection_slice(qs, info, kwargs, CategoryCountableConnection)
 
     @staticmethod
     def resolve_description_json(root: models.Category, _info):
@@ -130,7 +131,7 @@ class Category(ModelObjectType):
         has_required_permissions = has_one_of_permissions(
             requestor, ALL_PRODUCTS_PERMISSIONS
         )
-        tree = root.get_descendants(include_self=True)
+        tree = get_category_tree().get_descendant_ids([root.pk])
         if channel is None and not has_required_permissions:
             channel = get_default_channel_slug_or_graphql_error()
         qs = models.Product.objects.all()
@@ -144,7 +145,7 @@ class Category(ModelObjectType):
             )
         if channel and has_required_permissions:
             qs = qs.filter(channel_listings__channel__slug=channel)
-        qs = qs.filter(category__in=tree)
+        qs = qs.filter(category_id__in=tree)
         qs = ChannelQsContext(qs=qs, channel_slug=channel)
         return create_connection_slice(qs, info, kwargs, ProductCountableConnection)
 
@@ -0,0 +1,28 @@
+import graphene
+
+from ....product import models
+from ...core.descriptions import ADDED_IN_39, PREVIEW_FEATURE
+from ...core.types import Job, ModelObjectType
+
+
+class ProductDeletion(ModelObjectType):
+    id = graphene.GlobalID(required=True)
+    deleted_count = graphene.Int(
+        required=True, description="Number of products deleted so far."
+    )
+    total_count = graphene.Int(
+        required=True, description="Number of products to delete."
+    )
+
+    class Meta:
+        description = (
+            "Represents a job of deleting products in the background."
+            + ADDED_IN_39
+            + PREVIEW_FEATURE
+        )
+        interfaces = [graphene.relay.Node, Job]
+        model = models.ProductDeletion
+
+    @staticmethod
+    def resolve_total_count(root: models.ProductDeletion, _info):
+        return len(root.product_ids)
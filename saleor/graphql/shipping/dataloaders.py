@@ -24,6 +24,8 @@ class ShippingMethodByIdLoader(DataLoader):
 
 class ShippingZoneByIdLoader(DataLoader):
     context_key = "shippingzone_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (ShippingZone,)
 
     def batch_load(self, keys):
         shipping_zones = ShippingZone.objects.using(
@@ -11,6 +11,8 @@ from ..core.dataloaders import DataLoader
 
 class SiteByIdLoader(DataLoader):
     context_key = "site_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Site,)
 
     def batch_load(self, keys):
         sites_mapped = Site.objects.using(self.database_connection_name).in_bulk(keys)
@@ -19,6 +21,8 @@ class SiteByIdLoader(DataLoader):
 
 class SiteByHostLoader(DataLoader):
     context_key = "site_by_host"
+    shared_cache_timeout = 300
+    shared_cache_models = (Site,)
 
     def batch_load(self, keys):
         # simulate non existing `domain__iexact__in`
@@ -21,6 +21,8 @@ from ..product.dataloaders import (
 
 class TaxConfigurationPerCountryByTaxConfigurationIDLoader(DataLoader):
     context_key = "tax_configuration_per_country_by_tax_configuration_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (TaxConfigurationPerCountry,)
 
     def batch_load(self, keys):
         tax_configs_per_country = TaxConfigurationPerCountry.objects.using(
@@ -36,6 +38,8 @@ class TaxConfigurationPerCountryByTaxConfigurationIDLoader(DataLoader):
 
 class TaxConfigurationByChannelId(DataLoader):
     context_key = "tax_configuration_by_channel_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (TaxConfiguration,)
 
     def batch_load(self, keys):
         tax_configs = TaxConfiguration.objects.using(
@@ -1,13 +1,16 @@
 import graphene
 from django.core.exceptions import ValidationError
+from django.db import transaction
 
 from ....core.permissions import CheckoutPermissions
 from ....tax import error_codes, models
 from ...account.enums import CountryCodeEnum
+from ...core.dataloaders import invalidate_shared_cache
 from ...core.descriptions import ADDED_IN_39, PREVIEW_FEATURE
 from ...core.mutations import ModelMutation
 from ...core.types import Error, NonNullList
 from ...core.utils import get_duplicates_items
+from ..dataloaders import TaxConfigurationPerCountryByTaxConfigurationIDLoader
 from ..enums import TaxCalculationStrategy
 from ..types import TaxConfiguration
 
@@ -181,3 +184,10 @@ class TaxConfigurationUpdate(ModelMutation):
         )
         cls.update_countries_configuration(instance, update_countries_configuration)
         cls.remove_countries_configuration(remove_countries_configuration)
+        # Country exceptions are saved in bulk, without the signals invalidating
+        # the shared cache of the data loader.
+        transaction.on_commit(
+            lambda: invalidate_shared_cache(
+                TaxConfigurationPerCountryByTaxConfigurationIDLoader.context_key
+            )
+        )
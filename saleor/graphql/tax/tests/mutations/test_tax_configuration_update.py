@@ -1,9 +1,12 @@
+from unittest.mock import patch
+
 import graphene
 import pytest
 
 from .....tax.error_codes import TaxConfigurationUpdateErrorCode
 from .....tax.models import TaxConfiguration
 from ....tests.utils import assert_no_permission, get_graphql_content
+from ...dataloaders import TaxConfigurationPerCountryByTaxConfigurationIDLoader
 from ...enums import TaxCalculationStrategy
 from ..fragments import TAX_CONFIGURATION_FRAGMENT
 
@@ -131,6 +134,39 @@ def test_update_as_app(
     )
 
 
+@patch("saleor.graphql.tax.mutations.tax_configuration_update.invalidate_shared_cache")
+def test_update_invalidates_country_exceptions_shared_cache(
+    invalidate_shared_cache_mock,
+    example_tax_configuration,
+    staff_api_client,
+    permission_manage_taxes,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    id = graphene.Node.to_global_id("TaxConfiguration", example_tax_configuration.pk)
+    variables = {
+        "id": id,
+        "input": {
+            "updateCountriesConfiguration": [
+                {"countryCode": "PL", "chargeTaxes": False, "displayGrossPrices": False}
+            ],
+        },
+    }
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_graphql(
+            MUTATION, variables, permissions=[permission_manage_taxes]
+        )
+
+    # then
+    content = get_graphql_content(response)
+    assert not content["data"]["taxConfigurationUpdate"]["errors"]
+    invalidate_shared_cache_mock.assert_called_once_with(
+        TaxConfigurationPerCountryByTaxConfigurationIDLoader.context_key
+    )
+
+
 def test_raise_duplicate_input_item(
     example_tax_configuration, staff_api_client, permission_manage_taxes
 ):
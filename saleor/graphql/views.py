@@ -25,9 +25,11 @@ from ..core.utils import is_valid_ipv4, is_valid_ipv6
 from ..webhook import observability
 from .api import API_PATH, schema
 from .context import get_context_value
+from .core.context import stick_client_to_primary
 from .core.validators.query_cost import validate_query_cost
 from .query_cost_map import COST_MAP
 from .utils import format_error, query_fingerprint, query_identifier
+from .webhook.subscription_payload import shared_sync_payloads
 
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 
@@ -331,17 +333,21 @@ class GraphQLView(View):
                         response = cache.get(key)
 
                     if not response:
-                        response = document.execute(  # type: ignore
-                            root=self.get_root_value(),
-                            variables=variables,
-                            operation_name=operation_name,
-                            context=get_context_value(request),
-                            middleware=self.middleware,
-                            **extra_options,
-                        )
+                        with shared_sync_payloads():
+                            response = document.execute(  # type: ignore
+                                root=self.get_root_value(),
+                                variables=variables,
+                                operation_name=operation_name,
+                                context=get_context_value(request),
+                                middleware=self.middleware,
+                                **extra_options,
+                            )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
 
+                    if getattr(request, "is_mutation", False):
+                        stick_client_to_primary(request)  # type: ignore
+
                     if app := getattr(request, "app", None):
                         span.set_tag("app.name", app.name)
 
@@ -523,6 +523,8 @@ class PreorderQuantityReservedByVariantChannelListingIdLoader(DataLoader):
 
 class WarehouseByIdLoader(DataLoader):
     context_key = "warehouse_by_id"
+    shared_cache_timeout = 300
+    shared_cache_models = (Warehouse,)
 
     def batch_load(self, keys: Iterable[UUID]) -> List[Optional[Warehouse]]:
         warehouses = (
@@ -1,8 +1,12 @@
-from typing import Any, Dict, Optional
+import copy
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Optional, Tuple
 
+from asgiref.local import Local
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models import Model
 from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
@@ -20,6 +24,8 @@ from ..utils import format_error
 
 logger = get_task_logger(__name__)
 
+_sync_payloads_context = Local()
+
 
 def validate_subscription_query(query: str) -> bool:
     from ..api import schema
@@ -100,6 +106,52 @@ def initialize_request(requestor=None, sync_event=False) -> HttpRequest:
     return request
 
 
+def _get_instance_key(instance) -> Optional[Hashable]:
+    if instance is None:
+        return None
+    if isinstance(instance, Model):
+        return instance._meta.label, instance.pk
+    return id(instance)
+
+
+def _get_subscribable_object_version(subscribable_object) -> Optional[Tuple]:
+    """Return the key identifying the current state of the object.
+
+    Only model instances with a last modification time can be identified, as it
+    changes whenever the object is saved.
+    """
+    if not isinstance(subscribable_object, Model) or subscribable_object.pk is None:
+        return None
+    modified_at = getattr(subscribable_object, "last_change", None) or getattr(
+        subscribable_object, "updated_at", None
+    )
+    if modified_at is None:
+        return None
+    return subscribable_object._meta.label, subscribable_object.pk, modified_at
+
+
+@contextmanager
+def shared_sync_payloads():
+    """Share the context of sync webhook payloads generated within the scope.
+
+    Subscription payloads of sync webhooks generated for the same object, not
+    modified in the meantime, are resolved with one request context, so they share
+    dataloaders, and payloads of the same event, query and app are generated once.
+    """
+    root = False
+    if settings.WEBHOOK_SYNC_SHARED_PAYLOADS_ENABLED and not hasattr(
+        _sync_payloads_context, "payloads"
+    ):
+        _sync_payloads_context.payloads, root = {}, True
+        _sync_payloads_context.requests = {}
+    try:
+        yield
+    finally:
+        if root:
+            del _sync_payloads_context.payloads
+            del _sync_payloads_context.requests
+
+
 def get_event_payload(event):
     # Queries that use dataloaders return Promise object for the "event" field. In that
     # case, we need to resolve them first.
@@ -142,12 +194,33 @@ def generate_payload_from_subscription(
     )
     app_id = app.pk if app else None
 
-    request.app = app  # type: ignore
+    version = _get_subscribable_object_version(subscribable_object)
+    shared = (
+        getattr(request, "sync_event", False)
+        and version is not None
+        and hasattr(_sync_payloads_context, "payloads")
+    )
+    if shared:
+        requestor_key = _get_instance_key(getattr(request, "requestor", None))
+        request_key = (requestor_key, app_id, version)
+        payload_key = (event_type, subscription_query, request_key)
+        if payload_key in _sync_payloads_context.payloads:
+            return copy.deepcopy(_sync_payloads_context.payloads[payload_key])
+        if request_key in _sync_payloads_context.requests:
+            request = _sync_payloads_context.requests[request_key]
+            context = request
+        else:
+            request.app = app  # type: ignore
+            context = get_context_value(request)
+            _sync_payloads_context.requests[request_key] = context
+    else:
+        request.app = app  # type: ignore
+        context = get_context_value(request)
 
     results = document.execute(
         allow_subscriptions=True,
         root=(event_type, subscribable_object),
-        context=get_context_value(request),
+        context=context,
     )
     if hasattr(results, "errors"):
         logger.warning(
@@ -176,4 +249,6 @@ def generate_payload_from_subscription(
             for error in payload_instance.errors
         ]
 
+    if shared:
+        _sync_payloads_context.payloads[payload_key] = copy.deepcopy(event_payload)
     return event_payload
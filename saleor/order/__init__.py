@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List
 
 if TYPE_CHECKING:
-    from .models import FulfillmentLine
+    from .models import FulfillmentLine, Order
 
 
 class OrderStatus:
@@ -283,3 +283,11 @@ class FulfillmentLineData:
     line: "FulfillmentLine"
     quantity: int
     replace: bool = False
+
+
+@dataclass
+class OrderFulfillmentData:
+    order: "Order"
+    # Lines to fulfill by the warehouse ID, in the format of `create_fulfillments`.
+    lines_for_warehouses: Dict[str, List[Dict]]
+    tracking_number: str = ""
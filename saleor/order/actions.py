@@ -7,6 +7,8 @@ from uuid import UUID
 
 from django.contrib.sites.models import Site
 from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
 
 from ..account.models import User
 from ..core import analytics
@@ -28,7 +30,7 @@ from ..payment.models import Payment, Transaction, TransactionItem
 from ..payment.utils import create_payment
 from ..warehouse.management import (
     deallocate_stock,
-    deallocate_stock_for_order,
+    deallocate_stock_for_orders,
     decrease_stock,
     get_order_lines_with_track_inventory,
 )
@@ -36,6 +38,7 @@ from ..warehouse.models import Stock
 from . import (
     FulfillmentLineData,
     FulfillmentStatus,
+    OrderFulfillmentData,
     OrderOrigin,
     OrderStatus,
     events,
@@ -177,17 +180,45 @@ def cancel_order(
 
     Release allocation of unfulfilled order items.
     """
+    cancel_orders([order], user, app, manager)
+
+
+def cancel_orders(
+    orders: List["Order"],
+    user: Optional["User"],
+    app: Optional["App"],
+    manager: "PluginsManager",
+):
+    """Cancel many orders at once.
+
+    Allocations of all orders are released and events are created with a few
+    queries, plugins are notified about each order once the transaction commits.
+    """
     # transaction ensures proper allocation and event triggering
     with traced_atomic_transaction():
-        events.order_canceled_event(order=order, user=user, app=app)
-        deallocate_stock_for_order(order, manager)
-        order.status = OrderStatus.CANCELED
-        order.save(update_fields=["status", "updated_at"])
+        events.orders_canceled_events(orders=orders, user=user, app=app)
+        deallocate_stock_for_orders(orders, manager)
+        now = timezone.now()
+        Order.objects.filter(pk__in=[order.pk for order in orders]).update(
+            status=OrderStatus.CANCELED, updated_at=now
+        )
+        for order in orders:
+            order.status = OrderStatus.CANCELED
+            order.updated_at = now
 
-        call_event(manager.order_cancelled, order)
-        call_event(manager.order_updated, order)
+        call_event(_send_orders_canceled_events, orders, user, app, manager)
 
-        call_event(send_order_canceled_confirmation, order, user, app, manager)
+
+def _send_orders_canceled_events(
+    orders: List["Order"],
+    user: Optional["User"],
+    app: Optional["App"],
+    manager: "PluginsManager",
+):
+    for order in orders:
+        manager.order_cancelled(order)
+        manager.order_updated(order)
+        send_order_canceled_confirmation(order, user, app, manager)
 
 
 def order_refunded(
@@ -353,7 +384,7 @@ def cancel_fulfillment(
 
     Return products to corresponding stocks if warehouse was defined.
     """
-    with traced_atomic_transaction():
+    with traced_atomic_transaction(), events.collect_order_events():
         fulfillment = Fulfillment.objects.select_for_update().get(pk=fulfillment.pk)
         events.fulfillment_canceled_event(
             order=fulfillment.order, user=user, app=app, fulfillment=fulfillment
@@ -694,10 +725,38 @@ def _create_fulfillment_lines(
         .select_related("product_variant")
     )
 
-    variant_to_stock: Dict[str, List[Stock]] = defaultdict(list)
+    variant_to_stock: Dict[int, List[Stock]] = defaultdict(list)
     for stock in stocks:
         variant_to_stock[stock.product_variant_id].append(stock)
 
+    fulfillment_lines, lines_info, insufficient_stocks = _prepare_fulfillment_lines(
+        fulfillment,
+        warehouse_pk,
+        lines_data,
+        variant_to_stock,
+        gift_card_lines_info,
+        allow_stock_to_be_exceeded,
+    )
+    if insufficient_stocks:
+        raise InsufficientStock(insufficient_stocks)
+
+    if lines_info:
+        if decrease_stock:
+            _decrease_stocks(lines_info, manager, allow_stock_to_be_exceeded)
+        _increase_order_line_quantity(lines_info)
+
+    return fulfillment_lines
+
+
+def _prepare_fulfillment_lines(
+    fulfillment: Fulfillment,
+    warehouse_pk: str,
+    lines_data: List[Dict],
+    variant_to_stock: Dict[int, List[Stock]],
+    gift_card_lines_info: List[GiftCardLineData],
+    allow_stock_to_be_exceeded: bool = False,
+) -> Tuple[List[FulfillmentLine], List[OrderLineInfo], List[InsufficientStockData]]:
+    """Return unsaved fulfillment lines, lines to fulfill and missing stocks."""
     insufficient_stocks = []
     fulfillment_lines = []
     lines_info = []
@@ -748,16 +807,7 @@ def _create_fulfillment_lines(
                         fulfillment_line=fulfillment_line,
                     )
                 )
-
-    if insufficient_stocks:
-        raise InsufficientStock(insufficient_stocks)
-
-    if lines_info:
-        if decrease_stock:
-            _decrease_stocks(lines_info, manager, allow_stock_to_be_exceeded)
-        _increase_order_line_quantity(lines_info)
-
-    return fulfillment_lines
+    return fulfillment_lines, lines_info, insufficient_stocks
 
 
 def create_fulfillments(
@@ -861,6 +911,200 @@ def create_fulfillments(
     return fulfillments
 
 
+def create_fulfillments_for_orders(
+    user: Optional["User"],
+    app: Optional["App"],
+    fulfillments_data: List[OrderFulfillmentData],
+    manager: "PluginsManager",
+    site_settings: "SiteSettings",
+    notify_customer: bool = True,
+    approved: bool = True,
+    allow_stock_to_be_exceeded: bool = False,
+) -> List[Fulfillment]:
+    """Fulfill many orders at once.
+
+    Work as `create_fulfillments` called for each of the orders, but the stocks of
+    all the orders are locked and decreased together, fulfillments with their lines
+    are created in bulk and the order statuses are recalculated with aggregate
+    queries.
+
+    Raise:
+        InsufficientStock: If there is not enough stock for lines of any order.
+
+    """
+    status = (
+        FulfillmentStatus.FULFILLED
+        if approved
+        else FulfillmentStatus.WAITING_FOR_APPROVAL
+    )
+    orders = [data.order for data in fulfillments_data]
+    fulfillments: List[Fulfillment] = []
+    fulfillments_per_order: Dict[UUID, List[Fulfillment]] = defaultdict(list)
+    fulfillment_lines: List[FulfillmentLine] = []
+    lines_per_order: Dict[UUID, List[FulfillmentLine]] = defaultdict(list)
+    gift_card_lines_per_order: Dict[UUID, List[GiftCardLineData]] = defaultdict(list)
+    lines_info: List[OrderLineInfo] = []
+    insufficient_stocks: List[InsufficientStockData] = []
+    with traced_atomic_transaction(), events.collect_order_events():
+        # Lock the orders to assign the subsequent numbers to their fulfillments.
+        list(
+            Order.objects.select_for_update(of=("self",))
+            .filter(pk__in=[order.pk for order in orders])
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        fulfillment_order = dict(
+            Fulfillment.objects.filter(order__in=orders)
+            .order_by()
+            .values("order_id")
+            .annotate(max_order=Max("fulfillment_order"))
+            .values_list("order_id", "max_order")
+        )
+        stocks = _get_stocks_for_fulfillments(fulfillments_data)
+        for data in fulfillments_data:
+            order = data.order
+            channel_slug = order.channel.slug
+            for warehouse_pk, lines_data in data.lines_for_warehouses.items():
+                fulfillment_order[order.pk] = fulfillment_order.get(order.pk, 0) + 1
+                fulfillment = Fulfillment(
+                    order=order,
+                    status=status,
+                    tracking_number=data.tracking_number,
+                    fulfillment_order=fulfillment_order[order.pk],
+                )
+                (
+                    warehouse_fulfillment_lines,
+                    warehouse_lines_info,
+                    warehouse_insufficient_stocks,
+                ) = _prepare_fulfillment_lines(
+                    fulfillment,
+                    warehouse_pk,
+                    lines_data,
+                    stocks[(channel_slug, str(warehouse_pk))],
+                    gift_card_lines_per_order[order.pk],
+                    allow_stock_to_be_exceeded,
+                )
+                fulfillments.append(fulfillment)
+                fulfillments_per_order[order.pk].append(fulfillment)
+                fulfillment_lines.extend(warehouse_fulfillment_lines)
+                lines_per_order[order.pk].extend(warehouse_fulfillment_lines)
+                lines_info.extend(warehouse_lines_info)
+                insufficient_stocks.extend(warehouse_insufficient_stocks)
+
+        if insufficient_stocks:
+            raise InsufficientStock(insufficient_stocks)
+
+        Fulfillment.objects.bulk_create(fulfillments)
+        if lines_info:
+            if approved:
+                _decrease_stocks(lines_info, manager, allow_stock_to_be_exceeded)
+            _increase_order_line_quantity(lines_info)
+        FulfillmentLine.objects.bulk_create(fulfillment_lines)
+        if approved:
+            utils.update_orders_status(orders)
+
+        for fulfillment in fulfillments:
+            if fulfillment.tracking_number:
+                call_event(manager.tracking_number_updated, fulfillment)
+        transaction.on_commit(
+            lambda: _send_orders_fulfilled_events(
+                fulfillments_per_order,
+                lines_per_order,
+                gift_card_lines_per_order,
+                user,
+                app,
+                manager,
+                site_settings,
+                approved,
+                notify_customer,
+            )
+        )
+    return fulfillments
+
+
+def _get_stocks_for_fulfillments(
+    fulfillments_data: List[OrderFulfillmentData],
+) -> Dict[Tuple[str, str], Dict[int, List[Stock]]]:
+    """Return stocks by the channel slug, the warehouse ID and the variant ID."""
+    lines_per_channel: Dict[str, List[Tuple[str, OrderLine]]] = defaultdict(list)
+    for data in fulfillments_data:
+        for warehouse_pk, lines_data in data.lines_for_warehouses.items():
+            lines_per_channel[data.order.channel.slug].extend(
+                (str(warehouse_pk), line_data["order_line"]) for line_data in lines_data
+            )
+
+    stocks: Dict[Tuple[str, str], Dict[int, List[Stock]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for channel_slug, lines in lines_per_channel.items():
+        channel_stocks = Stock.objects.for_channel_and_country(channel_slug).filter(
+            warehouse_id__in={warehouse_pk for warehouse_pk, _ in lines},
+            product_variant_id__in={line.variant_id for _, line in lines},
+        )
+        for stock in channel_stocks:
+            stocks[(channel_slug, str(stock.warehouse_id))][
+                stock.product_variant_id
+            ].append(stock)
+    return stocks
+
+
+def _send_orders_fulfilled_events(
+    fulfillments_per_order: Dict[UUID, List[Fulfillment]],
+    lines_per_order: Dict[UUID, List[FulfillmentLine]],
+    gift_card_lines_per_order: Dict[UUID, List[GiftCardLineData]],
+    user: Optional["User"],
+    app: Optional["App"],
+    manager: "PluginsManager",
+    site_settings: "SiteSettings",
+    approved: bool,
+    notify_customer: bool,
+):
+    from ..giftcard.utils import gift_cards_create
+
+    with traced_atomic_transaction(), events.collect_order_events():
+        for order_pk, fulfillments in fulfillments_per_order.items():
+            order = fulfillments[0].order
+            if not approved:
+                events.fulfillment_awaits_approval_event(
+                    order=order,
+                    user=user,
+                    app=app,
+                    fulfillment_lines=lines_per_order[order_pk],
+                )
+                call_event(manager.order_updated, order)
+                continue
+
+            if gift_card_lines_per_order[order_pk]:
+                gift_cards_create(
+                    order,
+                    gift_card_lines_per_order[order_pk],
+                    site_settings,
+                    user,
+                    app,
+                    manager,
+                )
+            events.fulfillment_fulfilled_items_event(
+                order=order,
+                user=user,
+                app=app,
+                fulfillment_lines=lines_per_order[order_pk],
+            )
+            call_event(manager.order_updated, order)
+            for fulfillment in fulfillments:
+                call_event(manager.fulfillment_created, fulfillment)
+            if order.status == OrderStatus.FULFILLED:
+                call_event(manager.order_fulfilled, order)
+                for fulfillment in fulfillments:
+                    call_event(manager.fulfillment_approved, fulfillment)
+
+    if approved and notify_customer:
+        for fulfillments in fulfillments_per_order.values():
+            for fulfillment in fulfillments:
+                send_fulfillment_confirmation_to_customer(
+                    fulfillment.order, fulfillment, user, app, manager
+                )
+
+
 def _get_fulfillment_line_if_exists(
     fulfillment_lines: List[FulfillmentLine], order_line_id, stock_id=None
 ):
@@ -1332,7 +1576,7 @@ def process_replace(
     order create the draft order with all user details, and requested lines.
     """
     # transaction ensures consistency in fulfillments and orders
-    with traced_atomic_transaction():
+    with traced_atomic_transaction(), events.collect_order_events():
         replace_fulfillment = _move_lines_to_replace_fulfillment(
             order_lines_to_replace=order_lines,
             fulfillment_lines_to_replace=fulfillment_lines,
@@ -1403,7 +1647,7 @@ def create_fulfillments_for_returned_products(
         refund_shipping_costs, amount, order.shipping_price_gross_amount
     )
     total_refund_amount = None
-    with traced_atomic_transaction():
+    with traced_atomic_transaction(), events.collect_order_events():
         if refund and (payment or transactions):
             total_refund_amount = _process_refund(
                 user=user,
@@ -1,5 +1,7 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from decimal import Decimal
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
 from ..account import events as account_events
 from ..account.models import User
@@ -18,6 +20,59 @@ UserType = Optional[User]
 AppType = Optional[App]
 
 
+class OrderEventsCollector:
+    """Accumulate order events to save them with a single query."""
+
+    def __init__(self):
+        self.events: List[OrderEvent] = []
+
+    def add(self, events: Iterable[OrderEvent]):
+        self.events.extend(events)
+
+    def flush(self) -> List[OrderEvent]:
+        events, self.events = self.events, []
+        return OrderEvent.objects.bulk_create(events)
+
+
+_collector: ContextVar[Optional[OrderEventsCollector]] = ContextVar(
+    "order_events_collector", default=None
+)
+
+
+@contextmanager
+def collect_order_events():
+    """Defer saving of the order events created within the block.
+
+    The events are saved with `bulk_create` when the outermost block exits without
+    an exception, so they don't have a primary key until then. Events created
+    outside of the block are saved immediately. Open the block within the database
+    transaction, so the events are saved before the `on_commit` callbacks run.
+    """
+    if _collector.get() is not None:
+        yield _collector.get()
+        return
+
+    collector = OrderEventsCollector()
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+    collector.flush()
+
+
+def _create_events(events: List[OrderEvent]) -> List[OrderEvent]:
+    collector = _collector.get()
+    if collector is None:
+        return OrderEvent.objects.bulk_create(events)
+    collector.add(events)
+    return events
+
+
+def _create_event(**data) -> OrderEvent:
+    return _create_events([OrderEvent(**data)])[0]
+
+
 def _line_per_quantity_to_line_object(quantity, line):
     return {"quantity": quantity, "line_pk": line.pk, "item": str(line)}
 
@@ -41,7 +96,7 @@ def _get_payment_data(amount: Optional[Decimal], payment: Payment) -> Dict:
 def event_transaction_capture_requested(
     order_id: "UUID", reference: str, amount: Decimal, user: UserType, app: AppType
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.TRANSACTION_CAPTURE_REQUESTED,
         user=user,
@@ -56,7 +111,7 @@ def event_transaction_capture_requested(
 def event_transaction_refund_requested(
     order_id: "UUID", reference: str, amount: Decimal, user: UserType, app: AppType
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.TRANSACTION_REFUND_REQUESTED,
         user=user,
@@ -71,7 +126,7 @@ def event_transaction_refund_requested(
 def event_transaction_void_requested(
     order_id: "UUID", reference: str, user: UserType, app: AppType
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.TRANSACTION_VOID_REQUESTED,
         user=user,
@@ -85,7 +140,7 @@ def event_transaction_void_requested(
 def event_order_refunded_notification(
     order_id: "UUID", user_id: Optional[int], app_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={
@@ -100,7 +155,7 @@ def event_order_refunded_notification(
 def event_order_confirmed_notification(
     order_id: "UUID", user_id: Optional[int], app_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={
@@ -115,7 +170,7 @@ def event_order_confirmed_notification(
 def event_order_cancelled_notification(
     order_id: "UUID", user_id: Optional[int], app_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={
@@ -130,7 +185,7 @@ def event_order_cancelled_notification(
 def event_order_confirmation_notification(
     order_id: "UUID", user_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={
@@ -144,7 +199,7 @@ def event_order_confirmation_notification(
 def event_fulfillment_confirmed_notification(
     order_id: "UUID", user_id: Optional[int], app_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={
@@ -159,7 +214,7 @@ def event_fulfillment_confirmed_notification(
 def event_fulfillment_digital_links_notification(
     order_id: "UUID", user_id: Optional[int], app_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={
@@ -174,7 +229,7 @@ def event_fulfillment_digital_links_notification(
 def event_payment_confirmed_notification(
     order_id: "UUID", user_id: Optional[int], customer_email: str
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.EMAIL_SENT,
         parameters={"email": customer_email, "email_type": OrderEventsEmails.PAYMENT},
@@ -188,7 +243,7 @@ def invoice_requested_event(
     user: UserType,
     app: AppType,
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order, app=app, type=OrderEvents.INVOICE_REQUESTED, user=user
     )
 
@@ -200,7 +255,7 @@ def invoice_generated_event(
     app: AppType,
     invoice_number: str,
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.INVOICE_GENERATED,
         user=user,
@@ -218,7 +273,7 @@ def invoice_updated_event(
     url: str,
     status: str
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.INVOICE_UPDATED,
         user=user,
@@ -230,7 +285,7 @@ def invoice_updated_event(
 def event_invoice_sent_notification(
     *, order_id: "UUID", user_id: Optional[int], app_id: Optional[int], email: str
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order_id=order_id,
         type=OrderEvents.INVOICE_SENT,
         user_id=user_id,
@@ -248,7 +303,7 @@ def email_resent_event(
 def draft_order_created_event(
     *, order: Order, user: UserType, app: AppType
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order, type=OrderEvents.DRAFT_CREATED, user=user, app=app
     )
 
@@ -267,7 +322,7 @@ def order_added_products_event(
     else:
         lines = _lines_per_quantity_to_line_object_list(order_lines)
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.ADDED_PRODUCTS,
         user=user,
@@ -290,7 +345,7 @@ def order_removed_products_event(
     else:
         lines = _lines_per_quantity_to_line_object_list(order_lines)
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.REMOVED_PRODUCTS,
         user=user,
@@ -311,7 +366,7 @@ def draft_order_created_from_replace_event(
         "related_order_pk": original_order.pk,
         "lines": _lines_per_quantity_to_line_object_list(lines),
     }
-    return OrderEvent.objects.create(
+    return _create_event(
         order=draft_order,
         type=OrderEvents.DRAFT_CREATED_FROM_REPLACE,
         user=user,
@@ -333,18 +388,25 @@ def order_created_event(
                 order=order,
             )
 
-    return OrderEvent.objects.create(order=order, type=event_type, user=user, app=app)
+    return _create_event(order=order, type=event_type, user=user, app=app)
 
 
 def order_confirmed_event(*, order: Order, user: UserType, app: AppType) -> OrderEvent:
-    return OrderEvent.objects.create(
-        order=order, type=OrderEvents.CONFIRMED, user=user, app=app
-    )
+    return _create_event(order=order, type=OrderEvents.CONFIRMED, user=user, app=app)
 
 
 def order_canceled_event(*, order: Order, user: UserType, app: AppType) -> OrderEvent:
-    return OrderEvent.objects.create(
-        order=order, type=OrderEvents.CANCELED, user=user, app=app
+    return _create_event(order=order, type=OrderEvents.CANCELED, user=user, app=app)
+
+
+def orders_canceled_events(
+    *, orders: Iterable[Order], user: UserType, app: AppType
+) -> List[OrderEvent]:
+    return _create_events(
+        [
+            OrderEvent(order=order, type=OrderEvents.CANCELED, user=user, app=app)
+            for order in orders
+        ]
     )
 
 
@@ -358,7 +420,7 @@ def order_manually_marked_as_paid_event(
     parameters = {}  # type: ignore
     if transaction_reference:
         parameters = {"transaction_reference": transaction_reference}
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.ORDER_MARKED_AS_PAID,
         user=user,
@@ -368,7 +430,7 @@ def order_manually_marked_as_paid_event(
 
 
 def order_fully_paid_event(*, order: Order, user: UserType, app: AppType) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order, type=OrderEvents.ORDER_FULLY_PAID, user=user, app=app
     )
 
@@ -377,7 +439,7 @@ def order_replacement_created(
     *, original_order: Order, replace_order: Order, user: UserType, app: AppType
 ) -> OrderEvent:
     parameters = {"related_order_pk": replace_order.pk}
-    return OrderEvent.objects.create(
+    return _create_event(
         order=original_order,
         type=OrderEvents.ORDER_REPLACEMENT_CREATED,
         user=user,
@@ -389,7 +451,7 @@ def order_replacement_created(
 def payment_authorized_event(
     *, order: Order, user: UserType, app: AppType, amount: Decimal, payment: Payment
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.PAYMENT_AUTHORIZED,
         user=user,
@@ -401,7 +463,7 @@ def payment_authorized_event(
 def payment_captured_event(
     *, order: Order, user: UserType, app: AppType, amount: Decimal, payment: Payment
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.PAYMENT_CAPTURED,
         user=user,
@@ -413,7 +475,7 @@ def payment_captured_event(
 def payment_refunded_event(
     *, order: Order, user: UserType, app: AppType, amount: Decimal, payment: Payment
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.PAYMENT_REFUNDED,
         user=user,
@@ -425,7 +487,7 @@ def payment_refunded_event(
 def payment_voided_event(
     *, order: Order, user: UserType, app: AppType, payment: Payment
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.PAYMENT_VOIDED,
         user=user,
@@ -443,7 +505,7 @@ def payment_failed_event(
     if payment:
         parameters.update({"gateway": payment.gateway, "payment_id": payment.token})
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.PAYMENT_FAILED,
         user=user,
@@ -463,7 +525,7 @@ def transaction_event(
 ) -> OrderEvent:
 
     parameters = {"message": name, "reference": reference, "status": status}
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.TRANSACTION_EVENT,
         user=user,
@@ -483,7 +545,7 @@ def external_notification_event(
     parameters = parameters or {}
     parameters["message"] = message
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.EXTERNAL_SERVICE_NOTIFICATION,
         user=user,
@@ -495,7 +557,7 @@ def external_notification_event(
 def fulfillment_canceled_event(
     *, order: Order, user: UserType, app: AppType, fulfillment: Optional[Fulfillment]
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_CANCELED,
         user=user,
@@ -512,7 +574,7 @@ def fulfillment_restocked_items_event(
     fulfillment: Union[Order, Fulfillment],
     warehouse_pk: Optional["UUID"] = None,
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_RESTOCKED_ITEMS,
         user=user,
@@ -531,7 +593,7 @@ def fulfillment_fulfilled_items_event(
     app: AppType,
     fulfillment_lines: List[FulfillmentLine]
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_FULFILLED_ITEMS,
         user=user,
@@ -547,7 +609,7 @@ def fulfillment_awaits_approval_event(
     app: AppType,
     fulfillment_lines: List[FulfillmentLine]
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_AWAITS_APPROVAL,
         user=user,
@@ -564,7 +626,7 @@ def order_returned_event(
     returned_lines: List[Tuple[int, OrderLine]],
 ):
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_RETURNED,
         user=user,
@@ -585,7 +647,7 @@ def fulfillment_replaced_event(
     app: AppType,
     replaced_lines: List[OrderLine],
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_REPLACED,
         user=user,
@@ -603,7 +665,7 @@ def fulfillment_refunded_event(
     amount: Decimal,
     shipping_costs_included: bool
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.FULFILLMENT_REFUNDED,
         user=user,
@@ -627,7 +689,7 @@ def fulfillment_tracking_updated_event(
     tracking_number: str,
     fulfillment: Fulfillment
 ) -> OrderEvent:
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.TRACKING_UPDATED,
         user=user,
@@ -650,7 +712,7 @@ def order_note_added_event(
             )
         kwargs["user"] = user
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=OrderEvents.NOTE_ADDED,
         parameters={"message": message},
@@ -687,7 +749,7 @@ def order_discount_event(
 ) -> OrderEvent:
     discount_parameters = _prepare_discount_object(order_discount, old_order_discount)
 
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=event_type,
         user=user,
@@ -789,7 +851,7 @@ def order_line_discount_event(
 
     line_data = _line_per_quantity_to_line_object(line.quantity, line)
     line_data["discount"] = discount_parameters
-    return OrderEvent.objects.create(
+    return _create_event(
         order=order,
         type=event_type,
         user=user,
@@ -834,9 +896,9 @@ def order_line_product_removed_event(
     order: Order,
     user: UserType,
     app: AppType,
-    order_lines: List[Tuple[int, OrderLine]],
+    order_lines: List[OrderLine],
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         type=OrderEvents.ORDER_LINE_PRODUCT_DELETED,
         order=order,
         user=user,
@@ -849,9 +911,9 @@ def order_line_variant_removed_event(
     order: Order,
     user: UserType,
     app: AppType,
-    order_lines: List[Tuple[int, OrderLine]],
+    order_lines: List[OrderLine],
 ):
-    return OrderEvent.objects.create(
+    return _create_event(
         type=OrderEvents.ORDER_LINE_VARIANT_DELETED,
         order=order,
         user=user,
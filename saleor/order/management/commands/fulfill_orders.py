@@ -0,0 +1,215 @@
+import csv
+import uuid
+from collections import defaultdict
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from ....core.exceptions import InsufficientStock
+from ....plugins.manager import get_plugins_manager
+from ....warehouse.models import Warehouse
+from ... import OrderFulfillmentData
+from ...actions import create_fulfillments_for_orders
+from ...models import Order
+
+FULFILL_ORDERS_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates fulfillments of orders from a CSV file with `order` (number), "
+        "`sku`, `warehouse` (ID or slug), `quantity` and optional `tracking_number` "
+        "columns. Orders are fulfilled in batches, orders with invalid rows or "
+        "insufficient stock are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV file.")
+        parser.add_argument(
+            "--no-notify-customer",
+            action="store_false",
+            dest="notify_customer",
+            help="Don't send fulfillment notifications to the customers.",
+        )
+        parser.add_argument(
+            "--allow-stock-to-be-exceeded",
+            action="store_true",
+            help="Fulfill orders even if the stock is exceeded.",
+        )
+
+    def handle(self, *args, **options):
+        rows_per_order = self.read_rows(options["path"])
+        self.manager = get_plugins_manager()
+        self.site_settings = Site.objects.get_current().settings
+        order_numbers = sorted(rows_per_order)
+        fulfilled_count = 0
+        for offset in range(0, len(order_numbers), FULFILL_ORDERS_BATCH_SIZE):
+            batch = {
+                number: rows_per_order[number]
+                for number in order_numbers[offset : offset + FULFILL_ORDERS_BATCH_SIZE]
+            }
+            fulfilled_count += self.fulfill_orders(batch, options)
+
+        self.stdout.write(
+            f"Fulfilled {fulfilled_count} orders, "
+            f"skipped {len(order_numbers) - fulfilled_count} orders."
+        )
+
+    def read_rows(self, path):
+        rows_per_order = defaultdict(list)
+        invalid_orders = set()
+        with open(path, newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            if not reader.fieldnames or not {
+                "order",
+                "sku",
+                "warehouse",
+                "quantity",
+            }.issubset(reader.fieldnames):
+                raise CommandError(
+                    "The file requires `order`, `sku`, `warehouse` and `quantity` "
+                    "columns."
+                )
+            # The first row of data is in the second line of the file.
+            for line_number, line in enumerate(reader, start=2):
+                try:
+                    number = int(line["order"])
+                except (TypeError, ValueError):
+                    self.stderr.write(
+                        f"Line {line_number}: Invalid order number: {line['order']}."
+                    )
+                    continue
+                try:
+                    quantity = int(line["quantity"])
+                except (TypeError, ValueError):
+                    self.stderr.write(
+                        f"Line {line_number}: Invalid quantity: {line['quantity']}."
+                    )
+                    invalid_orders.add(number)
+                    continue
+                rows_per_order[number].append(
+                    {
+                        "sku": line["sku"],
+                        "warehouse": line["warehouse"],
+                        "quantity": quantity,
+                        "tracking_number": line.get("tracking_number") or "",
+                    }
+                )
+        for number in invalid_orders:
+            rows_per_order[number] = []
+        return rows_per_order
+
+    def fulfill_orders(self, rows_per_order, options):
+        orders = (
+            Order.objects.select_related("channel")
+            .prefetch_related("lines__variant")
+            .in_bulk(rows_per_order.keys(), field_name="number")
+        )
+        warehouses = self.get_warehouses_lookup(rows_per_order.values())
+        fulfillments_data = []
+        for number, rows in rows_per_order.items():
+            order = orders.get(number)
+            try:
+                if order is None:
+                    raise ValueError("Order doesn't exist.")
+                if not rows:
+                    raise ValueError("Order has invalid rows.")
+                fulfillments_data.append(self.clean_order(order, rows, warehouses))
+            except ValueError as error:
+                self.stderr.write(f"Order {number}: {error}")
+
+        while fulfillments_data:
+            try:
+                create_fulfillments_for_orders(
+                    None,
+                    None,
+                    fulfillments_data,
+                    self.manager,
+                    self.site_settings,
+                    notify_customer=options["notify_customer"],
+                    approved=self.site_settings.fulfillment_auto_approve,
+                    allow_stock_to_be_exceeded=options["allow_stock_to_be_exceeded"],
+                )
+            except InsufficientStock as exc:
+                # Skip the orders without enough stock and retry with the rest.
+                order_numbers = {
+                    data.order.pk: data.order.number for data in fulfillments_data
+                }
+                failed_orders = set()
+                for item in exc.items:
+                    if item.order_line:
+                        failed_orders.add(item.order_line.order_id)
+                        self.stderr.write(
+                            f"Order {order_numbers[item.order_line.order_id]}: "
+                            f"Insufficient stock of {item.order_line}."
+                        )
+                if not failed_orders:
+                    raise
+                fulfillments_data = [
+                    data
+                    for data in fulfillments_data
+                    if data.order.pk not in failed_orders
+                ]
+            else:
+                break
+        return len(fulfillments_data)
+
+    @staticmethod
+    def get_warehouses_lookup(rows_per_order):
+        keys = {row["warehouse"] for rows in rows_per_order for row in rows}
+        lookup = {}
+        for warehouse in Warehouse.objects.filter(
+            Q(slug__in=keys) | Q(pk__in=[key for key in keys if _is_uuid(key)])
+        ):
+            lookup[str(warehouse.pk)] = warehouse
+            lookup[warehouse.slug] = warehouse
+        return lookup
+
+    def clean_order(self, order, rows, warehouses):
+        settings = self.site_settings
+        if not order.is_fully_paid() and (
+            settings.fulfillment_auto_approve and not settings.fulfillment_allow_unpaid
+        ):
+            raise ValueError("Cannot fulfill unpaid order.")
+
+        lines_by_sku = {line.product_sku: line for line in order.lines.all()}
+        quantities = defaultdict(int)
+        lines_for_warehouses = defaultdict(list)
+        for row in rows:
+            line = lines_by_sku.get(row["sku"])
+            if line is None:
+                raise ValueError(f"Order has no line with SKU {row['sku']}.")
+            warehouse = warehouses.get(row["warehouse"])
+            if warehouse is None:
+                raise ValueError(f"Warehouse {row['warehouse']} doesn't exist.")
+            if row["quantity"] <= 0:
+                raise ValueError(f"Invalid quantity of {line}.")
+            if settings.fulfillment_auto_approve and (
+                line.variant and line.variant.is_preorder_active()
+            ):
+                raise ValueError(f"Can not fulfill preorder variant of {line}.")
+            quantities[line.pk] += row["quantity"]
+            if quantities[line.pk] > line.quantity_unfulfilled:
+                raise ValueError(
+                    f"Only {line.quantity_unfulfilled} items remaining to fulfill: "
+                    f"{line}."
+                )
+            lines_for_warehouses[str(warehouse.pk)].append(
+                {"order_line": line, "quantity": row["quantity"]}
+            )
+        return OrderFulfillmentData(
+            order=order,
+            lines_for_warehouses=dict(lines_for_warehouses),
+            tracking_number=next(
+                (row["tracking_number"] for row in rows if row["tracking_number"]), ""
+            ),
+        )
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
@@ -1,13 +1,14 @@
+from collections import defaultdict
 from unittest.mock import patch
 
 import pytest
 
 from ...core.exceptions import InsufficientStock
-from ...order import OrderEvents
+from ...order import OrderEvents, OrderFulfillmentData
 from ...plugins.manager import get_plugins_manager
 from ...tests.utils import flush_post_commit_hooks
 from ...warehouse.models import Allocation, Stock
-from ..actions import create_fulfillments
+from ..actions import create_fulfillments, create_fulfillments_for_orders
 from ..models import FulfillmentLine, OrderStatus
 
 
@@ -754,3 +755,104 @@ def test_create_fulfillments_quantity_allocated_lower_than_line_quantity(
     mock_email_fulfillment.assert_called_once_with(
         order, order.fulfillments.get(), staff_user, None, manager
     )
+
+
+@pytest.fixture
+def orders_to_fulfill(order_with_lines, order_with_lines_channel_PLN, warehouse):
+    channel_PLN = order_with_lines_channel_PLN.channel
+    channel_PLN.warehouses.add(warehouse)
+    for shipping_zone in warehouse.shipping_zones.all():
+        shipping_zone.channels.add(channel_PLN)
+    return [order_with_lines, order_with_lines_channel_PLN]
+
+
+def _get_order_fulfillment_data(order, tracking_number=""):
+    lines_for_warehouses = defaultdict(list)
+    for line in order.lines.all():
+        warehouse_pk = str(line.allocations.get().stock.warehouse_id)
+        lines_for_warehouses[warehouse_pk].append(
+            {"order_line": line, "quantity": line.quantity}
+        )
+    return OrderFulfillmentData(
+        order=order,
+        lines_for_warehouses=dict(lines_for_warehouses),
+        tracking_number=tracking_number,
+    )
+
+
+@patch("saleor.plugins.manager.PluginsManager.fulfillment_approved")
+@patch("saleor.order.actions.send_fulfillment_confirmation_to_customer", autospec=True)
+def test_create_fulfillments_for_orders(
+    mock_email_fulfillment,
+    mock_fulfillment_approved,
+    staff_user,
+    orders_to_fulfill,
+    site_settings,
+):
+    # given
+    orders = orders_to_fulfill
+    fulfillments_data = [
+        _get_order_fulfillment_data(orders[0], tracking_number="123"),
+        _get_order_fulfillment_data(orders[1]),
+    ]
+    stock_quantities = {
+        stock.pk: stock.quantity
+        for stock in Stock.objects.filter(allocations__order_line__order__in=orders)
+    }
+    manager = get_plugins_manager()
+
+    # when
+    fulfillments = create_fulfillments_for_orders(
+        staff_user, None, fulfillments_data, manager, site_settings
+    )
+    flush_post_commit_hooks()
+
+    # then
+    assert len(fulfillments) == 2
+    for order, fulfillment in zip(orders, fulfillments):
+        order.refresh_from_db()
+        assert order.status == OrderStatus.FULFILLED
+        assert order.fulfillments.get() == fulfillment
+        assert fulfillment.fulfillment_order == 1
+        for line in order.lines.all():
+            assert line.quantity_fulfilled == line.quantity
+            fulfillment_line = line.fulfillment_lines.get()
+            assert fulfillment_line.fulfillment == fulfillment
+            assert fulfillment_line.quantity == line.quantity
+            stock = fulfillment_line.stock
+            assert stock.quantity == stock_quantities[stock.pk] - line.quantity
+        event = order.events.get()
+        assert event.type == OrderEvents.FULFILLMENT_FULFILLED_ITEMS
+        assert event.user == staff_user
+    assert fulfillments[0].tracking_number == "123"
+    assert not Allocation.objects.filter(
+        order_line__order__in=orders, quantity_allocated__gt=0
+    ).exists()
+
+    flush_post_commit_hooks()
+    assert mock_email_fulfillment.call_count == 2
+    assert mock_fulfillment_approved.call_count == 2
+
+
+def test_create_fulfillments_for_orders_insufficient_stock(
+    staff_user, orders_to_fulfill, site_settings
+):
+    # given
+    orders = orders_to_fulfill
+    fulfillments_data = [_get_order_fulfillment_data(order) for order in orders]
+    line = orders[1].lines.first()
+    stock = line.allocations.get().stock
+    stock.quantity = 0
+    stock.save(update_fields=["quantity"])
+
+    # when
+    with pytest.raises(InsufficientStock) as exc:
+        create_fulfillments_for_orders(
+            staff_user, None, fulfillments_data, get_plugins_manager(), site_settings
+        )
+
+    # then
+    assert [item.order_line for item in exc.value.items] == [line]
+    for order in orders:
+        assert not order.fulfillments.exists()
+        assert not order.lines.filter(quantity_fulfilled__gt=0).exists()
@@ -30,12 +30,15 @@ from .. import FulfillmentStatus, OrderEvents, OrderStatus
 from ..calculations import fetch_order_prices_if_expired
 from ..events import (
     OrderEventsEmails,
+    collect_order_events,
     event_fulfillment_confirmed_notification,
     event_fulfillment_digital_links_notification,
     event_order_cancelled_notification,
     event_order_confirmation_notification,
     event_order_refunded_notification,
     event_payment_confirmed_notification,
+    order_confirmed_event,
+    order_note_added_event,
 )
 from ..models import Order
 from ..notifications import (
@@ -1154,6 +1157,57 @@ def test_email_sent_event_without_user_and_app_pk(
     }
 
 
+def test_collect_order_events(order, staff_user, django_assert_num_queries):
+    # given
+    with django_assert_num_queries(1):
+        with collect_order_events():
+            # when
+            confirmed_event = order_confirmed_event(
+                order=order, user=staff_user, app=None
+            )
+            note_event = order_note_added_event(
+                order=order, user=staff_user, app=None, message="Note"
+            )
+
+            # then
+            assert confirmed_event.pk is None
+            assert note_event.pk is None
+
+    assert confirmed_event.pk
+    assert note_event.pk
+    assert list(order.events.order_by("pk").values_list("type", flat=True)) == [
+        OrderEvents.CONFIRMED,
+        OrderEvents.NOTE_ADDED,
+    ]
+
+
+def test_collect_order_events_nested(order, staff_user):
+    # given
+    with collect_order_events() as collector:
+        with collect_order_events() as nested_collector:
+            # when
+            order_confirmed_event(order=order, user=staff_user, app=None)
+
+        # then
+        assert nested_collector is collector
+        assert not order.events.exists()
+
+    assert order.events.get().type == OrderEvents.CONFIRMED
+
+
+def test_collect_order_events_discards_events_on_error(order, staff_user):
+    # when
+    with pytest.raises(ValueError):
+        with collect_order_events():
+            order_confirmed_event(order=order, user=staff_user, app=None)
+            raise ValueError()
+
+    # then
+    assert not order.events.exists()
+    event = order_confirmed_event(order=order, user=staff_user, app=None)
+    assert event.pk
+
+
 GET_ORDER_AVAILABLE_COLLECTION_POINTS = """
     query getAvailableCollectionPointsForOrder(
         $id: ID!
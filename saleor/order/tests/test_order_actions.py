@@ -19,6 +19,7 @@ from ..actions import (
     automatically_fulfill_digital_lines,
     cancel_fulfillment,
     cancel_order,
+    cancel_orders,
     clean_mark_order_as_paid,
     fulfill_order_lines,
     handle_fully_paid_order,
@@ -375,6 +376,49 @@ def test_cancel_order(
     )
 
 
+@patch("saleor.plugins.manager.PluginsManager.order_cancelled")
+@patch("saleor.order.actions.send_order_canceled_confirmation")
+def test_cancel_orders(
+    send_order_canceled_confirmation_mock,
+    order_cancelled_mock,
+    order_with_lines,
+    order_with_lines_channel_PLN,
+    staff_user,
+):
+    # given
+    orders = [order_with_lines, order_with_lines_channel_PLN]
+    manager = get_plugins_manager()
+    stocks = list(
+        Stock.objects.filter(allocations__order_line__order__in=orders).distinct()
+    )
+    assert stocks
+    for stock in stocks:
+        stock.quantity_allocated = sum(
+            allocation.quantity_allocated for allocation in stock.allocations.all()
+        )
+    Stock.objects.bulk_update(stocks, ["quantity_allocated"])
+
+    # when
+    cancel_orders(orders, staff_user, None, manager)
+
+    # then
+    for order in orders:
+        order.refresh_from_db()
+        assert order.status == OrderStatus.CANCELED
+        order_event = order.events.get(type=OrderEvents.CANCELED)
+        assert order_event.user == staff_user
+    assert not Allocation.objects.filter(
+        order_line__order__in=orders, quantity_allocated__gt=0
+    ).exists()
+    for stock in stocks:
+        stock.refresh_from_db()
+        assert stock.quantity_allocated == 0
+
+    flush_post_commit_hooks()
+    assert order_cancelled_mock.call_count == 2
+    assert send_order_canceled_confirmation_mock.call_count == 2
+
+
 @patch("saleor.order.actions.send_order_refunded_confirmation")
 def test_order_refunded_by_user(
     send_order_refunded_confirmation_mock,
@@ -1,8 +1,11 @@
+from collections import defaultdict
 from decimal import Decimal
 from functools import wraps
-from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, cast
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, cast
+from uuid import UUID
 
 import graphene
+from django.db.models import Sum
 from django.utils import timezone
 from prices import Money, TaxedMoney
 
@@ -50,7 +53,7 @@ from . import (
     events,
 )
 from .fetch import OrderLineInfo
-from .models import Order, OrderLine
+from .models import Fulfillment, FulfillmentLine, Order, OrderLine
 
 if TYPE_CHECKING:
     from ..app.models import App
@@ -182,26 +185,93 @@ def update_order_status(order):
         status=FulfillmentStatus.WAITING_FOR_APPROVAL
     ).exists()
 
-    # total_quantity == 0 means that all products have been replaced, we don't change
-    # the order status in that case
-    if total_quantity == 0:
-        status = order.status
-    elif quantity_fulfilled <= 0:
-        status = OrderStatus.UNFULFILLED
-    elif 0 < quantity_returned < total_quantity:
-        status = OrderStatus.PARTIALLY_RETURNED
-    elif quantity_returned == total_quantity:
-        status = OrderStatus.RETURNED
-    elif quantity_fulfilled < total_quantity or awaiting_approval:
-        status = OrderStatus.PARTIALLY_FULFILLED
-    else:
-        status = OrderStatus.FULFILLED
-
+    status = _get_order_status(
+        order, total_quantity, quantity_fulfilled, quantity_returned, awaiting_approval
+    )
     if status != order.status:
         order.status = status
         order.save(update_fields=["status", "updated_at"])
 
 
+def update_orders_status(orders: Iterable[Order]):
+    """Update statuses of many orders depending on their fulfillments.
+
+    Quantities of the orders are calculated with aggregate queries, so the number
+    of queries doesn't depend on the number of orders.
+    """
+    orders = list(orders)
+    quantities = {
+        data["order_id"]: data
+        for data in OrderLine.objects.filter(order__in=orders)
+        .order_by()
+        .values("order_id")
+        .annotate(
+            total_quantity=Sum("quantity"), quantity_fulfilled=Sum("quantity_fulfilled")
+        )
+    }
+    quantity_returned: Dict[UUID, int] = defaultdict(int)
+    quantity_replaced: Dict[UUID, int] = defaultdict(int)
+    for data in (
+        FulfillmentLine.objects.filter(
+            fulfillment__order__in=orders,
+            fulfillment__status__in=[
+                FulfillmentStatus.RETURNED,
+                FulfillmentStatus.REFUNDED_AND_RETURNED,
+                FulfillmentStatus.REPLACED,
+            ],
+        )
+        .order_by()
+        .values("fulfillment__order_id", "fulfillment__status")
+        .annotate(quantity=Sum("quantity"))
+    ):
+        order_id = data["fulfillment__order_id"]
+        if data["fulfillment__status"] == FulfillmentStatus.REPLACED:
+            quantity_replaced[order_id] += data["quantity"]
+        else:
+            quantity_returned[order_id] += data["quantity"]
+    awaiting_approval = set(
+        Fulfillment.objects.filter(
+            order__in=orders, status=FulfillmentStatus.WAITING_FOR_APPROVAL
+        ).values_list("order_id", flat=True)
+    )
+
+    orders_to_update = []
+    now = timezone.now()
+    for order in orders:
+        order_quantities = quantities.get(order.pk, {})
+        status = _get_order_status(
+            order,
+            (order_quantities.get("total_quantity") or 0) - quantity_replaced[order.pk],
+            (order_quantities.get("quantity_fulfilled") or 0)
+            - quantity_replaced[order.pk],
+            quantity_returned[order.pk],
+            order.pk in awaiting_approval,
+        )
+        if status != order.status:
+            order.status = status
+            order.updated_at = now
+            orders_to_update.append(order)
+    Order.objects.bulk_update(orders_to_update, ["status", "updated_at"])
+
+
+def _get_order_status(
+    order, total_quantity, quantity_fulfilled, quantity_returned, awaiting_approval
+):
+    # total_quantity == 0 means that all products have been replaced, we don't change
+    # the order status in that case
+    if total_quantity == 0:
+        return order.status
+    if quantity_fulfilled <= 0:
+        return OrderStatus.UNFULFILLED
+    if 0 < quantity_returned < total_quantity:
+        return OrderStatus.PARTIALLY_RETURNED
+    if quantity_returned == total_quantity:
+        return OrderStatus.RETURNED
+    if quantity_fulfilled < total_quantity or awaiting_approval:
+        return OrderStatus.PARTIALLY_FULFILLED
+    return OrderStatus.FULFILLED
+
+
 @traced_atomic_transaction()
 def create_order_line(
     order,
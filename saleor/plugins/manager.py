@@ -25,6 +25,7 @@ from prices import TaxedMoney
 
 from ..channel.models import Channel
 from ..checkout import base_calculations
+from ..checkout.fetch import invalidate_checkout_lines_snapshots
 from ..core.models import EventDelivery
 from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
@@ -580,12 +581,14 @@ class PluginsManager(PaymentInterface):
 
     def collection_updated(self, collection: "Collection"):
         default_value = None
+        invalidate_checkout_lines_snapshots()
         return self.__run_method_on_plugins(
             "collection_updated", default_value, collection
         )
 
     def collection_deleted(self, collection: "Collection"):
         default_value = None
+        invalidate_checkout_lines_snapshots()
         return self.__run_method_on_plugins(
             "collection_deleted", default_value, collection
         )
@@ -602,10 +605,12 @@ class PluginsManager(PaymentInterface):
 
     def product_updated(self, product: "Product"):
         default_value = None
+        invalidate_checkout_lines_snapshots()
         return self.__run_method_on_plugins("product_updated", default_value, product)
 
     def product_deleted(self, product: "Product", variants: List[int]):
         default_value = None
+        invalidate_checkout_lines_snapshots()
         return self.__run_method_on_plugins(
             "product_deleted", default_value, product, variants
         )
@@ -624,12 +629,14 @@ class PluginsManager(PaymentInterface):
 
     def product_variant_updated(self, product_variant: "ProductVariant"):
         default_value = None
+        invalidate_checkout_lines_snapshots()
         return self.__run_method_on_plugins(
             "product_variant_updated", default_value, product_variant
         )
 
     def product_variant_deleted(self, product_variant: "ProductVariant"):
         default_value = None
+        invalidate_checkout_lines_snapshots()
         return self.__run_method_on_plugins(
             "product_variant_deleted",
             default_value,
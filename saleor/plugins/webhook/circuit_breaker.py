@@ -0,0 +1,160 @@
+"""Per-target circuit breaker for async webhooks.
+
+State of the breaker is kept in the cache, so it's shared between workers.
+Parked deliveries are kept in the database, so they aren't lost when the cache
+is evicted or when workers park and replay them concurrently.
+
+The breaker is closed until the failure rate of deliveries sent to the target
+within `WEBHOOK_CIRCUIT_BREAKER_WINDOW` crosses the threshold. Then it opens for
+`WEBHOOK_CIRCUIT_BREAKER_COOLDOWN` and deliveries to the target are parked, without
+any network calls. After the cooldown, a single delivery is sent as a probe.
+When it succeeds, the breaker closes and parked deliveries are replayed; otherwise
+the breaker opens again. Targets which receive no new deliveries are probed by
+`probe_webhook_circuit_breakers_task`, so their parked deliveries aren't stuck.
+"""
+import hashlib
+import time
+from enum import Enum
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ...core.models import ParkedEventDelivery
+
+CIRCUIT_BREAKER_KEY_PREFIX = "webhook_circuit_breaker"
+
+
+class CircuitBreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class WebhookCircuitBreaker:
+    def __init__(self, target_url: str):
+        parts = urlparse(target_url)
+        target = f"{parts.scheme}://{parts.hostname}:{parts.port}{parts.path}"
+        if parts.scheme.lower() in ["http", "https"]:
+            # All endpoints of the same host share the breaker.
+            target = f"{parts.scheme}://{parts.hostname}:{parts.port}"
+        target_hash = hashlib.sha256(target.encode()).hexdigest()
+        self.key_prefix = f"{CIRCUIT_BREAKER_KEY_PREFIX}:{target_hash}"
+
+    def _key(self, name: str) -> str:
+        return f"{self.key_prefix}:{name}"
+
+    def _window_key(self, name: str) -> str:
+        window = settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW.total_seconds()
+        return self._key(f"{name}:{int(time.time() // window)}")
+
+    @staticmethod
+    def _incr(key: str, timeout: Optional[float]) -> int:
+        if cache.add(key, 1, timeout=timeout):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=timeout)
+            return 1
+
+    def get_state(self) -> CircuitBreakerState:
+        if cache.get(self._key("open")):
+            return CircuitBreakerState.OPEN
+        if cache.get(self._key("tripped")):
+            return CircuitBreakerState.HALF_OPEN
+        return CircuitBreakerState.CLOSED
+
+    def allow_request(self) -> bool:
+        """Return whether a delivery can be sent to the target.
+
+        In the half-open state, only one delivery is let through as the probe.
+        """
+        state = self.get_state()
+        if state == CircuitBreakerState.CLOSED:
+            return True
+        if state == CircuitBreakerState.OPEN:
+            return False
+        probe_timeout = settings.WEBHOOK_TIMEOUT * 2
+        return cache.add(self._key("probe"), 1, timeout=probe_timeout)
+
+    def record_result(self, success: bool) -> bool:
+        """Record the delivery result and return whether the breaker has closed."""
+        if cache.get(self._key("tripped")):
+            cache.delete(self._key("probe"))
+            if success:
+                self.close()
+                return True
+            self.open()
+            return False
+
+        timeout = settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW.total_seconds() * 2
+        total = self._incr(self._window_key("total"), timeout)
+        if success:
+            return False
+        failures = self._incr(self._window_key("failures"), timeout)
+        if (
+            total >= settings.WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS
+            and failures / total >= settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        ):
+            self.open()
+        return False
+
+    def open(self):
+        cooldown = settings.WEBHOOK_CIRCUIT_BREAKER_COOLDOWN.total_seconds()
+        cache.set(self._key("open"), 1, timeout=cooldown)
+        # The breaker stays half-open until a probe succeeds, so it can't close
+        # without replaying the parked deliveries.
+        cache.set(self._key("tripped"), 1, timeout=None)
+
+    def close(self):
+        cache.delete_many(
+            [
+                self._key("open"),
+                self._key("tripped"),
+                self._window_key("total"),
+                self._window_key("failures"),
+            ]
+        )
+
+    def park(self, delivery_id: int):
+        """Add the delivery to the queue replayed when the breaker closes."""
+        ParkedEventDelivery.objects.bulk_create(
+            [
+                ParkedEventDelivery(
+                    circuit_breaker_key=self.key_prefix, delivery_id=delivery_id
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+    def get_parked_count(self) -> int:
+        return ParkedEventDelivery.objects.filter(
+            circuit_breaker_key=self.key_prefix
+        ).count()
+
+    def pop_parked(self, limit: Optional[int] = None) -> List[int]:
+        """Return IDs of parked deliveries and remove them from the queue.
+
+        When `limit` is given, only that many deliveries from the head of the queue
+        are returned. Deliveries popped concurrently by another worker are skipped.
+        """
+        with transaction.atomic():
+            parked = (
+                ParkedEventDelivery.objects.select_for_update(skip_locked=True)
+                .filter(circuit_breaker_key=self.key_prefix)
+                .order_by("pk")
+            )
+            if limit is not None:
+                parked = parked[:limit]
+            rows = list(parked.values_list("pk", "delivery_id"))
+            ParkedEventDelivery.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+        return [delivery_id for _, delivery_id in rows]
+
+    def get_metrics(self, state: Optional[CircuitBreakerState] = None) -> dict:
+        return {
+            "circuit_breaker_state": (state or self.get_state()).value,
+            "parked_deliveries_count": self.get_parked_count(),
+        }
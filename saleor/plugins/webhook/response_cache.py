@@ -0,0 +1,171 @@
+"""Caching responses of idempotent sync webhooks.
+
+Responses of events listed in `CACHEABLE_SYNC_EVENTS` are cached under the hash
+of the normalized payload, so the same checkout or order doesn't require
+a blocking request to the app each time it's fetched.
+
+Responses are kept for the time configured per event type in
+`WEBHOOK_SYNC_RESPONSE_CACHE_TIMEOUTS`. When
+`WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED` is set, apps can override it with
+the `max-age`, `stale-while-revalidate`, `no-cache` and `no-store` directives
+of the `Cache-Control` header of the response.
+
+A stale response is still returned within the `stale-while-revalidate` period,
+while the fresh one is fetched in the background.
+"""
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ...webhook.event_types import WebhookEventSyncType
+
+if TYPE_CHECKING:
+    from ...webhook.models import Webhook
+
+RESPONSE_CACHE_KEY_PREFIX = "webhook_sync_response"
+
+CACHEABLE_SYNC_EVENTS = {
+    WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES,
+    WebhookEventSyncType.ORDER_CALCULATE_TAXES,
+    WebhookEventSyncType.PAYMENT_LIST_GATEWAYS,
+    WebhookEventSyncType.SHIPPING_LIST_METHODS_FOR_CHECKOUT,
+}
+
+# Keys of the payload which differ between requests for the same data.
+VOLATILE_PAYLOAD_KEYS = {"issued_at", "issuedAt"}
+
+
+@dataclass
+class CachedResponse:
+    response_data: Any
+    # Timestamps until which the response is fresh, and can be served while stale.
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.fresh_until
+
+
+def _normalize(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {
+            key: _normalize(value)
+            for key, value in data.items()
+            if key not in VOLATILE_PAYLOAD_KEYS
+        }
+    if isinstance(data, list):
+        return [_normalize(value) for value in data]
+    return data
+
+
+def get_response_cache_key(
+    event_type: str, webhook: "Webhook", payload: str
+) -> Optional[str]:
+    """Return the cache key of the response, or `None` if it can't be cached."""
+    if event_type not in CACHEABLE_SYNC_EVENTS:
+        return None
+    if not (
+        settings.WEBHOOK_SYNC_RESPONSE_CACHE_TIMEOUTS.get(event_type)
+        or settings.WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED
+    ):
+        return None
+    try:
+        normalized_payload = json.dumps(
+            _normalize(json.loads(payload)), sort_keys=True, separators=(",", ":")
+        )
+    except ValueError:
+        normalized_payload = payload
+    payload_hash = hashlib.sha256(
+        f"{webhook.target_url}:{normalized_payload}".encode()
+    ).hexdigest()
+    return f"{RESPONSE_CACHE_KEY_PREFIX}:{event_type}:{webhook.pk}:{payload_hash}"
+
+
+def parse_cache_control(headers: Optional[Dict[str, str]]) -> Dict[str, Optional[str]]:
+    """Return directives of the `Cache-Control` header, by lowercase name."""
+    header = next(
+        (
+            value
+            for name, value in (headers or {}).items()
+            if name.lower() == "cache-control"
+        ),
+        "",
+    )
+    directives: Dict[str, Optional[str]] = {}
+    for directive in header.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def _get_seconds(directives: Dict[str, Optional[str]], name: str) -> Optional[int]:
+    try:
+        return max(int(directives[name] or ""), 0)
+    except (KeyError, ValueError):
+        return None
+
+
+def get_response_cache_timeouts(
+    event_type: str, response_headers: Optional[Dict[str, str]]
+) -> Tuple[float, float]:
+    """Return for how long the response is fresh and can be served while stale."""
+    timeout = settings.WEBHOOK_SYNC_RESPONSE_CACHE_TIMEOUTS.get(event_type)
+    stale_timeout = settings.WEBHOOK_SYNC_RESPONSE_CACHE_STALE_WHILE_REVALIDATE
+    timeout = timeout.total_seconds() if timeout else 0
+    stale_timeout = stale_timeout.total_seconds()
+
+    if settings.WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED:
+        directives = parse_cache_control(response_headers)
+        if {"no-store", "no-cache"} & directives.keys():
+            return 0, 0
+        max_age = _get_seconds(directives, "max-age")
+        if max_age is not None:
+            timeout = max_age
+        stale_while_revalidate = _get_seconds(directives, "stale-while-revalidate")
+        if stale_while_revalidate is not None:
+            stale_timeout = stale_while_revalidate
+    return timeout, stale_timeout
+
+
+def get_cached_response(cache_key: str) -> Optional[CachedResponse]:
+    cached_response = cache.get(cache_key)
+    if cached_response is None or cached_response.stale_until <= time.time():
+        return None
+    return cached_response
+
+
+def cache_response(
+    cache_key: str,
+    event_type: str,
+    response_data: Any,
+    response_headers: Optional[Dict[str, str]],
+):
+    timeout, stale_timeout = get_response_cache_timeouts(event_type, response_headers)
+    cache.delete(f"{cache_key}:refresh")
+    if not timeout:
+        cache.delete(cache_key)
+        return
+    now = time.time()
+    cached_response = CachedResponse(
+        response_data=response_data,
+        fresh_until=now + timeout,
+        stale_until=now + timeout + stale_timeout,
+    )
+    cache.set(cache_key, cached_response, timeout=timeout + stale_timeout)
+
+
+def should_refresh(cache_key: str) -> bool:
+    """Return whether the stale response should be refreshed by this request.
+
+    Only one refresh of the response runs at a time.
+    """
+    return cache.add(
+        f"{cache_key}:refresh", 1, timeout=settings.WEBHOOK_SYNC_TIMEOUT * 2
+    )
@@ -2,17 +2,20 @@ import json
 import logging
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from json import JSONDecodeError
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from urllib.parse import unquote, urlparse, urlunparse
 
 import boto3
+import opentracing
 import requests
 from botocore.exceptions import ClientError
 from celery import group
 from celery.exceptions import MaxRetriesExceededError, Retry
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
 from google.cloud import pubsub_v1
 from requests.exceptions import RequestException
@@ -20,7 +23,7 @@ from requests.exceptions import RequestException
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
 from ...celeryconf import app
 from ...core import EventDeliveryStatus
-from ...core.models import EventDelivery, EventPayload
+from ...core.models import EventDelivery, EventPayload, ParkedEventDelivery
 from ...core.tracing import webhooks_opentracing_trace
 from ...core.utils import build_absolute_uri
 from ...graphql.webhook.subscription_payload import (
@@ -35,6 +38,13 @@ from ...webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
 from ...webhook.observability import WebhookData
 from ...webhook.utils import get_webhooks_for_event
 from . import signature_for_payload
+from .circuit_breaker import CircuitBreakerState, WebhookCircuitBreaker
+from .response_cache import (
+    cache_response,
+    get_cached_response,
+    get_response_cache_key,
+    should_refresh,
+)
 from .utils import (
     attempt_update,
     catch_duration_time,
@@ -87,7 +97,7 @@ def create_deliveries_for_subscriptions(
         )
         return []
 
-    event_payloads = []
+    payloads = []
     event_deliveries = []
     for webhook in webhooks:
         data = generate_payload_from_subscription(
@@ -105,18 +115,18 @@ def create_deliveries_for_subscriptions(
             )
             continue
 
-        event_payload = EventPayload(payload=json.dumps({**data}))
-        event_payloads.append(event_payload)
+        payloads.append(json.dumps({**data}))
         event_deliveries.append(
             EventDelivery(
                 status=EventDeliveryStatus.PENDING,
                 event_type=event_type,
-                payload=event_payload,
                 webhook=webhook,
             )
         )
 
-    EventPayload.objects.bulk_create(event_payloads)
+    event_payloads = EventPayload.objects.bulk_create_with_payloads(payloads)
+    for event_delivery, event_payload in zip(event_deliveries, event_payloads):
+        event_delivery.payload = event_payload
     return EventDelivery.objects.bulk_create(event_deliveries)
 
 
@@ -158,7 +168,7 @@ def create_delivery_for_subscription_sync_event(
         raise PaymentError(
             f"No payload was generated with subscription for event: {event_type}"
         )
-    event_payload = EventPayload.objects.create(payload=json.dumps({**data}))
+    event_payload = EventPayload.objects.create_with_payload(json.dumps({**data}))
     event_delivery = EventDelivery.objects.create(
         status=EventDeliveryStatus.PENDING,
         event_type=event_type,
@@ -183,7 +193,7 @@ def trigger_webhooks_async(
     deliveries = []
 
     if regular_webhooks:
-        payload = EventPayload.objects.create(payload=data)
+        payload = EventPayload.objects.create_with_payload(data)
         deliveries.extend(
             create_event_delivery_list_for_webhooks(
                 webhooks=webhooks,
@@ -231,7 +241,7 @@ def trigger_webhook_sync(
         if not delivery:
             return None
     else:
-        event_payload = EventPayload.objects.create(payload=data)
+        event_payload = EventPayload.objects.create_with_payload(data)
         delivery = EventDelivery.objects.create(
             status=EventDeliveryStatus.PENDING,
             event_type=event_type,
@@ -282,7 +292,9 @@ def trigger_all_webhooks_sync(
                 return None
         else:
             if event_payload is None:
-                event_payload = EventPayload.objects.create(payload=generate_payload())
+                event_payload = EventPayload.objects.create_with_payload(
+                    generate_payload()
+                )
             delivery = EventDelivery.objects.create(
                 status=EventDeliveryStatus.PENDING,
                 event_type=event_type,
@@ -347,19 +359,45 @@ def send_webhook_using_http(
     )
 
 
-def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
+# SQS limits of a single `SendMessageBatch` call.
+SQS_MAX_BATCH_MESSAGES = 10
+SQS_MAX_BATCH_SIZE = 256 * 1024
+
+
+@lru_cache(maxsize=None)
+def get_sqs_client(region, access_key_id, secret_access_key):
+    """Return the SQS client for given credentials, shared within the process."""
+    extra_kwargs = {}
+    if settings.WEBHOOK_AWS_SQS_ENDPOINT_URL:
+        extra_kwargs["endpoint_url"] = settings.WEBHOOK_AWS_SQS_ENDPOINT_URL
+    return boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        **extra_kwargs,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_pubsub_publisher():
+    """Return the Pub/Sub publisher shared within the process.
+
+    The publisher batches messages published close in time.
+    """
+    return pubsub_v1.PublisherClient()
+
+
+def _get_sqs_client_and_queue_url(target_url):
     parts = urlparse(target_url)
     region = "us-east-1"
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=(
-            unquote(parts.password) if parts.password else parts.password
-        ),
+    client = get_sqs_client(
+        region,
+        parts.username,
+        unquote(parts.password) if parts.password else parts.password,
     )
     queue_url = urlunparse(
         (
@@ -371,8 +409,10 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
             parts.fragment,
         )
     )
-    is_fifo = parts.path.endswith(".fifo")
+    return client, queue_url
+
 
+def _get_sqs_message_kwargs(target_url, message, domain, signature, event_type):
     msg_attributes = {
         "SaleorDomain": {"DataType": "String", "StringValue": domain},
         "SaleorApiUrl": {
@@ -388,12 +428,46 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
         }
 
     message_kwargs = {
-        "QueueUrl": queue_url,
         "MessageAttributes": msg_attributes,
         "MessageBody": message.decode("utf-8"),
     }
-    if is_fifo:
+    if urlparse(target_url).path.endswith(".fifo"):
         message_kwargs["MessageGroupId"] = domain
+    return message_kwargs
+
+
+def _get_sqs_message_size(message_kwargs) -> int:
+    size = len(message_kwargs["MessageBody"].encode("utf-8"))
+    for name, attribute in message_kwargs["MessageAttributes"].items():
+        size += len(name) + len(attribute["DataType"])
+        size += len(attribute["StringValue"].encode("utf-8"))
+    return size
+
+
+def _get_sqs_batches(messages_kwargs):
+    """Split messages into batches within limits of `SendMessageBatch`."""
+    batch: List[Tuple[int, dict]] = []
+    batch_size = 0
+    for index, message_kwargs in enumerate(messages_kwargs):
+        message_size = _get_sqs_message_size(message_kwargs)
+        if batch and (
+            len(batch) == SQS_MAX_BATCH_MESSAGES
+            or batch_size + message_size > SQS_MAX_BATCH_SIZE
+        ):
+            yield batch
+            batch, batch_size = [], 0
+        batch.append((index, message_kwargs))
+        batch_size += message_size
+    if batch:
+        yield batch
+
+
+def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
+    client, queue_url = _get_sqs_client_and_queue_url(target_url)
+    message_kwargs = {
+        "QueueUrl": queue_url,
+        **_get_sqs_message_kwargs(target_url, message, domain, signature, event_type),
+    }
     with catch_duration_time() as duration:
         try:
             response = client.send_message(**message_kwargs)
@@ -404,21 +478,70 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
         return WebhookResponse(content=response, duration=duration())
 
 
+def send_webhooks_using_aws_sqs(
+    target_url, messages, domain, signatures, event_type
+) -> List[WebhookResponse]:
+    """Send messages to the queue using `SendMessageBatch` calls."""
+    client, queue_url = _get_sqs_client_and_queue_url(target_url)
+    messages_kwargs = [
+        _get_sqs_message_kwargs(target_url, message, domain, signature, event_type)
+        for message, signature in zip(messages, signatures)
+    ]
+    responses = [WebhookResponse(content="") for _ in messages]
+    for batch in _get_sqs_batches(messages_kwargs):
+        entries = [
+            {"Id": str(index), **message_kwargs} for index, message_kwargs in batch
+        ]
+        with catch_duration_time() as duration:
+            try:
+                response = client.send_message_batch(
+                    QueueUrl=queue_url, Entries=entries
+                )
+            except (ClientError,) as e:
+                for index, _ in batch:
+                    responses[index] = WebhookResponse(
+                        content=str(e),
+                        status=EventDeliveryStatus.FAILED,
+                        duration=duration(),
+                    )
+                continue
+            batch_duration = duration()
+        for entry in response.get("Successful", []):
+            responses[int(entry["Id"])] = WebhookResponse(
+                content=entry, duration=batch_duration
+            )
+        for entry in response.get("Failed", []):
+            responses[int(entry["Id"])] = WebhookResponse(
+                content=entry,
+                status=EventDeliveryStatus.FAILED,
+                duration=batch_duration,
+            )
+    return responses
+
+
+def _publish_using_google_cloud_pubsub(
+    client, topic_name, message, domain, signature, event_type
+):
+    return client.publish(
+        topic_name,
+        message,
+        saleorDomain=domain,
+        saleorApiUrl=build_absolute_uri(reverse("api"), domain),
+        eventType=event_type,
+        signature=signature,
+    )
+
+
 def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = get_pubsub_publisher()
     topic_name = parts.path[1:]  # drop the leading slash
     with catch_duration_time() as duration:
         try:
-            future = client.publish(
-                topic_name,
-                message,
-                saleorDomain=domain,
-                saleorApiUrl=build_absolute_uri(reverse("api"), domain),
-                eventType=event_type,
-                signature=signature,
+            future = _publish_using_google_cloud_pubsub(
+                client, topic_name, message, domain, signature, event_type
             )
         except (pubsub_v1.publisher.exceptions.MessageTooLargeError, RuntimeError) as e:
             return WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED)
@@ -427,6 +550,49 @@ def send_webhook_using_google_cloud_pubsub(
         return WebhookResponse(content=response, duration=response_duration)
 
 
+def send_webhooks_using_google_cloud_pubsub(
+    target_url, messages, domain, signatures, event_type
+) -> List[WebhookResponse]:
+    """Publish all messages before waiting for results.
+
+    This lets the publisher send the messages in batches.
+    """
+    parts = urlparse(target_url)
+    client = get_pubsub_publisher()
+    topic_name = parts.path[1:]  # drop the leading slash
+    responses: List[WebhookResponse] = []
+    futures: List[Optional[pubsub_v1.publisher.futures.Future]] = []
+    with catch_duration_time() as duration:
+        for message, signature in zip(messages, signatures):
+            try:
+                future = _publish_using_google_cloud_pubsub(
+                    client, topic_name, message, domain, signature, event_type
+                )
+            except (
+                pubsub_v1.publisher.exceptions.MessageTooLargeError,
+                RuntimeError,
+            ) as e:
+                responses.append(
+                    WebhookResponse(content=str(e), status=EventDeliveryStatus.FAILED)
+                )
+                futures.append(None)
+                continue
+            responses.append(WebhookResponse(content=""))
+            futures.append(future)
+        for index, future in enumerate(futures):
+            if future is None:
+                continue
+            try:
+                responses[index].content = future.result()
+            except Exception as e:
+                responses[index].content = str(e)
+                responses[index].status = EventDeliveryStatus.FAILED
+        publish_duration = duration()
+    for response in responses:
+        response.duration = publish_duration
+    return responses
+
+
 def send_webhook_using_scheme_method(
     target_url, domain, secret, event_type, data
 ) -> WebhookResponse:
@@ -451,6 +617,118 @@ def send_webhook_using_scheme_method(
     raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
 
 
+def send_webhooks_using_scheme_method(
+    target_url, domain, secret, event_type, data_list
+) -> List[WebhookResponse]:
+    """Send many payloads to the same target.
+
+    SQS and Pub/Sub targets receive the payloads in batches, other targets
+    one by one.
+    """
+    parts = urlparse(target_url)
+    batch_scheme_matrix: Dict[WebhookSchemes, Callable] = {
+        WebhookSchemes.AWS_SQS: send_webhooks_using_aws_sqs,
+        WebhookSchemes.GOOGLE_CLOUD_PUBSUB: send_webhooks_using_google_cloud_pubsub,
+    }
+    if send_method := batch_scheme_matrix.get(parts.scheme.lower()):
+        messages = [data.encode("utf-8") for data in data_list]
+        signatures = [signature_for_payload(message, secret) for message in messages]
+        return send_method(target_url, messages, domain, signatures, event_type)
+    return [
+        send_webhook_using_scheme_method(target_url, domain, secret, event_type, data)
+        for data in data_list
+    ]
+
+
+def park_event_delivery(circuit_breaker: WebhookCircuitBreaker, delivery):
+    """Park the delivery until the circuit breaker of its target closes."""
+    circuit_breaker.park(delivery.id)
+    task_logger.info(
+        "[Webhook ID: %r] Circuit breaker for %r is open, delivery id: %r parked.",
+        delivery.webhook.id,
+        delivery.webhook.target_url,
+        delivery.id,
+        extra=circuit_breaker.get_metrics(),
+    )
+    # The breaker could close in the meantime, without replaying this delivery.
+    if circuit_breaker.get_state() == CircuitBreakerState.CLOSED:
+        replay_parked_event_deliveries(circuit_breaker)
+
+
+def replay_parked_event_deliveries(
+    circuit_breaker: WebhookCircuitBreaker, limit: Optional[int] = None
+):
+    delivery_ids = circuit_breaker.pop_parked(limit)
+    for delivery_id in delivery_ids:
+        send_webhook_request_async.delay(delivery_id)
+    return delivery_ids
+
+
+@app.task
+def probe_webhook_circuit_breakers_task():
+    """Release deliveries parked by circuit breakers of targets without new events.
+
+    Parked deliveries of a closed breaker are replayed. For a half-open breaker,
+    the first parked delivery is sent as the probe; when it succeeds, the breaker
+    closes and the remaining deliveries are replayed.
+    """
+    from ...webhook.models import Webhook
+
+    parked_keys = set(
+        ParkedEventDelivery.objects.order_by()
+        .values_list("circuit_breaker_key", flat=True)
+        .distinct()
+    )
+    if not parked_keys:
+        return
+    circuit_breakers: Dict[str, WebhookCircuitBreaker] = {}
+    for target_url in Webhook.objects.values_list("target_url", flat=True):
+        circuit_breaker = WebhookCircuitBreaker(target_url)
+        if circuit_breaker.key_prefix in parked_keys:
+            circuit_breakers.setdefault(circuit_breaker.key_prefix, circuit_breaker)
+    for circuit_breaker in circuit_breakers.values():
+        state = circuit_breaker.get_state()
+        if state == CircuitBreakerState.CLOSED:
+            delivery_ids = replay_parked_event_deliveries(circuit_breaker)
+        elif state == CircuitBreakerState.HALF_OPEN:
+            delivery_ids = replay_parked_event_deliveries(circuit_breaker, limit=1)
+        else:
+            continue
+        task_logger.info(
+            "%s deliveries parked by the %s circuit breaker replayed.",
+            len(delivery_ids),
+            state.value,
+        )
+
+
+def record_circuit_breaker_result(
+    circuit_breaker: WebhookCircuitBreaker, webhook: "Webhook", response
+):
+    success = response.status == EventDeliveryStatus.SUCCESS
+    closed = circuit_breaker.record_result(success)
+    state = circuit_breaker.get_state()
+    span = opentracing.global_tracer().active_span
+    if span:
+        for tag, value in circuit_breaker.get_metrics(state).items():
+            span.set_tag(f"webhooks.{tag}", value)
+    if closed:
+        delivery_ids = replay_parked_event_deliveries(circuit_breaker)
+        task_logger.info(
+            "[Webhook ID: %r] Circuit breaker for %r closed, "
+            "%s parked deliveries replayed.",
+            webhook.id,
+            webhook.target_url,
+            len(delivery_ids),
+        )
+    elif not success and state == CircuitBreakerState.OPEN:
+        task_logger.warning(
+            "[Webhook ID: %r] Circuit breaker for %r is open.",
+            webhook.id,
+            webhook.target_url,
+            extra=circuit_breaker.get_metrics(state),
+        )
+
+
 @app.task(
     bind=True,
     retry_backoff=10,
@@ -471,6 +749,13 @@ def send_webhook_request_async(self, event_delivery_id):
         return
 
     webhook = delivery.webhook
+    circuit_breaker = None
+    if settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED:
+        circuit_breaker = WebhookCircuitBreaker(webhook.target_url)
+        if not circuit_breaker.allow_request():
+            park_event_delivery(circuit_breaker, delivery)
+            return
+
     data = delivery.payload.payload
     domain = Site.objects.get_current().domain
     attempt = create_attempt(delivery, self.request.id)
@@ -487,6 +772,8 @@ def send_webhook_request_async(self, event_delivery_id):
                 data,
             )
         attempt_update(attempt, response)
+        if circuit_breaker:
+            record_circuit_breaker_result(circuit_breaker, webhook, response)
         if response.status == EventDeliveryStatus.FAILED:
             task_logger.info(
                 "[Webhook ID: %r] Failed request to %r: %r for event: %r."
@@ -531,20 +818,36 @@ def send_webhook_request_async(self, event_delivery_id):
 
 
 def send_webhook_request_sync(
-    app_name, delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT
+    app_name, delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, use_cache=True
 ) -> Optional[Dict[Any, Any]]:
     event_payload = delivery.payload
     data = event_payload.payload
     webhook = delivery.webhook
     parts = urlparse(webhook.target_url)
-    domain = Site.objects.get_current().domain
-    message = data.encode("utf-8")
-    signature = signature_for_payload(message, webhook.secret_key)
 
     if parts.scheme.lower() not in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
         delivery_update(delivery, EventDeliveryStatus.FAILED)
         raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
 
+    cache_key = get_response_cache_key(delivery.event_type, webhook, data)
+    cached_response = (
+        get_cached_response(cache_key) if cache_key and use_cache else None
+    )
+    if cache_key and cached_response:
+        if cached_response.is_stale and should_refresh(cache_key):
+            # the delivery may be created in a transaction of the request
+            transaction.on_commit(
+                lambda: refresh_webhook_sync_response_task.delay(delivery.pk)
+            )
+        else:
+            delivery_update(delivery, EventDeliveryStatus.SUCCESS)
+            clear_successful_delivery(delivery)
+        return cached_response.response_data
+
+    domain = Site.objects.get_current().domain
+    message = data.encode("utf-8")
+    signature = signature_for_payload(message, webhook.secret_key)
+
     logger.debug(
         "[Webhook] Sending payload to %r for event %r.",
         webhook.target_url,
@@ -599,10 +902,29 @@ def send_webhook_request_sync(
     observability.report_event_delivery_attempt(attempt)
     clear_successful_delivery(delivery)
 
-    return response_data if response.status == EventDeliveryStatus.SUCCESS else None
+    if response.status != EventDeliveryStatus.SUCCESS:
+        return None
+    if cache_key:
+        cache_response(
+            cache_key, delivery.event_type, response_data, response.response_headers
+        )
+    return response_data
+
+
+@app.task(compression="zlib")
+def refresh_webhook_sync_response_task(event_delivery_id):
+    """Send the sync webhook again, to replace its stale cached response."""
+    delivery = (
+        EventDelivery.objects.select_related("payload", "webhook__app")
+        .filter(pk=event_delivery_id)
+        .first()
+    )
+    if not delivery or not delivery.payload:
+        return
+    send_webhook_request_sync(delivery.webhook.app.name, delivery, use_cache=False)
 
 
-def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
+def send_observability_events(webhooks: List[WebhookData], events: List[str]):
     event_type = WebhookEventAsyncType.OBSERVABILITY
     for webhook in webhooks:
         scheme = urlparse(webhook.target_url).scheme.lower()
@@ -614,14 +936,14 @@ def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
         }
         try:
             if scheme in [WebhookSchemes.AWS_SQS, WebhookSchemes.GOOGLE_CLOUD_PUBSUB]:
-                for event in events:
-                    response = send_webhook_using_scheme_method(
-                        webhook.target_url,
-                        webhook.saleor_domain,
-                        webhook.secret_key,
-                        event_type,
-                        observability.dump_payload(event),
-                    )
+                responses = send_webhooks_using_scheme_method(
+                    webhook.target_url,
+                    webhook.saleor_domain,
+                    webhook.secret_key,
+                    event_type,
+                    events,
+                )
+                for response in responses:
                     if response.status == EventDeliveryStatus.FAILED:
                         failed += 1
             else:
@@ -630,7 +952,7 @@ def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
                     webhook.saleor_domain,
                     webhook.secret_key,
                     event_type,
-                    observability.dump_payload(events),
+                    f"[{', '.join(events)}]",
                 )
                 if response.status == EventDeliveryStatus.FAILED:
                     failed = len(events)
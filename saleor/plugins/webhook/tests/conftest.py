@@ -9,11 +9,18 @@ from prices import Money
 from ....app.models import App
 from ....plugins.manager import get_plugins_manager
 from ....plugins.webhook.plugin import WebhookPlugin
+from ....plugins.webhook.tasks import get_pubsub_publisher, get_sqs_client
 from ....shipping.interface import ShippingMethodData
 from ....webhook.event_types import WebhookEventSyncType
 from ....webhook.models import Webhook, WebhookEvent
 
 
+@pytest.fixture(autouse=True)
+def clear_webhook_clients():
+    get_sqs_client.cache_clear()
+    get_pubsub_publisher.cache_clear()
+
+
 @pytest.fixture
 def webhook_plugin(settings):
     def factory() -> WebhookPlugin:
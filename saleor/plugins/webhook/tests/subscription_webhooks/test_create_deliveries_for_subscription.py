@@ -1,4 +1,5 @@
 import json
+from functools import partial
 from unittest.mock import patch
 
 import graphene
@@ -7,7 +8,13 @@ from freezegun import freeze_time
 
 from .....channel.models import Channel
 from .....giftcard.models import GiftCard
-from .....graphql.webhook.subscription_payload import validate_subscription_query
+from .....graphql.context import get_context_value
+from .....graphql.webhook.subscription_payload import (
+    generate_payload_from_subscription,
+    initialize_request,
+    shared_sync_payloads,
+    validate_subscription_query,
+)
 from .....menu.models import Menu, MenuItem
 from .....product.models import Category
 from .....shipping.models import ShippingMethod, ShippingZone
@@ -2247,3 +2254,99 @@ def test_generate_payload_from_subscription_return_permission_errors_in_payload(
     assert payload["errors"][0]["extensions"]["exception"]["code"] == error_code
     assert len(deliveries) == len(webhooks)
     assert deliveries[0].webhook == webhooks[0]
+
+
+def test_generate_payload_from_subscription_shared_sync_payloads(
+    checkout_with_shipping_required,
+    subscription_checkout_filter_shipping_methods_webhook,
+    django_assert_num_queries,
+    settings,
+):
+    # given
+    settings.WEBHOOK_SYNC_SHARED_PAYLOADS_ENABLED = True
+    checkout = checkout_with_shipping_required
+    webhook = subscription_checkout_filter_shipping_methods_webhook
+    event_type = WebhookEventSyncType.CHECKOUT_FILTER_SHIPPING_METHODS
+    generate_payload = partial(
+        generate_payload_from_subscription,
+        event_type,
+        checkout,
+        webhook.subscription_query,
+        app=webhook.app,
+    )
+
+    # when
+    with shared_sync_payloads():
+        payload = generate_payload(request=initialize_request(sync_event=True))
+        with django_assert_num_queries(0):
+            cached_payload = generate_payload(
+                request=initialize_request(sync_event=True)
+            )
+
+    # then
+    assert cached_payload == payload
+    assert cached_payload is not payload
+
+
+def test_generate_payload_from_subscription_shared_sync_payloads_object_changed(
+    checkout_with_shipping_required,
+    subscription_checkout_filter_shipping_methods_webhook,
+    settings,
+):
+    # given
+    settings.WEBHOOK_SYNC_SHARED_PAYLOADS_ENABLED = True
+    checkout = checkout_with_shipping_required
+    webhook = subscription_checkout_filter_shipping_methods_webhook
+    event_type = WebhookEventSyncType.CHECKOUT_FILTER_SHIPPING_METHODS
+    generate_payload = partial(
+        generate_payload_from_subscription,
+        event_type,
+        checkout,
+        webhook.subscription_query,
+        app=webhook.app,
+    )
+
+    # when
+    with shared_sync_payloads(), patch(
+        "saleor.graphql.context.get_context_value", wraps=get_context_value
+    ) as get_context_value_mock:
+        with freeze_time("2022-05-12 12:00:00"):
+            checkout.save(update_fields=["last_change"])
+            generate_payload(request=initialize_request(sync_event=True))
+            generate_payload(request=initialize_request(sync_event=True))
+        with freeze_time("2022-05-12 12:00:01"):
+            checkout.save(update_fields=["last_change"])
+            generate_payload(request=initialize_request(sync_event=True))
+
+    # then
+    assert get_context_value_mock.call_count == 2
+
+
+def test_generate_payload_from_subscription_not_shared_when_disabled(
+    checkout_with_shipping_required,
+    subscription_checkout_filter_shipping_methods_webhook,
+    settings,
+):
+    # given
+    settings.WEBHOOK_SYNC_SHARED_PAYLOADS_ENABLED = False
+    checkout = checkout_with_shipping_required
+    webhook = subscription_checkout_filter_shipping_methods_webhook
+    event_type = WebhookEventSyncType.CHECKOUT_FILTER_SHIPPING_METHODS
+
+    # when
+    with shared_sync_payloads():
+        with patch(
+            "saleor.graphql.context.get_context_value",
+            wraps=get_context_value,
+        ) as get_context_value_mock:
+            for _ in range(2):
+                generate_payload_from_subscription(
+                    event_type,
+                    checkout,
+                    webhook.subscription_query,
+                    request=initialize_request(sync_event=True),
+                    app=webhook.app,
+                )
+
+    # then
+    assert get_context_value_mock.call_count == 2
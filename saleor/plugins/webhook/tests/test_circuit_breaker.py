@@ -0,0 +1,336 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from celery.exceptions import Retry as CeleryTaskRetryError
+from django.core.cache import cache
+
+from ....core import EventDeliveryStatus
+from ....core.models import EventDelivery, EventDeliveryAttempt, ParkedEventDelivery
+from ....webhook.event_types import WebhookEventAsyncType
+from ..circuit_breaker import CircuitBreakerState, WebhookCircuitBreaker
+from ..tasks import probe_webhook_circuit_breakers_task, send_webhook_request_async
+
+
+@pytest.fixture
+def circuit_breaker_settings(settings):
+    cache.clear()
+    settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED = True
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 0.5
+    settings.WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS = 4
+    settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW = timedelta(minutes=1)
+    settings.WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = timedelta(minutes=1)
+    return settings
+
+
+@pytest.fixture
+def delivery_ids(event_payload, webhook):
+    deliveries = EventDelivery.objects.bulk_create(
+        [
+            EventDelivery(
+                event_type=WebhookEventAsyncType.ANY,
+                payload=event_payload,
+                webhook=webhook,
+            )
+            for _ in range(3)
+        ]
+    )
+    return [delivery.pk for delivery in deliveries]
+
+
+def test_circuit_breaker_opens_when_failure_rate_crosses_threshold(
+    circuit_breaker_settings,
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/webhooks/")
+    circuit_breaker.record_result(True)
+    circuit_breaker.record_result(True)
+    circuit_breaker.record_result(False)
+
+    # when
+    circuit_breaker.record_result(False)
+
+    # then
+    assert circuit_breaker.get_state() == CircuitBreakerState.OPEN
+    assert not circuit_breaker.allow_request()
+
+
+def test_circuit_breaker_stays_closed_below_min_requests(circuit_breaker_settings):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/webhooks/")
+
+    # when
+    for _ in range(3):
+        circuit_breaker.record_result(False)
+
+    # then
+    assert circuit_breaker.get_state() == CircuitBreakerState.CLOSED
+    assert circuit_breaker.allow_request()
+
+
+def test_circuit_breaker_is_shared_by_target_host(circuit_breaker_settings):
+    # given
+    WebhookCircuitBreaker("https://app.example.com/api/orders/").open()
+
+    # when
+    state = WebhookCircuitBreaker("https://app.example.com/api/products/").get_state()
+    other_host_state = WebhookCircuitBreaker("https://example.com/api/").get_state()
+
+    # then
+    assert state == CircuitBreakerState.OPEN
+    assert other_host_state == CircuitBreakerState.CLOSED
+
+
+def test_circuit_breaker_lets_single_probe_through_after_cooldown(
+    circuit_breaker_settings,
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    circuit_breaker.open()
+    cache.delete(circuit_breaker._key("open"))
+
+    # when
+    allowed = [circuit_breaker.allow_request() for _ in range(3)]
+
+    # then
+    assert circuit_breaker.get_state() == CircuitBreakerState.HALF_OPEN
+    assert allowed == [True, False, False]
+
+
+def test_circuit_breaker_failed_probe_opens_breaker(circuit_breaker_settings):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    circuit_breaker.open()
+    cache.delete(circuit_breaker._key("open"))
+    circuit_breaker.allow_request()
+
+    # when
+    closed = circuit_breaker.record_result(False)
+
+    # then
+    assert closed is False
+    assert circuit_breaker.get_state() == CircuitBreakerState.OPEN
+
+
+def test_circuit_breaker_parked_deliveries(circuit_breaker_settings, delivery_ids):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    for delivery_id in delivery_ids:
+        circuit_breaker.park(delivery_id)
+
+    # when
+    parked_count = circuit_breaker.get_parked_count()
+    parked = circuit_breaker.pop_parked()
+
+    # then
+    assert parked_count == 3
+    assert parked == delivery_ids
+    assert circuit_breaker.get_parked_count() == 0
+    assert circuit_breaker.pop_parked() == []
+    assert circuit_breaker.get_metrics() == {
+        "circuit_breaker_state": "closed",
+        "parked_deliveries_count": 0,
+    }
+
+
+def test_circuit_breaker_pop_parked_deliveries_with_limit(
+    circuit_breaker_settings, delivery_ids
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    for delivery_id in delivery_ids:
+        circuit_breaker.park(delivery_id)
+
+    # when
+    parked = circuit_breaker.pop_parked(limit=1)
+
+    # then
+    assert parked == delivery_ids[:1]
+    assert circuit_breaker.pop_parked() == delivery_ids[1:]
+
+
+def test_circuit_breaker_parks_delivery_once(circuit_breaker_settings, delivery_ids):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    circuit_breaker.park(delivery_ids[0])
+
+    # when
+    circuit_breaker.park(delivery_ids[0])
+
+    # then
+    assert circuit_breaker.get_parked_count() == 1
+    assert circuit_breaker.pop_parked() == delivery_ids[:1]
+
+
+def test_circuit_breaker_parked_deliveries_survive_cache_clear(
+    circuit_breaker_settings, delivery_ids
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    for delivery_id in delivery_ids:
+        circuit_breaker.park(delivery_id)
+
+    # when
+    cache.clear()
+
+    # then
+    assert circuit_breaker.pop_parked() == delivery_ids
+
+
+def test_circuit_breaker_parked_deliveries_are_kept_per_target(
+    circuit_breaker_settings, delivery_ids
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    other_circuit_breaker = WebhookCircuitBreaker("https://other.example.com/api/")
+    circuit_breaker.park(delivery_ids[0])
+    other_circuit_breaker.park(delivery_ids[1])
+
+    # when
+    parked = circuit_breaker.pop_parked()
+
+    # then
+    assert parked == delivery_ids[:1]
+    assert other_circuit_breaker.get_parked_count() == 1
+
+
+def test_parked_delivery_is_removed_with_delivery(
+    circuit_breaker_settings, delivery_ids
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker("https://app.example.com/api/")
+    circuit_breaker.park(delivery_ids[0])
+
+    # when
+    EventDelivery.objects.filter(pk=delivery_ids[0]).delete()
+
+    # then
+    assert not ParkedEventDelivery.objects.exists()
+    assert circuit_breaker.pop_parked() == []
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+def test_probe_webhook_circuit_breakers_task_replays_closed_breaker_deliveries(
+    mocked_send_webhook_request_async_delay,
+    webhook,
+    circuit_breaker_settings,
+    delivery_ids,
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker(webhook.target_url)
+    circuit_breaker.park(delivery_ids[0])
+    circuit_breaker.park(delivery_ids[1])
+
+    # when
+    probe_webhook_circuit_breakers_task()
+
+    # then
+    assert mocked_send_webhook_request_async_delay.call_args_list == [
+        mock.call(delivery_ids[0]),
+        mock.call(delivery_ids[1]),
+    ]
+    assert circuit_breaker.get_parked_count() == 0
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+def test_probe_webhook_circuit_breakers_task_sends_probe_of_half_open_breaker(
+    mocked_send_webhook_request_async_delay,
+    webhook,
+    circuit_breaker_settings,
+    delivery_ids,
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker(webhook.target_url)
+    circuit_breaker.open()
+    circuit_breaker.park(delivery_ids[0])
+    circuit_breaker.park(delivery_ids[1])
+
+    # when
+    probe_webhook_circuit_breakers_task()
+
+    # then
+    mocked_send_webhook_request_async_delay.assert_not_called()
+
+    # when
+    cache.delete(circuit_breaker._key("open"))
+    probe_webhook_circuit_breakers_task()
+
+    # then
+    mocked_send_webhook_request_async_delay.assert_called_once_with(delivery_ids[0])
+    assert circuit_breaker.get_parked_count() == 1
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+def test_send_webhook_request_async_parks_delivery_when_breaker_is_open(
+    mocked_send_response, event_delivery, circuit_breaker_settings
+):
+    # given
+    circuit_breaker = WebhookCircuitBreaker(event_delivery.webhook.target_url)
+    circuit_breaker.open()
+
+    # when
+    send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_not_called()
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+    assert not EventDeliveryAttempt.objects.filter(delivery=event_delivery).exists()
+    assert circuit_breaker.get_parked_count() == 1
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+@mock.patch("saleor.plugins.webhook.tasks.observability.report_event_delivery_attempt")
+@mock.patch("saleor.plugins.webhook.tasks.clear_successful_delivery")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+def test_send_webhook_request_async_successful_probe_replays_parked_deliveries(
+    mocked_send_response,
+    mocked_clear_delivery,
+    mocked_observability,
+    mocked_send_webhook_request_async_delay,
+    event_delivery,
+    webhook_response,
+    circuit_breaker_settings,
+    delivery_ids,
+):
+    # given
+    mocked_send_response.return_value = webhook_response
+    circuit_breaker = WebhookCircuitBreaker(event_delivery.webhook.target_url)
+    circuit_breaker.open()
+    circuit_breaker.park(delivery_ids[0])
+    circuit_breaker.park(delivery_ids[1])
+    cache.delete(circuit_breaker._key("open"))
+
+    # when
+    send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_called_once()
+    assert circuit_breaker.get_state() == CircuitBreakerState.CLOSED
+    assert mocked_send_webhook_request_async_delay.call_args_list == [
+        mock.call(delivery_ids[0]),
+        mock.call(delivery_ids[1]),
+    ]
+    assert circuit_breaker.get_parked_count() == 0
+
+
+@mock.patch("saleor.plugins.webhook.tasks.observability.report_event_delivery_attempt")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+def test_send_webhook_request_async_records_failures(
+    mocked_send_response,
+    mocked_observability,
+    event_delivery,
+    webhook_response_failed,
+    circuit_breaker_settings,
+):
+    # given
+    mocked_send_response.return_value = webhook_response_failed
+    circuit_breaker_settings.WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS = 1
+    circuit_breaker = WebhookCircuitBreaker(event_delivery.webhook.target_url)
+
+    # when
+    with pytest.raises(CeleryTaskRetryError):
+        send_webhook_request_async(event_delivery.pk)
+
+    # then
+    assert circuit_breaker.get_state() == CircuitBreakerState.OPEN
@@ -64,7 +64,8 @@ def test_observability_send_events(
 def test_send_observability_events(
     mock_send_webhook_using_scheme_method, observability_webhook_data
 ):
-    events = [{"event": "data"}, {"event": "data"}]
+    payloads = [{"event": "data"}, {"event": "data"}]
+    events = [dump_payload(payload) for payload in payloads]
 
     send_observability_events([observability_webhook_data], events)
 
@@ -73,7 +74,7 @@ def test_send_observability_events(
         observability_webhook_data.saleor_domain,
         observability_webhook_data.secret_key,
         WebhookEventAsyncType.OBSERVABILITY,
-        dump_payload(events),
+        dump_payload(payloads),
     )
 
 
@@ -81,7 +82,7 @@ def test_send_observability_events(
 def test_send_observability_events_when_reposnse_failed(
     mock_send_webhook_using_scheme_method, observability_webhook_data
 ):
-    events = [{"event": "data"}, {"event": "data"}]
+    events = [dump_payload({"event": "data"})] * 2
     response = Mock()
     response.status = EventDeliveryStatus.FAILED
     mock_send_webhook_using_scheme_method.return_value = response
@@ -90,39 +91,47 @@ def test_send_observability_events_when_reposnse_failed(
     mock_send_webhook_using_scheme_method.assert_called_once()
 
 
-@patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+@patch("saleor.plugins.webhook.tasks.send_webhooks_using_scheme_method")
 def test_send_observability_events_to_google_pub_sub(
-    mock_send_webhook_using_scheme_method, observability_webhook_data
+    mock_send_webhooks_using_scheme_method, observability_webhook_data
 ):
     observability_webhook_data.target_url = (
         "gcpubsub://cloud.google.com/projects/saleor/topics/test"
     )
     webhooks = [observability_webhook_data]
-    events = [{"event": "data"}, {"event": "data"}]
+    events = [dump_payload({"event": "data"}), dump_payload({"event": "data"})]
 
     send_observability_events(webhooks, events)
 
-    assert mock_send_webhook_using_scheme_method.call_count == len(events)
-    mock_send_webhook_using_scheme_method.assert_called_with(
+    mock_send_webhooks_using_scheme_method.assert_called_once_with(
         observability_webhook_data.target_url,
         observability_webhook_data.saleor_domain,
         observability_webhook_data.secret_key,
         WebhookEventAsyncType.OBSERVABILITY,
-        dump_payload(events[-1]),
+        events,
     )
 
 
-@patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+@patch("saleor.plugins.webhook.tasks.send_webhooks_using_scheme_method")
 def test_send_observability_events_to_google_pub_sub_when_reposnse_failed(
-    mock_send_webhook_using_scheme_method, observability_webhook_data
+    mock_send_webhooks_using_scheme_method, observability_webhook_data
 ):
     observability_webhook_data.target_url = (
         "gcpubsub://cloud.google.com/projects/saleor/topics/test"
     )
-    events = [{"event": "data"}, {"event": "data"}]
-    response = Mock()
-    response.status = EventDeliveryStatus.FAILED
-    mock_send_webhook_using_scheme_method.return_value = response
-
-    send_observability_events([observability_webhook_data], events)
-    assert mock_send_webhook_using_scheme_method.call_count == len(events)
+    events = [dump_payload({"event": "data"})] * 2
+    failed_response = Mock()
+    failed_response.status = EventDeliveryStatus.FAILED
+    success_response = Mock()
+    success_response.status = EventDeliveryStatus.SUCCESS
+    mock_send_webhooks_using_scheme_method.return_value = [
+        failed_response,
+        success_response,
+    ]
+
+    with patch("saleor.plugins.webhook.tasks.logger") as mock_logger:
+        send_observability_events([observability_webhook_data], events)
+
+    mock_send_webhooks_using_scheme_method.assert_called_once()
+    mock_logger.warning.assert_called_once()
+    assert mock_logger.warning.call_args.kwargs["extra"]["dropped_events_count"] == 1
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytest
 
 from ....core import EventDeliveryStatus
@@ -259,6 +261,21 @@ def test_clear_successful_delivery_when_payload_in_multiple_deliveries(event_del
     assert EventPayload.objects.filter(pk=event_payload.pk).exists()
 
 
+def test_clear_successful_delivery_keeps_payload_which_can_be_shared(
+    event_delivery, settings
+):
+    # given
+    settings.EVENT_PAYLOAD_DEDUPLICATION_PERIOD = timedelta(minutes=5)
+    event_delivery.status = EventDeliveryStatus.SUCCESS
+    event_delivery.save()
+    event_payload = event_delivery.payload
+    # when
+    clear_successful_delivery(event_delivery)
+    # then
+    assert not EventDelivery.objects.filter(pk=event_delivery.pk).exists()
+    assert EventPayload.objects.filter(pk=event_payload.pk).exists()
+
+
 def test_clear_successful_delivery_on_failed_delivery(event_delivery):
     # given
     event_delivery.status = EventDeliveryStatus.FAILED
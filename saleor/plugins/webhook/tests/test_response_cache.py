@@ -0,0 +1,173 @@
+import datetime
+import json
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from ....core.models import EventDelivery, EventPayload
+from ....webhook.event_types import WebhookEventSyncType
+from ..response_cache import (
+    get_cached_response,
+    get_response_cache_key,
+    get_response_cache_timeouts,
+)
+from ..tasks import send_webhook_request_sync
+
+GATEWAYS_RESPONSE = [{"id": "credit-card", "name": "Credit Card"}]
+
+
+@pytest.fixture
+def response_cache_settings(settings):
+    cache.clear()
+    settings.WEBHOOK_SYNC_RESPONSE_CACHE_TIMEOUTS = {
+        WebhookEventSyncType.PAYMENT_LIST_GATEWAYS: datetime.timedelta(minutes=5)
+    }
+    settings.WEBHOOK_SYNC_RESPONSE_CACHE_STALE_WHILE_REVALIDATE = datetime.timedelta(
+        minutes=1
+    )
+    settings.WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED = False
+    return settings
+
+
+@pytest.fixture
+def create_list_gateways_delivery(payment_app):
+    webhook = payment_app.webhooks.first()
+
+    def create_delivery(issued_at="2022-01-01T00:00:00"):
+        payload = json.dumps(
+            {"checkout": {"token": "123"}, "meta": {"issued_at": issued_at}}
+        )
+        return EventDelivery.objects.create(
+            event_type=WebhookEventSyncType.PAYMENT_LIST_GATEWAYS,
+            payload=EventPayload.objects.create_with_payload(payload),
+            webhook=webhook,
+        )
+
+    return create_delivery
+
+
+def mock_response(mock_post, headers=None):
+    mock_post.return_value.ok = True
+    mock_post.return_value.text = json.dumps(GATEWAYS_RESPONSE)
+    mock_post.return_value.headers = headers or {}
+    mock_post.return_value.status_code = 200
+    mock_post.return_value.elapsed = datetime.timedelta(seconds=1)
+
+
+@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+def test_send_webhook_request_sync_uses_cached_response(
+    mock_post, response_cache_settings, payment_app, create_list_gateways_delivery
+):
+    # given
+    mock_response(mock_post)
+    send_webhook_request_sync(payment_app.name, create_list_gateways_delivery())
+
+    # when
+    response_data = send_webhook_request_sync(
+        payment_app.name, create_list_gateways_delivery(issued_at="2022-01-02")
+    )
+
+    # then
+    assert response_data == GATEWAYS_RESPONSE
+    mock_post.assert_called_once()
+    assert not EventDelivery.objects.exists()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+def test_send_webhook_request_sync_cache_disabled(
+    mock_post, payment_app, create_list_gateways_delivery
+):
+    # given
+    cache.clear()
+    mock_response(mock_post)
+    send_webhook_request_sync(payment_app.name, create_list_gateways_delivery())
+
+    # when
+    response_data = send_webhook_request_sync(
+        payment_app.name, create_list_gateways_delivery()
+    )
+
+    # then
+    assert response_data == GATEWAYS_RESPONSE
+    assert mock_post.call_count == 2
+
+
+@mock.patch("saleor.plugins.webhook.tasks.refresh_webhook_sync_response_task.delay")
+@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+def test_send_webhook_request_sync_refreshes_stale_response(
+    mock_post,
+    mock_refresh_task,
+    response_cache_settings,
+    payment_app,
+    create_list_gateways_delivery,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    mock_response(mock_post)
+    delivery = create_list_gateways_delivery()
+    send_webhook_request_sync(payment_app.name, delivery)
+    cache_key = get_response_cache_key(
+        delivery.event_type, delivery.webhook, delivery.payload.payload
+    )
+    cached_response = cache.get(cache_key)
+    cached_response.fresh_until = 0
+    cache.set(cache_key, cached_response)
+    stale_delivery = create_list_gateways_delivery()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response_data = send_webhook_request_sync(payment_app.name, stale_delivery)
+        send_webhook_request_sync(payment_app.name, create_list_gateways_delivery())
+        mock_refresh_task.assert_not_called()
+
+    # then
+    assert response_data == GATEWAYS_RESPONSE
+    mock_post.assert_called_once()
+    assert len(callbacks) == 1
+    mock_refresh_task.assert_called_once_with(stale_delivery.pk)
+
+
+@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+def test_send_webhook_request_sync_respects_cache_control(
+    mock_post, response_cache_settings, payment_app, create_list_gateways_delivery
+):
+    # given
+    response_cache_settings.WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED = True
+    mock_response(mock_post, headers={"Cache-Control": "no-store"})
+    delivery = create_list_gateways_delivery()
+
+    # when
+    send_webhook_request_sync(payment_app.name, delivery)
+
+    # then
+    cache_key = get_response_cache_key(
+        delivery.event_type, delivery.webhook, delivery.payload.payload
+    )
+    assert get_cached_response(cache_key) is None
+
+
+def test_get_response_cache_timeouts_from_cache_control(response_cache_settings):
+    # given
+    response_cache_settings.WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED = True
+    headers = {"cache-control": "public, max-age=30, stale-while-revalidate=10"}
+
+    # when
+    timeouts = get_response_cache_timeouts(
+        WebhookEventSyncType.PAYMENT_LIST_GATEWAYS, headers
+    )
+
+    # then
+    assert timeouts == (30, 10)
+
+
+def test_get_response_cache_key_not_cacheable_event(
+    response_cache_settings, payment_app
+):
+    # when
+    cache_key = get_response_cache_key(
+        WebhookEventSyncType.PAYMENT_CAPTURE, payment_app.webhooks.first(), "{}"
+    )
+
+    # then
+    assert cache_key is None
@@ -6,7 +6,9 @@ from dataclasses import dataclass
 from time import time
 from typing import TYPE_CHECKING, Any, List, Optional
 
+from django.conf import settings
 from django.db.models import QuerySet
+from django.utils import timezone
 
 from ...app.models import App
 from ...core.models import (
@@ -254,7 +256,16 @@ def clear_successful_delivery(delivery: "EventDelivery"):
         payload_id = delivery.payload_id
         delivery.delete()
         if payload_id:
-            EventPayload.objects.filter(pk=payload_id, deliveries__isnull=True).delete()
+            payloads = EventPayload.objects.filter(
+                pk=payload_id, deliveries__isnull=True
+            )
+            # Payloads which can still be shared by new deliveries are left to be
+            # removed by `delete_event_payloads_task`. The period is doubled, so
+            # a payload found just before it stopped being shared isn't removed
+            # before its new delivery is created.
+            if period := settings.EVENT_PAYLOAD_DEDUPLICATION_PERIOD:
+                payloads = payloads.filter(created_at__lt=timezone.now() - period * 2)
+            payloads.delete()
 
 
 DEFAULT_TAX_CODE = "UNMAPPED"
@@ -1,11 +1,12 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 
 
 class ProductAppConfig(AppConfig):
     name = "saleor.product"
 
     def ready(self):
+        from .category_tree import invalidate_category_tree
         from .models import Category, Collection, DigitalContent, ProductMedia
         from .signals import (
             delete_background_image,
@@ -34,3 +35,13 @@ class ProductAppConfig(AppConfig):
             sender=DigitalContent,
             dispatch_uid="delete_digital_content_file",
         )
+        post_save.connect(
+            invalidate_category_tree,
+            sender=Category,
+            dispatch_uid="invalidate_category_tree_on_save",
+        )
+        post_delete.connect(
+            invalidate_category_tree,
+            sender=Category,
+            dispatch_uid="invalidate_category_tree_on_delete",
+        )
@@ -0,0 +1,99 @@
+"""In-memory structure of the categories tree.
+
+The tree is built from a single query of category and parent IDs and kept in the
+process memory, so subtrees and ancestors of categories are resolved without MPTT
+queries. The tree is versioned with a counter stored in the Django cache, which is
+bumped whenever a category is saved or deleted; each process rebuilds its tree
+when it notices the version has changed.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+CATEGORY_TREE_VERSION_KEY = "category_tree_version"
+
+_local_tree: Optional[Tuple[int, "CategoryTree"]] = None
+
+
+class CategoryTree:
+    """Ancestors and descendants of each category, indexed by the category ID."""
+
+    def __init__(self, categories: Iterable[Tuple[int, Optional[int]]]):
+        # Categories must be given in the tree order, so each parent is processed
+        # before its children.
+        self.ancestors: Dict[int, Tuple[int, ...]] = {}
+        self.descendants: Dict[int, List[int]] = {}
+        for category_id, parent_id in categories:
+            ancestors: Tuple[int, ...] = ()
+            if parent_id is not None:
+                ancestors = self.ancestors[parent_id] + (parent_id,)
+            self.ancestors[category_id] = ancestors
+            self.descendants[category_id] = []
+            for ancestor_id in ancestors:
+                self.descendants[ancestor_id].append(category_id)
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self.ancestors
+
+    def get_ancestor_ids(self, category_id: int) -> List[int]:
+        """Return IDs of the category ancestors, starting from the root category."""
+        return list(self.ancestors.get(category_id, ()))
+
+    def get_descendant_ids(
+        self, category_ids: Iterable[int], include_self: bool = True
+    ) -> Set[int]:
+        """Return IDs of all categories in the subtrees of the given categories.
+
+        IDs of categories which don't exist are skipped.
+        """
+        result: Set[int] = set()
+        for category_id in category_ids:
+            if category_id not in self.ancestors:
+                continue
+            if include_self:
+                result.add(category_id)
+            result.update(self.descendants[category_id])
+        return result
+
+
+def _load_category_tree() -> CategoryTree:
+    from .models import Category
+
+    return CategoryTree(
+        Category.objects.order_by("tree_id", "lft").values_list("id", "parent_id")
+    )
+
+
+def get_category_tree() -> CategoryTree:
+    global _local_tree
+
+    # The version is read before the categories are fetched, so a tree loaded
+    # while the categories are being changed is rebuilt on the next call.
+    version = cache.get_or_set(CATEGORY_TREE_VERSION_KEY, 0, timeout=None)
+    if version is not None and _local_tree and _local_tree[0] == version:
+        return _local_tree[1]
+    tree = _load_category_tree()
+    # A tree loaded inside a transaction may contain changes which are rolled
+    # back later, so it's not kept for the next calls.
+    if version is not None and not transaction.get_connection().in_atomic_block:
+        _local_tree = (version, tree)
+    return tree
+
+
+def _bump_category_tree_version():
+    try:
+        cache.incr(CATEGORY_TREE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATEGORY_TREE_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_category_tree(**_kwargs):
+    """Drop the cached categories tree in all processes.
+
+    The version is bumped right away, so the change is visible within the current
+    transaction, and once again after the commit, so other processes don't keep
+    a tree loaded before the change was committed.
+    """
+    _bump_category_tree_version()
+    transaction.on_commit(_bump_category_tree_version)
@@ -0,0 +1,132 @@
+"""Deleting many products at once.
+
+Products are deleted in chunks of `PRODUCTS_DELETE_BATCH_SIZE` ordered by the
+primary key, each chunk in a separate transaction. Files of the deleted media,
+thumbnails and digital contents are removed from the storage with one task per
+chunk, instead of one task per file sent by the `post_delete` signals.
+"""
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from ..attribute import AttributeInputType
+from ..attribute.models import AttributeValue
+from ..core.tasks import delete_files_from_storage_task
+from ..order import OrderStatus
+from ..order import events as order_events
+from ..order.models import OrderLine
+from ..thumbnail.models import Thumbnail
+from .models import (
+    DigitalContent,
+    DigitalContentUrl,
+    Product,
+    ProductDeletion,
+    ProductMedia,
+    ProductVariant,
+    VariantMedia,
+)
+
+if TYPE_CHECKING:
+    from ..account.models import User
+    from ..app.models import App
+    from ..plugins.manager import PluginsManager
+
+PRODUCTS_DELETE_BATCH_SIZE = 500
+
+
+def delete_products(
+    product_ids: Sequence[int],
+    manager: "PluginsManager",
+    user: Optional["User"] = None,
+    app: Optional["App"] = None,
+    product_deletion: Optional[ProductDeletion] = None,
+) -> int:
+    """Delete a chunk of products with their variants in a single transaction.
+
+    Lines of draft orders with the deleted variants are removed and the orders are
+    recalculated. The progress of the given deletion job is updated in the same
+    transaction. Return the number of deleted products.
+    """
+    with transaction.atomic():
+        products = list(
+            Product.objects.select_for_update(of=("self",))
+            .filter(pk__in=product_ids)
+            .order_by("pk")
+        )
+        if not products:
+            return 0
+        product_pks = [product.pk for product in products]
+        product_variants: Dict[int, List[int]] = defaultdict(list)
+        for product_id, variant_id in ProductVariant.objects.filter(
+            product_id__in=product_pks
+        ).values_list("product_id", "id"):
+            product_variants[product_id].append(variant_id)
+        variant_ids = [id for ids in product_variants.values() for id in ids]
+
+        AttributeValue.objects.filter(
+            productassignments__product_id__in=product_pks,
+            attribute__input_type__in=AttributeInputType.TYPES_WITH_UNIQUE_VALUES,
+        ).delete()
+        draft_order_lines = list(
+            OrderLine.objects.filter(
+                variant_id__in=variant_ids, order__status=OrderStatus.DRAFT
+            ).select_related("order")
+        )
+        file_paths = _delete_files_records(product_pks, variant_ids)
+        Product.objects.filter(pk__in=product_pks).delete()
+
+        if draft_order_lines:
+            _delete_draft_order_lines(draft_order_lines, user, app)
+        for product in products:
+            manager.product_deleted(product, product_variants[product.pk])
+        if product_deletion is not None:
+            product_deletion.deleted_count += len(products)
+            product_deletion.save(update_fields=["deleted_count", "updated_at"])
+        if file_paths:
+            transaction.on_commit(
+                lambda: delete_files_from_storage_task.delay(file_paths)
+            )
+    return len(products)
+
+
+def _delete_files_records(product_pks: List[int], variant_ids: List[int]):
+    """Delete media, thumbnails and digital contents, return paths of their files.
+
+    The rows are deleted without sending the `post_delete` signals, which would
+    schedule a storage task for every file.
+    """
+    thumbnails = Thumbnail.objects.filter(product_media__product_id__in=product_pks)
+    media = ProductMedia.objects.filter(product_id__in=product_pks)
+    digital_contents = DigitalContent.objects.filter(product_variant_id__in=variant_ids)
+    file_paths = [
+        *thumbnails.values_list("image", flat=True),
+        *media.values_list("image", flat=True),
+        *digital_contents.values_list("content_file", flat=True),
+    ]
+    querysets: List[QuerySet] = [
+        thumbnails,
+        VariantMedia.objects.filter(media__product_id__in=product_pks),
+        media,
+        DigitalContentUrl.objects.filter(content__in=digital_contents),
+        digital_contents,
+    ]
+    for queryset in querysets:
+        queryset._raw_delete(queryset.db)  # type: ignore[attr-defined]
+    return [path for path in file_paths if path]
+
+
+def _delete_draft_order_lines(
+    lines: List[OrderLine], user: Optional["User"], app: Optional["App"]
+):
+    from ..order.tasks import recalculate_orders_task
+
+    OrderLine.objects.filter(pk__in=[line.pk for line in lines]).delete()
+    order_to_lines = defaultdict(list)
+    for line in lines:
+        order_to_lines[line.order].append(line)
+    with order_events.collect_order_events():
+        for order, order_lines in order_to_lines.items():
+            order_events.order_line_product_removed_event(order, user, app, order_lines)
+    recalculate_orders_task.delay(list({line.order_id for line in lines}))
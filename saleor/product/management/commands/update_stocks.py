@@ -0,0 +1,87 @@
+import csv
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ....plugins.manager import get_plugins_manager
+from ....warehouse.stock_upsert import (
+    STOCKS_UPSERT_BATCH_SIZE,
+    StockUpsertRow,
+    bulk_upsert_stocks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates or updates stocks of product variants from a CSV file with "
+        "`sku` or `variant_id`, `warehouse` (ID or slug) and `quantity` columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV file.")
+
+    def handle(self, *args, **options):
+        manager = get_plugins_manager()
+        created_count = updated_count = errors_count = 0
+        with open(options["path"], newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            if not reader.fieldnames or not {"warehouse", "quantity"}.issubset(
+                reader.fieldnames
+            ):
+                raise CommandError(
+                    "The file requires `warehouse` and `quantity` columns."
+                )
+            # The first row of data is in the second line of the file.
+            first_line = 2
+            while True:
+                lines = list(islice(reader, STOCKS_UPSERT_BATCH_SIZE))
+                if not lines:
+                    break
+                rows = []
+                for line_number, line in enumerate(lines, start=first_line):
+                    try:
+                        rows.append(self.parse_row(line))
+                    except ValueError as error:
+                        errors_count += 1
+                        self.stderr.write(f"Line {line_number}: {error}")
+                        rows.append(None)
+                result = bulk_upsert_stocks([row for row in rows if row], manager)
+                line_numbers = [
+                    line_number
+                    for line_number, row in enumerate(rows, start=first_line)
+                    if row
+                ]
+                for upsert_error in result.errors:
+                    self.stderr.write(
+                        f"Line {line_numbers[upsert_error.index]}: "
+                        f"{upsert_error.field}: {upsert_error.message}"
+                    )
+                created_count += result.created_count
+                updated_count += result.updated_count
+                errors_count += len(
+                    {upsert_error.index for upsert_error in result.errors}
+                )
+                first_line += len(lines)
+
+        self.stdout.write(
+            f"Created {created_count} and updated {updated_count} stocks, "
+            f"skipped {errors_count} invalid rows."
+        )
+
+    @staticmethod
+    def parse_row(line):
+        try:
+            quantity = int(line["quantity"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid quantity: {line['quantity']}.")
+        variant_id = line.get("variant_id")
+        try:
+            variant_id = int(variant_id) if variant_id else None
+        except ValueError:
+            raise ValueError(f"Invalid variant ID: {variant_id}.")
+        return StockUpsertRow(
+            warehouse=line["warehouse"] or "",
+            quantity=quantity,
+            variant_id=variant_id,
+            sku=line.get("sku") or None,
+        )
@@ -40,7 +40,7 @@ from prices import Money
 
 from ..channel.models import Channel
 from ..core.db.fields import SanitizedJSONField
-from ..core.models import ModelWithMetadata, PublishableModel, SortableModel
+from ..core.models import Job, ModelWithMetadata, PublishableModel, SortableModel
 from ..core.permissions import (
     DiscountPermissions,
     OrderPermissions,
@@ -973,3 +973,17 @@ class CollectionTranslation(SeoModelTranslation):
             }
         )
         return translated_keys
+
+
+class ProductDeletion(Job):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="product_deletions",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+    app = models.ForeignKey(
+        "app.App", related_name="product_deletions", on_delete=models.CASCADE, null=True
+    )
+    product_ids = JSONField(default=list)
+    deleted_count = models.PositiveIntegerField(default=0)
@@ -1,6 +1,7 @@
 import logging
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, cast
 
+import celery
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
@@ -8,10 +9,13 @@ from django.utils import timezone
 
 from ..attribute.models import Attribute
 from ..celeryconf import app
+from ..core import JobStatus
 from ..core.exceptions import PreorderAllocationError
 from ..discount.models import Sale
+from ..plugins.manager import get_plugins_manager
 from ..warehouse.management import deactivate_preorder_for_variant
-from .models import Product, ProductType, ProductVariant
+from .deletion import PRODUCTS_DELETE_BATCH_SIZE, delete_products
+from .models import Product, ProductDeletion, ProductType, ProductVariant
 from .search import PRODUCTS_BATCH_SIZE, update_products_search_vector
 from .utils.variant_prices import (
     update_product_discounted_price,
@@ -21,6 +25,9 @@ from .utils.variant_prices import (
 )
 from .utils.variants import generate_and_set_variant_name
 
+if TYPE_CHECKING:
+    from ..core.middleware import Requestor
+
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
 
@@ -105,6 +112,50 @@ def update_products_discounted_prices_task(product_ids: List[int]):
     update_products_discounted_prices(products)
 
 
+class ProductDeletionTask(celery.Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        product_deletion = ProductDeletion.objects.get(pk=args[0])
+        product_deletion.status = JobStatus.FAILED
+        product_deletion.message = str(exc)[:255]
+        product_deletion.save(update_fields=["status", "message", "updated_at"])
+
+    def on_success(self, retval, task_id, args, kwargs):
+        product_deletion = ProductDeletion.objects.get(pk=args[0])
+        product_deletion.status = JobStatus.SUCCESS
+        product_deletion.message = f"Deleted {product_deletion.deleted_count} products."
+        product_deletion.save(update_fields=["status", "message", "updated_at"])
+
+
+@app.task(base=ProductDeletionTask, acks_late=True)
+def delete_products_task(product_deletion_id: int):
+    """Delete products of the deletion job in chunks, recording the progress.
+
+    Products deleted by a previous run of the task are skipped, so a failed
+    deletion can be resumed by running it again.
+    """
+    product_deletion = ProductDeletion.objects.select_related("user", "app").get(
+        pk=product_deletion_id
+    )
+    user, requestor_app = product_deletion.user, product_deletion.app
+    # deletions are created by staff users or apps
+    requestor = cast("Requestor", user or requestor_app)
+    manager = get_plugins_manager(lambda: requestor)
+    product_ids = sorted(product_deletion.product_ids)
+    for offset in range(0, len(product_ids), PRODUCTS_DELETE_BATCH_SIZE):
+        delete_products(
+            product_ids[offset : offset + PRODUCTS_DELETE_BATCH_SIZE],
+            manager,
+            user,
+            requestor_app,
+            product_deletion,
+        )
+        task_logger.info(
+            "Deleted %s of %s products.",
+            product_deletion.deleted_count,
+            len(product_ids),
+        )
+
+
 @app.task
 def deactivate_preorder_for_variants_task():
     variants_to_clean = _get_preorder_variants_to_clean()
@@ -1,6 +1,9 @@
 from unittest.mock import patch
 
+import pytest
+
 from ...plugins.manager import get_plugins_manager
+from ..category_tree import get_category_tree
 from ..models import Category
 from ..utils import collect_categories_tree_products, delete_categories
 
@@ -62,3 +65,59 @@ def test_delete_categories_trigger_product_updated_webhook(
     ).exists()
 
     assert len(product_list) == product_updated_mock.call_count
+
+
+def test_category_tree(categories_tree):
+    # given
+    parent = categories_tree
+    child = parent.children.get()
+    grandchild = child.children.create(name="Grandchild", slug="grandchild")
+    other = Category.objects.create(name="Other", slug="other")
+
+    # when
+    tree = get_category_tree()
+
+    # then
+    assert tree.get_descendant_ids([parent.pk]) == {
+        parent.pk,
+        child.pk,
+        grandchild.pk,
+    }
+    assert tree.get_descendant_ids([child.pk, other.pk], include_self=False) == {
+        grandchild.pk
+    }
+    assert tree.get_descendant_ids([other.pk + 1]) == set()
+    assert tree.get_ancestor_ids(grandchild.pk) == [parent.pk, child.pk]
+    assert tree.get_ancestor_ids(parent.pk) == []
+
+
+def test_category_tree_invalidated_on_category_change(categories_tree):
+    # given
+    parent = categories_tree
+    child = parent.children.get()
+    get_category_tree()
+
+    # when
+    new_child = parent.children.create(name="New child", slug="new-child")
+    child.delete()
+
+    # then
+    assert get_category_tree().get_descendant_ids([parent.pk]) == {
+        parent.pk,
+        new_child.pk,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_category_tree_is_cached(django_assert_num_queries):
+    # given
+    parent = Category.objects.create(name="Parent", slug="parent")
+    child = parent.children.create(name="Child", slug="child")
+    get_category_tree()
+
+    # when
+    with django_assert_num_queries(0):
+        tree = get_category_tree()
+
+    # then
+    assert tree.get_descendant_ids([parent.pk]) == {parent.pk, child.pk}
@@ -4,8 +4,11 @@ from unittest.mock import patch
 
 from django.utils import timezone
 
+from ...core import JobStatus
+from ..models import Product, ProductDeletion
 from ..tasks import (
     _get_preorder_variants_to_clean,
+    delete_products_task,
     update_product_discounted_price_task,
     update_products_discounted_prices_of_discount_task,
     update_products_search_vector_task,
@@ -128,3 +131,49 @@ def test_update_products_search_vector_task(product):
 
     # then
     assert product.search_index_dirty is False
+
+
+@patch("saleor.product.tasks.PRODUCTS_DELETE_BATCH_SIZE", 2)
+@patch("saleor.plugins.manager.PluginsManager.product_deleted")
+def test_delete_products_task(product_deleted_mock, product_list, staff_user):
+    # given
+    product_ids = [product.pk for product in product_list]
+    product_deletion = ProductDeletion.objects.create(
+        user=staff_user, product_ids=product_ids
+    )
+
+    # when
+    delete_products_task.delay(product_deletion.pk)
+
+    # then
+    assert not Product.objects.filter(pk__in=product_ids).exists()
+    assert product_deleted_mock.call_count == 3
+    product_deletion.refresh_from_db()
+    assert product_deletion.status == JobStatus.SUCCESS
+    assert product_deletion.deleted_count == 3
+
+
+@patch("saleor.product.tasks.PRODUCTS_DELETE_BATCH_SIZE", 2)
+@patch("saleor.plugins.manager.PluginsManager.product_deleted")
+def test_delete_products_task_resumes_deletion(
+    product_deleted_mock, product_list, staff_user
+):
+    # given
+    product_ids = [product.pk for product in product_list]
+    product_deletion = ProductDeletion.objects.create(
+        user=staff_user,
+        product_ids=product_ids,
+        status=JobStatus.FAILED,
+        deleted_count=2,
+    )
+    Product.objects.filter(pk__in=product_ids[:2]).delete()
+
+    # when
+    delete_products_task.delay(product_deletion.pk)
+
+    # then
+    assert not Product.objects.filter(pk__in=product_ids).exists()
+    assert product_deleted_mock.call_count == 1
+    product_deletion.refresh_from_db()
+    assert product_deletion.status == JobStatus.SUCCESS
+    assert product_deletion.deleted_count == 3
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
 from ...attribute import AttributeType
@@ -33,6 +34,32 @@ def generate_and_set_variant_name(
     return variant
 
 
+def generate_and_set_variants_names(variants: List["ProductVariant"]):
+    """Generate names of many variants at once, based on their attributes."""
+    from ...attribute.models import AssignedVariantAttribute
+    from ..models import ProductVariant
+
+    attributes_display = defaultdict(list)
+    variant_selection_attributes = AssignedVariantAttribute.objects.filter(
+        variant__in=variants,
+        assignment__variant_selection=True,
+        assignment__attribute__type=AttributeType.PRODUCT_TYPE,
+    ).prefetch_related("values__translations")
+    for attribute_rel in variant_selection_attributes:
+        translated_values = [
+            str(value.translated) for value in attribute_rel.values.all()
+        ]
+        attributes_display[attribute_rel.variant_id].append(
+            ", ".join(translated_values)
+        )
+
+    for variant in variants:
+        name = " / ".join(sorted(attributes_display[variant.pk]))
+        variant.name = name or variant.sku or variant.get_global_id()
+    ProductVariant.objects.bulk_update(variants, ["name"])
+    return variants
+
+
 def get_variant_selection_attributes(
     attributes: Iterable[Tuple["Attribute", bool]]
 ) -> List[Tuple["Attribute", bool]]:
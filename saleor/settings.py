@@ -97,6 +97,38 @@ DATABASES = {
     # ),
 }
 
+# Pool of read replicas used by GraphQL queries, as a comma-separated list of
+# database URLs. Replicas lagging behind the primary for more than
+# DATABASE_REPLICA_MAX_LAG are skipped until the next check.
+DATABASE_REPLICA_URLS = get_list(os.environ.get("DATABASE_REPLICA_URLS", ""))
+DATABASE_CONNECTION_REPLICA_NAMES = []
+replica_url: str
+for index, replica_url in enumerate(filter(None, DATABASE_REPLICA_URLS)):
+    replica_name = f"replica_{index}"
+    DATABASES[replica_name] = dj_database_url.parse(
+        replica_url, conn_max_age=DB_CONN_MAX_AGE
+    )
+    DATABASE_CONNECTION_REPLICA_NAMES.append(replica_name)
+
+# Relative weights of the replicas, in order of DATABASE_REPLICA_URLS.
+# Replicas are chosen with equal probability when not set.
+DATABASE_REPLICA_WEIGHTS = [
+    int(weight)
+    for weight in get_list(os.environ.get("DATABASE_REPLICA_WEIGHTS", ""))
+    if weight
+]
+DATABASE_REPLICA_MAX_LAG = timedelta(
+    seconds=parse(os.environ.get("DATABASE_REPLICA_MAX_LAG", "5 seconds"))
+)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = timedelta(
+    seconds=parse(os.environ.get("DATABASE_REPLICA_LAG_CHECK_INTERVAL", "10 seconds"))
+)
+# Time for which queries of a client that has run a mutation are sent to the primary
+# database, so the client reads its own writes.
+DATABASE_PRIMARY_STICKINESS = timedelta(
+    seconds=parse(os.environ.get("DATABASE_PRIMARY_STICKINESS", "5 seconds"))
+)
+
 DATABASE_ROUTERS = ["saleor.core.db_routers.PrimaryReplicaRouter"]
 
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
@@ -567,10 +599,6 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.giftcard.tasks.deactivate_expired_cards_task",
         "schedule": crontab(hour=0, minute=0),
     },
-    "update-stocks-quantity-allocated": {
-        "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
-        "schedule": crontab(hour=0, minute=0),
-    },
     "delete-old-export-files": {
         "task": "saleor.csv.tasks.delete_old_export_files",
         "schedule": crontab(hour=1, minute=0),
@@ -585,6 +613,15 @@ CELERY_BEAT_SCHEDULE = {
     },
 }
 
+# Expired data (checkouts, reservations, event payloads, export files) is deleted
+# by periodic tasks in batches of this many rows.
+PURGE_BATCH_SIZE = int(os.environ.get("PURGE_BATCH_SIZE", 1000))
+# Maximum duration of a single run of each purge; the next run resumes from
+# where the previous one stopped.
+PURGE_TIME_BUDGET = timedelta(
+    seconds=parse(os.environ.get("PURGE_TIME_BUDGET", "1 minute"))
+)
+
 # The maximum wait time between each is_due() call on schedulers
 # It needs to be higher than the frequency of the schedulers to avoid unnecessary
 # is_due() calls
@@ -593,6 +630,16 @@ CELERY_BEAT_MAX_LOOP_INTERVAL = 300  # 5 minutes
 EVENT_PAYLOAD_DELETE_PERIOD = timedelta(
     seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_PERIOD", "14 days"))
 )
+# Identical webhook payloads created within this period are stored once.
+# Set to 0 to store every payload separately.
+EVENT_PAYLOAD_DEDUPLICATION_PERIOD = timedelta(
+    seconds=parse(os.environ.get("EVENT_PAYLOAD_DEDUPLICATION_PERIOD", "0 seconds"))
+)
+# Webhook payloads of at least this size in bytes are stored compressed.
+# Set to 0 to disable the compression.
+EVENT_PAYLOAD_COMPRESSION_MIN_SIZE = int(
+    os.environ.get("EVENT_PAYLOAD_COMPRESSION_MIN_SIZE", 0)
+)
 
 # Observability settings
 OBSERVABILITY_BROKER_URL = os.environ.get("OBSERVABILITY_BROKER_URL")
@@ -600,6 +647,24 @@ OBSERVABILITY_ACTIVE = bool(OBSERVABILITY_BROKER_URL)
 OBSERVABILITY_REPORT_ALL_API_CALLS = get_bool_from_env(
     "OBSERVABILITY_REPORT_ALL_API_CALLS", False
 )
+# Fraction of API calls reported to observability webhooks.
+# Rates of specific GraphQL operations can be set as a comma-separated list of
+# `operationName:rate` pairs. Failed API calls and ones slower than
+# OBSERVABILITY_SLOW_API_CALL_THRESHOLD are always reported.
+OBSERVABILITY_API_CALL_SAMPLE_RATE = float(
+    os.environ.get("OBSERVABILITY_API_CALL_SAMPLE_RATE", 1.0)
+)
+OBSERVABILITY_API_CALL_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.rsplit(":", 1)
+        for item in get_list(os.environ.get("OBSERVABILITY_API_CALL_SAMPLE_RATES", ""))
+        if item
+    )
+}
+OBSERVABILITY_SLOW_API_CALL_THRESHOLD = timedelta(
+    seconds=parse(os.environ.get("OBSERVABILITY_SLOW_API_CALL_THRESHOLD", "1 second"))
+)
 OBSERVABILITY_MAX_PAYLOAD_SIZE = int(
     os.environ.get("OBSERVABILITY_MAX_PAYLOAD_SIZE", 25 * 1000)
 )
@@ -615,6 +680,16 @@ OBSERVABILITY_REPORT_PERIOD = timedelta(
 OBSERVABILITY_BUFFER_TIMEOUT = timedelta(
     seconds=parse(os.environ.get("OBSERVABILITY_BUFFER_TIMEOUT", "5 minutes"))
 )
+# Keep the buffer in a Redis stream read by a consumer group, so many reporters
+# can send events in parallel without duplicates.
+OBSERVABILITY_BUFFER_USE_STREAMS = get_bool_from_env(
+    "OBSERVABILITY_BUFFER_USE_STREAMS", False
+)
+# Time, in milliseconds, that reporting an event may add to a request. Events
+# taking longer are logged with their overhead.
+OBSERVABILITY_REPORT_TIME_BUDGET = timedelta(
+    milliseconds=int(os.environ.get("OBSERVABILITY_REPORT_TIME_BUDGET", 50))
+)
 if OBSERVABILITY_ACTIVE:
     CELERY_BEAT_SCHEDULE["observability-reporter"] = {
         "task": "saleor.plugins.webhook.tasks.observability_reporter_task",
@@ -721,12 +796,107 @@ if (
 # for getting response from the server.
 WEBHOOK_TIMEOUT = 10
 WEBHOOK_SYNC_TIMEOUT = 20
+# Custom endpoint of the SQS API, e.g. of a local SQS emulator.
+WEBHOOK_AWS_SQS_ENDPOINT_URL = os.environ.get("WEBHOOK_AWS_SQS_ENDPOINT_URL")
+
+# Stop sending async webhooks to targets failing too often, see
+# `saleor.plugins.webhook.circuit_breaker`.
+WEBHOOK_CIRCUIT_BREAKER_ENABLED = get_bool_from_env(
+    "WEBHOOK_CIRCUIT_BREAKER_ENABLED", False
+)
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = float(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 0.5)
+)
+WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS = int(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS", 10)
+)
+WEBHOOK_CIRCUIT_BREAKER_WINDOW = timedelta(
+    seconds=parse(os.environ.get("WEBHOOK_CIRCUIT_BREAKER_WINDOW", "1 minute"))
+)
+WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = timedelta(
+    seconds=parse(os.environ.get("WEBHOOK_CIRCUIT_BREAKER_COOLDOWN", "1 minute"))
+)
+if WEBHOOK_CIRCUIT_BREAKER_ENABLED:
+    CELERY_BEAT_SCHEDULE["probe-webhook-circuit-breakers"] = {
+        "task": "saleor.plugins.webhook.tasks.probe_webhook_circuit_breakers_task",
+        "schedule": WEBHOOK_CIRCUIT_BREAKER_COOLDOWN,
+        "options": {"expires": WEBHOOK_CIRCUIT_BREAKER_COOLDOWN.total_seconds()},
+    }
+# Generate subscription payloads of sync webhooks triggered within a single API
+# call with shared dataloaders, and reuse payloads generated for the same object.
+WEBHOOK_SYNC_SHARED_PAYLOADS_ENABLED = get_bool_from_env(
+    "WEBHOOK_SYNC_SHARED_PAYLOADS_ENABLED", False
+)
+# Cache responses of idempotent sync webhooks, see
+# `saleor.plugins.webhook.response_cache`. Times are set per event type as
+# a comma-separated list of `event_type:time` pairs, e.g.
+# "shipping_list_methods_for_checkout:5 minutes,payment_list_gateways:1 minute".
+WEBHOOK_SYNC_RESPONSE_CACHE_TIMEOUTS = {
+    event_type.strip(): timedelta(seconds=parse(timeout))
+    for event_type, timeout in (
+        item.split(":", 1)
+        for item in get_list(os.environ.get("WEBHOOK_SYNC_RESPONSE_CACHE_TIMEOUTS", ""))
+        if item
+    )
+}
+# Time for which an expired response is still used, while it's being refreshed
+# in the background.
+WEBHOOK_SYNC_RESPONSE_CACHE_STALE_WHILE_REVALIDATE = timedelta(
+    seconds=parse(
+        os.environ.get(
+            "WEBHOOK_SYNC_RESPONSE_CACHE_STALE_WHILE_REVALIDATE", "0 seconds"
+        )
+    )
+)
+# Let apps control caching of their responses with the `Cache-Control` header.
+WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED = get_bool_from_env(
+    "WEBHOOK_SYNC_RESPONSE_CACHE_CONTROL_ENABLED", False
+)
 
 # Since we split checkout complete logic into two separate transactions, in order to
 # mimic stock lock, we apply short reservation for the stocks. The value represents
 # time of the reservation in seconds.
 RESERVE_DURATION = 45
 
+# Reserve stocks by atomically increasing reserved quantity counters of stocks
+# instead of locking all stocks of reserved variants. Recommended for flash sales
+# when many customers reserve the same variants at once. The counters are reconciled
+# with reservations every STOCKS_QUANTITY_RESERVED_UPDATE_PERIOD.
+RESERVE_STOCKS_USING_COUNTERS = get_bool_from_env(
+    "RESERVE_STOCKS_USING_COUNTERS", False
+)
+STOCKS_QUANTITY_RESERVED_UPDATE_PERIOD = timedelta(
+    seconds=parse(os.environ.get("STOCKS_QUANTITY_RESERVED_UPDATE_PERIOD", "1 minute"))
+)
+# Allocated quantity of stocks whose allocations have changed is reconciled with
+# allocations every STOCKS_QUANTITY_ALLOCATED_UPDATE_PERIOD. All stocks are checked
+# once a day, when `update_stocks_quantity_allocated_task` is run with
+# `full_scan=True`.
+STOCKS_QUANTITY_ALLOCATED_UPDATE_PERIOD = timedelta(
+    seconds=parse(
+        os.environ.get("STOCKS_QUANTITY_ALLOCATED_UPDATE_PERIOD", "10 minutes")
+    )
+)
+STOCKS_QUANTITY_ALLOCATED_UPDATE_BATCH_SIZE = int(
+    os.environ.get("STOCKS_QUANTITY_ALLOCATED_UPDATE_BATCH_SIZE", 1000)
+)
+CELERY_BEAT_SCHEDULE["update-stocks-quantity-allocated"] = {
+    "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
+    "schedule": STOCKS_QUANTITY_ALLOCATED_UPDATE_PERIOD,
+    "options": {"expires": STOCKS_QUANTITY_ALLOCATED_UPDATE_PERIOD.total_seconds()},
+}
+CELERY_BEAT_SCHEDULE["update-stocks-quantity-allocated-full-scan"] = {
+    "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
+    "schedule": crontab(hour=0, minute=0),
+    "kwargs": {"full_scan": True},
+}
+if RESERVE_STOCKS_USING_COUNTERS:
+    CELERY_BEAT_SCHEDULE["update-stocks-quantity-reserved"] = {
+        "task": "saleor.warehouse.tasks.update_stocks_quantity_reserved_task",
+        "schedule": STOCKS_QUANTITY_RESERVED_UPDATE_PERIOD,
+        "options": {"expires": STOCKS_QUANTITY_RESERVED_UPDATE_PERIOD.total_seconds()},
+    }
+
 # Initialize a simple and basic Jaeger Tracing integration
 # for open-tracing if enabled.
 #
@@ -758,6 +928,14 @@ if REDIS_URL:
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
+# Share values of reference data loaders (like channels, warehouses or attributes)
+# between requests, using an in-process LRU cache and the cache defined above.
+DATALOADER_SHARED_CACHE_ENABLED = get_bool_from_env(
+    "DATALOADER_SHARED_CACHE_ENABLED", False
+)
+# Maximum number of values kept in the in-process cache of data loaders.
+DATALOADER_LOCAL_CACHE_SIZE = int(os.environ.get("DATALOADER_LOCAL_CACHE_SIZE", 10000))
+
 JWT_EXPIRE = True
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "5 minutes")))
 JWT_TTL_APP_ACCESS = timedelta(
@@ -774,6 +952,30 @@ CHECKOUT_PRICES_TTL = timedelta(
     seconds=parse(os.environ.get("CHECKOUT_PRICES_TTL", "1 hour"))
 )
 
+# Time for which the fetched checkout lines are cached between requests.
+# The snapshot is versioned by the checkout's `last_change` and dropped on catalogue
+# changes. Set to 0 to disable the cache.
+CHECKOUT_LINES_SNAPSHOT_TTL = timedelta(
+    seconds=parse(os.environ.get("CHECKOUT_LINES_SNAPSHOT_TTL", "0 seconds"))
+)
+
+# Strategies used to resolve `totalCount` of connections, by connection name:
+# "exact" (default), "cached" (exact count cached for TOTAL_COUNT_CACHE_TIMEOUT)
+# or "estimated" (PostgreSQL planner estimate, used when it's above
+# TOTAL_COUNT_ESTIMATE_THRESHOLD).
+TOTAL_COUNT_STRATEGIES = {
+    "OrderCountableConnection": os.environ.get("ORDERS_TOTAL_COUNT_STRATEGY", "exact"),
+    "ProductCountableConnection": os.environ.get(
+        "PRODUCTS_TOTAL_COUNT_STRATEGY", "exact"
+    ),
+}
+TOTAL_COUNT_CACHE_TIMEOUT = timedelta(
+    seconds=parse(os.environ.get("TOTAL_COUNT_CACHE_TIMEOUT", "1 minute"))
+)
+TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("TOTAL_COUNT_ESTIMATE_THRESHOLD", 100000)
+)
+
 # The maximum SearchVector expression count allowed per index SQL statement
 # If the count is exceeded, the expression list will be truncated
 INDEX_MAXIMUM_EXPR_COUNT = 4000
@@ -6,6 +6,7 @@ from django.db import transaction
 from django.db.models import F, Sum
 from django.db.models.expressions import Exists, OuterRef
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from ..channel import AllocationStrategy
 from ..checkout.models import CheckoutLine
@@ -40,6 +41,14 @@ if TYPE_CHECKING:
 StockData = namedtuple("StockData", ["pk", "quantity"])
 
 
+def update_stocks_quantity_allocated(stocks: List[Stock]):
+    """Save allocated quantity of stocks and mark their allocations as changed."""
+    now = timezone.now()
+    for stock in stocks:
+        stock.allocations_updated_at = now
+    Stock.objects.bulk_update(stocks, ["quantity_allocated", "allocations_updated_at"])
+
+
 @traced_atomic_transaction()
 def allocate_stocks(
     order_lines_info: Iterable["OrderLineInfo"],
@@ -146,7 +155,7 @@ def allocate_stocks(
                 F("quantity_allocated") + alloc.quantity_allocated
             )
             stocks_to_update.append(stock)
-        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        update_stocks_quantity_allocated(stocks_to_update)
 
         for allocation in allocations:
             allocated_stock = (
@@ -352,7 +361,7 @@ def deallocate_stock(
                 )
             )
 
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(stocks_to_update)
 
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
@@ -397,7 +406,7 @@ def increase_stock(
                 order_line=order_line, stock=stock, quantity_allocated=quantity
             )
         stock.quantity_allocated = F("quantity_allocated") + quantity
-        stock.save(update_fields=["quantity_allocated"])
+        update_stocks_quantity_allocated([stock])
 
 
 @traced_atomic_transaction()
@@ -429,7 +438,7 @@ def increase_allocations(
         stock.quantity_allocated = F("quantity_allocated") - alloc.quantity_allocated
         stocks_to_update.append(stock)
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(stocks_to_update)
 
     allocate_stocks(
         lines_info,
@@ -470,9 +479,11 @@ def decrease_stock(
     try:
         deallocate_stock(order_lines_info, manager)
     except AllocationError as exc:
-        Allocation.objects.filter(order_line__in=exc.order_lines).update(
-            quantity_allocated=0
-        )
+        allocations = Allocation.objects.filter(order_line__in=exc.order_lines)
+        Stock.objects.filter(
+            Exists(allocations.filter(stock_id=OuterRef("pk")))
+        ).update(allocations_updated_at=timezone.now())
+        allocations.update(quantity_allocated=0)
 
     stocks = (
         Stock.objects.select_for_update(of=("self",))
@@ -582,25 +593,57 @@ def get_order_lines_with_track_inventory(
 @traced_atomic_transaction()
 def deallocate_stock_for_order(order: "Order", manager: PluginsManager):
     """Remove all allocations for given order."""
-    lines = OrderLine.objects.filter(order_id=order.id)
+    deallocate_stock_for_orders([order], manager)
+
+
+def deallocate_stock_for_orders(orders: Iterable["Order"], manager: PluginsManager):
+    """Remove all allocations for given orders.
+
+    Stocks are locked and updated at once, ordered by `pk` to avoid deadlocks.
+    """
     allocations = Allocation.objects.filter(
-        Exists(lines.filter(id=OuterRef("order_line_id"))), quantity_allocated__gt=0
-    ).select_related("stock")
+        order_line__order_id__in=[order.pk for order in orders],
+        quantity_allocated__gt=0,
+    )
+    stocks = {
+        stock.pk: stock
+        for stock in Stock.objects.select_for_update(of=("self",))
+        .filter(Exists(allocations.filter(stock_id=OuterRef("pk"))))
+        .order_by("pk")
+    }
+    if not stocks:
+        return
+    quantities_to_deallocate = (
+        allocations.order_by()
+        .values("stock_id")
+        .annotate(quantity=Sum("quantity_allocated"))
+        .values_list("stock_id", "quantity")
+    )
 
-    stocks_to_update = []
-    for alloc in allocations:
-        stock = alloc.stock
-        stock.quantity_allocated = F("quantity_allocated") - alloc.quantity_allocated
-        stocks_to_update.append(stock)
+    available_quantities = dict(
+        Stock.objects.filter(pk__in=stocks.keys())
+        .annotate_available_quantity()
+        .values_list("pk", "available_quantity")
+    )
 
-    for allocation in allocations.annotate_stock_available_quantity():
-        if allocation.stock_available_quantity <= 0:
-            transaction.on_commit(
-                lambda: manager.product_variant_back_in_stock(allocation.stock)
-            )
+    back_in_stock = []
+    for stock_id, quantity in quantities_to_deallocate:
+        stock = stocks[stock_id]
+        if available_quantities[stock_id] <= 0:
+            back_in_stock.append(stock)
+        stock.quantity_allocated -= quantity
 
     allocations.update(quantity_allocated=0)
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(list(stocks.values()))
+    if back_in_stock:
+        transaction.on_commit(
+            lambda: _send_back_in_stock_events(back_in_stock, manager)
+        )
+
+
+def _send_back_in_stock_events(stocks: List[Stock], manager: PluginsManager):
+    for stock in stocks:
+        manager.product_variant_back_in_stock(stock)
 
 
 @traced_atomic_transaction()
@@ -804,7 +847,7 @@ def deactivate_preorder_for_variant(product_variant: ProductVariant):
         Stock.objects.bulk_create(stocks_to_create)
 
     if stocks_to_update:
-        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        update_stocks_quantity_allocated(stocks_to_update)
 
     if allocations_to_create:
         Allocation.objects.bulk_create(allocations_to_create)
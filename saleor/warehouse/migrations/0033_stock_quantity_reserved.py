@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2022-11-21 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0032_alter_channel_warehouse"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="quantity_reserved",
+            field=models.IntegerField(default=0),
+        ),
+    ]
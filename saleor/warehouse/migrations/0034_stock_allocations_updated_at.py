@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0033_stock_quantity_reserved"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="allocations_updated_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
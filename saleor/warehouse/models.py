@@ -343,6 +343,13 @@ class Stock(models.Model):
     )
     quantity = models.IntegerField(default=0)
     quantity_allocated = models.IntegerField(default=0)
+    # Counter of reserved quantity maintained only when stocks are reserved using
+    # counters. It's reconciled with reservations by
+    # `update_stocks_quantity_reserved_task`.
+    quantity_reserved = models.IntegerField(default=0)
+    # Time of the last change of the stock's allocations, used as the watermark by
+    # `update_stocks_quantity_allocated_task` to reconcile only changed stocks.
+    allocations_updated_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     objects = models.Manager.from_queryset(StockQuerySet)()
 
@@ -2,8 +2,9 @@ from collections import defaultdict, namedtuple
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
+from django.conf import settings
 from django.db.models import F, Sum
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 
 from ..core.exceptions import InsufficientStock, InsufficientStockData
@@ -100,6 +101,16 @@ def reserve_stocks(
     if not checkout_lines:
         return
 
+    if settings.RESERVE_STOCKS_USING_COUNTERS:
+        return _reserve_stocks_using_counters(
+            checkout_lines,
+            variants_map,
+            country_code,
+            channel,
+            reserved_until,
+            replace=replace,
+        )
+
     stocks = list(
         Stock.objects.select_for_update(of=("self",))
         .get_variants_stocks_for_country(country_code, channel.slug, variants)
@@ -170,7 +181,9 @@ def reserve_stocks(
 
     if reservations:
         if replace:
-            Reservation.objects.filter(checkout_line__in=checkout_lines).delete()
+            release_stock_reservations(
+                Reservation.objects.filter(checkout_line__in=checkout_lines)
+            )
         Reservation.objects.bulk_create(reservations)
 
 
@@ -230,6 +243,162 @@ def _create_stock_reservations(
     return [], []
 
 
+@traced_atomic_transaction()
+def _reserve_stocks_using_counters(
+    checkout_lines: Iterable["CheckoutLine"],
+    variants_map: Dict[int, "ProductVariant"],
+    country_code: str,
+    channel: "Channel",
+    reserved_until: datetime,
+    *,
+    replace: bool = True,
+):
+    """Reserve stocks by increasing `quantity_reserved` counters of stocks.
+
+    Stocks are not locked up front. Instead, the counter of each stock is increased
+    with a single conditional UPDATE that succeeds only when the stock still has
+    enough available quantity, so concurrent reservations of the same variant
+    don't queue on locks of all its stocks.
+    """
+    if replace:
+        release_stock_reservations(
+            Reservation.objects.filter(checkout_line__in=checkout_lines)
+        )
+
+    stocks = list(
+        Stock.objects.get_variants_stocks_for_country(
+            country_code, channel.slug, variants_map.values()
+        )
+        .order_by("pk")
+        .values(
+            "pk",
+            "product_variant",
+            "quantity",
+            "quantity_allocated",
+            "quantity_reserved",
+            "warehouse_id",
+        )
+    )
+    quantity_allocation_for_stocks = {
+        stock_data["pk"]: stock_data["quantity_allocated"] for stock_data in stocks
+    }
+    stocks = sort_stocks(
+        channel.allocation_strategy,
+        stocks,
+        channel,
+        quantity_allocation_for_stocks,
+    )
+
+    variant_to_stocks: Dict[int, List[dict]] = defaultdict(list)
+    for stock_data in stocks:
+        variant_to_stocks[stock_data["product_variant"]].append(stock_data)
+
+    insufficient_stocks: List[InsufficientStockData] = []
+    reservations: List[Reservation] = []
+    # lines are sorted to always update counters in the same order
+    for line in sorted(checkout_lines, key=lambda line: line.variant_id):
+        line_reservations = _create_stock_reservations_using_counters(
+            line, variant_to_stocks[line.variant_id], reserved_until
+        )
+        if line_reservations is None:
+            insufficient_stocks.append(
+                InsufficientStockData(
+                    variant=variants_map[line.variant_id],
+                    available_quantity=line.quantity,
+                )  # type: ignore
+            )
+        else:
+            reservations.extend(line_reservations)
+
+    if insufficient_stocks:
+        raise InsufficientStock(insufficient_stocks)
+
+    Reservation.objects.bulk_create(reservations)
+
+
+def _create_stock_reservations_using_counters(
+    line: "CheckoutLine", stocks: List[dict], reserved_until: datetime
+) -> Optional[List[Reservation]]:
+    quantity_reserved = 0
+    reservations = []
+    for stock_data in stocks:
+        quantity_available_in_stock = (
+            stock_data["quantity"]
+            - stock_data["quantity_allocated"]
+            - stock_data["quantity_reserved"]
+        )
+        quantity_to_reserve = min(
+            line.quantity - quantity_reserved, quantity_available_in_stock
+        )
+        if quantity_to_reserve <= 0:
+            continue
+
+        # the stock could be reserved by other checkouts in the meantime, so the
+        # counter is increased only if the stock still has enough quantity
+        updated = Stock.objects.filter(
+            pk=stock_data["pk"],
+            quantity__gte=(
+                F("quantity_allocated") + F("quantity_reserved") + quantity_to_reserve
+            ),
+        ).update(quantity_reserved=F("quantity_reserved") + quantity_to_reserve)
+        if not updated:
+            continue
+
+        stock_data["quantity_reserved"] += quantity_to_reserve
+        reservations.append(
+            Reservation(
+                checkout_line=line,
+                stock_id=stock_data["pk"],
+                quantity_reserved=quantity_to_reserve,
+                reserved_until=reserved_until,
+            )
+        )
+        quantity_reserved += quantity_to_reserve
+        if quantity_reserved == line.quantity:
+            return reservations
+
+    return None
+
+
+def release_stock_reservations(reservations):
+    """Delete given reservations and decrease stock counters accordingly.
+
+    All reservations must be deleted with this function, or with
+    `release_checkout_lines_reservations` before their checkout lines are deleted,
+    as otherwise `quantity_reserved` counters of stocks stay increased.
+
+    Counters are decreased only for not expired reservations, as expired ones are
+    dropped from the counters by `update_stocks_quantity_reserved_task`.
+    """
+    if settings.RESERVE_STOCKS_USING_COUNTERS:
+        quantity_reserved_per_stock = (
+            reservations.not_expired()
+            .order_by("stock")
+            .values("stock")
+            .annotate(quantity_reserved_sum=Sum("quantity_reserved"))
+        )
+        for reservation_data in quantity_reserved_per_stock:
+            Stock.objects.filter(pk=reservation_data["stock"]).update(
+                quantity_reserved=Greatest(
+                    F("quantity_reserved") - reservation_data["quantity_reserved_sum"],
+                    0,
+                )
+            )
+    reservations.delete()
+
+
+def release_checkout_lines_reservations(checkout_lines):
+    """Release reservations of checkout lines which are about to be deleted.
+
+    Reservations are deleted together with their checkout lines by cascade, so
+    they need to be released up front only when stock counters are used.
+    """
+    if settings.RESERVE_STOCKS_USING_COUNTERS:
+        release_stock_reservations(
+            Reservation.objects.filter(checkout_line__in=checkout_lines)
+        )
+
+
 def reserve_preorders(
     checkout_lines: Iterable["CheckoutLine"],
     variants: Iterable["ProductVariant"],
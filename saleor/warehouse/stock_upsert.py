@@ -0,0 +1,232 @@
+"""Creating and updating stocks of many variants at once.
+
+Rows are applied in batches of `STOCKS_UPSERT_BATCH_SIZE`. Each batch is resolved
+and saved with a few set-based queries in a separate transaction, so invalid rows
+are reported as errors without aborting the rest of the rows.
+
+The `product_variant_back_in_stock` and `product_variant_out_of_stock` events are
+sent only for the stocks which quantity crossed zero.
+"""
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from ..product.models import ProductVariant
+from .error_codes import StockErrorCode
+from .models import Stock, Warehouse
+
+if TYPE_CHECKING:
+    from ..plugins.manager import PluginsManager
+
+STOCKS_UPSERT_BATCH_SIZE = 1000
+
+
+@dataclass
+class StockUpsertRow:
+    # ID or slug of the warehouse.
+    warehouse: str
+    quantity: int
+    variant_id: Optional[int] = None
+    sku: Optional[str] = None
+
+
+@dataclass
+class StockUpsertError:
+    index: int
+    field: str
+    message: str
+    code: str
+
+
+@dataclass
+class StockUpsertResult:
+    created_count: int = 0
+    updated_count: int = 0
+    errors: List[StockUpsertError] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return self.created_count + self.updated_count
+
+
+def bulk_upsert_stocks(
+    rows: Sequence[StockUpsertRow], manager: "PluginsManager"
+) -> StockUpsertResult:
+    """Set quantities of the variants' stocks, creating the missing ones.
+
+    Errors are reported by the index of the row.
+    """
+    result = StockUpsertResult()
+    seen_stocks: Set[Tuple[int, uuid.UUID]] = set()
+    for offset in range(0, len(rows), STOCKS_UPSERT_BATCH_SIZE):
+        batch = rows[offset : offset + STOCKS_UPSERT_BATCH_SIZE]
+        stocks_data = _clean_rows(batch, offset, seen_stocks, result)
+        if stocks_data:
+            try:
+                _save_stocks(stocks_data, manager, result)
+            except IntegrityError:
+                # Some of the stocks were created concurrently, retry with them
+                # being updated instead.
+                _save_stocks(stocks_data, manager, result)
+    return result
+
+
+def _get_warehouses_lookup(rows: Sequence[StockUpsertRow]) -> Dict[str, Warehouse]:
+    warehouse_ids = set()
+    slugs = set()
+    for row in rows:
+        try:
+            warehouse_ids.add(uuid.UUID(str(row.warehouse)))
+        except ValueError:
+            slugs.add(row.warehouse)
+    lookup = {}
+    for warehouse in Warehouse.objects.filter(
+        Q(pk__in=warehouse_ids) | Q(slug__in=slugs)
+    ):
+        lookup[str(warehouse.pk)] = warehouse
+        lookup[warehouse.slug] = warehouse
+    return lookup
+
+
+def _clean_rows(
+    rows: Sequence[StockUpsertRow],
+    offset: int,
+    seen_stocks: Set[Tuple[int, uuid.UUID]],
+    result: StockUpsertResult,
+) -> List[Tuple[ProductVariant, Warehouse, int]]:
+    variants_by_sku = {
+        variant.sku: variant
+        for variant in ProductVariant.objects.filter(
+            sku__in={row.sku for row in rows if row.sku}
+        )
+    }
+    variants_by_id = ProductVariant.objects.in_bulk(
+        {row.variant_id for row in rows if row.variant_id}
+    )
+    warehouses = _get_warehouses_lookup(rows)
+
+    stocks_data = []
+    for index, row in enumerate(rows, start=offset):
+        errors_count = len(result.errors)
+        variant = None
+        if bool(row.variant_id) == bool(row.sku):
+            result.errors.append(
+                StockUpsertError(
+                    index,
+                    "sku",
+                    "Either a variant ID or SKU must be provided.",
+                    StockErrorCode.REQUIRED.value,
+                )
+            )
+        else:
+            variant = (
+                variants_by_id.get(row.variant_id)
+                if row.variant_id
+                else variants_by_sku.get(row.sku)
+            )
+            if variant is None:
+                field_name = "variant_id" if row.variant_id else "sku"
+                result.errors.append(
+                    StockUpsertError(
+                        index,
+                        field_name,
+                        "Product variant doesn't exist.",
+                        StockErrorCode.NOT_FOUND.value,
+                    )
+                )
+        warehouse = warehouses.get(str(row.warehouse))
+        if warehouse is None:
+            result.errors.append(
+                StockUpsertError(
+                    index,
+                    "warehouse",
+                    "Warehouse doesn't exist.",
+                    StockErrorCode.NOT_FOUND.value,
+                )
+            )
+        if row.quantity < 0:
+            result.errors.append(
+                StockUpsertError(
+                    index,
+                    "quantity",
+                    "Quantity can't be negative.",
+                    StockErrorCode.INVALID.value,
+                )
+            )
+        if len(result.errors) > errors_count or not variant or not warehouse:
+            continue
+
+        key = (variant.pk, warehouse.pk)
+        if key in seen_stocks:
+            result.errors.append(
+                StockUpsertError(
+                    index,
+                    "warehouse",
+                    "Duplicated stock of the variant in the warehouse.",
+                    StockErrorCode.UNIQUE.value,
+                )
+            )
+            continue
+        seen_stocks.add(key)
+        stocks_data.append((variant, warehouse, row.quantity))
+    return stocks_data
+
+
+def _save_stocks(
+    stocks_data: List[Tuple[ProductVariant, Warehouse, int]],
+    manager: "PluginsManager",
+    result: StockUpsertResult,
+):
+    stocks_to_create = []
+    stocks_to_update = []
+    back_in_stock = []
+    out_of_stock = []
+    with transaction.atomic():
+        existing_stocks = {
+            (stock.product_variant_id, stock.warehouse_id): stock
+            for stock in Stock.objects.select_for_update(of=("self",))
+            .filter(
+                product_variant_id__in={variant.pk for variant, _, _ in stocks_data},
+                warehouse_id__in={warehouse.pk for _, warehouse, _ in stocks_data},
+            )
+            .order_by("pk")
+        }
+        for variant, warehouse, quantity in stocks_data:
+            stock = existing_stocks.get((variant.pk, warehouse.pk))
+            if stock is None:
+                stock = Stock(
+                    product_variant=variant, warehouse=warehouse, quantity=quantity
+                )
+                stocks_to_create.append(stock)
+                if quantity > 0:
+                    back_in_stock.append(stock)
+                continue
+
+            if stock.quantity <= 0 < quantity:
+                back_in_stock.append(stock)
+            elif quantity <= 0 < stock.quantity:
+                out_of_stock.append(stock)
+            stock.product_variant = variant
+            stock.warehouse = warehouse
+            stock.quantity = quantity
+            stocks_to_update.append(stock)
+
+        Stock.objects.bulk_create(stocks_to_create)
+        Stock.objects.bulk_update(stocks_to_update, ["quantity"])
+        transaction.on_commit(
+            lambda: _send_stock_events(manager, back_in_stock, out_of_stock)
+        )
+    result.created_count += len(stocks_to_create)
+    result.updated_count += len(stocks_to_update)
+
+
+def _send_stock_events(
+    manager: "PluginsManager", back_in_stock: List[Stock], out_of_stock: List[Stock]
+):
+    for stock in back_in_stock:
+        manager.product_variant_back_in_stock(stock)
+    for stock in out_of_stock:
+        manager.product_variant_out_of_stock(stock)
@@ -1,9 +1,15 @@
+from datetime import timedelta
+from typing import List
+
 from celery.utils.log import get_task_logger
-from django.db.models import F, Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, F, OuterRef, Q, Subquery, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from ..celeryconf import app
+from ..core.purge import purge, schedule_purge_continuation
 from .models import Allocation, PreorderReservation, Reservation, Stock
 
 task_logger = get_task_logger(__name__)
@@ -11,46 +17,148 @@ task_logger = get_task_logger(__name__)
 
 @app.task
 def delete_empty_allocations_task():
-    count, _ = Allocation.objects.filter(quantity_allocated=0).delete()
-    if count:
-        task_logger.debug("Removed %s allocations", count)
+    result = purge("empty_allocations", Allocation.objects.filter(quantity_allocated=0))
+    if result.deleted_count:
+        task_logger.debug("Removed %s allocations", result.deleted_count)
+    schedule_purge_continuation(delete_empty_allocations_task, result)
 
 
 @app.task
 def delete_expired_reservations_task():
-    stock_reservations, _ = Reservation.objects.filter(
-        reserved_until__lt=timezone.now()
-    ).delete()
-    preorder_reservations, _ = PreorderReservation.objects.filter(
-        reserved_until__lt=timezone.now()
-    ).delete()
-
-    if stock_reservations or preorder_reservations:
+    now = timezone.now()
+    stock_reservations = purge(
+        "expired_reservations", Reservation.objects.filter(reserved_until__lt=now)
+    )
+    preorder_reservations = purge(
+        "expired_preorder_reservations",
+        PreorderReservation.objects.filter(reserved_until__lt=now),
+    )
+
+    if stock_reservations.deleted_count or preorder_reservations.deleted_count:
         task_logger.debug(
             "Removed %s stock reservations and %s preorder reservations",
-            stock_reservations,
-            preorder_reservations,
+            stock_reservations.deleted_count,
+            preorder_reservations.deleted_count,
         )
+    schedule_purge_continuation(
+        delete_expired_reservations_task, stock_reservations, preorder_reservations
+    )
 
 
-@app.task
-def update_stocks_quantity_allocated_task():
-    stocks_to_update = []
-    for mismatched_stock in Stock.objects.annotate(
-        allocations_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
-    ).exclude(quantity_allocated=F("allocations_allocated")):
+STOCKS_QUANTITY_ALLOCATED_WATERMARK_KEY = "stocks_quantity_allocated_watermark"
+# Stocks changed shortly before the previous run are checked again, as their
+# transactions could be committed after the run had finished.
+STOCKS_QUANTITY_ALLOCATED_WATERMARK_OVERLAP = timedelta(minutes=1)
+
+
+def _reconcile_stocks_quantity_allocated(stock_ids: List[int]) -> int:
+    quantity_allocated = Coalesce(
+        Subquery(
+            Allocation.objects.filter(stock_id=OuterRef("pk"))
+            .order_by()
+            .values("stock_id")
+            .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+            .values("quantity_allocated_sum")
+        ),
+        0,
+    )
+    mismatched_stocks = list(
+        Stock.objects.filter(pk__in=stock_ids)
+        .annotate(allocations_allocated=quantity_allocated)
+        .exclude(quantity_allocated=F("allocations_allocated"))
+        .values_list("pk", "quantity_allocated", "allocations_allocated")
+    )
+    for pk, stock_allocated, allocations_allocated in mismatched_stocks:
         task_logger.info(
             "Mismatch updating quantity_allocated: stock %d had "
             "%d allocated, but should have %d.",
-            mismatched_stock.pk,
-            mismatched_stock.quantity_allocated,
-            mismatched_stock.allocations_allocated,
+            pk,
+            stock_allocated,
+            allocations_allocated,
         )
-        mismatched_stock.quantity_allocated = mismatched_stock.allocations_allocated
-        stocks_to_update.append(mismatched_stock)
+    # counters are recalculated in the update query, as they could be changed
+    # by new allocations in the meantime
+    Stock.objects.filter(pk__in=[pk for pk, _, _ in mismatched_stocks]).update(
+        quantity_allocated=quantity_allocated
+    )
+    return len(mismatched_stocks)
+
 
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+@app.task
+def update_stocks_quantity_allocated_task(full_scan=False):
+    """Reconcile stocks' allocated quantity with their allocations.
+
+    By default, only stocks whose allocations have changed since the previous run
+    are checked. Pass `full_scan=True` to check all stocks. Stocks are processed
+    in batches of `STOCKS_QUANTITY_ALLOCATED_UPDATE_BATCH_SIZE`.
+    """
+    started_at = timezone.now()
+    watermark = (
+        None if full_scan else cache.get(STOCKS_QUANTITY_ALLOCATED_WATERMARK_KEY)
+    )
+    stocks = Stock.objects.order_by("pk")
+    if watermark:
+        stocks = stocks.filter(allocations_updated_at__gte=watermark)
+    elif not full_scan:
+        stocks = stocks.filter(allocations_updated_at__isnull=False)
+
+    batch_size = settings.STOCKS_QUANTITY_ALLOCATED_UPDATE_BATCH_SIZE
+    checked_count = corrected_count = 0
+    last_pk = 0
+    while True:
+        stock_ids = list(
+            stocks.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size]
+        )
+        if not stock_ids:
+            break
+        corrected_count += _reconcile_stocks_quantity_allocated(stock_ids)
+        checked_count += len(stock_ids)
+        last_pk = stock_ids[-1]
+
+    cache.set(
+        STOCKS_QUANTITY_ALLOCATED_WATERMARK_KEY,
+        started_at - STOCKS_QUANTITY_ALLOCATED_WATERMARK_OVERLAP,
+        timeout=None,
+    )
+    task_logger.info(
+        "Finished updating quantity_allocated on stocks, %d were checked and "
+        "%d were corrected.",
+        checked_count,
+        corrected_count,
+    )
+
+
+@app.task
+def update_stocks_quantity_reserved_task():
+    """Reconcile stocks' reserved quantity counters with not expired reservations.
+
+    Counters are used only when `RESERVE_STOCKS_USING_COUNTERS` is enabled.
+    """
+    reservations = Reservation.objects.filter(stock_id=OuterRef("pk")).not_expired()
+    quantity_reserved = Coalesce(
+        Subquery(
+            reservations.order_by()
+            .values("stock_id")
+            .annotate(quantity_reserved_sum=Sum("quantity_reserved"))
+            .values("quantity_reserved_sum")
+        ),
+        0,
+    )
+    stocks = Stock.objects.filter(
+        Q(quantity_reserved__gt=0)
+        | Exists(Reservation.objects.filter(stock_id=OuterRef("pk")))
+    )
+    mismatched_stocks_ids = list(
+        stocks.annotate(reservations_reserved=quantity_reserved)
+        .exclude(quantity_reserved=F("reservations_reserved"))
+        .values_list("pk", flat=True)
+    )
+    # counters are recalculated in the update query, as they could be changed
+    # by new reservations in the meantime
+    Stock.objects.filter(pk__in=mismatched_stocks_ids).update(
+        quantity_reserved=quantity_reserved
+    )
     task_logger.info(
-        "Finished updating quantity_allocated on stocks, %d were corrected.",
-        len(stocks_to_update),
+        "Finished updating quantity_reserved on stocks, %d were corrected.",
+        len(mismatched_stocks_ids),
     )
@@ -7,7 +7,11 @@ from ...channel import AllocationStrategy
 from ...checkout.models import Checkout
 from ...core.exceptions import InsufficientStock
 from ..models import ChannelWarehouse, Reservation, Stock, Warehouse
-from ..reservations import reserve_stocks
+from ..reservations import (
+    release_checkout_lines_reservations,
+    release_stock_reservations,
+    reserve_stocks,
+)
 
 COUNTRY_CODE = "US"
 RESERVATION_LENGTH = 5
@@ -294,3 +298,198 @@ def test_stock_reservation_accounts_for_order_allocations_and_reservations(
             channel_USD,
             timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
         )
+
+
+def test_reserve_stocks_using_counters(checkout_line, channel_USD, settings):
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    checkout_line.quantity = 5
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    stock.refresh_from_db()
+    assert stock.quantity == 10
+    assert stock.quantity_reserved == 5
+    reservation = Reservation.objects.get(checkout_line=checkout_line, stock=stock)
+    assert reservation.quantity_reserved == 5
+
+
+def test_reserve_stocks_using_counters_replaces_previous_reservations(
+    checkout_line_with_one_reservation, channel_USD, settings
+):
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    checkout_line = checkout_line_with_one_reservation
+    previous_reservation = checkout_line.reservations.get()
+    stock = previous_reservation.stock
+    Stock.objects.update(quantity=0)
+    stock.quantity = 5
+    stock.quantity_reserved = previous_reservation.quantity_reserved
+    stock.save(update_fields=["quantity", "quantity_reserved"])
+    checkout_line.quantity = 5
+    checkout_line.save(update_fields=["quantity"])
+
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 5
+    reservation = Reservation.objects.get(checkout_line=checkout_line)
+    assert reservation.quantity_reserved == 5
+
+
+def test_reserve_stocks_using_counters_in_many_stocks(
+    checkout_line, warehouse, shipping_zone, channel_USD, settings
+):
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    checkout_line.quantity = 5
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 3
+    stock.save(update_fields=["quantity"])
+
+    secondary_warehouse = Warehouse.objects.create(
+        address=warehouse.address,
+        name="Warehouse 2",
+        slug="warehouse-2",
+        email=warehouse.email,
+    )
+    secondary_warehouse.shipping_zones.add(shipping_zone)
+    secondary_warehouse.channels.add(channel_USD)
+    secondary_stock = Stock.objects.create(
+        warehouse=secondary_warehouse,
+        product_variant=checkout_line.variant,
+        quantity=3,
+        quantity_reserved=1,
+    )
+
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    stock.refresh_from_db()
+    secondary_stock.refresh_from_db()
+    assert stock.quantity_reserved == 3
+    assert secondary_stock.quantity_reserved == 3
+    assert Reservation.objects.filter(checkout_line=checkout_line).count() == 2
+
+
+def test_reserve_stocks_using_counters_accounts_for_reserved_counter(
+    checkout_line, channel_USD, settings
+):
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    checkout_line.quantity = 5
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 10
+    stock.quantity_allocated = 3
+    stock.quantity_reserved = 3
+    stock.save(update_fields=["quantity", "quantity_allocated", "quantity_reserved"])
+
+    with pytest.raises(InsufficientStock):
+        reserve_stocks(
+            [checkout_line],
+            [checkout_line.variant],
+            COUNTRY_CODE,
+            channel_USD,
+            timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+        )
+
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 3
+    assert not Reservation.objects.exists()
+
+
+def test_release_stock_reservations_decreases_counters(
+    checkout_line_with_one_reservation, settings
+):
+    # given
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    reservation = checkout_line_with_one_reservation.reservations.get()
+    stock = reservation.stock
+    stock.quantity_reserved = reservation.quantity_reserved + 2
+    stock.save(update_fields=["quantity_reserved"])
+
+    # when
+    release_stock_reservations(Reservation.objects.filter(pk=reservation.pk))
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 2
+    assert not Reservation.objects.exists()
+
+
+def test_release_stock_reservations_skips_counters_of_expired_reservations(
+    checkout_line_with_one_reservation, settings
+):
+    # given
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    reservation = checkout_line_with_one_reservation.reservations.get()
+    reservation.reserved_until = timezone.now() - timedelta(minutes=1)
+    reservation.save(update_fields=["reserved_until"])
+    stock = reservation.stock
+    stock.quantity_reserved = 2
+    stock.save(update_fields=["quantity_reserved"])
+
+    # when
+    release_stock_reservations(Reservation.objects.filter(pk=reservation.pk))
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 2
+    assert not Reservation.objects.exists()
+
+
+def test_release_checkout_lines_reservations_using_counters(
+    checkout_line_with_one_reservation, settings
+):
+    # given
+    settings.RESERVE_STOCKS_USING_COUNTERS = True
+    checkout_line = checkout_line_with_one_reservation
+    reservation = checkout_line.reservations.get()
+    stock = reservation.stock
+    stock.quantity_reserved = reservation.quantity_reserved
+    stock.save(update_fields=["quantity_reserved"])
+
+    # when
+    release_checkout_lines_reservations([checkout_line])
+    checkout_line.delete()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 0
+    assert not Reservation.objects.exists()
+
+
+def test_release_checkout_lines_reservations_without_counters(
+    checkout_line_with_one_reservation, settings
+):
+    # given
+    settings.RESERVE_STOCKS_USING_COUNTERS = False
+    checkout_line = checkout_line_with_one_reservation
+
+    # when
+    release_checkout_lines_reservations([checkout_line])
+
+    # then
+    assert checkout_line.reservations.exists()
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from ...plugins.manager import get_plugins_manager
+from ...tests.utils import flush_post_commit_hooks
+from ..error_codes import StockErrorCode
+from ..models import Stock
+from ..stock_upsert import StockUpsertRow, bulk_upsert_stocks
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_out_of_stock")
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
+def test_bulk_upsert_stocks(mock_back_in_stock, mock_out_of_stock, variant, warehouses):
+    # given
+    first_warehouse, second_warehouse = warehouses
+    stock = Stock.objects.create(
+        product_variant=variant, warehouse=first_warehouse, quantity=10
+    )
+    rows = [
+        StockUpsertRow(warehouse=first_warehouse.slug, quantity=0, sku=variant.sku),
+        StockUpsertRow(
+            warehouse=str(second_warehouse.pk), quantity=5, variant_id=variant.pk
+        ),
+    ]
+
+    # when
+    result = bulk_upsert_stocks(rows, get_plugins_manager())
+    flush_post_commit_hooks()
+
+    # then
+    assert result.created_count == 1
+    assert result.updated_count == 1
+    assert not result.errors
+    stock.refresh_from_db()
+    assert stock.quantity == 0
+    new_stock = Stock.objects.get(warehouse=second_warehouse)
+    assert new_stock.quantity == 5
+    mock_out_of_stock.assert_called_once_with(stock)
+    mock_back_in_stock.assert_called_once_with(new_stock)
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_out_of_stock")
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
+def test_bulk_upsert_stocks_not_crossing_zero(
+    mock_back_in_stock, mock_out_of_stock, stock
+):
+    # given
+    rows = [
+        StockUpsertRow(
+            warehouse=stock.warehouse.slug,
+            quantity=stock.quantity + 5,
+            sku=stock.product_variant.sku,
+        )
+    ]
+
+    # when
+    result = bulk_upsert_stocks(rows, get_plugins_manager())
+    flush_post_commit_hooks()
+
+    # then
+    assert result.updated_count == 1
+    mock_back_in_stock.assert_not_called()
+    mock_out_of_stock.assert_not_called()
+
+
+def test_bulk_upsert_stocks_reports_invalid_rows(variant, warehouse):
+    # given
+    rows = [
+        StockUpsertRow(warehouse=warehouse.slug, quantity=3, sku="unknown"),
+        StockUpsertRow(warehouse="unknown", quantity=3, sku=variant.sku),
+        StockUpsertRow(warehouse=warehouse.slug, quantity=-1, sku=variant.sku),
+        StockUpsertRow(warehouse=warehouse.slug, quantity=7, sku=variant.sku),
+        StockUpsertRow(warehouse=warehouse.slug, quantity=8, variant_id=variant.pk),
+        StockUpsertRow(warehouse=warehouse.slug, quantity=8),
+    ]
+
+    # when
+    result = bulk_upsert_stocks(rows, get_plugins_manager())
+
+    # then
+    assert result.created_count == 1
+    assert [(error.index, error.field, error.code) for error in result.errors] == [
+        (0, "sku", StockErrorCode.NOT_FOUND.value),
+        (1, "warehouse", StockErrorCode.NOT_FOUND.value),
+        (2, "quantity", StockErrorCode.INVALID.value),
+        (4, "warehouse", StockErrorCode.UNIQUE.value),
+        (5, "sku", StockErrorCode.REQUIRED.value),
+    ]
+    assert Stock.objects.get(product_variant=variant).quantity == 7
+
+
+@mock.patch("saleor.warehouse.stock_upsert.STOCKS_UPSERT_BATCH_SIZE", 2)
+def test_bulk_upsert_stocks_in_batches(product_variant_list, warehouse):
+    # given
+    rows = [
+        StockUpsertRow(warehouse=warehouse.slug, quantity=index, sku=variant.sku)
+        for index, variant in enumerate(product_variant_list)
+    ]
+
+    # when
+    result = bulk_upsert_stocks(rows, get_plugins_manager())
+
+    # then
+    assert result.count == len(product_variant_list)
+    assert not result.errors
+    for index, variant in enumerate(product_variant_list):
+        assert variant.stocks.get(warehouse=warehouse).quantity == index
@@ -1,12 +1,14 @@
 from datetime import timedelta
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 
-from ..models import PreorderReservation, Reservation
+from ..models import PreorderReservation, Reservation, Stock
 from ..tasks import (
     delete_expired_reservations_task,
     update_stocks_quantity_allocated_task,
+    update_stocks_quantity_reserved_task,
 )
 
 
@@ -66,7 +68,7 @@ def test_update_stocks_quantity_allocated_task(
     stock.quantity_allocated = stock_allocated
     stock.save(update_fields=["quantity_allocated"])
 
-    update_stocks_quantity_allocated_task()
+    update_stocks_quantity_allocated_task(full_scan=True)
 
     allocation.refresh_from_db()
     stock.refresh_from_db()
@@ -81,7 +83,92 @@ def test_update_stocks_quantity_allocated_task_stock_without_allocations(stock):
     stock.quantity_allocated = stock_allocated
     stock.save(update_fields=["quantity_allocated"])
 
+    update_stocks_quantity_allocated_task(full_scan=True)
+
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+
+
+def test_update_stocks_quantity_allocated_task_checks_only_changed_stocks(
+    allocation, warehouse_JPY, settings
+):
+    # given
+    cache.clear()
+    settings.STOCKS_QUANTITY_ALLOCATED_UPDATE_BATCH_SIZE = 1
     update_stocks_quantity_allocated_task()
 
+    changed_stock = allocation.stock
+    changed_stock.quantity_allocated = allocation.quantity_allocated + 1
+    changed_stock.allocations_updated_at = timezone.now()
+    changed_stock.save(update_fields=["quantity_allocated", "allocations_updated_at"])
+
+    not_changed_stock = Stock.objects.create(
+        product_variant=changed_stock.product_variant,
+        warehouse=warehouse_JPY,
+        quantity_allocated=5,
+        allocations_updated_at=timezone.now() - timedelta(days=1),
+    )
+
+    # when
+    update_stocks_quantity_allocated_task()
+
+    # then
+    changed_stock.refresh_from_db()
+    not_changed_stock.refresh_from_db()
+    assert changed_stock.quantity_allocated == allocation.quantity_allocated
+    assert not_changed_stock.quantity_allocated == 5
+
+    # when
+    update_stocks_quantity_allocated_task(full_scan=True)
+
+    # then
+    not_changed_stock.refresh_from_db()
+    assert not_changed_stock.quantity_allocated == 0
+
+
+def test_update_stocks_quantity_allocated_task_full_scan_after_order_line_deleted(
+    allocation,
+):
+    # given
+    cache.clear()
+    update_stocks_quantity_allocated_task()
+    stock = allocation.stock
+    stock.quantity_allocated = allocation.quantity_allocated
+    stock.save(update_fields=["quantity_allocated"])
+    allocation.order_line.delete()
+
+    # when
+    update_stocks_quantity_allocated_task(full_scan=True)
+
+    # then
     stock.refresh_from_db()
     assert stock.quantity_allocated == 0
+
+
+def test_update_stocks_quantity_reserved_task(
+    checkout_line_with_reservation_in_many_stocks,
+):
+    reservations = Reservation.objects.order_by("pk")
+    expired_reservation = reservations.last()
+    expired_reservation.reserved_until = timezone.now() - timedelta(seconds=1)
+    expired_reservation.save(update_fields=["reserved_until"])
+    Stock.objects.update(quantity_reserved=100)
+
+    update_stocks_quantity_reserved_task()
+
+    for reservation in reservations:
+        reservation.stock.refresh_from_db()
+        expected_quantity_reserved = (
+            0 if reservation == expired_reservation else reservation.quantity_reserved
+        )
+        assert reservation.stock.quantity_reserved == expected_quantity_reserved
+
+
+def test_update_stocks_quantity_reserved_task_stock_without_reservations(stock):
+    stock.quantity_reserved = 9
+    stock.save(update_fields=["quantity_reserved"])
+
+    update_stocks_quantity_reserved_task()
+
+    stock.refresh_from_db()
+    assert stock.quantity_reserved == 0
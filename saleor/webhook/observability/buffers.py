@@ -1,11 +1,11 @@
 import math
-import pickle
-import zlib
-from typing import Any, Dict, List, Optional, Tuple
+import os
+import socket
+from typing import Dict, List, Optional, Set, Tuple
 
 from asgiref.local import Local
 from django.conf import settings
-from redis import ConnectionPool, Redis
+from redis import ConnectionPool, Redis, ResponseError
 
 from .exceptions import ConnectionNotConfigured
 
@@ -15,8 +15,11 @@ _local = Local()
 
 
 class BaseBuffer:
-    _compressor_preset = 6
-    _pickle_version = 5
+    """Buffer of serialized observability events.
+
+    Events are put into the buffer already serialized to JSON, so they're stored
+    and sent as they are, without any additional encoding on the request path.
+    """
 
     def __init__(
         self,
@@ -34,42 +37,40 @@ class BaseBuffer:
         self.connection_timeout = connection_timeout
         self.timeout = timeout
 
-    def decode(self, value: bytes) -> Any:
-        return pickle.loads(zlib.decompress(value))
+    def decode(self, value: bytes) -> str:
+        return value.decode("utf-8")
 
-    def encode(self, value: Any) -> bytes:
-        return zlib.compress(
-            pickle.dumps(value, self._pickle_version), self._compressor_preset
-        )
+    def encode(self, value: str) -> bytes:
+        return value.encode("utf-8")
 
-    def put_event(self, event: Any) -> int:
+    def put_event(self, event: str) -> int:
         raise NotImplementedError(
             "subclasses of BaseBuffer must provide a put_event() method"
         )
 
-    def put_events(self, events: List[Any]) -> int:
+    def put_events(self, events: List[str]) -> int:
         raise NotImplementedError(
             "subclasses of BaseBuffer must provide a put_events() method"
         )
 
     def put_multi_key_events(
-        self, events_dict: Dict[KEY_TYPE, List[Any]]
+        self, events_dict: Dict[KEY_TYPE, List[str]]
     ) -> Dict[KEY_TYPE, int]:
         raise NotImplementedError(
             "subclasses of BaseBuffer must provide a put_events_multi_buffer() method"
         )
 
-    def pop_event(self) -> Any:
+    def pop_event(self) -> Optional[str]:
         raise NotImplementedError(
             "subclasses of BaseBuffer must provide a pop_events() method"
         )
 
-    def pop_events(self) -> List[Any]:
+    def pop_events(self) -> List[str]:
         raise NotImplementedError(
             "subclasses of BaseBuffer must provide a pop_events() method"
         )
 
-    def pop_events_get_size(self) -> Tuple[List[Any], int]:
+    def pop_events_get_size(self) -> Tuple[List[str], int]:
         raise NotImplementedError(
             "subclasses of BaseBuffer must provide a pop_events_get_size() method"
         )
@@ -121,7 +122,7 @@ class RedisBuffer(BaseBuffer):
         return self._client
 
     def _put_events(
-        self, key: KEY_TYPE, events: List[Any], client: Optional[Redis] = None
+        self, key: KEY_TYPE, events: List[str], client: Optional[Redis] = None
     ) -> int:
         start_index = -self.max_size
         events_data = [self.encode(event) for event in events[start_index:]]
@@ -132,17 +133,17 @@ class RedisBuffer(BaseBuffer):
         client.expire(key, self.timeout)
         return max(0, len(events) - self.max_size)
 
-    def put_events(self, events: List[Any]) -> int:
+    def put_events(self, events: List[str]) -> int:
         with self.client.pipeline(transaction=False) as pipe:
             dropped = self._put_events(self.key, events, client=pipe)
             result = pipe.execute()
         return dropped + max(0, result[0] - self.max_size)
 
-    def put_event(self, event: Any) -> int:
+    def put_event(self, event: str) -> int:
         return self.put_events([event])
 
     def put_multi_key_events(
-        self, events_dict: Dict[KEY_TYPE, List[Any]]
+        self, events_dict: Dict[KEY_TYPE, List[str]]
     ) -> Dict[KEY_TYPE, int]:
         keys = list(events_dict.keys())
         trimmed: Dict[KEY_TYPE, int] = {}
@@ -157,7 +158,7 @@ class RedisBuffer(BaseBuffer):
             trimmed[key] += max(0, buffer_len - self.max_size)
         return trimmed
 
-    def _pop_events(self, key: KEY_TYPE, batch_size: int) -> Tuple[List[Any], int]:
+    def _pop_events(self, key: KEY_TYPE, batch_size: int) -> Tuple[List[str], int]:
         events = []
         with self.client.pipeline(transaction=False) as pipe:
             pipe.llen(key)
@@ -171,15 +172,15 @@ class RedisBuffer(BaseBuffer):
             events.append(self.decode(elem))
         return events, size - len(events)
 
-    def pop_event(self) -> Any:
+    def pop_event(self) -> Optional[str]:
         events, _ = self._pop_events(self.key, batch_size=1)
         return events[0] if events else None
 
-    def pop_events(self) -> List[Any]:
+    def pop_events(self) -> List[str]:
         events, _ = self._pop_events(self.key, self.batch_size)
         return events
 
-    def pop_events_get_size(self) -> Tuple[List[Any], int]:
+    def pop_events_get_size(self) -> Tuple[List[str], int]:
         return self._pop_events(self.key, self.batch_size)
 
     def clear(self) -> int:
@@ -193,6 +194,110 @@ class RedisBuffer(BaseBuffer):
         return self.client.llen(self.key)
 
 
+class RedisStreamBuffer(RedisBuffer):
+    """Buffer kept in a Redis stream and read by a consumer group.
+
+    Each event is delivered to only one consumer of the group, so many reporters
+    can pop events in parallel without sending duplicates. Events are acknowledged
+    and removed from the stream right after being read.
+    """
+
+    _group_name = "observability_reporters"
+    _field_name = b"event"
+    _groups: Set[Tuple[str, KEY_TYPE]] = set()
+
+    @property
+    def consumer_name(self) -> str:
+        return f"{socket.gethostname()}-{os.getpid()}"
+
+    def _put_events(
+        self, key: KEY_TYPE, events: List[str], client: Optional[Redis] = None
+    ) -> int:
+        start_index = -self.max_size
+        if client is None:
+            client = self.client
+        client.xlen(key)
+        for event in events[start_index:]:
+            client.xadd(
+                key, {self._field_name: self.encode(event)}, maxlen=self.max_size
+            )
+        client.expire(key, self.timeout)
+        return max(0, len(events) - self.max_size)
+
+    def put_events(self, events: List[str]) -> int:
+        with self.client.pipeline(transaction=False) as pipe:
+            dropped = self._put_events(self.key, events, client=pipe)
+            result = pipe.execute()
+        added = min(len(events), self.max_size)
+        return dropped + max(0, result[0] + added - self.max_size)
+
+    def put_multi_key_events(
+        self, events_dict: Dict[KEY_TYPE, List[str]]
+    ) -> Dict[KEY_TYPE, int]:
+        keys = list(events_dict.keys())
+        trimmed: Dict[KEY_TYPE, int] = {}
+        if not keys:
+            return trimmed
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                trimmed[key] = self._put_events(key, events_dict[key], client=pipe)
+            result = pipe.execute()
+        for key in keys:
+            added = min(len(events_dict[key]), self.max_size)
+            buffer_len = result.pop(0)
+            # drop results of XADD commands and EXPIRE
+            del result[: added + 1]
+            trimmed[key] += max(0, buffer_len + added - self.max_size)
+        return trimmed
+
+    def create_group(self, key: KEY_TYPE):
+        if (self.broker_url, key) in self._groups:
+            return
+        try:
+            self.client.xgroup_create(key, self._group_name, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups.add((self.broker_url, key))
+
+    def _pop_events(self, key: KEY_TYPE, batch_size: int) -> Tuple[List[str], int]:
+        self.create_group(key)
+        try:
+            response = self.client.xreadgroup(
+                self._group_name,
+                self.consumer_name,
+                {key: ">"},
+                count=max(1, batch_size),
+            )
+        except ResponseError as e:
+            # the stream with its group has expired
+            if "NOGROUP" not in str(e):
+                raise
+            self._groups.discard((self.broker_url, key))
+            return [], 0
+        entries = response[0][1] if response else []
+        events = [self.decode(data[self._field_name]) for _, data in entries]
+        with self.client.pipeline(transaction=False) as pipe:
+            if entries:
+                ids = [entry_id for entry_id, _ in entries]
+                pipe.xack(key, self._group_name, *ids)
+                pipe.xdel(key, *ids)
+            pipe.xlen(key)
+            result = pipe.execute()
+        return events, result[-1]
+
+    def clear(self) -> int:
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.key)
+            pipe.delete(self.key)
+            result = pipe.execute()
+        self._groups.discard((self.broker_url, self.key))
+        return result[0]
+
+    def size(self) -> int:
+        return self.client.xlen(self.key)
+
+
 def get_buffer(
     key: KEY_TYPE, connection_timeout=DEFAULT_CONNECTION_TIMEOUT
 ) -> BaseBuffer:
@@ -202,7 +307,10 @@ def get_buffer(
     max_size = settings.OBSERVABILITY_BUFFER_SIZE_LIMIT
     batch_size = settings.OBSERVABILITY_BUFFER_BATCH_SIZE
     timeout = int(settings.OBSERVABILITY_BUFFER_TIMEOUT.total_seconds())
-    return RedisBuffer(
+    buffer_class = (
+        RedisStreamBuffer if settings.OBSERVABILITY_BUFFER_USE_STREAMS else RedisBuffer
+    )
+    return buffer_class(
         broker_url,
         key,
         max_size,
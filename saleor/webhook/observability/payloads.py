@@ -71,6 +71,56 @@ def dump_payload(payload: Any) -> str:
     return json.dumps(to_camel_case(payload), ensure_ascii=True, cls=CustomJsonEncoder)
 
 
+def _trim_json(obj: Any, bytes_limit: int) -> Tuple[Any, int, bool]:
+    if isinstance(obj, Mapping):
+        trimmed_dict: Dict[str, Any] = {}
+        size, trimmed = len("{}"), False
+        for key, value in obj.items():
+            separator_size = len(", ") if trimmed_dict else 0
+            key_size = separator_size + len(f'"{key}": ')
+            if size + key_size >= bytes_limit:
+                return trimmed_dict, size, True
+            value, value_size, trimmed = _trim_json(
+                value, bytes_limit - size - key_size
+            )
+            trimmed_dict[key] = value
+            size += key_size + value_size
+            if trimmed:
+                break
+        return trimmed_dict, size, trimmed
+    if isinstance(obj, (list, tuple)):
+        trimmed_list: List[Any] = []
+        size, trimmed = len("[]"), False
+        for item in obj:
+            separator_size = len(", ") if trimmed_list else 0
+            if size + separator_size >= bytes_limit:
+                return trimmed_list, size, True
+            item, item_size, trimmed = _trim_json(
+                item, bytes_limit - size - separator_size
+            )
+            trimmed_list.append(item)
+            size += separator_size + item_size
+            if trimmed:
+                break
+        return trimmed_list, size, trimmed
+    if isinstance(obj, str):
+        if len(obj) + len('""') > bytes_limit:
+            obj = obj[: max(0, bytes_limit - len('""'))]
+            return obj, len(obj) + len('""'), True
+        return obj, len(obj) + len('""'), False
+    return obj, len(json.dumps(obj, cls=CustomJsonEncoder)), False
+
+
+def trim_json(obj: Any, bytes_limit: int) -> Tuple[Any, bool]:
+    """Return a copy of the object cut down to about `bytes_limit` bytes of JSON.
+
+    Used to drop the parts of large results that would be truncated anyway,
+    before they're serialized. The second value tells whether anything was cut.
+    """
+    trimmed_obj, _, trimmed = _trim_json(obj, bytes_limit)
+    return trimmed_obj, trimmed
+
+
 TRUNC_PLACEHOLDER = JsonTruncText(truncated=False)
 EMPTY_TRUNC = JsonTruncText(truncated=True)
 GQL_OPERATION_PLACEHOLDER = GraphQLOperation(
@@ -118,7 +168,9 @@ def serialize_gql_operation_result(
         ):
             payload["operation_type"] = definition.operation
     if operation.result:
-        result = JsonTruncText.truncate(pretty_json(operation.result), bytes_limit)
+        result_data, trimmed = trim_json(operation.result, bytes_limit)
+        result = JsonTruncText.truncate(pretty_json(result_data), bytes_limit)
+        result.truncated = result.truncated or trimmed
         bytes_limit -= result.byte_size
         payload["result"] = result
     return payload, max(0, bytes_limit)
@@ -1,12 +1,13 @@
 from datetime import timedelta
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 from django.utils import timezone
 from freezegun import freeze_time
 
-from ..buffers import RedisBuffer, get_buffer
+from ..buffers import RedisBuffer, RedisStreamBuffer, get_buffer
 from ..exceptions import ConnectionNotConfigured
-from ..tests.conftest import BATCH_SIZE, BROKER_URL_HOST, KEY, MAX_SIZE
+from ..tests.conftest import BATCH_SIZE, BROKER_URL, BROKER_URL_HOST, KEY, MAX_SIZE
 
 
 def test_get_buffer(redis_server, settings):
@@ -16,6 +17,12 @@ def test_get_buffer(redis_server, settings):
     assert buffer.batch_size == settings.OBSERVABILITY_BUFFER_BATCH_SIZE
 
 
+def test_get_buffer_using_streams(redis_server, settings):
+    settings.OBSERVABILITY_BUFFER_USE_STREAMS = True
+    buffer = get_buffer(KEY)
+    assert isinstance(buffer, RedisStreamBuffer)
+
+
 def test_get_buffer_with_no_config(settings):
     settings.OBSERVABILITY_BROKER_URL = None
     with pytest.raises(ConnectionNotConfigured):
@@ -45,35 +52,35 @@ def test_in_batches(buffer):
 
 
 def test_put_event(buffer):
-    event = {"event": "data"}
+    event = '{"event": "data"}'
     dropped = buffer.put_event(event)
     assert buffer.size() == 1
     assert dropped == 0
 
 
 def test_buffer_put_events_max_size(buffer):
-    event = {"event": "data"}
+    event = '{"event": "data"}'
     for i in range(MAX_SIZE * 2):
         buffer.put_event(event)
     assert buffer.size() == MAX_SIZE
 
 
 def test_put_events(buffer):
-    events = [{"event": "data"}] * 2
+    events = ['{"event": "data"}'] * 2
     dropped = buffer.put_events(events)
     assert buffer.size() == 2
     assert dropped == 0
 
 
 def test_put_events_max_size(buffer):
-    events = [{"event": "data"}] * MAX_SIZE * 2
+    events = ['{"event": "data"}'] * MAX_SIZE * 2
     dropped = buffer.put_events(events)
     assert buffer.size() == MAX_SIZE
     assert dropped == MAX_SIZE
 
 
 def test_buffer_drops_events_when_put_events(buffer):
-    events = [{"event": "data"}] * MAX_SIZE
+    events = ['{"event": "data"}'] * MAX_SIZE
     buffer.put_events(events)
     dropped = buffer.put_events(events)
     assert dropped == MAX_SIZE
@@ -81,9 +88,9 @@ def test_buffer_drops_events_when_put_events(buffer):
 
 
 def test_put_multi_key_events(patch_connection_pool):
-    key_a, events_a = "buffer_a", [{"event": "data"}] * 2
-    key_b, events_b = "buffer_b", [{"event": "data"}] * MAX_SIZE
-    key_c, events_c = "buffer_c", [{"event": "data"}] * MAX_SIZE * 2
+    key_a, events_a = "buffer_a", ['{"event": "data"}'] * 2
+    key_b, events_b = "buffer_b", ['{"event": "data"}'] * MAX_SIZE
+    key_c, events_c = "buffer_c", ['{"event": "data"}'] * MAX_SIZE * 2
     buffer_a, buffer_b, buffer_c = (
         get_buffer(key_a),
         get_buffer(key_b),
@@ -99,10 +106,10 @@ def test_put_multi_key_events(patch_connection_pool):
 
 
 def test_put_multi_key_events_when_buffer_full(patch_connection_pool):
-    max_events = [{"event": "data"}] * MAX_SIZE
-    key_a, events_a = "buffer_a", [{"event": "data"}] * 2
-    key_b, events_b = "buffer_b", [{"event": "data"}] * MAX_SIZE
-    key_c, events_c = "buffer_c", [{"event": "data"}] * MAX_SIZE * 2
+    max_events = ['{"event": "data"}'] * MAX_SIZE
+    key_a, events_a = "buffer_a", ['{"event": "data"}'] * 2
+    key_b, events_b = "buffer_b", ['{"event": "data"}'] * MAX_SIZE
+    key_c, events_c = "buffer_c", ['{"event": "data"}'] * MAX_SIZE * 2
     buffer_a = get_buffer(key_a)
     buffer_a.put_multi_key_events(
         {key_a: max_events, key_b: max_events, key_c: max_events}
@@ -115,7 +122,7 @@ def test_put_multi_key_events_when_buffer_full(patch_connection_pool):
 
 
 def test_pop_event(buffer):
-    event = "buffer", {"event": "data"}
+    event = '{"event": "data"}'
     buffer.put_event(event)
     popped_event = buffer.pop_event()
     assert id(event) != id(popped_event)
@@ -125,7 +132,7 @@ def test_pop_event(buffer):
 
 
 def test_pop_events(buffer):
-    events = [{"event": f"data{i}"} for i in range(MAX_SIZE)]
+    events = [f'{{"event": "data{i}"}}' for i in range(MAX_SIZE)]
     buffer.put_events(events)
     popped_events = buffer.pop_events()
     assert len(popped_events) == BATCH_SIZE
@@ -134,7 +141,7 @@ def test_pop_events(buffer):
 
 
 def test_pop_events_get_size(buffer):
-    events = [{"event": f"data{i}"} for i in range(MAX_SIZE)]
+    events = [f'{{"event": "data{i}"}}' for i in range(MAX_SIZE)]
     buffer.put_events(events)
     popped_events, size = buffer.pop_events_get_size()
     assert len(popped_events) == BATCH_SIZE
@@ -144,7 +151,7 @@ def test_pop_events_get_size(buffer):
 
 
 def test_clear(buffer):
-    events = [{"event": "data"}] * 2
+    events = ['{"event": "data"}'] * 2
     buffer.put_events(events)
     assert buffer.size() == 2
     assert buffer.clear() == 2
@@ -154,8 +161,81 @@ def test_clear(buffer):
 def test_pop_expired_events(buffer):
     push_time = timezone.now()
     with freeze_time(push_time):
-        events = [{"event": f"data{i}"} for i in range(MAX_SIZE)]
+        events = [f'{{"event": "data{i}"}}' for i in range(MAX_SIZE)]
         buffer.put_events(events)
     with freeze_time(push_time + timedelta(seconds=buffer.timeout + 1)):
         popped_events = buffer.pop_events()
     assert popped_events == []
+
+
+@pytest.fixture
+def stream_buffer_client():
+    client = MagicMock()
+    with patch.object(
+        RedisStreamBuffer, "client", new_callable=PropertyMock, return_value=client
+    ), patch.object(RedisStreamBuffer, "_groups", set()):
+        yield client
+
+
+def test_stream_buffer_put_events(stream_buffer_client):
+    # given
+    buffer = RedisStreamBuffer(BROKER_URL, KEY, MAX_SIZE, BATCH_SIZE)
+    pipe = stream_buffer_client.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [MAX_SIZE - 1, b"1-0", b"2-0", True]
+    events = ['{"event": "data1"}', '{"event": "data2"}']
+
+    # when
+    dropped = buffer.put_events(events)
+
+    # then
+    assert dropped == 1
+    assert pipe.xadd.call_count == 2
+    pipe.xadd.assert_called_with(KEY, {b"event": events[1].encode()}, maxlen=MAX_SIZE)
+    pipe.expire.assert_called_once_with(KEY, buffer.timeout)
+
+
+def test_stream_buffer_pop_events_get_size(stream_buffer_client):
+    # given
+    buffer = RedisStreamBuffer(BROKER_URL, KEY, MAX_SIZE, BATCH_SIZE)
+    stream_buffer_client.xreadgroup.return_value = [
+        [
+            KEY.encode(),
+            [
+                (b"1-0", {b"event": b'{"event": "data1"}'}),
+                (b"2-0", {b"event": b'{"event": "data2"}'}),
+            ],
+        ]
+    ]
+    pipe = stream_buffer_client.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [2, 2, 3]
+
+    # when
+    events, size = buffer.pop_events_get_size()
+
+    # then
+    assert events == ['{"event": "data1"}', '{"event": "data2"}']
+    assert size == 3
+    stream_buffer_client.xgroup_create.assert_called_once_with(
+        KEY, buffer._group_name, id="0", mkstream=True
+    )
+    stream_buffer_client.xreadgroup.assert_called_once_with(
+        buffer._group_name, buffer.consumer_name, {KEY: ">"}, count=BATCH_SIZE
+    )
+    pipe.xack.assert_called_once_with(KEY, buffer._group_name, b"1-0", b"2-0")
+    pipe.xdel.assert_called_once_with(KEY, b"1-0", b"2-0")
+
+
+def test_stream_buffer_pop_events_when_empty(stream_buffer_client):
+    # given
+    buffer = RedisStreamBuffer(BROKER_URL, KEY, MAX_SIZE, BATCH_SIZE)
+    stream_buffer_client.xreadgroup.return_value = []
+    pipe = stream_buffer_client.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [0]
+
+    # when
+    events, size = buffer.pop_events_get_size()
+
+    # then
+    assert events == []
+    assert size == 0
+    pipe.xack.assert_not_called()
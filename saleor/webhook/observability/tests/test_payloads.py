@@ -37,6 +37,7 @@ from ..payloads import (
     serialize_gql_operation_results,
     serialize_headers,
     to_camel_case,
+    trim_json,
 )
 from ..utils import GraphQLOperationResponse
 
@@ -147,6 +148,35 @@ def test_serialize_gql_operation_result_when_truncated(gql_operation_factory):
     assert len(dump_payload(payload)) <= bytes_limit
 
 
+@pytest.mark.parametrize(
+    "obj,bytes_limit,expected,expected_trimmed",
+    [
+        ({"data": "result"}, 1024, {"data": "result"}, False),
+        ({"data": "result"}, 13, {"data": "r"}, True),
+        ({"data": [1, 2, 3], "extra": 1}, 16, {"data": [1, 2]}, True),
+        ([{"a": 1}, {"b": 2}], 10, [{"a": 1}], True),
+        ("text", 4, "te", True),
+    ],
+)
+def test_trim_json(obj, bytes_limit, expected, expected_trimmed):
+    trimmed_obj, trimmed = trim_json(obj, bytes_limit)
+    assert trimmed_obj == expected
+    assert trimmed is expected_trimmed
+
+
+def test_serialize_gql_operation_result_trims_large_result(gql_operation_factory):
+    query = "query FirstQuery { shop { name } }"
+    result = {"data": {"products": [{"name": f"product-{i}"} for i in range(1000)]}}
+    operation_result = gql_operation_factory(query, "FirstQuery", None, result)
+    bytes_limit = 1024
+
+    payload, _ = serialize_gql_operation_result(operation_result, bytes_limit)
+
+    assert payload["result"].truncated
+    assert pretty_json(result).startswith(payload["result"].text)
+    assert len(dump_payload(payload)) <= bytes_limit
+
+
 def test_serialize_gql_operation_results(gql_operation_factory):
     query = "query FirstQuery { shop { name } } query SecondQuery { shop { name } }"
     result = {"data": "result"}
@@ -1,5 +1,5 @@
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
@@ -12,6 +12,7 @@ from ..payload_schema import JsonTruncText
 from ..payloads import CustomJsonEncoder
 from ..utils import (
     ApiCall,
+    GraphQLOperationResponse,
     get_webhooks,
     get_webhooks_clear_mem_cache,
     pop_events_with_remaining_size,
@@ -221,6 +222,87 @@ def test_api_call_response_report_when_no_gql_response(
     mock_put_event.assert_not_called()
 
 
+@patch("saleor.webhook.observability.utils.put_event")
+def test_api_call_report_not_sampled(
+    mock_put_event,
+    observability_enabled,
+    patch_get_webhooks,
+    app,
+    api_call,
+    test_request,
+    settings,
+):
+    test_request.app = app
+    settings.OBSERVABILITY_API_CALL_SAMPLE_RATE = 0.0
+
+    api_call.report()
+
+    mock_put_event.assert_not_called()
+
+
+@patch("saleor.webhook.observability.utils.put_event")
+def test_api_call_report_sampled_by_operation_rate(
+    mock_put_event,
+    observability_enabled,
+    patch_get_webhooks,
+    app,
+    api_call,
+    test_request,
+    settings,
+):
+    test_request.app = app
+    settings.OBSERVABILITY_API_CALL_SAMPLE_RATE = 0.0
+    settings.OBSERVABILITY_API_CALL_SAMPLE_RATES = {"FirstQuery": 1.0}
+    api_call.gql_operations = [
+        GraphQLOperationResponse(name="OtherQuery"),
+        GraphQLOperationResponse(name="FirstQuery"),
+    ]
+
+    api_call.report()
+
+    mock_put_event.assert_called_once()
+
+
+@patch("saleor.webhook.observability.utils.put_event")
+def test_api_call_report_with_errors_always_reported(
+    mock_put_event,
+    observability_enabled,
+    patch_get_webhooks,
+    app,
+    api_call,
+    test_request,
+    settings,
+):
+    test_request.app = app
+    settings.OBSERVABILITY_API_CALL_SAMPLE_RATE = 0.0
+    api_call.gql_operations = [
+        GraphQLOperationResponse(name="FirstQuery", result={"errors": ["error"]})
+    ]
+
+    api_call.report()
+
+    mock_put_event.assert_called_once()
+
+
+@patch("saleor.webhook.observability.utils.put_event")
+def test_api_call_report_slow_always_reported(
+    mock_put_event,
+    observability_enabled,
+    patch_get_webhooks,
+    app,
+    api_call,
+    test_request,
+    settings,
+):
+    test_request.app = app
+    settings.OBSERVABILITY_API_CALL_SAMPLE_RATE = 0.0
+    settings.OBSERVABILITY_SLOW_API_CALL_THRESHOLD = timedelta(0)
+
+    api_call.report()
+
+    mock_put_event.assert_called_once()
+
+
 @patch("saleor.webhook.observability.utils.put_event")
 def test_report_event_delivery_attempt(
     mock_put_event,
@@ -246,6 +328,23 @@ def test_report_event_delivery_attempt_not_active(
 def test_put_event(patch_get_buffer, buffer):
     put_event(lambda: {"payload": "data"})
     assert buffer.size() == 1
+    assert buffer.pop_event() == '{"payload": "data"}'
+
+
+@patch("saleor.webhook.observability.utils.logger")
+def test_put_event_over_time_budget(mock_logger, patch_get_buffer, buffer, settings):
+    settings.OBSERVABILITY_REPORT_TIME_BUDGET = timedelta(0)
+    put_event(lambda: {"payload": "data"})
+    assert buffer.size() == 1
+    mock_logger.warning.assert_called_once()
+    assert mock_logger.warning.call_args.kwargs["extra"]["observability_overhead"] > 0
+
+
+@patch("saleor.webhook.observability.utils.logger")
+def test_put_event_within_time_budget(mock_logger, patch_get_buffer, buffer, settings):
+    settings.OBSERVABILITY_REPORT_TIME_BUDGET = timedelta(seconds=10)
+    put_event(lambda: {"payload": "data"})
+    mock_logger.warning.assert_not_called()
 
 
 @pytest.mark.parametrize(
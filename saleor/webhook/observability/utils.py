@@ -1,5 +1,6 @@
 import functools
 import logging
+import random
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -19,7 +20,11 @@ from ..event_types import WebhookEventAsyncType
 from ..utils import get_webhooks_for_event
 from .buffers import get_buffer
 from .exceptions import TruncationError
-from .payloads import generate_api_call_payload, generate_event_delivery_attempt_payload
+from .payloads import (
+    dump_payload,
+    generate_api_call_payload,
+    generate_event_delivery_attempt_payload,
+)
 from .tracing import opentracing_trace
 
 if TYPE_CHECKING:
@@ -91,18 +96,27 @@ def task_next_retry_date(retry_error: "Retry") -> Optional[datetime]:
 
 
 def put_event(generate_payload: Callable[[], Any]):
-    try:
-        payload = generate_payload()
-        with opentracing_trace("put_event", "buffer"):
+    start_time = monotonic()
+    with opentracing_trace("put_event", "buffer") as span:
+        try:
+            payload = dump_payload(generate_payload())
             if get_buffer(get_buffer_name()).put_event(payload):
                 logger.warning("Observability buffer full, event dropped.")
-    except TruncationError as err:
-        logger.warning("Observability event dropped. %s", err, extra=err.extra)
-    except Exception:
-        logger.error("Observability event dropped.", exc_info=True)
+        except TruncationError as err:
+            logger.warning("Observability event dropped. %s", err, extra=err.extra)
+        except Exception:
+            logger.error("Observability event dropped.", exc_info=True)
+        overhead = monotonic() - start_time
+        span.set_tag("observability.overhead", overhead)
+    if overhead > settings.OBSERVABILITY_REPORT_TIME_BUDGET.total_seconds():
+        logger.warning(
+            "Reporting observability event took %.3fs, over the time budget.",
+            overhead,
+            extra={"observability_overhead": overhead},
+        )
 
 
-def pop_events_with_remaining_size() -> Tuple[List[Any], int]:
+def pop_events_with_remaining_size() -> Tuple[List[str], int]:
     with opentracing_trace("pop_events", "buffer"):
         try:
             buffer = get_buffer(get_buffer_name())
@@ -129,6 +143,40 @@ class ApiCall:
         self.response: Optional["HttpResponse"] = None
         self._reported = False
         self.request = request
+        self.start_time = monotonic()
+
+    def has_errors(self) -> bool:
+        if self.response is not None and self.response.status_code >= 400:
+            return True
+        return any(
+            operation.result_invalid
+            or (isinstance(operation.result, dict) and operation.result.get("errors"))
+            for operation in self.gql_operations
+        )
+
+    def get_sample_rate(self) -> float:
+        rates = settings.OBSERVABILITY_API_CALL_SAMPLE_RATES
+        default_rate = settings.OBSERVABILITY_API_CALL_SAMPLE_RATE
+        return max(
+            (
+                rates.get(operation.name, default_rate)
+                for operation in self.gql_operations
+            ),
+            default=default_rate,
+        )
+
+    def is_sampled(self) -> bool:
+        """Decide whether the API call should be reported.
+
+        Failed and slow API calls are always reported, others are sampled at the rate
+        configured for their operations.
+        """
+        if self.has_errors():
+            return True
+        duration = monotonic() - self.start_time
+        if duration >= settings.OBSERVABILITY_SLOW_API_CALL_THRESHOLD.total_seconds():
+            return True
+        return random.random() < self.get_sample_rate()
 
     def report(self):
         if self._reported or not settings.OBSERVABILITY_ACTIVE:
@@ -141,7 +189,7 @@ class ApiCall:
             return
         self._reported = True
         with opentracing_trace("report_api_call", "reporter"):
-            if get_webhooks():
+            if get_webhooks() and self.is_sampled():
                 put_event(
                     partial(
                         generate_api_call_payload,